@@ -1,3 +1,7 @@
+import random
+from pathlib import Path
+from typing import Optional
+
 import click
 from webdriver_manager.chrome import ChromeDriverManager
 
@@ -14,7 +18,9 @@ from hrt.common.enums import (
     MarkedQuestionListingType,
     NumberOfLetters,
     QuestionAnswerDisplay,
+    QuestionBankImportFormat,
     QuestionDisplayMode,
+    QuestionLanguage,
     QuestionListingType,
     QuestionRefType,
     QuizAnswerDisplay,
@@ -23,10 +29,21 @@ from hrt.common.enums import (
     SortBy,
     TopQuestionsListingType,
 )
+from hrt.common.exam_simulator import estimate_exam_readiness
+from hrt.common.quiz import QuizFactory
+from hrt.common.review_schedule import SECONDS_PER_DAY
 from hrt.downloaders.base_downloader import DownloaderFactory
 from hrt.processors.callsign_processor import CallSignsProcessor
-from hrt.processors.question_processor import QuestionProcessor
-from hrt.processors.quiz_processor import QuizProcessor
+from hrt.processors.question_processor import (
+    QuestionProcessor,
+    report_question_bank_stats,
+    search_question_banks,
+)
+from hrt.processors.quiz_processor import QuizProcessor, report_answer_stats
+from hrt.question_banks.question_bank_importer import (
+    get_imported_categories_path,
+    import_question_bank,
+)
 
 
 @click.group(
@@ -125,6 +142,11 @@ def show(
             logger.error(f"Enum {enum} not found.")
 
 
+def get_language(ctx) -> QuestionLanguage:
+    """Returns the language of the questions selected with the --lang option."""
+    return QuestionLanguage.from_id(ctx.obj.get("language", QuestionLanguage.EN.id))
+
+
 def get_common_question_params(ctx):
     """Extract common parameters for question commands."""
     config = ctx.obj["config"]
@@ -166,10 +188,17 @@ def get_common_question_params(ctx):
     default=False,
     help="Display the output without saving to file.",
 )
+@click.option(
+    "--lang",
+    type=click.Choice(QuestionLanguage.ids()),
+    default=QuestionLanguage.EN.id,
+    help="Language of the questions.",
+)
 @click.pass_context
-def question(ctx, country, answer_display, no_save_to_file):
+def question(ctx, country, answer_display, no_save_to_file, lang):
     """Commands related to question management."""
     ctx.obj["country_code"] = country
+    ctx.obj["language"] = lang
     ctx.obj["answer_display"] = answer_display
     ctx.obj["save_to_file"] = not no_save_to_file
 
@@ -177,8 +206,9 @@ def question(ctx, country, answer_display, no_save_to_file):
 @question.command("list")
 @click.option(
     "--criteria",
-    type=click.Choice(GeneralQuestionListingType.ids()),
-    help="List questions with specific criteria.",
+    type=click.Choice([*GeneralQuestionListingType.ids(), constants.ALL_LISTING_TYPES_ID]),
+    help="List questions with specific criteria, or all the listings with "
+    f"'{constants.ALL_LISTING_TYPES_ID}'.",
 )
 @click.option(
     "--top-criteria",
@@ -195,6 +225,13 @@ def list_questions(
     config, country_code, answer_display, save_to_file, exam_type = get_common_question_params(ctx)
     criteria_type: QuestionListingType | None = GeneralQuestionListingType.ALL
     max_questions = 0
+    if criteria == constants.ALL_LISTING_TYPES_ID:
+        logger.info(f"Exam type: {exam_type}")
+        qp = QuestionProcessor(
+            config, country_code, exam_type, QuestionDisplayMode.PRINT, get_language(ctx)
+        )
+        qp.list_all(answer_display, constants.DEFAULT_TOP_QUESTIONS_COUNT, save_to_file)
+        return
     if criteria:
         criteria_type = QuestionListingType.from_id(criteria)
         logger.info(f"Listing questions based on criteria: {criteria_type}")
@@ -212,6 +249,8 @@ def list_questions(
         config,
         country_code,
         exam_type,
+        QuestionDisplayMode.PRINT,
+        get_language(ctx),
     )
     qp.list(criteria_type, answer_display, max_questions, save_to_file)
 
@@ -237,11 +276,115 @@ def list_marked_questions(ctx, criteria):
         config,
         country_code,
         exam_type,
+        QuestionDisplayMode.PRINT,
+        get_language(ctx),
     )
     criteria_type: MarkedQuestionListingType = MarkedQuestionListingType.from_id(criteria)
     qp.list_marked(criteria_type, answer_display, questions_count, save_to_file)
 
 
+@question.command("search")
+@click.argument("terms")
+@click.option(
+    "--max-results",
+    type=click.IntRange(min=1),
+    default=constants.DEFAULT_SEARCH_RESULTS_COUNT,
+    help="Maximum number of questions to return.",
+)
+@click.pass_context
+def search_questions(ctx, terms, max_results):
+    """Search questions of all exam types by question text and choices."""
+    config = ctx.obj["config"]
+    country_code = CountryCode.from_id(ctx.obj["country_code"])
+    answer_display = QuestionAnswerDisplay.from_id(ctx.obj["answer_display"])
+    logger.info(f"Searching questions for country: {country_code}, terms: {terms}")
+    search_question_banks(
+        config,
+        country_code,
+        terms,
+        answer_display,
+        max_results,
+        ctx.obj["save_to_file"],
+        get_language(ctx),
+    )
+
+
+@question.command("diff")
+@click.option(
+    "--apply",
+    is_flag=True,
+    default=False,
+    help="Migrate metrics and marked questions to the new release.",
+)
+@click.pass_context
+def diff_question_bank(ctx, apply):
+    """Compare the question bank file with the release it replaced."""
+    config, country_code, _, save_to_file, exam_type = get_common_question_params(ctx)
+    qp = QuestionProcessor(
+        config, country_code, exam_type, QuestionDisplayMode.PRINT, get_language(ctx)
+    )
+    qp.diff(apply, save_to_file)
+
+
+@question.command("stats")
+@click.option(
+    "--json",
+    "json_format",
+    is_flag=True,
+    default=False,
+    help="Export the statistics as JSON.",
+)
+@click.pass_context
+def question_stats(ctx, json_format):
+    """Report statistics of the question banks of all exam types."""
+    config = ctx.obj["config"]
+    country_code = CountryCode.from_id(ctx.obj["country_code"])
+    logger.info(f"Reporting question statistics for country: {country_code}")
+    report_question_bank_stats(
+        config, country_code, json_format, ctx.obj["save_to_file"], get_language(ctx)
+    )
+
+
+@question.command("import")
+@click.argument("source", type=click.Path(exists=True, dir_okay=False))
+@click.argument("output", type=click.Path(dir_okay=False))
+@click.option(
+    "--format",
+    "import_format",
+    type=click.Choice(QuestionBankImportFormat.ids()),
+    help="Format of the source, from its extension by default.",
+)
+@click.option(
+    "--categories",
+    type=click.Path(dir_okay=False),
+    help="Categories file to write, next to the output file by default.",
+)
+@click.option(
+    "--prefix",
+    default=constants.IMPORTED_QUESTION_PREFIX,
+    show_default=True,
+    help="Prefix of the question numbers generated for the questions without one.",
+)
+@click.option("--force", is_flag=True, default=False, help="Overwrite existing files.")
+def import_questions(source, output, import_format, categories, prefix, force):
+    """Import a custom question bank from a CSV or JSON lines file."""
+    categories = categories or get_imported_categories_path(output)
+    existing = [str(path) for path in (output, categories) if Path(path).exists()]
+    if existing and not force:
+        raise click.ClickException(f"{', '.join(existing)} already exists, use --force")
+    try:
+        result = import_question_bank(
+            source,
+            output,
+            categories,
+            QuestionBankImportFormat.from_id(import_format) if import_format else None,
+            prefix,
+        )
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="SOURCE") from e
+    click.echo("\n".join(result.format()))
+
+
 # QUIZ COMMANDS
 @hamradiotoolbox.group("quiz")
 @click.option(
@@ -267,10 +410,23 @@ def list_marked_questions(ctx, criteria):
     default=QuizSource.ALL.id,
     help="Source of questions for the quiz.",
 )
+@click.option(
+    "--seed",
+    type=int,
+    help="Seed of the random question and choice order, to reproduce a quiz.",
+)
+@click.option(
+    "--lang",
+    type=click.Choice(QuestionLanguage.ids()),
+    default=QuestionLanguage.EN.id,
+    help="Language of the questions.",
+)
 @click.pass_context
-def quiz(ctx, country, number_of_questions, answer_display, qs):
+def quiz(ctx, country, number_of_questions, answer_display, qs, seed, lang):
     """Commands for managing quizzes."""
     ctx.obj["country_code"] = country
+    ctx.obj["language"] = lang
+    ctx.obj["seed"] = seed
     ctx.obj["answer_display"] = answer_display
     config = ctx.obj["config"]
     quiz_config: dict = config.get("quiz")
@@ -335,6 +491,7 @@ def start_quiz(ctx):
         country,
         ExamType.from_id(exam_type),
         QuestionDisplayMode.QUIZ,
+        get_language(ctx),
     )
     question_bank = qp.get_question_bank()
     quiz_processor = QuizProcessor(
@@ -346,10 +503,104 @@ def start_quiz(ctx):
         quiz_config,
         print_config,
         metrics_config,
+        ctx.obj["seed"],
     )
     quiz_processor.process()
 
 
+@quiz.command("resume")
+@click.pass_context
+def resume_quiz(ctx):
+    """Resume an unfinished quiz or practice exam of an exam type."""
+    country_code = ctx.obj["country_code"]
+    if not country_code:
+        logger.error("Country code not found.")
+        return
+
+    country: CountryCode = CountryCode.from_id(country_code)  # type: ignore
+    exam_type: str | None = utils.select_option_from_list(
+        list(ExamType.supported_country_ids(country)), "Exam type"
+    )
+    if not exam_type:
+        logger.error("Exam type not found.")
+        return
+    logger.info(f"Resuming quiz for {exam_type}.")
+    qp = QuestionProcessor(
+        ctx.obj["config"],
+        country,
+        ExamType.from_id(exam_type),
+        QuestionDisplayMode.QUIZ,
+        get_language(ctx),
+    )
+    quiz_processor = QuizProcessor(
+        qp.get_question_bank(),
+        0,
+        QuestionDisplayMode.QUIZ,
+        QuizAnswerDisplay.from_id(ctx.obj["answer_display"]),
+        QuizSource.from_id(ctx.obj["qs"]),
+        ctx.obj["quiz_config"],
+        ctx.obj["print_config"],
+        ctx.obj["metrics_config"],
+        ctx.obj["seed"],
+        resume=True,
+    )
+    quiz_processor.process()
+
+
+@quiz.command("stats")
+@click.option(
+    "--days",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of days of each accuracy period.",
+)
+@click.option(
+    "--top",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help="Number of slowest questions.",
+)
+@click.option(
+    "--json",
+    "json_format",
+    is_flag=True,
+    default=False,
+    help="Export the statistics as JSON.",
+)
+@click.pass_context
+def quiz_stats(ctx, days, top, json_format):
+    """Report the learning statistics of the answers of an exam type."""
+    country_code = ctx.obj["country_code"]
+    if not country_code:
+        logger.error("Country code not found.")
+        return
+
+    country: CountryCode = CountryCode.from_id(country_code)  # type: ignore
+    exam_type: str | None = utils.select_option_from_list(
+        list(ExamType.supported_country_ids(country)), "Exam type"
+    )
+    if not exam_type:
+        logger.error("Exam type not found.")
+        return
+    logger.info(f"Reporting answer statistics for {exam_type}.")
+    qp = QuestionProcessor(
+        ctx.obj["config"],
+        country,
+        ExamType.from_id(exam_type),
+        QuestionDisplayMode.QUIZ,
+        get_language(ctx),
+    )
+    report_answer_stats(
+        qp.get_question_bank(),
+        ctx.obj["metrics_config"],
+        json_format,
+        days * SECONDS_PER_DAY,
+        top,
+    )
+
+
 # PRACTICE EXAM COMMANDS
 @hamradiotoolbox.group("practice")
 @click.option(
@@ -358,10 +609,23 @@ def start_quiz(ctx):
     required=True,
     help="Country for which to start the quiz.",
 )
+@click.option(
+    "--seed",
+    type=int,
+    help="Seed of the random question and choice order, to reproduce a practice exam.",
+)
+@click.option(
+    "--lang",
+    type=click.Choice(QuestionLanguage.ids()),
+    default=QuestionLanguage.EN.id,
+    help="Language of the questions.",
+)
 @click.pass_context
-def practice(ctx, country):
+def practice(ctx, country, seed, lang):
     """Commands for managing practice exams."""
     ctx.obj["country_code"] = country
+    ctx.obj["language"] = lang
+    ctx.obj["seed"] = seed
     config = ctx.obj["config"]
 
     practice_config: dict = config.get_practice_exam_settings()
@@ -387,21 +651,19 @@ def practice(ctx, country):
     logger.info(f"Practice exam for country: {country}")
 
 
-@practice.command("start")
-@click.pass_context
-def start_practice_exam(ctx):
-    """Start a practice exam."""
+def get_practice_exam_type(ctx) -> Optional[tuple[ExamType, int]]:
+    """Select the exam type of a practice exam and get its number of questions."""
     country_code = ctx.obj["country_code"]
     if not country_code:
         logger.error("Country code not found.")
-        return
+        return None
     country = CountryCode.from_id(country_code)
     exam_type = utils.select_option_from_list(
         list(ExamType.supported_country_ids(country)), "Exam type"
     )
     if not exam_type:
         logger.error("Exam type not found.")
-        return
+        return None
 
     country_config = ctx.obj["country_config"]
     exam_type_config = country_config.get("question_bank").get(exam_type)
@@ -409,22 +671,34 @@ def start_practice_exam(ctx):
         logger.error(
             f"Exam type {exam_type} not found in the country {country_code} configuration."
         )
-        return
+        return None
     number_of_questions = exam_type_config.get("number_of_questions")
     if not number_of_questions:
         logger.error("Number of questions not found.")
+        return None
+    return ExamType.from_id(exam_type), number_of_questions
+
+
+@practice.command("start")
+@click.pass_context
+def start_practice_exam(ctx):
+    """Start a practice exam."""
+    practice_exam_type = get_practice_exam_type(ctx)
+    if not practice_exam_type:
         return
+    exam_type, number_of_questions = practice_exam_type
 
     config = ctx.obj["config"]
     metrics_config = ctx.obj["metrics_config"]
     practice_config = ctx.obj["practice_config"]
     print_config = ctx.obj["print_config"]
-    logger.info(f"Starting practice exam for {exam_type} with {number_of_questions} questions.")
+    logger.info(f"Starting practice exam for {exam_type.id} with {number_of_questions} questions.")
     qp = QuestionProcessor(
         config,
-        country,
-        ExamType.from_id(exam_type),
+        exam_type.country,
+        exam_type,
         QuestionDisplayMode.PRACTICE_EXAM,
+        get_language(ctx),
     )
 
     question_bank = qp.get_question_bank()
@@ -433,14 +707,50 @@ def start_practice_exam(ctx):
         number_of_questions,
         QuestionDisplayMode.PRACTICE_EXAM,
         QuizAnswerDisplay.from_id(DEFAULT_ANSWER_DISPLAY_PRACTICE_EXAM.id),
-        QuizSource.ALL,
+        QuizSource.BLUEPRINT,
         practice_config.get(DEFAULT_ANSWER_DISPLAY_PRACTICE_EXAM.id),
         print_config,
         metrics_config,
+        ctx.obj["seed"],
     )
     quiz_processor.process()
 
 
+@practice.command("simulate")
+@click.option(
+    "--runs",
+    type=click.IntRange(min=0),
+    default=constants.DEFAULT_SIMULATION_RUNS,
+    show_default=True,
+    help="Number of practice exams to simulate (0 for the exact probabilities only).",
+)
+@click.pass_context
+def simulate_practice_exam(ctx, runs):
+    """Estimate the probability of passing a practice exam from the question metrics."""
+    practice_exam_type = get_practice_exam_type(ctx)
+    if not practice_exam_type:
+        return
+    exam_type, number_of_questions = practice_exam_type
+
+    qp = QuestionProcessor(
+        ctx.obj["config"],
+        exam_type.country,
+        exam_type,
+        QuestionDisplayMode.PRACTICE_EXAM,
+        get_language(ctx),
+    )
+    quiz_class = QuizFactory.get_quiz_class(exam_type)
+    readiness = estimate_exam_readiness(
+        qp.get_question_bank(),
+        number_of_questions,
+        quiz_class.PASS_PERCENTAGE,
+        quiz_class.PASS_PERCENTAGE_WITH_HONOURS,
+        runs,
+        random.Random(ctx.obj["seed"]),
+    )
+    click.echo("\n".join(readiness.format()))
+
+
 # DOWNLOAD COMMANDS
 @hamradiotoolbox.group("download")
 @click.option(
@@ -0,0 +1,93 @@
+"""
+This module contains the AliasSampler class which draws weighted random indices in O(1).
+
+The sampler builds a Walker alias table (Vose's method) in O(n): each slot of the table holds the
+probability of keeping its own index, and the index to use otherwise. A draw picks a slot and
+flips a biased coin.
+
+Samples without replacement reject the indices already drawn. Once the drawn indices hold half
+of the total weight, the table is rebuilt over the remaining indices, so each draw needs fewer
+than two attempts on average.
+"""
+
+import random
+from typing import List, Optional, Sequence
+
+
+class AliasSampler:
+    """Weighted random sampler over the indices of a list of weights."""
+
+    def __init__(self, weights: Sequence[float]):
+        """Build the alias table.
+        :param weights: Non-negative weight of each index, at least one of them positive.
+        :raises ValueError: If a weight is negative or all the weights are zero.
+        """
+        if any(weight < 0 for weight in weights):
+            raise ValueError("Weights must not be negative")
+        self._weights = list(weights)
+        self._total = sum(self._weights)
+        if self._total <= 0:
+            raise ValueError("At least one weight must be positive")
+        self._probabilities, self._aliases = self._build(self._weights, self._total)
+
+    @staticmethod
+    def _build(weights: List[float], total: float) -> tuple[List[float], List[int]]:
+        count = len(weights)
+        scaled = [weight * count / total for weight in weights]
+        probabilities = [1.0] * count
+        aliases = list(range(count))
+        small = [i for i, value in enumerate(scaled) if value < 1]
+        large = [i for i, value in enumerate(scaled) if value >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            probabilities[less] = scaled[less]
+            aliases[less] = more
+            scaled[more] -= 1 - scaled[less]
+            (small if scaled[more] < 1 else large).append(more)
+        # the remaining slots keep their own index, up to rounding errors
+        return probabilities, aliases
+
+    def __len__(self) -> int:
+        return len(self._weights)
+
+    @property
+    def weights(self) -> List[float]:
+        """Weights of the indices."""
+        return self._weights
+
+    def draw(self, rng: Optional[random.Random] = None) -> int:
+        """Draw an index with a probability proportional to its weight."""
+        sampler = rng if rng else random
+        count = len(self._probabilities)
+        slot = min(int(sampler.random() * count), count - 1)
+        if sampler.random() < self._probabilities[slot]:
+            return slot
+        return self._aliases[slot]
+
+    def sample(self, count: int, rng: Optional[random.Random] = None) -> List[int]:
+        """Draw distinct indices, each draw proportional to the weights of the remaining ones.
+        :param count: Number of indices, limited to the number of indices with a positive weight.
+        :param rng: Random number generator to use (default is the random module).
+        :return: Indices in the order they were drawn.
+        """
+        candidates = [i for i, weight in enumerate(self._weights) if weight > 0]
+        count = min(count, len(candidates))
+        drawn: List[int] = []
+        chosen: set[int] = set()
+        sampler: AliasSampler = self
+        # indices of the current table, the table is rebuilt over the remaining candidates
+        indices: Optional[List[int]] = None
+        drawn_weight = 0.0
+        while len(drawn) < count:
+            slot = sampler.draw(rng)
+            index = indices[slot] if indices is not None else slot
+            if index in chosen:
+                continue
+            drawn.append(index)
+            chosen.add(index)
+            drawn_weight += self._weights[index]
+            if drawn_weight * 2 > sampler._total and len(drawn) < count:
+                indices = [i for i in candidates if i not in chosen]
+                sampler = AliasSampler([self._weights[i] for i in indices])
+                drawn_weight = 0.0
+        return drawn
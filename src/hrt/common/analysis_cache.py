@@ -0,0 +1,134 @@
+"""
+This module contains the AnalysisCache class which memoizes the analysis results of a question
+bank snapshot. Results are optionally persisted as JSON next to the question bank file, with
+questions stored by question number, and are discarded when the hash of the bank file changes.
+The persisted file is shared by the processes computing the listings, its updates are made under
+a FileLock.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+from hrt.common.config_reader import logger
+from hrt.common.file_lock import FileLock
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.question import Question
+
+T = TypeVar("T")
+
+
+def encode_result(value: Any) -> Any:
+    """Encode an analysis result as JSON compatible data, replacing questions by their number."""
+    if isinstance(value, Question):
+        return {"q": value.question_number}
+    if isinstance(value, dict):
+        return {"d": [[encode_result(k), encode_result(v)] for k, v in value.items()]}
+    if isinstance(value, tuple):
+        return {"t": [encode_result(item) for item in value]}
+    if isinstance(value, list):
+        return [encode_result(item) for item in value]
+    return value
+
+
+def decode_result(value: Any, questions: dict[QuestionNumber, Question]) -> Any:
+    """Decode an analysis result encoded with encode_result.
+    :param value: Encoded analysis result.
+    :param questions: Questions by question number.
+    :return: Analysis result.
+    :raises KeyError: If a question is not in the questions.
+    """
+    if isinstance(value, list):
+        return [decode_result(item, questions) for item in value]
+    if isinstance(value, dict):
+        if "q" in value:
+            return questions[value["q"]]
+        if "d" in value:
+            return {
+                decode_result(k, questions): decode_result(v, questions) for k, v in value["d"]
+            }
+        if "t" in value:
+            return tuple(decode_result(item, questions) for item in value["t"])
+    return value
+
+
+class AnalysisCache:
+    """Analysis results of a question bank snapshot, computed once per key."""
+
+    def __init__(
+        self,
+        questions: list[Question],
+        filepath: Optional[Path] = None,
+        file_hash: str = "",
+    ):
+        """Create the analysis cache.
+        :param questions: Questions of the question bank snapshot.
+        :param filepath: Path to persist the results to (default is None, not persisted).
+        :param file_hash: Hash of the question bank file the questions were loaded from.
+        """
+        self._questions = questions
+        self._filepath = filepath
+        self._file_hash = file_hash
+        self._results: dict[str, Any] = {}
+        self._persisted: dict[str, Any] = self._load()
+        self._lock = threading.Lock()
+
+    @property
+    def questions(self) -> list[Question]:
+        """Questions of the question bank snapshot."""
+        return self._questions
+
+    def get(self, key: str, compute: Callable[[], T]) -> T:
+        """Returns the result for the key, computing and persisting it on first use.
+        :param key: Analysis key.
+        :param compute: Function computing the analysis result.
+        :return: Analysis result.
+        """
+        if key in self._results:
+            return self._results[key]
+        if key in self._persisted:
+            try:
+                by_number = {question.question_number: question for question in self._questions}
+                self._results[key] = decode_result(self._persisted[key], by_number)
+                return self._results[key]
+            except KeyError:
+                logger.warning("Persisted analysis %s does not match the questions", key)
+        result = compute()
+        self._results[key] = result
+        encoded = encode_result(result)
+        with self._lock:
+            self._persisted[key] = encoded
+            self._save()
+        return result
+
+    def _load(self) -> dict[str, Any]:
+        if not self._filepath or not os.path.exists(self._filepath):
+            return {}
+        try:
+            with open(self._filepath, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError) as e:
+            logger.warning("Unable to read analysis cache %s: %s", self._filepath, e)
+            return {}
+        if data.get("hash") != self._file_hash:
+            logger.info("Analysis cache %s is stale", self._filepath)
+            return {}
+        return data.get("results", {})
+
+    def _save(self) -> None:
+        if not self._filepath:
+            return
+        temp_path = f"{self._filepath}.{os.getpid()}.tmp"
+        try:
+            # the thread lock does not cover the forked processes sharing the file
+            with FileLock(str(self._filepath)):
+                # results persisted meanwhile by another process sharing the file are kept
+                for key, value in self._load().items():
+                    self._persisted.setdefault(key, value)
+                with open(temp_path, "w", encoding="utf-8") as file:
+                    json.dump({"hash": self._file_hash, "results": self._persisted}, file)
+                os.replace(temp_path, self._filepath)
+        except OSError as e:
+            logger.warning("Unable to save analysis cache %s: %s", self._filepath, e)
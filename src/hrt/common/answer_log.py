@@ -0,0 +1,276 @@
+"""
+This module contains the AnswerLog class, an append-only log of the answers of the quizzes, and
+the AnswerRecorder class, the quiz session listener appending to it.
+
+The log is columnar: each field of the answer events has its own file of fixed-width values, in
+the folder of the log. An analysis reads only the columns it needs, each with a single
+array.fromfile call, and the n-th value of every column belongs to the n-th event. The values
+are little-endian, so a column file can also be read as is by other tools (numpy.fromfile with
+the matching dtype).
+
+Question numbers are stored as their index in the questions file of the log, one question number
+per line, appended the first time a question is answered.
+
+Events are appended while holding the lock of the log (FileLock). An event interrupted while its
+columns are appended leaves columns of different lengths: the log is read up to the shortest
+column, and the next append truncates the longer columns first.
+"""
+
+import os
+import sys
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+from hrt.common.enums import QuizEventType
+from hrt.common.file_lock import FileLock
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.question import ChoiceOrder
+from hrt.common.quiz_session import QuizEvent
+
+# array typecodes of the columns (8, 4, 1, 1, 4 and 4 bytes), by column name
+COLUMNS: Dict[str, str] = {
+    # milliseconds since the epoch
+    "timestamp": "q",
+    # index of the question number in the questions file
+    "question": "I",
+    # index of the chosen choice in the question bank order, -1 if the question was skipped
+    "choice": "b",
+    # 1 if the choice is the answer, 0 otherwise
+    "correct": "B",
+    # milliseconds between the question shown and the answer
+    "latency": "I",
+    # id of the quiz session
+    "session": "I",
+}
+COLUMN_WIDTHS: Dict[str, int] = {
+    column: array(typecode).itemsize for column, typecode in COLUMNS.items()
+}
+QUESTIONS_FILENAME: str = "questions.txt"
+MAX_LATENCY: int = 2**32 - 1
+
+
+def new_session_id() -> int:
+    """Returns a random session id, unique without coordinating the processes logging answers."""
+    return int.from_bytes(os.urandom(4), "little")
+
+
+class AnswerEvent:
+    """Answer of a question in a quiz session."""
+
+    def __init__(
+        self,
+        timestamp: int,
+        question_number: QuestionNumber,
+        choice: int,
+        correct: bool,
+        latency: int,
+        session: int,
+    ):
+        """Create the event.
+        :param timestamp: Time of the answer, in milliseconds since the epoch.
+        :param question_number: Question number.
+        :param choice: Index of the chosen choice in the question bank order, -1 if skipped.
+        :param correct: Whether the choice is the answer.
+        :param latency: Milliseconds between the question shown and the answer.
+        :param session: Id of the quiz session.
+        """
+        self.timestamp = timestamp
+        self.question_number = question_number
+        self.choice = choice
+        self.correct = correct
+        self.latency = latency
+        self.session = session
+
+    def __repr__(self) -> str:
+        return (
+            f"AnswerEvent({self.question_number}, choice={self.choice}, "
+            f"correct={self.correct}, latency={self.latency}, session={self.session})"
+        )
+
+
+class AnswerColumns:
+    """Columns of the answer events read from the log."""
+
+    def __init__(self, columns: Dict[str, array], question_numbers: List[QuestionNumber]):
+        """Create the columns.
+        :param columns: Values of the columns read, by column name.
+        :param question_numbers: Question numbers, by index in the question column.
+        """
+        self.columns = columns
+        self.question_numbers = question_numbers
+
+    def __len__(self) -> int:
+        return min((len(values) for values in self.columns.values()), default=0)
+
+    def __getitem__(self, column: str) -> array:
+        return self.columns[column]
+
+
+class AnswerLog:
+    """Append-only columnar log of the answer events."""
+
+    def __init__(self, folder: str):
+        """Create the log, its files are created by the first append.
+        :param folder: Folder of the log files.
+        """
+        self._folder = folder
+        self._question_numbers: List[QuestionNumber] = []
+        self._question_indices: Dict[QuestionNumber, int] = {}
+
+    @property
+    def folder(self) -> str:
+        """Folder of the log files."""
+        return self._folder
+
+    def get_column_path(self, column: str) -> str:
+        """Path of the file of a column."""
+        return os.path.join(self._folder, f"{column}.bin")
+
+    def _get_questions_path(self) -> str:
+        return os.path.join(self._folder, QUESTIONS_FILENAME)
+
+    def _get_count(self) -> int:
+        """Number of complete events, the length of the shortest column."""
+        counts = []
+        for column in COLUMNS:
+            try:
+                size = os.path.getsize(self.get_column_path(column))
+            except OSError:
+                return 0
+            counts.append(size // COLUMN_WIDTHS[column])
+        return min(counts)
+
+    def __len__(self) -> int:
+        return self._get_count()
+
+    def _read_question_numbers(self) -> List[QuestionNumber]:
+        path = self._get_questions_path()
+        if not os.path.exists(path):
+            return []
+        with open(path, "r", encoding="utf-8") as f:
+            return [QuestionNumber(line.rstrip("\n")) for line in f if line.strip()]
+
+    def _load_question_indices(self) -> None:
+        """Read the question numbers added to the questions file since they were last read."""
+        question_numbers = self._read_question_numbers()
+        if len(question_numbers) == len(self._question_numbers):
+            return
+        self._question_numbers = question_numbers
+        self._question_indices = {qn: index for index, qn in enumerate(question_numbers)}
+
+    def _get_question_index(self, question_number: QuestionNumber, added: List[str]) -> int:
+        index = self._question_indices.get(question_number)
+        if index is None:
+            index = len(self._question_numbers)
+            self._question_numbers.append(question_number)
+            self._question_indices[question_number] = index
+            added.append(question_number)
+        return index
+
+    def append(self, events: Iterable[AnswerEvent]) -> int:
+        """Append the events to the log.
+        :param events: Answer events.
+        :return: Number of events appended.
+        """
+        os.makedirs(self._folder, exist_ok=True)
+        with FileLock(os.path.join(self._folder, "answers")):
+            self._load_question_indices()
+            added: List[str] = []
+            columns = {column: array(COLUMNS[column]) for column in COLUMNS}
+            for event in events:
+                columns["timestamp"].append(event.timestamp)
+                columns["question"].append(self._get_question_index(event.question_number, added))
+                columns["choice"].append(event.choice)
+                columns["correct"].append(1 if event.correct else 0)
+                columns["latency"].append(min(max(event.latency, 0), MAX_LATENCY))
+                columns["session"].append(event.session)
+            count = len(columns["timestamp"])
+            if not count:
+                return 0
+            if added:
+                with open(self._get_questions_path(), "a", encoding="utf-8") as f:
+                    f.writelines(f"{qn}\n" for qn in added)
+            self._append_columns(columns)
+            return count
+
+    def _append_columns(self, columns: Dict[str, array]) -> None:
+        """Append the values of the columns, after truncating the columns of an incomplete
+        event."""
+        count = self._get_count()
+        for column, values in columns.items():
+            if sys.byteorder == "big":
+                values.byteswap()
+            with open(self.get_column_path(column), "ab") as f:
+                f.truncate(count * COLUMN_WIDTHS[column])
+                values.tofile(f)
+
+    def read(self, columns: Optional[Iterable[str]] = None) -> AnswerColumns:
+        """Read the columns of the complete events.
+        :param columns: Names of the columns to read (default is None, all the columns).
+        :return: Columns read, with the question numbers of the question column.
+        :raises ValueError: If a column name is invalid.
+        """
+        names = list(COLUMNS) if columns is None else list(columns)
+        invalid = [name for name in names if name not in COLUMNS]
+        if invalid:
+            raise ValueError(f"Invalid answer log columns: {', '.join(invalid)}")
+        count = self._get_count()
+        values: Dict[str, array] = {}
+        for name in names:
+            column = array(COLUMNS[name])
+            if count:
+                with open(self.get_column_path(name), "rb") as f:
+                    column.fromfile(f, count)
+                if sys.byteorder == "big":
+                    column.byteswap()
+            values[name] = column
+        question_numbers = self._read_question_numbers() if "question" in names else []
+        return AnswerColumns(values, question_numbers)
+
+
+class AnswerRecorder:
+    """Quiz session listener logging the answers and skips."""
+
+    def __init__(self, answer_log: AnswerLog, choice_order: ChoiceOrder, session: int):
+        """Create the recorder.
+        :param answer_log: Log of the answers.
+        :param choice_order: Order of the choices of the quiz.
+        :param session: Id of the quiz session.
+        """
+        self._answer_log = answer_log
+        self._choice_order = choice_order
+        self._session = session
+        # a resumed quiz shows its current question without an event
+        self._shown_at = time.monotonic()
+
+    @property
+    def session(self) -> int:
+        """Id of the quiz session."""
+        return self._session
+
+    def record(self, event: QuizEvent) -> None:
+        """Log an answer or skip, used as a listener of the session."""
+        if event.event_type == QuizEventType.QUESTION:
+            self._shown_at = time.monotonic()
+            return
+        if event.event_type not in (QuizEventType.ANSWERED, QuizEventType.SKIPPED):
+            return
+        question = event.question
+        if question is None:
+            return
+        choice = -1
+        if event.event_type == QuizEventType.ANSWERED:
+            choice = self._choice_order.get(question)[event.choice_index]
+        self._answer_log.append(
+            [
+                AnswerEvent(
+                    time.time_ns() // 1_000_000,
+                    question.question_number,
+                    choice,
+                    event.is_correct,
+                    round((time.monotonic() - self._shown_at) * 1000),
+                    self._session,
+                )
+            ]
+        )
@@ -0,0 +1,244 @@
+"""
+This module computes learning statistics from the columns of the answer log.
+
+The statistics are computed from the totals of a single pass over the columns, zipped together,
+with the per-period, per-category and per-question totals kept in lists and counters indexed by
+the integer values of the columns. The report can be rendered as text or exported as JSON.
+"""
+
+import time
+from collections import Counter
+from typing import Any, Dict, List
+
+from hrt.common import utils
+from hrt.common.answer_log import AnswerColumns
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.question_stats import get_ratio
+from hrt.common.review_schedule import SECONDS_PER_DAY
+
+UNCATEGORIZED: str = "-"
+
+
+def get_utc_offset(timestamp: int) -> int:
+    """Returns the offset of the local time from UTC at the timestamp, in milliseconds."""
+    return time.localtime(timestamp // 1000).tm_gmtoff * 1000
+
+
+class AnswerTotals:
+    """Totals of the answers of the log, skips excluded, computed in a single pass over the
+    timestamp, question, choice, correct and latency columns."""
+
+    def __init__(
+        self,
+        answers: AnswerColumns,
+        categories: Dict[QuestionNumber, str],
+        period: int = SECONDS_PER_DAY,
+        max_attempts: int = 5,
+    ):
+        """Compute the totals.
+        :param answers: Columns of the answer log, in log order.
+        :param categories: Category id of the questions, by question number.
+        :param period: Length of the accuracy periods in seconds, the periods are aligned on the
+            local time like a day starts at local midnight (default is a day).
+        :param max_attempts: Number of answers of a question in the learning curves (default
+            is 5).
+        """
+        self.question_numbers = answers.question_numbers
+        self.period = period
+        self.max_attempts = max_attempts
+        question_categories = [categories.get(qn, UNCATEGORIZED) for qn in self.question_numbers]
+        self.categories = sorted(set(question_categories))
+        category_indices = {category: index for index, category in enumerate(self.categories)}
+        # offset of the learning curve of the category of each question
+        self._curve_offsets = [
+            category_indices[category] * max_attempts for category in question_categories
+        ]
+        count = len(self.question_numbers)
+        self.answered = [0] * count
+        self.latencies = [0] * count
+        self.curve_answered = [0] * (len(self.categories) * max_attempts)
+        self.curve_correct = [0] * (len(self.categories) * max_attempts)
+        self.period_answered: Counter = Counter()
+        self.period_correct: Counter = Counter()
+        # start of the periods (seconds since the epoch), by period
+        self.period_starts: Dict[int, int] = {}
+        self._add(answers)
+
+    def _add(self, answers: AnswerColumns) -> None:
+        period_ms = self.period * 1000
+        max_attempts = self.max_attempts
+        answered, latencies = self.answered, self.latencies
+        curve_offsets = self._curve_offsets
+        curve_answered, curve_correct = self.curve_answered, self.curve_correct
+        # answers of the current period, added to the counters when the period changes
+        current, period_answered, period_correct = -1, 0, 0
+        period_start = period_end = 0
+        for timestamp, question, choice, is_correct, latency in zip(
+            answers["timestamp"],
+            answers["question"],
+            answers["choice"],
+            answers["correct"],
+            answers["latency"],
+            strict=True,
+        ):
+            if choice < 0:
+                continue
+            attempt = answered[question]
+            answered[question] = attempt + 1
+            latencies[question] += latency
+            if attempt < max_attempts:
+                curve_answered[curve_offsets[question] + attempt] += 1
+                curve_correct[curve_offsets[question] + attempt] += is_correct
+            if not period_start <= timestamp < period_end:
+                self._add_period(current, period_answered, period_correct)
+                current, period_start, period_end = self._get_period(timestamp, period_ms)
+                period_answered, period_correct = 0, 0
+            period_answered += 1
+            period_correct += is_correct
+        self._add_period(current, period_answered, period_correct)
+
+    def _get_period(self, timestamp: int, period_ms: int) -> tuple[int, int, int]:
+        """Returns the period of the timestamp in local time, with its start and end timestamps.
+
+        The start and the end get the offset of the local time in effect at that time, so the
+        periods follow the daylight saving time changes.
+        """
+        offset = get_utc_offset(timestamp)
+        period = (timestamp + offset) // period_ms
+        start = period * period_ms
+        start -= get_utc_offset(start - offset)
+        end = (period + 1) * period_ms
+        end -= get_utc_offset(end - offset)
+        self.period_starts.setdefault(period, start // 1000)
+        return period, start, end
+
+    def _add_period(self, bucket: int, answered: int, correct: int) -> None:
+        if answered:
+            self.period_answered[bucket] += answered
+            self.period_correct[bucket] += correct
+
+
+def get_accuracy_over_time(totals: AnswerTotals) -> List[Dict[str, Any]]:
+    """Accuracy of the answers per period, skips excluded.
+    :param totals: Totals of the answer log.
+    :return: Start (seconds since the epoch, at a local time boundary), answers, correct
+        answers and accuracy of the periods with answers, in time order.
+    """
+    answered, correct = totals.period_answered, totals.period_correct
+    return [
+        {
+            "start": totals.period_starts[bucket],
+            "answered": answered[bucket],
+            "correct": correct[bucket],
+            "accuracy": get_ratio(correct[bucket], answered[bucket]),
+        }
+        for bucket in sorted(answered)
+    ]
+
+
+def get_learning_curves(totals: AnswerTotals) -> Dict[str, List[float]]:
+    """Accuracy of the first, second, ... answer of the questions of each category.
+    :param totals: Totals of the answer log.
+    :return: Accuracy of the n-th answer of the questions, for n up to max_attempts or the last
+        answer made, by category id.
+    """
+    curves = {}
+    for index, category in enumerate(totals.categories):
+        offset = index * totals.max_attempts
+        curve = [
+            get_ratio(totals.curve_correct[slot], totals.curve_answered[slot])
+            for slot in range(offset, offset + totals.max_attempts)
+            if totals.curve_answered[slot]
+        ]
+        if curve:
+            curves[category] = curve
+    return curves
+
+
+def get_slowest_questions(totals: AnswerTotals, top: int = 10) -> List[Dict[str, Any]]:
+    """Questions with the highest mean latency of their answers, skips excluded.
+    :param totals: Totals of the answer log.
+    :param top: Number of questions (default is 10).
+    :return: Question number, answers and mean latency in milliseconds of the questions, slowest
+        first.
+    """
+    answered, latencies = totals.answered, totals.latencies
+    means = [
+        (latencies[index] / answered[index], index)
+        for index in range(len(answered))
+        if answered[index]
+    ]
+    means.sort(reverse=True)
+    return [
+        {
+            "question": totals.question_numbers[index],
+            "answered": answered[index],
+            "mean_latency": round(mean),
+        }
+        for mean, index in means[:top]
+    ]
+
+
+def get_answer_stats(
+    answers: AnswerColumns,
+    categories: Dict[QuestionNumber, str],
+    period: int = SECONDS_PER_DAY,
+    top: int = 10,
+    max_attempts: int = 5,
+) -> Dict[str, Any]:
+    """Compute the learning statistics of the answer log.
+    :param answers: All the columns of the answer log.
+    :param categories: Category id of the questions, by question number.
+    :param period: Length of the accuracy periods in seconds, aligned on the local time
+        (default is a day).
+    :param top: Number of slowest questions (default is 10).
+    :param max_attempts: Number of answers of a question in the learning curves (default is 5).
+    :return: JSON compatible dictionary of statistics.
+    """
+    totals = AnswerTotals(answers, categories, period, max_attempts)
+    skipped = answers["choice"].count(-1)
+    total = len(answers)
+    correct = sum(answers["correct"])
+    return {
+        "events": total,
+        "sessions": len(set(answers["session"])),
+        "questions": len(set(answers["question"])),
+        "answered": total - skipped,
+        "skipped": skipped,
+        "accuracy": get_ratio(correct, total - skipped),
+        "accuracy_over_time": get_accuracy_over_time(totals),
+        "learning_curves": get_learning_curves(totals),
+        "slowest_questions": get_slowest_questions(totals, top),
+    }
+
+
+def format_answer_stats(stats: Dict[str, Any]) -> List[str]:
+    """Format the learning statistics as text lines.
+    :param stats: Statistics returned by get_answer_stats, with the country and exam type.
+    :return: List of text lines.
+    """
+    output = [utils.get_header(f"{stats['country']} {stats['exam_type']} answer statistics")]
+    output.append(
+        f"Answers: {stats['answered']} in {stats['sessions']} sessions, "
+        f"{stats['questions']} questions, skipped {stats['skipped']}, "
+        f"accuracy {stats['accuracy']:.1%}"
+    )
+    if stats["accuracy_over_time"]:
+        output.append("Accuracy over time:")
+        for period in stats["accuracy_over_time"]:
+            start = time.strftime("%Y-%m-%d %H:%M", time.localtime(period["start"]))
+            output.append(
+                f"  {start}: {period['correct']}/{period['answered']} ({period['accuracy']:.1%})"
+            )
+    if stats["learning_curves"]:
+        output.append("Learning curves (accuracy of the 1st, 2nd, ... answer):")
+        for category, curve in stats["learning_curves"].items():
+            output.append(f"  {category}: {' '.join(f'{ratio:.0%}' for ratio in curve)}")
+    if stats["slowest_questions"]:
+        output.append("Slowest questions (mean seconds):")
+        for question in stats["slowest_questions"]:
+            output.append(
+                f"  {question['question']}: {question['mean_latency'] / 1000:.1f} "
+                f"({question['answered']} answers)"
+            )
+    return output
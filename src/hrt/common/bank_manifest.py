@@ -0,0 +1,212 @@
+"""
+This module contains the BankManifest class, a content hash per question of a question bank, and
+the BankDiff class describing the changes between two releases of a question bank.
+
+The manifest is persisted next to the question bank file. When a new release of the question bank
+replaces the file, the saved manifest is joined with the manifest of the new questions to classify
+them as added, removed, reworded or renumbered, and the files keyed by question number (metrics
+and marked questions) are migrated accordingly.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+from hrt.common import constants
+from hrt.common.config_reader import logger
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.question import Question
+
+QUESTION_HASH_LENGTH: int = 16
+FIELD_SEPARATOR: str = "\x1f"
+
+
+def get_question_hash(question: Question) -> str:
+    """Returns the content hash of the question.
+
+    The hash covers the question text, the answer and the other choices in sorted order, so a
+    release that only reorders the choices keeps the hash.
+    """
+    others = sorted(choice for choice in question.choices if choice != question.answer)
+    content = FIELD_SEPARATOR.join([question.question_text, question.answer, *others])
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:QUESTION_HASH_LENGTH]
+
+
+def get_manifest_path(filepath: Union[str, os.PathLike]) -> Path:
+    """Returns the path of the manifest persisted next to the question bank file."""
+    return Path(f"{filepath}{constants.MANIFEST_FILE_SUFFIX}")
+
+
+class BankDiff:
+    """Changes between two releases of a question bank."""
+
+    def __init__(self):
+        self.added: list[QuestionNumber] = []
+        self.removed: list[QuestionNumber] = []
+        self.reworded: list[QuestionNumber] = []
+        self.renumbered: dict[QuestionNumber, QuestionNumber] = {}
+        self.unchanged: list[QuestionNumber] = []
+
+    @property
+    def has_changes(self) -> bool:
+        """Check if any question was added, removed, reworded or renumbered."""
+        return bool(self.added or self.removed or self.reworded or self.renumbered)
+
+    def get_unchanged_content_mapping(self) -> dict[QuestionNumber, QuestionNumber]:
+        """Returns the new question number of each question whose content did not change."""
+        mapping = {number: number for number in self.unchanged}
+        mapping.update(self.renumbered)
+        return mapping
+
+    def format(self) -> list[str]:
+        """Format the changes as text lines."""
+        output = []
+        for label, numbers in (
+            ("Added", self.added),
+            ("Removed", self.removed),
+            ("Reworded", self.reworded),
+        ):
+            output.append(f"{label}: {len(numbers)}")
+            output.extend(f"  {number}" for number in numbers)
+        output.append(f"Renumbered: {len(self.renumbered)}")
+        output.extend(f"  {old} -> {new}" for old, new in self.renumbered.items())
+        output.append(f"Unchanged: {len(self.unchanged)}")
+        return output
+
+
+class BankManifest:
+    """Content hash of each question of a question bank release."""
+
+    def __init__(self, hashes: dict[QuestionNumber, str], file_hash: str = ""):
+        """Create the manifest.
+        :param hashes: Content hash by question number.
+        :param file_hash: Hash of the question bank file.
+        """
+        self._hashes = hashes
+        self._file_hash = file_hash
+
+    @property
+    def hashes(self) -> dict[QuestionNumber, str]:
+        """Content hash by question number."""
+        return self._hashes
+
+    @property
+    def file_hash(self) -> str:
+        """Hash of the question bank file."""
+        return self._file_hash
+
+    @classmethod
+    def from_questions(cls, questions: list[Question], file_hash: str = "") -> "BankManifest":
+        """Create the manifest of the questions."""
+        return cls(
+            {question.question_number: get_question_hash(question) for question in questions},
+            file_hash,
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> Optional["BankManifest"]:
+        """Load the manifest from the path.
+        :param path: Path of the manifest file.
+        :return: Manifest or None if the manifest is missing or invalid.
+        """
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            return cls(
+                {QuestionNumber(number): value for number, value in data["questions"].items()},
+                data.get("hash", ""),
+            )
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning("Invalid question bank manifest at %s: %s", path, e)
+            return None
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        """Save the manifest to the path, replacing any existing manifest."""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({"hash": self._file_hash, "questions": self._hashes}, file, indent=0)
+        os.replace(temp_path, path)
+        logger.info("Question bank manifest saved to %s", path)
+
+    def diff(self, new: "BankManifest") -> BankDiff:
+        """Compare the manifest with the manifest of a new release.
+
+        Questions are first joined on their content hash: a question found under the same number
+        is unchanged, otherwise it is renumbered. The remaining questions are joined on their
+        number: a question found in both releases is reworded, otherwise it is added or removed.
+
+        :param new: Manifest of the new release.
+        :return: Changes between the releases.
+        """
+        result = BankDiff()
+        old_by_hash: dict[str, list[QuestionNumber]] = {}
+        for number, value in self._hashes.items():
+            old_by_hash.setdefault(value, []).append(number)
+        unmatched_new: list[QuestionNumber] = []
+        matched_old: set[QuestionNumber] = set()
+        for number, value in new.hashes.items():
+            if self._hashes.get(number) == value:
+                result.unchanged.append(number)
+                matched_old.add(number)
+            else:
+                unmatched_new.append(number)
+
+        still_unmatched: list[QuestionNumber] = []
+        for number in unmatched_new:
+            candidates = [
+                old for old in old_by_hash.get(new.hashes[number], []) if old not in matched_old
+            ]
+            if candidates:
+                result.renumbered[candidates[0]] = number
+                matched_old.add(candidates[0])
+            else:
+                still_unmatched.append(number)
+
+        for number in still_unmatched:
+            if number in self._hashes and number not in matched_old:
+                result.reworded.append(number)
+                matched_old.add(number)
+            else:
+                result.added.append(number)
+        result.removed = [number for number in self._hashes if number not in matched_old]
+        return result
+
+
+def migrate_question_numbers_file(path: Union[str, os.PathLike], diff: BankDiff) -> int:
+    """Rewrite a file keyed by question number (metrics, marked questions or review schedule)
+    for a new release.
+
+    Each line starts with a question number, optionally followed by the metrics delimiter. Lines
+    of renumbered questions get the new number and lines of removed questions are dropped, in a
+    single pass over the file.
+
+    :param path: Path of the file.
+    :param diff: Changes between the releases.
+    :return: Number of lines dropped.
+    """
+    if not os.path.exists(path):
+        return 0
+    removed = set(diff.removed)
+    lines = []
+    dropped = 0
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            number, delimiter, rest = line.partition(constants.DEFAULT_METRICS_DELIMITER)
+            if number in removed:
+                dropped += 1
+                continue
+            new_number = diff.renumbered.get(QuestionNumber(number), number)
+            lines.append(f"{new_number}{delimiter}{rest}")
+    lines.sort()
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        file.writelines(f"{line}\n" for line in lines)
+    os.replace(temp_path, path)
+    return dropped
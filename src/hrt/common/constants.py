@@ -12,6 +12,7 @@ DOT: str = "."
 DASH: str = "-"
 CW_DOT_DASH_WEIGHT: dict = {DOT: 1, DASH: 3}
 DEFAULT_TOP_QUESTIONS_COUNT: int = 10
+ALL_LISTING_TYPES_ID: str = "all-types"
 MIN_TOP_QUESTIONS_COUNT: int = 1
 MAX_TOP_QUESTIONS_COUNT: int = 50
 MIN_MARKED_QUESTIONS_COUNT: int = 2
@@ -24,6 +25,34 @@ DEFAULT_METRICS_FOLDER: str = "data/metrics"
 DEFAULT_OUTPUT_FOLDER: str = "data/output"
 DEFAULT_INPUT_FOLDER: str = "data/input"
 DEFAULT_METRICS_DELIMITER: str = ":"
+DEFAULT_REVIEW_SCHEDULE_FILENAME: str = "review-schedule.txt"
+DEFAULT_QUIZ_JOURNAL_FILENAME: str = "quiz-journal.jsonl"
+DEFAULT_ANSWER_LOG_FOLDER: str = "answer-log"
+JOURNAL_SYNC_INTERVAL: float = 2.0
+DEFAULT_ADAPTIVE_WEIGHTS: dict[str, float] = {
+    "base": 1.0,
+    "wrong": 2.0,
+    "skip": 1.0,
+    "recent": 4.0,
+}
+DEFAULT_SEARCH_RESULTS_COUNT: int = 10
+SEARCH_INDEX_FILE_SUFFIX: str = ".idx"
+SEARCH_OUTPUT_FILENAME: str = "search-results.txt"
+STATS_OUTPUT_FILENAME: str = "stats.txt"
+STATS_JSON_OUTPUT_FILENAME: str = "stats.json"
+ANALYSIS_CACHE_FILE_SUFFIX: str = ".analysis.json"
+MANIFEST_FILE_SUFFIX: str = ".manifest.json"
+BANK_DIFF_OUTPUT_FILENAME: str = "bank-diff.txt"
+OUTPUT_BUFFER_SIZE: int = 64 * 1024
+BILINGUAL_TEXT_SEPARATOR: str = "\n"
+BILINGUAL_CHOICE_SEPARATOR: str = " / "
+IMPORTED_QUESTION_PREFIX: str = "C"
+IMPORT_ERRORS_REPORTED: int = 20
+IMPORTED_CATEGORIES_SUFFIX: str = "-categories.txt"
+QUESTION_BANK_ENCODING: str = "iso-8859-1"
+DEFAULT_SIMULATION_RUNS: int = 100_000
+SIMULATION_PRIOR_CORRECT: int = 1
+SIMULATION_PRIOR_WRONG: int = 1
 DEFAULT_ANSWER_DISPLAY_PRACTICE_EXAM: QuestionAnswerDisplay = QuestionAnswerDisplay.IN_THE_END
 WARNING_MESSAGE = """
 WARNING: This scraping functionality is provided for personal, educational, and research use only.
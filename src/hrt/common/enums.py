@@ -298,6 +298,13 @@ class TopQuestionsListingType(QuestionListingType):
 
     LONGEST_QUESTION_TEXT = ("longest-question-text", "Longest question text")
     LONGEST_CORRECT_CHOICE = ("longest-correct-choice", "Longest correct choice")
+    CHOICE_LENGTH_SPREAD = ("choice-length-spread", "Largest spread of choice lengths")
+    CORRECT_CHOICE_LENGTH_RATIO = (
+        "correct-choice-length-ratio",
+        "Correct choice longest relative to the other choices",
+    )
+    WRONG_ATTEMPT_RATE = ("wrong-attempt-rate", "Highest wrong attempt rate")
+    SKIP_RATE = ("skip-rate", "Highest skip rate")
 
 
 class MarkedQuestionListingType(QuestionListingType):
@@ -363,6 +370,27 @@ class QuizAnswerDisplay(HRTEnum):
     HIDE = ("hide", "Hide")
 
 
+class QuizState(HRTEnum):
+    """Enumeration for the states of the quiz loop."""
+
+    QUESTION = ("question", "Display the current question")
+    CHOICE = ("choice", "Select a choice for the current question")
+    ACTION = ("action", "Select an action for the selected choice")
+    REVIEW = ("review", "Select an action for the submitted question")
+    DONE = ("done", "Quiz finished or quit")
+
+
+class QuizEventType(HRTEnum):
+    """Enumeration for the events of a quiz session."""
+
+    QUESTION = ("question", "Question to answer")
+    ANSWERED = ("answered", "Question answered")
+    SKIPPED = ("skipped", "Question skipped")
+    MARKED = ("marked", "Question marked")
+    UNMARKED = ("unmarked", "Question unmarked")
+    FINISHED = ("finished", "Quiz finished")
+
+
 class QuestionDisplayMode(HRTEnum):
     """Enumeration for question display modes."""
 
@@ -371,6 +399,21 @@ class QuestionDisplayMode(HRTEnum):
     PRACTICE_EXAM = ("practice_exam", "Practice exam")
 
 
+class QuestionLanguage(HRTEnum):
+    """Enumeration for the languages of the question text."""
+
+    EN = ("en", "English")
+    FR = ("fr", "French")
+    BOTH = ("both", "English and French")
+
+
+class QuestionBankImportFormat(HRTEnum):
+    """Enumeration for the formats of the imported question banks."""
+
+    CSV = ("csv", "Comma separated values with a header row")
+    JSONL = ("jsonl", "One JSON object per line")
+
+
 class QuizSource(HRTEnum):
     """Enumeration for quiz source types."""
 
@@ -382,3 +425,6 @@ class QuizSource(HRTEnum):
     SKIPPED_QUESTIONS = ("skipped", "Skipped questions")
     EXCLUDE_CORRECT_ANSWERS = ("x-ca", "Exclude correct answers")
     EXCLUDE_MARKED_QUESTIONS = ("x-mq", "Exclude marked questions")
+    BLUEPRINT = ("blueprint", "Questions distributed per the exam blueprint")
+    DUE = ("due", "Questions due for review (spaced repetition)")
+    ADAPTIVE = ("adaptive", "Questions weighted toward wrong and skipped answers")
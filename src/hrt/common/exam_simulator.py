@@ -0,0 +1,240 @@
+"""
+This module estimates the probability of passing an exam from the metrics of the questions.
+
+The probability of answering each question correctly is modeled from its metrics (correct, wrong
+and skip counts) and an exam is drawn like a practice exam: each category contributes its quota
+of questions, sampled without replacement. The distribution of the score of each category is
+computed exactly, so the exam score distribution is their convolution.
+
+The simulation draws the score of every run for one category at once from that distribution and
+adds the columns of the categories, instead of answering each question of each run in a loop.
+"""
+
+import math
+import operator
+import random
+from typing import Optional, Sequence
+
+from hrt.common import constants
+from hrt.common.config_reader import logger
+from hrt.common.question import Question
+from hrt.common.question_bank import QuestionBank
+
+
+def get_success_probability(question: Question) -> float:
+    """Returns the probability of answering the question correctly.
+
+    The probability is the posterior mean of the correct answer rate, skips counting as wrong
+    answers, with a uniform prior. It is never lower than the probability of a random guess.
+    """
+    metric = question.existing_metric
+    correct = metric.correct_attempts + constants.SIMULATION_PRIOR_CORRECT
+    attempts = (
+        metric.correct_attempts
+        + metric.wrong_attempts
+        + metric.skip_count
+        + constants.SIMULATION_PRIOR_CORRECT
+        + constants.SIMULATION_PRIOR_WRONG
+    )
+    guess = 1 / len(question.choices) if question.choices else 0.0
+    return max(correct / attempts, guess)
+
+
+def get_score_distribution(probabilities: Sequence[float], quota: int) -> list[float]:
+    """Returns the distribution of the number of correct answers to a sample of the questions.
+
+    The questions are sampled uniformly without replacement. The distribution is built one
+    question at a time over the sample sizes, normalized at each step so the values stay
+    probabilities, in O(questions * quota^2).
+
+    :param probabilities: Probability of answering each question of the pool correctly.
+    :param quota: Number of questions sampled from the pool.
+    :return: Probability of each number of correct answers, from 0 to the quota.
+    """
+    quota = min(quota, len(probabilities))
+    # dist[j][s]: probability of s correct answers to j questions sampled from those seen so far
+    dist = [[1.0]] + [[0.0] * (j + 1) for j in range(1, quota + 1)]
+    for seen, p in enumerate(probabilities, start=1):
+        q = 1 - p
+        for j in range(min(seen, quota), 0, -1):
+            row, previous = dist[j], dist[j - 1]
+            kept = (seen - j) / seen
+            added = j / seen
+            for s in range(j, 0, -1):
+                prev_s = previous[s] if s < j else 0.0
+                row[s] = kept * row[s] + added * (q * prev_s + p * previous[s - 1])
+            row[0] = kept * row[0] + added * q * previous[0]
+    return dist[quota]
+
+
+def convolve(first: Sequence[float], second: Sequence[float]) -> list[float]:
+    """Returns the distribution of the sum of two independent scores."""
+    result = [0.0] * (len(first) + len(second) - 1)
+    for i, a in enumerate(first):
+        if a:
+            for j, b in enumerate(second):
+                result[i + j] += a * b
+    return result
+
+
+def get_pass_mark(number_of_questions: int, percentage: int) -> int:
+    """Returns the lowest score whose rounded percentage reaches the pass percentage."""
+    return next(
+        (
+            score
+            for score in range(number_of_questions + 1)
+            if round(score / number_of_questions * 100) >= percentage
+        ),
+        number_of_questions + 1,
+    )
+
+
+class ExamReadiness:
+    """Estimated exam results."""
+
+    def __init__(
+        self,
+        distribution: list[float],
+        pass_mark: int,
+        honours_mark: int,
+        runs: int,
+        simulated_pass: int,
+        simulated_honours: int,
+    ):
+        """Create the estimate.
+        :param distribution: Probability of each exam score.
+        :param pass_mark: Lowest passing score.
+        :param honours_mark: Lowest score passing with honours.
+        :param runs: Number of simulated exams.
+        :param simulated_pass: Number of simulated exams passed.
+        :param simulated_honours: Number of simulated exams passed with honours.
+        """
+        self.distribution = distribution
+        self.pass_mark = pass_mark
+        self.honours_mark = honours_mark
+        self.runs = runs
+        self.simulated_pass = simulated_pass
+        self.simulated_honours = simulated_honours
+
+    @property
+    def number_of_questions(self) -> int:
+        """Number of questions of the exam."""
+        return len(self.distribution) - 1
+
+    @property
+    def expected_score(self) -> float:
+        """Expected number of correct answers."""
+        return sum(score * p for score, p in enumerate(self.distribution))
+
+    @property
+    def pass_probability(self) -> float:
+        """Probability of passing the exam."""
+        return sum(self.distribution[self.pass_mark :])
+
+    @property
+    def honours_probability(self) -> float:
+        """Probability of passing the exam with honours."""
+        return sum(self.distribution[self.honours_mark :])
+
+    def format(self) -> list[str]:
+        """Format the estimate as text lines."""
+
+        def simulated(count: int) -> str:
+            ratio = count / self.runs
+            error = 1.96 * math.sqrt(ratio * (1 - ratio) / self.runs)
+            return f"{ratio:.2%} ± {error:.2%}"
+
+        total = self.number_of_questions
+        expected = self.expected_score
+        output = [
+            f"Questions: {total}",
+            f"Expected score: {expected:.1f} ({expected / total:.1%})" if total else "",
+            f"Pass ({self.pass_mark}+ correct): {self.pass_probability:.2%}",
+            f"Pass with honours ({self.honours_mark}+ correct): {self.honours_probability:.2%}",
+        ]
+        if self.runs:
+            output.extend(
+                [
+                    f"Simulated exams: {self.runs}",
+                    f"Simulated pass: {simulated(self.simulated_pass)}",
+                    f"Simulated pass with honours: {simulated(self.simulated_honours)}",
+                ]
+            )
+        return [line for line in output if line]
+
+
+def get_category_distributions(
+    question_bank: QuestionBank, number_of_questions: int
+) -> list[list[float]]:
+    """Returns the score distribution of each category of a practice exam.
+
+    Each category quota is sampled from the questions of the category, or the whole question
+    bank is sampled if it has no quotas, as for a practice exam. The quotas are fitted to the
+    category sizes as the practice exam does.
+
+    :param question_bank: Loaded question bank with its metrics.
+    :param number_of_questions: Number of questions of the exam.
+    :return: Score distribution of each category.
+    """
+    questions = question_bank.questions
+    quotas = question_bank.get_fitted_category_quotas(number_of_questions)
+    if not quotas:
+        logger.warning("No category quotas found, using uniform sampling")
+        probabilities = [get_success_probability(question) for question in questions]
+        return [get_score_distribution(probabilities, number_of_questions)]
+    distributions = []
+    for category_id, quota in quotas.items():
+        indices = question_bank.category_index[category_id]
+        probabilities = [get_success_probability(questions[i]) for i in indices]
+        distributions.append(get_score_distribution(probabilities, quota))
+    return distributions
+
+
+def simulate_scores(
+    distributions: Sequence[Sequence[float]], runs: int, rng: random.Random
+) -> list[int]:
+    """Simulate exam scores.
+    :param distributions: Score distribution of each category.
+    :param runs: Number of exams to simulate.
+    :param rng: Random generator.
+    :return: Score of each simulated exam.
+    """
+    scores = [0] * runs
+    for distribution in distributions:
+        draws = rng.choices(range(len(distribution)), weights=distribution, k=runs)
+        scores = list(map(operator.add, scores, draws))
+    return scores
+
+
+def estimate_exam_readiness(
+    question_bank: QuestionBank,
+    number_of_questions: int,
+    pass_percentage: int,
+    honours_percentage: int,
+    runs: int = constants.DEFAULT_SIMULATION_RUNS,
+    rng: Optional[random.Random] = None,
+) -> ExamReadiness:
+    """Estimate the probability of passing a practice exam of the question bank.
+    :param question_bank: Loaded question bank with its metrics.
+    :param number_of_questions: Number of questions of the exam.
+    :param pass_percentage: Percentage of correct answers to pass.
+    :param honours_percentage: Percentage of correct answers to pass with honours.
+    :param runs: Number of exams to simulate (default is DEFAULT_SIMULATION_RUNS, 0 for none).
+    :param rng: Random generator (default is None, a new unseeded generator).
+    :return: Estimated exam results.
+    """
+    distributions = get_category_distributions(question_bank, number_of_questions)
+    distribution = [1.0]
+    for category_distribution in distributions:
+        distribution = convolve(distribution, category_distribution)
+    total = len(distribution) - 1
+    pass_mark = get_pass_mark(total, pass_percentage) if total else 0
+    honours_mark = get_pass_mark(total, honours_percentage) if total else 0
+    simulated_pass = simulated_honours = 0
+    if runs > 0:
+        scores = simulate_scores(distributions, runs, rng or random.Random())
+        simulated_pass = sum(1 for score in scores if score >= pass_mark)
+        simulated_honours = sum(1 for score in scores if score >= honours_mark)
+    return ExamReadiness(
+        distribution, pass_mark, honours_mark, runs, simulated_pass, simulated_honours
+    )
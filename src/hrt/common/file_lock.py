@@ -0,0 +1,76 @@
+"""
+This module contains the FileLock class, an advisory lock shared by the processes updating a
+progress file (metrics, marked questions, review schedule, quiz journal) or a shared cache file
+(analysis results).
+
+The lock is taken on a separate lock file next to the progress file, so the progress file can be
+replaced while the lock is held. The lock file is never deleted, deleting it would let two
+processes lock different files of the same name.
+
+Locking uses fcntl.flock, on platforms without fcntl the lock is always acquired.
+"""
+
+import os
+from typing import IO, Optional
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+
+class FileLock:
+    """Advisory lock of a progress file."""
+
+    def __init__(self, filepath: str):
+        """Create the lock, it is not acquired yet.
+        :param filepath: Path of the progress file.
+        """
+        self._lock_path = f"{filepath}.lock"
+        self._file: Optional[IO] = None
+
+    @property
+    def lock_path(self) -> str:
+        """Path of the lock file."""
+        return self._lock_path
+
+    @property
+    def is_locked(self) -> bool:
+        """Check if the lock is held by this instance."""
+        return self._file is not None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """Acquire the lock.
+        :param blocking: Whether to wait for the lock when another process holds it.
+        :return: True if the lock is acquired, False if another process holds it (not blocking).
+        """
+        if self._file is not None:
+            raise ValueError(f"Lock {self._lock_path} is already acquired")
+        os.makedirs(os.path.dirname(self._lock_path) or ".", exist_ok=True)
+        # the lock file stays open while the lock is held
+        lock_file = open(self._lock_path, "a", encoding="utf-8")  # noqa: SIM115
+        if fcntl is not None:
+            flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            try:
+                fcntl.flock(lock_file.fileno(), flags)
+            except BlockingIOError:
+                lock_file.close()
+                return False
+        self._file = lock_file
+        return True
+
+    def release(self) -> None:
+        """Release the lock, if it is held."""
+        if self._file is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._file.close()
+        self._file = None
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.release()
@@ -0,0 +1,164 @@
+"""
+This module contains the LanguageColumns class which indexes the language columns of a bilingual
+delimited question bank file.
+
+Each row holds a key column followed by the columns of the primary language (English) and the
+columns of the secondary language (French). The file is scanned once as bytes to record, for
+each row, the byte offsets of the columns of each language; quoted columns may span lines. Only
+the columns of the requested language are decoded, so loading one language does not pay for the
+other one, and the columns of the other language can still be read from the index later on.
+"""
+
+import csv
+import mmap
+import os
+from array import array
+from typing import Collection, Iterator, Optional, Union
+
+from hrt.common.enums import QuestionLanguage
+
+
+class LanguageColumns:
+    """Byte offsets of the language columns of each row of a delimited file."""
+
+    def __init__(
+        self,
+        filepath: Union[str, os.PathLike],
+        primary_fields: int,
+        delimiter: str = ";",
+        encoding: str = "iso-8859-1",
+        header: Optional[str] = None,
+    ):
+        """Index the file.
+        :param filepath: Path of the delimited file.
+        :param primary_fields: Number of columns up to the end of the primary language columns,
+            key column included.
+        :param delimiter: Delimiter of the columns (default is semicolon).
+        :param encoding: Encoding of the file (default is iso-8859-1).
+        :param header: Prefix of the header row to skip (default is None, no header).
+        """
+        self._filepath = filepath
+        self._primary_fields = primary_fields
+        self._delimiter = delimiter
+        self._encoding = encoding
+        self.keys: list[str] = []
+        # per row: start of the row, end of the key column, end of the primary columns (-1 for
+        # rows parsed as CSV) and end of the row
+        self._row_starts = array("q")
+        self._key_ends = array("q")
+        self._primary_ends = array("q")
+        self._row_ends = array("q")
+        self._index(header)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _index(self, header: Optional[str]) -> None:
+        delimiter = self._delimiter.encode(self._encoding)
+        header_prefix = header.encode(self._encoding) if header else None
+        with open(self._filepath, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                start = 0
+                size = len(data)
+                while start < size:
+                    end = self._find_row_end(data, start, size, delimiter)
+                    row_end = end - 1 if end > start and data[end - 1] == 0x0D else end
+                    if row_end > start and not (
+                        header_prefix and data[start : start + len(header_prefix)] == header_prefix
+                    ):
+                        self._index_row(data, start, row_end, delimiter)
+                    start = end + 1
+
+    @staticmethod
+    def _find_row_end(data: mmap.mmap, start: int, size: int, delimiter: bytes) -> int:
+        """Offset of the newline ending the row. As in csv, a quote opens a quoted column only at
+        the start of the column, and newlines within quoted columns are skipped."""
+        end = data.find(b"\n", start)
+        if end == -1:
+            end = size
+        if data.find(b'"', start, end) == -1:
+            return end
+        column = start
+        while True:
+            position = column
+            if data[column : column + 1] == b'"':
+                position = LanguageColumns._find_closing_quote(data, column + 1)
+                if position == -1:
+                    return size
+            end = data.find(b"\n", position)
+            if end == -1:
+                end = size
+            column = data.find(delimiter, position, end)
+            if column == -1:
+                return end
+            column += len(delimiter)
+
+    @staticmethod
+    def _find_closing_quote(data: mmap.mmap, position: int) -> int:
+        """Offset after the quote closing a quoted column, "" being an escaped quote, or -1."""
+        while True:
+            closing = data.find(b'"', position)
+            if closing == -1:
+                return -1
+            if data[closing + 1 : closing + 2] != b'"':
+                return closing + 1
+            position = closing + 2
+
+    def _index_row(self, data: mmap.mmap, start: int, end: int, delimiter: bytes) -> None:
+        key_end = data.find(delimiter, start, end)
+        if key_end == -1:
+            key_end = end
+        primary_end = -1
+        if data.find(b'"', start, end) == -1:
+            # quoted columns may contain the delimiter, those rows are parsed as CSV instead
+            primary_end = key_end
+            for _ in range(self._primary_fields - 1):
+                if primary_end == end:
+                    break
+                primary_end = data.find(delimiter, primary_end + 1, end)
+                if primary_end == -1:
+                    primary_end = end
+        self.keys.append(data[start:key_end].decode(self._encoding).strip('"'))
+        self._row_starts.append(start)
+        self._key_ends.append(key_end)
+        self._primary_ends.append(primary_end)
+        self._row_ends.append(end)
+
+    def _get_fields(self, data: mmap.mmap, row: int, secondary: bool) -> list[str]:
+        """Decode the language columns of the row."""
+        start, end = self._row_starts[row], self._row_ends[row]
+        if self._primary_ends[row] == -1:
+            text = data[start:end].decode(self._encoding)
+            fields = next(csv.reader([text], delimiter=self._delimiter))
+            if secondary:
+                return fields[self._primary_fields :]
+            return fields[1 : self._primary_fields]
+        key_end, primary_end = self._key_ends[row], self._primary_ends[row]
+        if secondary:
+            span = data[primary_end + 1 : end] if primary_end < end else b""
+        else:
+            span = data[key_end + 1 : primary_end] if key_end < end else b""
+        return span.decode(self._encoding).split(self._delimiter) if span else []
+
+    def read(
+        self, language: QuestionLanguage, keys: Optional[Collection[str]] = None
+    ) -> Iterator[tuple[str, list[str]]]:
+        """Read the columns of the language of each row.
+        :param language: English for the primary columns, French for the secondary columns.
+        :param keys: Keys of the rows to read, the other rows are not decoded (default is None,
+            all the rows).
+        :return: Iterator of the key and the language columns of each row.
+        """
+        if not self.keys:
+            return
+        secondary = language == QuestionLanguage.FR
+        with (
+            open(self._filepath, "rb") as file,
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data,
+        ):
+            for row, key in enumerate(self.keys):
+                if keys is not None and key not in keys:
+                    continue
+                yield key, self._get_fields(data, row, secondary)
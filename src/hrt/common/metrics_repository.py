@@ -0,0 +1,223 @@
+"""
+This module contains the MetricsRepository class, the in-memory metrics of a metrics file.
+
+Each metrics file has one repository per process, shared by the question banks and the quiz
+processor, so the file is read once per process. It is read again only if it was changed since
+the repository last read or wrote it.
+
+The repository keeps the metrics by question number, along with the question numbers in file
+order, which is sorted. Saving adds the counts of the new metrics through the dictionary, sorts
+the question numbers not in the file yet and merges them into the file order, in
+O(n + m log m) for n stored and m new metrics, then replaces the file once it is written.
+
+Processes saving the same metrics file concurrently hold its advisory lock (FileLock) while
+they read, merge and replace it. A process that finds the lock held does not wait: it writes its
+metrics to a delta file of its own, next to the metrics file. Delta files are read along with the
+metrics file, and merged into it by the next save that holds the lock. A delta file is deleted
+once the metrics file it was merged into replaced the previous one.
+"""
+
+import heapq
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from hrt.common import constants, utils
+from hrt.common.file_lock import FileLock
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.question_metric import QuestionMetric
+
+
+def copy_metric(metric: QuestionMetric) -> QuestionMetric:
+    """Returns a copy of the metric."""
+    return QuestionMetric(
+        metric.question_number, metric.correct_attempts, metric.wrong_attempts, metric.skip_count
+    )
+
+
+def format_metric(metric: QuestionMetric) -> str:
+    """Format the metric as a line of the metrics file."""
+    delimiter = constants.DEFAULT_METRICS_DELIMITER
+    return delimiter.join(
+        [
+            metric.question_number,
+            str(metric.correct_attempts),
+            str(metric.wrong_attempts),
+            str(metric.skip_count),
+        ]
+    )
+
+
+class MetricsRepository:
+    """In-memory metrics of a metrics file, shared per process."""
+
+    _repositories: Dict[str, "MetricsRepository"] = {}
+    _repositories_lock = threading.Lock()
+
+    def __init__(self, filepath: Union[str, os.PathLike]):
+        """Create the repository, the file is read on first use.
+        :param filepath: Path of the metrics file.
+        """
+        self._filepath = str(filepath)
+        self._metrics: Dict[QuestionNumber, QuestionMetric] = {}
+        self._order: List[QuestionNumber] = []
+        self._fingerprint: Optional[tuple] = None
+        self._delta_paths: List[str] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get(cls, filepath: Union[str, os.PathLike]) -> "MetricsRepository":
+        """Returns the repository of the metrics file, creating it on first use."""
+        key = os.path.abspath(filepath)
+        with cls._repositories_lock:
+            repository = cls._repositories.get(key)
+            if repository is None:
+                repository = cls._repositories[key] = MetricsRepository(filepath)
+            return repository
+
+    @classmethod
+    def clear(cls) -> None:
+        """Remove all the repositories, their files are read again on next use."""
+        with cls._repositories_lock:
+            cls._repositories.clear()
+
+    @property
+    def filepath(self) -> str:
+        """Path of the metrics file."""
+        return self._filepath
+
+    def _get_delta_paths(self) -> List[str]:
+        """Paths of the delta files of the metrics file, written completely."""
+        folder = os.path.dirname(self._filepath) or "."
+        prefix = f"{os.path.basename(self._filepath)}.delta-"
+        try:
+            names = os.listdir(folder)
+        except OSError:
+            return []
+        return [
+            os.path.join(folder, name)
+            for name in sorted(names)
+            if name.startswith(prefix) and not name.endswith(".tmp")
+        ]
+
+    def _get_fingerprint(self, delta_paths: List[str]) -> Optional[tuple]:
+        try:
+            stat = os.stat(self._filepath)
+        except OSError:
+            return None
+        # the file is replaced when written, so a new inode identifies a write even within the
+        # mtime granularity; delta files are not changed once written, their names identify them
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns, tuple(delta_paths)
+
+    def _load(self) -> None:
+        """Read the file if it changed since it was last read or written.
+
+        A file that cannot be stat'ed is read every time, it is missing and reads as empty.
+        """
+        delta_paths = self._get_delta_paths()
+        fingerprint = self._get_fingerprint(delta_paths)
+        if fingerprint is not None and fingerprint == self._fingerprint:
+            return
+        metrics: Dict[QuestionNumber, QuestionMetric] = {}
+        # the lines of a question renumbered to the number of another one, and of the delta
+        # files, add to the counts of the question
+        for filepath in [self._filepath, *delta_paths]:
+            for metric in utils.read_metrics_from_file(filepath):
+                existing = metrics.get(metric.question_number)
+                if existing is None:
+                    metrics[metric.question_number] = metric
+                    continue
+                existing.correct_attempts += metric.correct_attempts
+                existing.wrong_attempts += metric.wrong_attempts
+                existing.skip_count += metric.skip_count
+        self._metrics = metrics
+        # the file is written sorted, so sorting its order is a linear pass without deltas
+        self._order = sorted(metrics)
+        self._fingerprint = fingerprint
+        self._delta_paths = delta_paths
+
+    def get_metrics(self) -> Dict[QuestionNumber, QuestionMetric]:
+        """Returns a copy of the metrics by question number, in question number order."""
+        with self._lock:
+            self._load()
+            return {qn: copy_metric(self._metrics[qn]) for qn in self._order}
+
+    def _save_delta(self, metrics: List[QuestionMetric]) -> None:
+        """Write the metrics to a new delta file, merged into the metrics file later."""
+        delta_path = f"{self._filepath}.delta-{os.getpid()}-{uuid.uuid4().hex}"
+        utils.replace_file_lines(delta_path, (format_metric(metric) for metric in metrics))
+
+    def _add_metrics(self, metrics: List[QuestionMetric]) -> None:
+        """Add the counts of the metrics to the metrics in memory."""
+        new_numbers: List[QuestionNumber] = []
+        for metric in metrics:
+            existing = self._metrics.get(metric.question_number)
+            if existing is None:
+                self._metrics[metric.question_number] = metric
+                new_numbers.append(metric.question_number)
+                continue
+            existing.correct_attempts += metric.correct_attempts
+            existing.wrong_attempts += metric.wrong_attempts
+            existing.skip_count += metric.skip_count
+        if new_numbers:
+            new_numbers.sort()
+            self._order = list(heapq.merge(self._order, new_numbers))
+
+    def _write(self) -> None:
+        """Replace the metrics file with the metrics in memory and delete the merged deltas.
+
+        The lock of the metrics file must be held.
+        """
+        try:
+            utils.replace_file_lines(
+                self._filepath, (format_metric(self._metrics[qn]) for qn in self._order)
+            )
+        except Exception:
+            # the metrics in memory are ahead of the file, read it again on next use
+            self._fingerprint = None
+            raise
+        for delta_path in self._delta_paths:
+            Path(delta_path).unlink(missing_ok=True)
+        self._delta_paths = []
+        # delta files written since the file was read make the fingerprint differ
+        self._fingerprint = self._get_fingerprint([])
+
+    def save_metrics(self, metrics: Iterable[Optional[QuestionMetric]]) -> int:
+        """Add the counts of the metrics to the stored metrics and write the file once.
+
+        The metrics file is written while holding its lock, along with the delta files written
+        so far. If another process holds the lock, the metrics are written to a delta file
+        instead. A delta file is deleted after the metrics file is replaced, so a crash in
+        between counts it twice, but never loses it.
+
+        :param metrics: Metrics to add, None values are ignored.
+        :return: Number of metrics added.
+        """
+        new_metrics = [copy_metric(metric) for metric in metrics if metric]
+        if not new_metrics:
+            return 0
+        with self._lock:
+            file_lock = FileLock(self._filepath)
+            if not file_lock.acquire(blocking=False):
+                self._save_delta(new_metrics)
+                return len(new_metrics)
+            try:
+                self._load()
+                self._add_metrics(new_metrics)
+                self._write()
+            finally:
+                file_lock.release()
+            return len(new_metrics)
+
+    def merge_deltas(self) -> int:
+        """Merge the delta files into the metrics file, waiting for its lock.
+        :return: Number of delta files merged.
+        """
+        with self._lock, FileLock(self._filepath):
+            self._load()
+            merged = len(self._delta_paths)
+            if merged:
+                self._write()
+            return merged
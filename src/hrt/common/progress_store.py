@@ -0,0 +1,313 @@
+"""
+This module contains the ProgressStore class, a SQLite store of the question metrics and the
+marked questions of all the exam types.
+
+The store is an alternative to the metrics and marked questions text files, enabled by the
+``database`` key of the metrics configuration. The database is in WAL mode, so the question
+banks read it while a quiz saves its progress. Rows are keyed on (country, exam_type,
+question_number), and each metric field is indexed per exam type for the threshold queries.
+
+A quiz saves the metrics of its questions as upserts adding to the stored counts, in a single
+transaction, so a save costs the number of questions changed rather than the size of the
+question bank. The text files of an exam type are imported once, the first time the store is
+opened for it.
+"""
+
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from hrt.common import utils
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.metrics_repository import MetricsRepository
+from hrt.common.question_metric import QuestionMetric
+
+SCHEMA_VERSION: int = 1
+METRIC_FIELDS: tuple[str, ...] = ("correct_attempts", "wrong_attempts", "skip_count")
+BUSY_TIMEOUT: float = 10.0
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS metrics (
+    country TEXT NOT NULL,
+    exam_type TEXT NOT NULL,
+    question_number TEXT NOT NULL,
+    correct_attempts INTEGER NOT NULL DEFAULT 0,
+    wrong_attempts INTEGER NOT NULL DEFAULT 0,
+    skip_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (country, exam_type, question_number)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS metrics_correct_attempts
+    ON metrics (country, exam_type, correct_attempts);
+CREATE INDEX IF NOT EXISTS metrics_wrong_attempts
+    ON metrics (country, exam_type, wrong_attempts);
+CREATE INDEX IF NOT EXISTS metrics_skip_count
+    ON metrics (country, exam_type, skip_count);
+CREATE TABLE IF NOT EXISTS marked_questions (
+    country TEXT NOT NULL,
+    exam_type TEXT NOT NULL,
+    question_number TEXT NOT NULL,
+    PRIMARY KEY (country, exam_type, question_number)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS migrations (
+    country TEXT NOT NULL,
+    exam_type TEXT NOT NULL,
+    migrated_at INTEGER NOT NULL,
+    PRIMARY KEY (country, exam_type)
+) WITHOUT ROWID;
+"""
+
+UPSERT_METRIC: str = """
+INSERT INTO metrics
+    (country, exam_type, question_number, correct_attempts, wrong_attempts, skip_count)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (country, exam_type, question_number) DO UPDATE SET
+    correct_attempts = correct_attempts + excluded.correct_attempts,
+    wrong_attempts = wrong_attempts + excluded.wrong_attempts,
+    skip_count = skip_count + excluded.skip_count
+"""
+
+
+class ProgressStore:
+    """SQLite store of the question metrics and marked questions."""
+
+    def __init__(self, filepath: Union[str, os.PathLike]):
+        """Open the store, creating the database if it does not exist.
+        :param filepath: Path of the database file.
+        """
+        self._filepath = str(filepath)
+        Path(self._filepath).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self._filepath, timeout=BUSY_TIMEOUT)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            self._connection.close()
+            raise ValueError(f"Unsupported progress store version {version}: {self._filepath}")
+        if version < SCHEMA_VERSION:
+            with self._connection:
+                self._connection.executescript(SCHEMA)
+                self._connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def __enter__(self) -> "ProgressStore":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    @property
+    def filepath(self) -> str:
+        """Path of the database file."""
+        return self._filepath
+
+    def close(self) -> None:
+        """Close the store. The last connection to close moves the WAL into the database."""
+        self._connection.close()
+
+    def load_metrics(self, country: str, exam_type: str) -> Dict[QuestionNumber, QuestionMetric]:
+        """Returns the metrics of the questions of an exam type, by question number."""
+        cursor = self._connection.execute(
+            "SELECT question_number, correct_attempts, wrong_attempts, skip_count FROM metrics "
+            "WHERE country = ? AND exam_type = ?",
+            (country, exam_type),
+        )
+        return {
+            QuestionNumber(row[0]): QuestionMetric(QuestionNumber(row[0]), *row[1:])
+            for row in cursor
+        }
+
+    def get_metrics_at_least(
+        self, country: str, exam_type: str, field: str, threshold: int
+    ) -> List[QuestionMetric]:
+        """Returns the metrics whose field is at least the threshold, read through its index.
+        :param country: Country code.
+        :param exam_type: Exam type id.
+        :param field: Metric field, one of correct_attempts, wrong_attempts or skip_count.
+        :param threshold: Minimum value of the metric field.
+        :return: Metrics ordered by the metric field value.
+        :raises ValueError: If the field is not a metric field.
+        """
+        if field not in METRIC_FIELDS:
+            raise ValueError(f"Invalid metric field: {field}")
+        cursor = self._connection.execute(
+            "SELECT question_number, correct_attempts, wrong_attempts, skip_count FROM metrics "
+            f"WHERE country = ? AND exam_type = ? AND {field} >= ? ORDER BY {field}",
+            (country, exam_type, threshold),
+        )
+        return [QuestionMetric(QuestionNumber(row[0]), *row[1:]) for row in cursor]
+
+    def add_metrics(self, country: str, exam_type: str, metrics: Iterable[QuestionMetric]) -> int:
+        """Add the counts of the metrics to the stored metrics, in a single transaction.
+        :return: Number of metrics added.
+        """
+        rows = [
+            (
+                country,
+                exam_type,
+                metric.question_number,
+                metric.correct_attempts,
+                metric.wrong_attempts,
+                metric.skip_count,
+            )
+            for metric in metrics
+            if metric
+        ]
+        with self._connection:
+            self._connection.executemany(UPSERT_METRIC, rows)
+        return len(rows)
+
+    def load_marked_questions(self, country: str, exam_type: str) -> set[QuestionNumber]:
+        """Returns the numbers of the marked questions of an exam type."""
+        cursor = self._connection.execute(
+            "SELECT question_number FROM marked_questions WHERE country = ? AND exam_type = ?",
+            (country, exam_type),
+        )
+        return {QuestionNumber(row[0]) for row in cursor}
+
+    def set_marked_questions(
+        self, country: str, exam_type: str, marks: Dict[QuestionNumber, bool]
+    ) -> None:
+        """Mark and unmark questions, in a single transaction.
+        :param marks: Marked status of the questions to update, by question number.
+        """
+        marked = [(country, exam_type, qn) for qn, is_marked in marks.items() if is_marked]
+        unmarked = [(country, exam_type, qn) for qn, is_marked in marks.items() if not is_marked]
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO marked_questions (country, exam_type, question_number) "
+                "VALUES (?, ?, ?)",
+                marked,
+            )
+            self._connection.executemany(
+                "DELETE FROM marked_questions "
+                "WHERE country = ? AND exam_type = ? AND question_number = ?",
+                unmarked,
+            )
+
+    def is_migrated(self, country: str, exam_type: str) -> bool:
+        """Check if the text files of an exam type were imported."""
+        row = self._connection.execute(
+            "SELECT 1 FROM migrations WHERE country = ? AND exam_type = ?", (country, exam_type)
+        ).fetchone()
+        return row is not None
+
+    def migrate_files(
+        self,
+        country: str,
+        exam_type: str,
+        metrics_filepath: Optional[Union[str, os.PathLike]],
+        marked_questions_filepath: Optional[Union[str, os.PathLike]],
+    ) -> bool:
+        """Import the metrics and marked questions text files of an exam type, once.
+
+        The files are left in place, the store is the source of the progress afterwards.
+
+        :return: True if the files were imported, False if they already were.
+        """
+        if self.is_migrated(country, exam_type):
+            return False
+        # the metrics of the delta files not merged into the metrics file yet are imported too
+        metrics = (
+            list(MetricsRepository.get(metrics_filepath).get_metrics().values())
+            if metrics_filepath
+            else []
+        )
+        marked: set[QuestionNumber] = set()
+        if marked_questions_filepath and os.path.exists(marked_questions_filepath):
+            lines = utils.read_delim_file(str(marked_questions_filepath), delimiter="\n")
+            marked = {QuestionNumber(item) for line in lines for item in line if item}
+        with self._connection:
+            # claim the migration first: the insert takes the write lock, so a process that
+            # passed the check above concurrently waits for it and finds the migration done
+            cursor = self._connection.execute(
+                "INSERT OR IGNORE INTO migrations (country, exam_type, migrated_at) "
+                "VALUES (?, ?, ?)",
+                (country, exam_type, int(time.time())),
+            )
+            if cursor.rowcount == 0:
+                return False
+            self._connection.execute(
+                "DELETE FROM metrics WHERE country = ? AND exam_type = ?", (country, exam_type)
+            )
+            self._connection.executemany(
+                UPSERT_METRIC,
+                [
+                    (
+                        country,
+                        exam_type,
+                        m.question_number,
+                        m.correct_attempts,
+                        m.wrong_attempts,
+                        m.skip_count,
+                    )
+                    for m in metrics
+                ],
+            )
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO marked_questions (country, exam_type, question_number) "
+                "VALUES (?, ?, ?)",
+                [(country, exam_type, qn) for qn in marked],
+            )
+        return True
+
+    def migrate_question_numbers(
+        self,
+        country: str,
+        exam_type: str,
+        renumbered: Dict[QuestionNumber, QuestionNumber],
+        removed: Iterable[QuestionNumber],
+    ) -> int:
+        """Move the progress of renumbered questions and drop the removed ones, in a single
+        transaction. Only the rows of the changed questions are read.
+        :param renumbered: New question number of the renumbered questions.
+        :param removed: Numbers of the removed questions.
+        :return: Number of rows dropped.
+        """
+        removed = set(removed)
+        changed = [(country, exam_type, qn) for qn in [*renumbered, *removed]]
+        dropped = 0
+        with self._connection:
+            metric_rows = []
+            marked_rows = []
+            for key in changed:
+                metric_rows.extend(
+                    self._connection.execute(
+                        "SELECT question_number, correct_attempts, wrong_attempts, skip_count "
+                        "FROM metrics "
+                        "WHERE country = ? AND exam_type = ? AND question_number = ?",
+                        key,
+                    )
+                )
+                marked_rows.extend(
+                    self._connection.execute(
+                        "SELECT question_number FROM marked_questions "
+                        "WHERE country = ? AND exam_type = ? AND question_number = ?",
+                        key,
+                    )
+                )
+            for table in ("metrics", "marked_questions"):
+                self._connection.executemany(
+                    f"DELETE FROM {table} "
+                    "WHERE country = ? AND exam_type = ? AND question_number = ?",
+                    changed,
+                )
+            dropped = sum(1 for row in [*metric_rows, *marked_rows] if row[0] in removed)
+            self._connection.executemany(
+                UPSERT_METRIC,
+                [
+                    (country, exam_type, renumbered[row[0]], *row[1:])
+                    for row in metric_rows
+                    if row[0] not in removed
+                ],
+            )
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO marked_questions (country, exam_type, question_number) "
+                "VALUES (?, ?, ?)",
+                [
+                    (country, exam_type, renumbered[row[0]])
+                    for row in marked_rows
+                    if row[0] not in removed
+                ],
+            )
+        return dropped
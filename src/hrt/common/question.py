@@ -10,14 +10,13 @@ The Question class has the following attributes:
 """
 
 import random
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, List, Optional, Sequence
 
-from hrt.common.constants import ANSWER_DISPLAY_PREFIX
-from hrt.common.enums import QuestionAnswerDisplay
 from hrt.common.hrt_types import QuestionNumber
 from hrt.common.question_category import QuestionCategory
 from hrt.common.question_display import IQuestionDisplay
 from hrt.common.question_metric import QuestionMetric
+from hrt.common.question_renderer import get_display_key, get_question_template
 
 if TYPE_CHECKING:
     from hrt.common.question_ref import QuestionRef  # pragma: no cover
@@ -43,7 +42,6 @@ class Question:
         if len(choices) > 0 and answer not in choices:
             raise ValueError("Answer is not in the choices")
         self._answer = answer
-        random.shuffle(self._choices)
         self._answer_index: int = self.choices.index(self.answer) if len(self.choices) > 0 else -1
         self._category = category
         if not metric:
@@ -148,16 +146,35 @@ class Question:
 
     @property
     def choices(self) -> List[str]:
-        """Returns the choices for the question."""
+        """Returns the choices for the question, in the question bank order."""
         return self._choices
 
     @property
     def quiz_choices(self) -> List[str]:
         """Returns the choices for the question in a quiz format."""
-        choices = self.choices.copy()
+        return self.get_quiz_choices()
+
+    def get_choices(self, order: Optional[Sequence[int]] = None) -> List[str]:
+        """Returns the choices for the question.
+        :param order: Permutation of the choice indices (default is None, question bank order).
+        :return: List of choices.
+        """
+        if order is None:
+            return list(self._choices)
+        return [self._choices[i] for i in order]
+
+    def get_quiz_choices(self, order: Optional[Sequence[int]] = None) -> List[str]:
+        """Returns the choices for the question in a quiz format, followed by the skip choice."""
+        choices = self.get_choices(order)
         choices.append(self.SKIP_CHOICE)
         return choices
 
+    def get_answer_index(self, order: Optional[Sequence[int]] = None) -> int:
+        """Returns the index of the answer in the choices ordered by the permutation."""
+        if order is None:
+            return self._answer_index
+        return list(order).index(self._answer_index)
+
     @property
     def answer(self) -> str:
         """Returns the answer to the question."""
@@ -168,29 +185,51 @@ class Question:
         """Returns the index of the answer in the choices."""
         return self._answer_index
 
-    def format(self) -> str:
+    def format(self, order: Optional[Sequence[int]] = None) -> str:
         """Formats the question for display."""
-        question_output = [f"{self.question_number}: {self.question_text}"]
-        all_choices = self.choices
-        for i, choice in enumerate(all_choices):
-            if (
-                self.question_display
-                and self.question_display.answer_display == QuestionAnswerDisplay.WITH_QUESTION
-                and choice == self.answer
-            ):
-                question_output.append(f"{ANSWER_DISPLAY_PREFIX}{i + 1}. {choice}")
-            else:
-                question_output.append(f"    {i + 1}. {choice}")
-        question_output.append("")
-        return "\n".join(question_output)
-
-    def format_quiz_question(self) -> str:
+        return self._render(order, quiz=False)
+
+    def format_quiz_question(self, order: Optional[Sequence[int]] = None) -> str:
         """Formats the question for display in a quiz."""
-        question_output = [f"{self.question_number}: {self.question_text}"]
-        all_choices = self.choices
-        for i, choice in enumerate(all_choices):
-            question_output.append(f"{i + 1}. {choice}")
-        # Add the skip choice
-        question_output.append(f"{len(all_choices) + 1}. {self.SKIP_CHOICE}")
-        question_output.append("")
-        return "\n".join(question_output)
+        return self._render(order, quiz=True)
+
+    def _render(self, order: Optional[Sequence[int]], quiz: bool) -> str:
+        template = get_question_template(
+            get_display_key(self.question_display), quiz, self.SKIP_CHOICE
+        )
+        return template.render(self, self.get_choices(order), self.get_answer_index(order))
+
+
+class ChoiceOrder:
+    """Order of the choices of the questions for a quiz or a listing session.
+
+    Questions keep their choices in the question bank order, so a loaded question bank can be
+    shared by several sessions. Each session draws a permutation of the choices of a question
+    the first time the question is shown, from its own random generator, so the order is
+    reproducible from a seed.
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        """Create the choice order.
+        :param rng: Random generator (default is None, a new unseeded generator).
+        """
+        self._rng = rng if rng is not None else random.Random()
+        self._orders: dict[QuestionNumber, tuple[int, ...]] = {}
+
+    def get(self, question: Question) -> tuple[int, ...]:
+        """Returns the permutation of the choice indices of the question."""
+        order = self._orders.get(question.question_number)
+        if order is None:
+            indices = list(range(len(question.choices)))
+            self._rng.shuffle(indices)
+            order = tuple(indices)
+            self._orders[question.question_number] = order
+        return order
+
+    def set(self, question: Question, order: Sequence[int]) -> None:
+        """Set the permutation of the choice indices of the question, to restore a session.
+        :raises ValueError: If the order is not a permutation of the choice indices.
+        """
+        if sorted(order) != list(range(len(question.choices))):
+            raise ValueError(f"Invalid choice order {order} for {question.question_number}")
+        self._orders[question.question_number] = tuple(order)
@@ -1,11 +1,18 @@
 """Question bank class."""
 
+import os
 import random
+import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from hrt.common import utils
+from hrt.common import constants, utils
+from hrt.common.analysis_cache import AnalysisCache
+from hrt.common.bank_manifest import BankManifest, get_manifest_path
 from hrt.common.config_reader import logger
 from hrt.common.enums import (
     CountryCode,
@@ -13,13 +20,22 @@ from hrt.common.enums import (
     GeneralQuestionListingType,
     MarkedQuestionListingType,
     QuestionDisplayMode,
+    QuestionLanguage,
     QuestionListingType,
     TopQuestionsListingType,
 )
 from hrt.common.hrt_types import QuestionNumber
-from hrt.common.question import Question
+from hrt.common.progress_store import ProgressStore
+from hrt.common.question import ChoiceOrder, Question
 from hrt.common.question_category import QuestionCategory
 from hrt.common.question_metric import QuestionMetric
+from hrt.common.question_query import MetricColumns, QuestionIndex, QuestionQuery
+
+MARKED_METRIC_FIELDS: dict[MarkedQuestionListingType, str] = {
+    MarkedQuestionListingType.CORRECT_ANSWER: "correct_attempts",
+    MarkedQuestionListingType.WRONG_ATTEMPT: "wrong_attempts",
+    MarkedQuestionListingType.SKIPPED: "skip_count",
+}
 
 
 class IQuestionBank(ABC):
@@ -45,6 +61,26 @@ class IQuestionBank(ABC):
     def categories_filepath(self) -> Path:
         """Filepath of the question categories."""
 
+    @property
+    @abstractmethod
+    def language(self) -> QuestionLanguage:
+        """Language of the question text."""
+
+    @property
+    @abstractmethod
+    def derived_filepath(self) -> Path:
+        """Path prefix of the files derived from the questions (search index, analysis)."""
+
+    @property
+    @abstractmethod
+    def file_hash(self) -> str:
+        """Hash of the question bank file the questions were loaded from, empty if none."""
+
+    @property
+    @abstractmethod
+    def file_stat(self) -> list[int]:
+        """Stat of the question bank file taken before it was hashed, empty if none."""
+
     @abstractmethod
     def load_questions(self) -> list[Question]:
         """Load questions from the question bank."""
@@ -71,6 +107,11 @@ class IQuestionBank(ABC):
     def categories(self) -> list[QuestionCategory]:
         """Categories in the question bank."""
 
+    @property
+    @abstractmethod
+    def metrics(self) -> dict[QuestionNumber, QuestionMetric]:
+        """Metrics of the questions by question number."""
+
     @abstractmethod
     def get_random_questions(
         self,
@@ -82,26 +123,59 @@ class IQuestionBank(ABC):
         """Returns a list of random questions."""
 
     @abstractmethod
-    def get_random_quiz_questions(self, number_of_questions: int) -> list[Question]:
+    def get_random_quiz_questions(
+        self, number_of_questions: int, rng: Optional[random.Random] = None
+    ) -> list[Question]:
         """Returns a list of random questions for a quiz."""
 
+    @abstractmethod
+    def query(self) -> QuestionQuery:
+        """Returns a query matching all the questions in the question bank."""
+
+    @abstractmethod
+    def get_blueprint_questions(
+        self, number_of_questions: int, rng: Optional[random.Random] = None
+    ) -> list[Question]:
+        """Returns a list of random questions distributed per the category quotas."""
+
     @abstractmethod
     def get_questions(
         self,
         criteria: QuestionListingType | TopQuestionsListingType,
         max_questions: int = 0,
+        choice_order: Optional[ChoiceOrder] = None,
     ) -> tuple[dict | list, list[str]]:
         """Returns a list of questions based on the criteria."""
 
+    @abstractmethod
+    def iter_questions(
+        self,
+        criteria: QuestionListingType | TopQuestionsListingType,
+        max_questions: int = 0,
+        choice_order: Optional[ChoiceOrder] = None,
+    ) -> tuple[dict | list, Iterator[str]]:
+        """Returns the questions based on the criteria and their text, formatted lazily."""
+
     @abstractmethod
     def get_marked_questions(
         self,
         criteria: MarkedQuestionListingType,
-        metrics: list[QuestionMetric],
+        metrics: Optional[list[QuestionMetric]] = None,
         question_count: int = 0,
+        choice_order: Optional[ChoiceOrder] = None,
     ) -> tuple[list[Question], list[str]]:
         """Returns a list of marked questions based on the criteria."""
 
+    @abstractmethod
+    def iter_marked_questions(
+        self,
+        criteria: MarkedQuestionListingType,
+        metrics: Optional[list[QuestionMetric]] = None,
+        question_count: int = 0,
+        choice_order: Optional[ChoiceOrder] = None,
+    ) -> tuple[list[Question], Iterator[str]]:
+        """Returns the marked questions based on the criteria and their text, formatted lazily."""
+
     @abstractmethod
     def get_all_questions(self) -> list[Question]:
         """Returns all questions in the question bank."""
@@ -130,6 +204,20 @@ class IQuestionBank(ABC):
     def get_longest_correct_choice(self, max_questions: int = 0) -> list[Question]:
         """Returns a list of questions with the longest correct choice."""
 
+    @abstractmethod
+    def get_top_questions(
+        self, criteria: TopQuestionsListingType, max_questions: int = 0
+    ) -> list[Question]:
+        """Returns a list of questions with the largest values of the criteria."""
+
+    @abstractmethod
+    def get_manifest_questions(self) -> list[Question]:
+        """Returns the questions the manifest of the question bank is computed from."""
+
+    @abstractmethod
+    def prepare_listings(self) -> None:
+        """Build the indexes shared by the listings ahead of computing them concurrently."""
+
     @abstractmethod
     def get_marked_questions_filepath(self) -> str:
         """Returns the filepath of the marked questions."""
@@ -139,37 +227,80 @@ class IQuestionBank(ABC):
         """Returns all marked questions."""
 
 
-def process_list_result(result: list[Question]) -> list[str]:
-    """Process list of questions result."""
-    return [question.format() for question in result]
+def get_derived_filepath(filepath: Path, language: QuestionLanguage) -> Path:
+    """Path prefix of the files derived from the questions of the language (search index,
+    analysis).
 
+    The files derived from the questions of another language than English get the id of the
+    language appended to the question bank file name.
+    """
+    if language == QuestionLanguage.EN:
+        return Path(filepath)
+    return Path(f"{filepath}.{language.id}")
 
-def process_dict_result(
-    criteria: QuestionListingType | TopQuestionsListingType, result: dict
+
+def format_question(question: Question, choice_order: Optional[ChoiceOrder] = None) -> str:
+    """Format the question with its choices in the order of the session, if any."""
+    return question.format(choice_order.get(question) if choice_order else None)
+
+
+def iter_list_result(
+    result: Iterable[Question], choice_order: Optional[ChoiceOrder] = None
+) -> Iterator[str]:
+    """Format the questions of a list result lazily."""
+    for question in result:
+        yield format_question(question, choice_order)
+
+
+def process_list_result(
+    result: Iterable[Question], choice_order: Optional[ChoiceOrder] = None
 ) -> list[str]:
-    """Process a dictionary of questions result."""
-    result_text = []
+    """Process list of questions result."""
+    return list(iter_list_result(result, choice_order))
+
+
+def iter_dict_result(
+    criteria: QuestionListingType | TopQuestionsListingType,
+    result: dict,
+    choice_order: Optional[ChoiceOrder] = None,
+) -> Iterator[str]:
+    """Format the questions of a dictionary result lazily."""
     match criteria:
         case GeneralQuestionListingType.SAME_ANSWER:
             for answer, questions in result.items():
-                result_text.append(f"Answer: {answer}")
-                result_text.extend(process_list_result(questions))
+                yield f"Answer: {answer}"
+                yield from iter_list_result(questions, choice_order)
         case GeneralQuestionListingType.SAME_CHOICES:
             for choices, questions in result.items():
-                result_text.append(f"Choices: {choices}")
-                result_text.extend(process_list_result(questions))
+                yield f"Choices: {choices}"
+                yield from iter_list_result(questions, choice_order)
         case GeneralQuestionListingType.TWO_OR_MORE_SAME_CHOICES:
             for question, similar_questions in result.items():
                 # append all question numbers in the same line
                 qnums = ", ".join([q.question_number for q in similar_questions])
-                result_text.append(f"{question.question_number}, {qnums}")
-                result_text.append(question.format())
+                yield f"{question.question_number}, {qnums}"
+                yield format_question(question, choice_order)
                 for similar_question in similar_questions:
-                    result_text.append(similar_question.format())
+                    yield format_question(similar_question, choice_order)
         case GeneralQuestionListingType.QN_ANSWER:
             for qnum, answer in result.items():
-                result_text.append(f"{qnum}: {answer}")
-    return result_text
+                yield f"{qnum}: {answer}"
+
+
+def process_dict_result(
+    criteria: QuestionListingType | TopQuestionsListingType,
+    result: dict,
+    choice_order: Optional[ChoiceOrder] = None,
+) -> list[str]:
+    """Process a dictionary of questions result."""
+    return list(iter_dict_result(criteria, result, choice_order))
+
+
+def record_questions(questions: Iterable[Question], seen: list[Question]) -> Iterator[Question]:
+    """Yield the questions, appending each one to the seen list as it is consumed."""
+    for question in questions:
+        seen.append(question)
+        yield question
 
 
 class QuestionBank(IQuestionBank, ABC):
@@ -184,8 +315,11 @@ class QuestionBank(IQuestionBank, ABC):
         categories_filepath: Optional[Path] = None,
         marked_questions_filepath: Optional[Path] = None,
         metrics_filepath: Optional[Path] = None,
+        language: QuestionLanguage = QuestionLanguage.EN,
+        progress_store_filepath: Optional[Path] = None,
     ):
         self.mappings: Optional[Dict[Any, Any]] = None
+        self._language = language
         self._country = country
         self._exam_type = exam_type
         self._filepath = filepath
@@ -193,9 +327,17 @@ class QuestionBank(IQuestionBank, ABC):
         self._categories_filepath = categories_filepath
         self._marked_questions_filepath = marked_questions_filepath
         self._metrics_filepath = metrics_filepath
+        self._progress_store_filepath = progress_store_filepath
         self._questions: list[Question] = []
         self._categories: list[QuestionCategory] = []
         self._metrics: dict[QuestionNumber, QuestionMetric] = {}
+        self._categories_by_id: dict[str, QuestionCategory] = {}
+        self._category_index: dict[str, list[int]] = {}
+        self._question_index: Optional[QuestionIndex] = None
+        self._analysis_cache: Optional[AnalysisCache] = None
+        self._prefetched_marked_questions: Optional[set[QuestionNumber]] = None
+        self._file_hash = ""
+        self._file_stat: list[int] = []
         self.init_question_bank()
 
     @property
@@ -206,6 +348,23 @@ class QuestionBank(IQuestionBank, ABC):
     def exam_type(self):
         return self._exam_type
 
+    @property
+    def language(self) -> QuestionLanguage:
+        return self._language
+
+    @property
+    def derived_filepath(self) -> Path:
+        """Path prefix of the files derived from the questions (search index, analysis)."""
+        return get_derived_filepath(self._filepath, self._language)
+
+    @property
+    def file_hash(self) -> str:
+        return self._file_hash
+
+    @property
+    def file_stat(self) -> list[int]:
+        return self._file_stat
+
     @property
     def filepath(self) -> Path:
         """Filepath of the question bank."""
@@ -239,6 +398,11 @@ class QuestionBank(IQuestionBank, ABC):
             raise ValueError("Marked questions filepath is not set")
         return self._marked_questions_filepath
 
+    @property
+    def progress_store_filepath(self) -> Optional[Path]:
+        """Filepath of the progress store, None if the progress is kept in text files."""
+        return self._progress_store_filepath
+
     @property
     def categories(self) -> list[QuestionCategory]:
         return self._categories
@@ -248,19 +412,84 @@ class QuestionBank(IQuestionBank, ABC):
         """Metrics of the question bank."""
         return self._metrics
 
+    @property
+    def category_index(self) -> dict[str, list[int]]:
+        """Question indices grouped by category id."""
+        return self._category_index
+
     def init_question_bank(self):
-        """Initialize the question bank."""
+        """Initialize the question bank.
+
+        Categories, metrics and marked questions are independent files and are read in
+        parallel, while the question bank file is hashed. Questions are loaded once they are
+        available, since each question references its category and metric. The hash is taken
+        before the questions are loaded, so a change of the file during the load leaves the
+        hash stale rather than the files derived from the questions.
+        """
         logger.info("Initializing question bank")
-        self._categories = self.load_categories()
+        self._question_index = None
+        self._analysis_cache = None
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            hash_future = executor.submit(self._hash_file)
+            categories_future = executor.submit(self.load_categories)
+            metrics_future = executor.submit(self.load_metrics)
+            marked_future = (
+                executor.submit(self.read_marked_questions)
+                if self._marked_questions_filepath or self._progress_store_filepath
+                else None
+            )
+            self._categories = categories_future.result()
+            self._metrics = metrics_future.result()
+            if marked_future:
+                self._prefetched_marked_questions = marked_future.result()
+            self._file_stat, self._file_hash = hash_future.result()
+        self._categories_by_id = {category.category_id: category for category in self._categories}
         logger.info("Loaded %d categories", len(self._categories))
-        self._metrics = self.load_metrics()
         logger.info("Loaded %d metrics", len(self._metrics))
         self._questions = self.load_questions()
         logger.info("Loaded %d questions", len(self._questions))
+        self._check_manifest()
+        self._category_index = self._build_category_index()
         mq_counts = self.load_marked_questions()
         logger.info("Loaded %d marked questions", mq_counts)
         self.init_criteria_mapping()
 
+    def _hash_file(self) -> tuple[list[int], str]:
+        """Returns the stat and the hash of the question bank file, stat'ed before hashing."""
+        if self._filepath is None or not os.path.isfile(self._filepath):
+            return [], ""
+        file_stat = utils.get_file_stat(self._filepath)
+        try:
+            return file_stat, utils.get_file_hash(self._filepath)
+        except OSError as e:
+            logger.warning("Unable to hash question bank %s: %s", self._filepath, e)
+            return [], ""
+
+    def _check_manifest(self) -> None:
+        """Save the manifest of the question bank file if it is missing.
+
+        The manifest is the baseline the next release of the question bank is compared against.
+        Warns when the file changed since the manifest was saved.
+        """
+        if not self._file_hash:
+            return
+        manifest_path = get_manifest_path(self._filepath)
+        file_hash = self._file_hash
+        manifest = BankManifest.load(manifest_path)
+        if manifest is None:
+            try:
+                BankManifest.from_questions(self.get_manifest_questions(), file_hash).save(
+                    manifest_path
+                )
+            except OSError as e:
+                logger.warning("Unable to save question bank manifest %s: %s", manifest_path, e)
+        elif manifest.file_hash != file_hash:
+            logger.warning(
+                "Question bank %s changed since its manifest was saved, "
+                "run 'question diff --apply' to migrate metrics and marked questions",
+                self._filepath,
+            )
+
     def init_criteria_mapping(self):
         """Initialize the criteria mapping."""
         self.mappings = {
@@ -272,6 +501,21 @@ class QuestionBank(IQuestionBank, ABC):
             TopQuestionsListingType.LONGEST_QUESTION_TEXT: self.get_longest_question_text,
             TopQuestionsListingType.LONGEST_CORRECT_CHOICE: self.get_longest_correct_choice,
         }
+        for criteria in TopQuestionsListingType:
+            self.mappings.setdefault(criteria, partial(self.get_top_questions, criteria))
+
+    def _build_category_index(self) -> dict[str, list[int]]:
+        """Partition the question indices by category id."""
+        category_index: dict[str, list[int]] = {}
+        for index, question in enumerate(self._questions):
+            if question.category is None:
+                continue
+            category_index.setdefault(question.category.category_id, []).append(index)
+        return category_index
+
+    def get_category_by_id(self, category_id: str) -> Optional[QuestionCategory]:
+        """Get the category by its ID."""
+        return self._categories_by_id.get(category_id)
 
     @property
     def questions(self):
@@ -284,20 +528,41 @@ class QuestionBank(IQuestionBank, ABC):
         self,
         criteria: QuestionListingType | TopQuestionsListingType,
         max_questions: int = 0,
+        choice_order: Optional[ChoiceOrder] = None,
     ) -> tuple[dict | list, list[str]]:
+        result, result_text = self.iter_questions(criteria, max_questions, choice_order)
+        # formatting the text consumes the result if the criteria function returned an iterator
+        result_text = list(result_text)
+        return result, result_text
+
+    def iter_questions(
+        self,
+        criteria: QuestionListingType | TopQuestionsListingType,
+        max_questions: int = 0,
+        choice_order: Optional[ChoiceOrder] = None,
+    ) -> tuple[dict | list, Iterator[str]]:
+        """Returns the questions based on the criteria and their text, formatted lazily.
+
+        The criteria functions may return an iterator of questions, which is consumed once by the
+        text iterator. In that case the returned list of questions is filled as the text is
+        consumed, so it is complete only once the text iterator is exhausted.
+
+        :param criteria: Listing criteria.
+        :param max_questions: Maximum number of questions (default is 0, all).
+        :param choice_order: Order of the choices in the question text (default is None, the
+            question bank order).
+        :return: Questions and an iterator of their text.
+        """
         if self.mappings is None:
             raise ValueError("Mappings not initialized")
         func = self.mappings.get(criteria)
         if not func:
             raise ValueError(f"Method for Criteria {criteria} not found")
-        if criteria in [
-            TopQuestionsListingType.LONGEST_QUESTION_TEXT,
-            TopQuestionsListingType.LONGEST_CORRECT_CHOICE,
-        ]:
+        if isinstance(criteria, TopQuestionsListingType):
             # For top questions criteria, pass the max_questions parameter
             result = func(max_questions)
         elif criteria == GeneralQuestionListingType.ALL and max_questions > 0:
-            result = func()[:max_questions]
+            result = islice(func(), max_questions)
         else:
             result = func()
 
@@ -305,55 +570,111 @@ class QuestionBank(IQuestionBank, ABC):
             GeneralQuestionListingType.SAME_ANSWER,
             GeneralQuestionListingType.QN_ANSWER,
         ]:
-            result_text = process_dict_result(criteria, result)
+            result_text = iter_dict_result(criteria, result, choice_order)
         elif criteria == GeneralQuestionListingType.SAME_CHOICES:
             dict_result = self._get_same_choices_dict()
-            result_text = process_dict_result(criteria, dict_result)
+            result_text = iter_dict_result(criteria, dict_result, choice_order)
         elif criteria == GeneralQuestionListingType.TWO_OR_MORE_SAME_CHOICES:
             dict_result = self._get_two_or_more_same_choices_dict()
-            result_text = process_dict_result(criteria, dict_result)
+            result_text = iter_dict_result(criteria, dict_result, choice_order)
+        elif isinstance(result, list):
+            result_text = iter_list_result(result, choice_order)
         else:
-            result_text = process_list_result(result)
+            seen: list[Question] = []
+            result_text = iter_list_result(record_questions(result, seen), choice_order)
+            result = seen
         return result, result_text
 
     def get_marked_questions(
         self,
         criteria: MarkedQuestionListingType,
-        metrics: list[QuestionMetric],
+        metrics: Optional[list[QuestionMetric]] = None,
         question_count: int = 0,
+        choice_order: Optional[ChoiceOrder] = None,
     ) -> tuple[list[Question], list[str]]:
-        if criteria == MarkedQuestionListingType.CORRECT_ANSWER:
-            marked_questions = [
-                metric.question_number
-                for metric in metrics
-                if metric.correct_attempts >= question_count
-            ]
-        elif criteria == MarkedQuestionListingType.WRONG_ATTEMPT:
-            marked_questions = [
-                metric.question_number
-                for metric in metrics
-                if metric.wrong_attempts >= question_count
-            ]
-        elif criteria == MarkedQuestionListingType.SKIPPED:
-            marked_questions = [
-                metric.question_number for metric in metrics if metric.skip_count >= question_count
-            ]
-        else:
-            raise ValueError(f"Criteria {criteria} not found")
-
-        result = [
-            question
-            for question in self._questions
-            if question.question_number in marked_questions
-        ]
-        result_text = process_list_result(result)
+        """Returns the questions whose metric for the criteria meets the question count.
+
+        :param criteria: Metric to compare against the question count.
+        :param metrics: Metrics to use instead of the question bank metrics.
+        :param question_count: Minimum value of the metric.
+        :param choice_order: Order of the choices in the question text (default is None, the
+            question bank order).
+        :return: Questions in question bank order and their text.
+        """
+        result, result_text = self.iter_marked_questions(
+            criteria, metrics, question_count, choice_order
+        )
+        return result, list(result_text)
 
-        return result, result_text
+    def iter_marked_questions(
+        self,
+        criteria: MarkedQuestionListingType,
+        metrics: Optional[list[QuestionMetric]] = None,
+        question_count: int = 0,
+        choice_order: Optional[ChoiceOrder] = None,
+    ) -> tuple[list[Question], Iterator[str]]:
+        """Returns the marked questions based on the criteria and their text, formatted lazily.
+        :param criteria: Metric to compare against the question count.
+        :param metrics: Metrics to use instead of the question bank metrics.
+        :param question_count: Minimum value of the metric.
+        :param choice_order: Order of the choices in the question text (default is None, the
+            question bank order).
+        :return: Questions in question bank order and an iterator of their text.
+        """
+        field = MARKED_METRIC_FIELDS.get(criteria)
+        if field is None:
+            raise ValueError(f"Criteria {criteria} not found")
+        if metrics is None:
+            metric_columns = self._get_question_index().metric_columns
+        else:
+            metric_columns = MetricColumns(
+                self._questions, {metric.question_number: metric for metric in metrics}
+            )
+        indices = sorted(metric_columns.at_least(field, question_count))
+        result = [self._questions[i] for i in indices]
+        return result, iter_list_result(result, choice_order)
 
     def get_all_questions(self) -> list[Question]:
         return self.questions
 
+    def get_manifest_questions(self) -> list[Question]:
+        """Returns the questions the manifest of the question bank is computed from.
+
+        The manifest tracks the question content across releases whatever the language the
+        question bank is loaded in, so it is computed from the English questions.
+        """
+        return self._questions
+
+    def prepare_listings(self) -> None:
+        """Build the question index and the analysis cache ahead of computing the listings.
+
+        Listings computed concurrently, in threads or forked processes, then share them instead
+        of each building its own copy.
+        """
+        self._get_question_index()
+        self._get_analysis_cache()
+
+    def _get_analysis_cache(self) -> AnalysisCache:
+        """Returns the analysis cache of the current questions.
+
+        Results are persisted next to the question bank file, when it exists, and reused while
+        the hash of the question bank file, taken when the questions were loaded, is unchanged.
+        """
+        cache = self._analysis_cache
+        if cache is None or cache.questions is not self._questions:
+            filepath: Optional[Path] = None
+            if self._file_hash:
+                filepath = Path(f"{self.derived_filepath}{constants.ANALYSIS_CACHE_FILE_SUFFIX}")
+            cache = AnalysisCache(self._questions, filepath, self._file_hash)
+            self._analysis_cache = cache
+        return cache
+
     def get_same_answer_questions(self) -> dict[str, list[Question]]:
+        return self._get_analysis_cache().get(
+            GeneralQuestionListingType.SAME_ANSWER.id, self._find_same_answer_questions
+        )
+
+    def _find_same_answer_questions(self) -> dict[str, list[Question]]:
         questions_with_same_answer: Dict[str, List[Question]] = {}
         for question in self.questions:
             if question.answer in questions_with_same_answer:
@@ -364,6 +685,11 @@ class QuestionBank(IQuestionBank, ABC):
 
     def _get_same_choices_dict(self) -> dict[tuple[Any, ...], list[Question]]:
         """Internal helper to get same choices questions as a dictionary."""
+        return self._get_analysis_cache().get(
+            GeneralQuestionListingType.SAME_CHOICES.id, self._find_same_choices
+        )
+
+    def _find_same_choices(self) -> dict[tuple[Any, ...], list[Question]]:
         questions_with_same_choices: Dict[Tuple[Any, ...], List[Question]] = {}
         for question in self.questions:
             choices = tuple(sorted(question.choices))
@@ -383,6 +709,12 @@ class QuestionBank(IQuestionBank, ABC):
 
     def _get_two_or_more_same_choices_dict(self) -> dict[Question, list[Question]]:
         """Internal helper to get questions with two or more the same choices as a dictionary."""
+        return self._get_analysis_cache().get(
+            GeneralQuestionListingType.TWO_OR_MORE_SAME_CHOICES.id,
+            self._find_two_or_more_same_choices,
+        )
+
+    def _find_two_or_more_same_choices(self) -> dict[Question, list[Question]]:
         questions_with_two_more_same_options: dict[Question, list[Question]] = {}
         for question in self.questions:
             choices = question.choices
@@ -414,18 +746,44 @@ class QuestionBank(IQuestionBank, ABC):
         return qnum_answer_questions
 
     def get_longest_question_text(self, max_questions: int = 0) -> list[Question]:
-        return sorted(self.questions, key=lambda x: len(x.question_text), reverse=True)[
-            :max_questions
-        ]
+        return self.get_top_questions(TopQuestionsListingType.LONGEST_QUESTION_TEXT, max_questions)
 
     def get_longest_correct_choice(self, max_questions: int = 1) -> list[Question]:
-        return sorted(self.questions, key=lambda x: len(x.answer), reverse=True)[:max_questions]
+        return self.get_top_questions(
+            TopQuestionsListingType.LONGEST_CORRECT_CHOICE, max_questions
+        )
 
-    def load_marked_questions(self) -> int:
+    def get_top_questions(
+        self, criteria: TopQuestionsListingType, max_questions: int = 0
+    ) -> list[Question]:
+        """Returns the questions with the largest values of the criteria feature.
+
+        Feature columns are computed once per question bank snapshot and the top questions are
+        selected with a heap, in O(n log k) for k questions.
+
+        :param criteria: Feature to rank the questions by.
+        :param max_questions: Number of questions to return.
+        :return: List of questions, largest feature value first.
+        """
+        feature_columns = self._get_question_index().feature_columns
+        return [self._questions[i] for i in feature_columns.top(criteria, max_questions)]
+
+    def read_marked_questions(self) -> set[QuestionNumber]:
+        """Read the numbers of the marked questions, from the progress store if it is set."""
+        if self._progress_store_filepath:
+            with ProgressStore(self._progress_store_filepath) as store:
+                return store.load_marked_questions(self.country.code, self._exam_type.id)
         marked_questions = utils.read_delim_file(
             str(self.marked_questions_filepath), delimiter="\n"
         )
-        flattened_questions = [item for sublist in marked_questions for item in sublist]
+        return {QuestionNumber(item) for sublist in marked_questions for item in sublist}
+
+    def load_marked_questions(self) -> int:
+        flattened_questions = self._prefetched_marked_questions
+        self._prefetched_marked_questions = None
+        if flattened_questions is None:
+            flattened_questions = self.read_marked_questions()
+        self._question_index = None
         for question in self._questions:
             if question.question_number in flattened_questions:
                 question.is_marked = True
@@ -447,39 +805,46 @@ class QuestionBank(IQuestionBank, ABC):
         :param excluded_questions: List of questions to exclude from the random selection.
         :return: List of random questions.
         """
-        if include_marked:
-            questions = [question for question in self._questions if question.is_marked]
-        else:
-            questions = [question for question in self._questions if not question.is_marked]
-
+        query = self.query().marked() if include_marked else self.query().unmarked()
         if included_questions:
-            questions = [
-                question
-                for question in questions
-                if question.question_number in included_questions
-            ]
-
+            query = query.including(included_questions)
         if excluded_questions:
-            questions = [
-                question
-                for question in questions
-                if question.question_number not in excluded_questions
-            ]
-
-        if number_of_questions > len(questions):
+            query = query.excluding(excluded_questions)
+        available = query.count()
+        if number_of_questions > available:
             logger.debug(
                 "Number of questions requested %d is greater than available questions %d",
                 number_of_questions,
-                len(questions),
+                available,
             )
-            number_of_questions = len(questions)
+        return query.sample(number_of_questions)
 
-        return random.sample(questions, number_of_questions)
+    def query(self) -> QuestionQuery:
+        """Returns a query matching all the questions in the question bank.
 
-    def get_random_quiz_questions(self, number_of_questions: int) -> list[Question]:
+        The bitmap indexes behind the query are built on first use and rebuilt when the
+        questions, metrics or marked questions are reloaded.
+        """
+        return QuestionQuery(self._get_question_index())
+
+    def _get_question_index(self) -> QuestionIndex:
+        index = self._question_index
+        if (
+            index is None
+            or index.questions is not self._questions
+            or index.metrics is not self._metrics
+        ):
+            index = QuestionIndex(self._questions, self._metrics)
+            self._question_index = index
+        return index
+
+    def get_random_quiz_questions(
+        self, number_of_questions: int, rng: Optional[random.Random] = None
+    ) -> list[Question]:
         """Returns a list of random questions for a quiz.
 
         :param number_of_questions: Number of random questions to return.
+        :param rng: Random number generator to use (default is the random module).
         :return: List of random questions.
         """
         if number_of_questions > len(self._questions):
@@ -489,7 +854,117 @@ class QuestionBank(IQuestionBank, ABC):
                 len(self._questions),
             )
             number_of_questions = len(self._questions)
-        return random.sample(self._questions, number_of_questions)
+        return (rng or random).sample(self._questions, number_of_questions)
+
+    def get_category_quotas(self, number_of_questions: int) -> dict[str, int]:
+        """Returns the number of questions to draw from each category.
+
+        The quotas follow the categories file. When the requested number of questions differs
+        from the blueprint total, the quotas are scaled using the largest remainder method.
+
+        :param number_of_questions: Total number of questions to distribute.
+        :return: Dictionary of category id to number of questions.
+        """
+        quotas = {
+            category.category_id: category.max_questions
+            for category in self._categories
+            if category.max_questions > 0 and category.category_id in self._category_index
+        }
+        total = sum(quotas.values())
+        if total == 0 or number_of_questions == total:
+            return quotas
+        scaled = {cid: quota * number_of_questions / total for cid, quota in quotas.items()}
+        result = {cid: int(value) for cid, value in scaled.items()}
+        remaining = number_of_questions - sum(result.values())
+        by_remainder = sorted(scaled, key=lambda cid: scaled[cid] - result[cid], reverse=True)
+        for cid in by_remainder[:remaining]:
+            result[cid] += 1
+        return result
+
+    def _fit_category_quotas(self, quotas: dict[str, int]) -> dict[str, int]:
+        """Clamp the quotas to the number of questions of each category.
+
+        The questions missing from the clamped categories are given to the categories with
+        spare questions, in proportion to their blueprint quotas using the largest remainder
+        method.
+
+        :param quotas: Number of questions to draw from each category.
+        :return: Dictionary of category id to number of questions, at most the category size.
+        """
+        sizes = {cid: len(self._category_index[cid]) for cid in quotas}
+        result = {cid: min(quota, sizes[cid]) for cid, quota in quotas.items()}
+        for cid, quota in quotas.items():
+            if quota > sizes[cid]:
+                logger.warning(
+                    "Category %s has %d questions, fewer than its quota %d",
+                    cid,
+                    sizes[cid],
+                    quota,
+                )
+        shortfall = sum(quotas.values()) - sum(result.values())
+        while shortfall > 0:
+            spare = {cid: sizes[cid] - result[cid] for cid in result if sizes[cid] > result[cid]}
+            if not spare:
+                break
+            weights = {cid: self._categories_by_id[cid].max_questions for cid in spare}
+            total = sum(weights.values())
+            scaled = {cid: shortfall * weight / total for cid, weight in weights.items()}
+            extra = {cid: min(int(scaled[cid]), spare[cid]) for cid in spare}
+            by_remainder = sorted(
+                spare, key=lambda cid: scaled[cid] - int(scaled[cid]), reverse=True
+            )
+            for cid in by_remainder:
+                if sum(extra.values()) >= shortfall:
+                    break
+                if extra[cid] < spare[cid]:
+                    extra[cid] += 1
+            for cid, count in extra.items():
+                result[cid] += count
+            shortfall -= sum(extra.values())
+        return result
+
+    def get_fitted_category_quotas(self, number_of_questions: int) -> dict[str, int]:
+        """Returns the number of questions to draw from each category, at most its size.
+
+        These are the quotas of get_category_quotas, with the questions missing from the
+        categories smaller than their quota given to the other categories.
+
+        :param number_of_questions: Total number of questions to distribute.
+        :return: Dictionary of category id to number of questions, empty if there are no quotas.
+        """
+        quotas = self.get_category_quotas(number_of_questions)
+        return self._fit_category_quotas(quotas) if quotas else {}
+
+    def get_blueprint_questions(
+        self, number_of_questions: int, rng: Optional[random.Random] = None
+    ) -> list[Question]:
+        """Returns a list of random questions distributed per the category quotas.
+
+        Each category quota is drawn from the category index, so no rejection sampling over the
+        whole bank is needed. Falls back to uniform sampling if the bank has no quotas.
+
+        :param number_of_questions: Number of random questions to return.
+        :param rng: Random number generator to use (default is None, an unseeded generator).
+        :return: List of random questions, in random order.
+        """
+        quotas = self.get_fitted_category_quotas(number_of_questions)
+        if not quotas:
+            logger.warning("No category quotas found, using uniform sampling")
+            return self.get_random_quiz_questions(number_of_questions, rng)
+        rng = rng or random.Random()
+        questions: list[Question] = []
+        for category_id, quota in quotas.items():
+            indices = self._category_index[category_id]
+            questions.extend(self._questions[i] for i in rng.sample(indices, quota))
+        if len(questions) < number_of_questions:
+            logger.warning(
+                "The blueprint categories have %d questions, fewer than the %d requested",
+                len(questions),
+                number_of_questions,
+            )
+        # the questions are drawn category by category, mix them
+        rng.shuffle(questions)
+        return questions
 
     def get_marked_questions_filepath(self) -> str:
         """Returns the filepath of the marked questions."""
@@ -512,6 +987,8 @@ class QuestionBankFactory:
         categories_filepath: Path | None = None,
         marked_questions_filepath: Path | None = None,
         metrics_filepath: Path | None = None,
+        language: QuestionLanguage = QuestionLanguage.EN,
+        progress_store_filepath: Path | None = None,
     ) -> IQuestionBank:
         """Returns a question bank based on the country code."""
         if country == CountryCode.CANADA:
@@ -524,5 +1001,115 @@ class QuestionBankFactory:
                 categories_filepath=categories_filepath,
                 marked_questions_filepath=marked_questions_filepath,
                 metrics_filepath=metrics_filepath,
+                language=language,
+                progress_store_filepath=progress_store_filepath,
             )
         raise ValueError(f"Country {country} not supported")
+
+    @staticmethod
+    def read_questions(
+        country: CountryCode,
+        filepath: Path,
+        language: QuestionLanguage,
+        question_numbers: Iterable[QuestionNumber],
+    ) -> list[Question]:
+        """Read the questions of the question numbers from the question bank file, without
+        loading the question bank. The questions have no category or metric."""
+        if country == CountryCode.CANADA:
+            from hrt.question_banks.ca_question_bank import read_questions
+
+            return read_questions(filepath, language, set(question_numbers))
+        raise ValueError(f"Country {country} not supported")
+
+
+class QuestionBankRegistry:
+    """Process-wide registry of loaded question banks.
+
+    Banks are cached by country, exam type, display mode, language and the fingerprint (path,
+    size and modification time) of their input files, so each bank is loaded once per process
+    until one of its files changes. Banks whose input files cannot be stat'ed are loaded
+    without caching.
+    """
+
+    _banks: dict[tuple, "Future[IQuestionBank]"] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_fingerprint(*filepaths: Optional[Path]) -> Optional[tuple]:
+        """Returns the fingerprint of the files, or None if a file cannot be stat'ed."""
+        fingerprint: list[Optional[tuple]] = []
+        for filepath in filepaths:
+            if filepath is None:
+                fingerprint.append(None)
+                continue
+            try:
+                stat = os.stat(filepath)
+            except OSError:
+                return None
+            fingerprint.append((str(filepath), stat.st_size, stat.st_mtime_ns))
+        return tuple(fingerprint)
+
+    @classmethod
+    def get_question_bank(
+        cls,
+        country: CountryCode,
+        exam_type: ExamType,
+        filepath: Path,
+        display_mode: QuestionDisplayMode = QuestionDisplayMode.PRINT,
+        categories_filepath: Path | None = None,
+        marked_questions_filepath: Path | None = None,
+        metrics_filepath: Path | None = None,
+        language: QuestionLanguage = QuestionLanguage.EN,
+        progress_store_filepath: Path | None = None,
+    ) -> IQuestionBank:
+        """Returns the question bank, loading it if it is not in the registry.
+
+        Concurrent requests for the same bank wait for a single load.
+        """
+        args = (
+            country,
+            exam_type,
+            filepath,
+            display_mode,
+            categories_filepath,
+            marked_questions_filepath,
+            metrics_filepath,
+            language,
+            progress_store_filepath,
+        )
+        fingerprint = cls.get_fingerprint(
+            filepath,
+            categories_filepath,
+            marked_questions_filepath,
+            metrics_filepath,
+            progress_store_filepath,
+        )
+        if fingerprint is None:
+            return QuestionBankFactory.get_question_bank(*args)
+
+        bank_key = (country, exam_type, display_mode, language)
+        key = (*bank_key, fingerprint)
+        with cls._lock:
+            future = cls._banks.get(key)
+            is_loader = future is None
+            if future is None:
+                for stale_key in [k for k in cls._banks if k[:-1] == bank_key]:
+                    del cls._banks[stale_key]
+                future = Future()
+                cls._banks[key] = future
+        if is_loader:
+            try:
+                future.set_result(QuestionBankFactory.get_question_bank(*args))
+            except Exception as e:
+                with cls._lock:
+                    cls._banks.pop(key, None)
+                future.set_exception(e)
+        else:
+            logger.info("Using loaded question bank for %s %s", country, exam_type)
+        return future.result()
+
+    @classmethod
+    def clear(cls) -> None:
+        """Remove all the question banks from the registry."""
+        with cls._lock:
+            cls._banks.clear()
@@ -0,0 +1,385 @@
+"""
+This module contains the QuestionQuery class which selects questions from a question bank.
+Questions are selected using bitmap indexes, where bit i of a bitmap is set when the question
+at index i in the question bank matches. Filters compose lazily and are only resolved, using
+bitwise operations, when the questions are requested.
+"""
+
+import heapq
+import random
+from array import array
+from bisect import bisect_left
+from typing import Callable, Iterable, Optional, Sequence
+
+from hrt.common.alias_sampler import AliasSampler
+from hrt.common.enums import TopQuestionsListingType
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.question import Question
+from hrt.common.question_metric import QuestionMetric
+
+METRIC_FIELDS: tuple[str, ...] = ("correct_attempts", "wrong_attempts", "skip_count")
+
+
+def bitmap_from_indices(indices: Iterable[int], size: int) -> int:
+    """Build a bitmap from the given question indices.
+    :param indices: Indices of the questions to set.
+    :param size: Number of questions in the question bank.
+    :return: Bitmap with the bits of the given indices set.
+    """
+    buffer = bytearray((size >> 3) + 1)
+    for index in indices:
+        buffer[index >> 3] |= 1 << (index & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def indices_from_bitmap(bitmap: int) -> list[int]:
+    """Returns the indices of the bits set in the bitmap, in ascending order."""
+    bits = bin(bitmap)[:1:-1]
+    return [index for index, bit in enumerate(bits) if bit == "1"]
+
+
+class MetricColumns:
+    """Question metrics held in array-backed columns.
+
+    Each metric field is a column indexed by question index, with a permutation of the indices
+    of the questions with metrics sorted by the column value. Threshold queries resolve with a
+    bisect on the sorted values and a slice of the permutation.
+    """
+
+    def __init__(self, questions: list[Question], metrics: dict[QuestionNumber, QuestionMetric]):
+        self._columns = {field: array("l", [0]) * len(questions) for field in METRIC_FIELDS}
+        positions = []
+        for index, question in enumerate(questions):
+            metric = metrics.get(question.question_number)
+            if metric is None:
+                continue
+            positions.append(index)
+            for field, column in self._columns.items():
+                column[index] = getattr(metric, field)
+        self._positions = array("l", positions)
+        self._permutations: dict[str, array] = {}
+        self._sorted_values: dict[str, array] = {}
+        for field, column in self._columns.items():
+            permutation = array("l", sorted(positions, key=column.__getitem__))
+            self._permutations[field] = permutation
+            self._sorted_values[field] = array("l", (column[i] for i in permutation))
+
+    @property
+    def positions(self) -> array:
+        """Indices of the questions with metrics, in question bank order."""
+        return self._positions
+
+    def column(self, field: str) -> array:
+        """Column of the metric field, indexed by question index."""
+        if field not in self._columns:
+            raise ValueError(f"Invalid metric field: {field}")
+        return self._columns[field]
+
+    def at_least(self, field: str, threshold: int) -> array:
+        """Indices of the questions whose metric field is at least the threshold.
+        :param field: Metric field, one of correct_attempts, wrong_attempts or skip_count.
+        :param threshold: Minimum value of the metric field.
+        :return: Question indices ordered by the metric field value.
+        """
+        if field not in self._permutations:
+            raise ValueError(f"Invalid metric field: {field}")
+        start = bisect_left(self._sorted_values[field], threshold)
+        return self._permutations[field][start:]
+
+
+def choice_length_spread(question: Question) -> float:
+    """Difference between the longest and the shortest choice."""
+    lengths = [len(choice) for choice in question.choices]
+    return float(max(lengths) - min(lengths)) if lengths else 0.0
+
+
+def correct_choice_length_ratio(question: Question) -> float:
+    """Length of the correct choice relative to the average length of the other choices."""
+    others = [len(choice) for choice in question.choices if choice != question.answer]
+    average = sum(others) / len(others) if others else 0
+    return len(question.answer) / average if average else 0.0
+
+
+QUESTION_FEATURES: dict[TopQuestionsListingType, Callable[[Question], float]] = {
+    TopQuestionsListingType.LONGEST_QUESTION_TEXT: lambda question: len(question.question_text),
+    TopQuestionsListingType.LONGEST_CORRECT_CHOICE: lambda question: len(question.answer),
+    TopQuestionsListingType.CHOICE_LENGTH_SPREAD: choice_length_spread,
+    TopQuestionsListingType.CORRECT_CHOICE_LENGTH_RATIO: correct_choice_length_ratio,
+}
+
+
+class FeatureColumns:
+    """Numeric features of the questions, held in columns indexed by question index.
+
+    Each column is computed once, on first use. Top-N queries select from the column with a
+    heap, without sorting the whole question bank.
+    """
+
+    def __init__(self, questions: list[Question], metric_columns: MetricColumns):
+        self._questions = questions
+        self._metric_columns = metric_columns
+        self._columns: dict[TopQuestionsListingType, array] = {}
+
+    def column(self, criteria: TopQuestionsListingType) -> array:
+        """Feature column of the criteria, indexed by question index."""
+        if criteria not in self._columns:
+            self._columns[criteria] = self._compute_column(criteria)
+        return self._columns[criteria]
+
+    def _compute_column(self, criteria: TopQuestionsListingType) -> array:
+        feature = QUESTION_FEATURES.get(criteria)
+        if feature:
+            return array("d", (feature(question) for question in self._questions))
+        correct = self._metric_columns.column("correct_attempts")
+        wrong = self._metric_columns.column("wrong_attempts")
+        skipped = self._metric_columns.column("skip_count")
+        if criteria == TopQuestionsListingType.WRONG_ATTEMPT_RATE:
+            return array(
+                "d", (w / (c + w) if c + w else 0.0 for c, w in zip(correct, wrong, strict=True))
+            )
+        if criteria == TopQuestionsListingType.SKIP_RATE:
+            return array(
+                "d",
+                (
+                    s / (c + w + s) if c + w + s else 0.0
+                    for c, w, s in zip(correct, wrong, skipped, strict=True)
+                ),
+            )
+        raise ValueError(f"Criteria {criteria} not found")
+
+    def top(self, criteria: TopQuestionsListingType, max_questions: int) -> list[int]:
+        """Indices of the questions with the largest feature values.
+
+        Questions with a zero feature value are not ranked. Ties keep the question bank order.
+        :param criteria: Feature to rank the questions by.
+        :param max_questions: Number of questions to return.
+        :return: Question indices, largest feature value first.
+        """
+        column = self.column(criteria)
+        candidates = (index for index, value in enumerate(column) if value > 0)
+        return heapq.nlargest(max_questions, candidates, key=column.__getitem__)
+
+
+class QuestionIndex:
+    """Bitmap indexes over the questions of a question bank.
+
+    The indexes are built lazily and cached, so they reflect the marked status and metrics of
+    the questions at the time they were first used.
+    """
+
+    def __init__(self, questions: list[Question], metrics: dict[QuestionNumber, QuestionMetric]):
+        self._questions = questions
+        self._metrics = metrics
+        self._all = (1 << len(questions)) - 1
+        self._positions: dict[QuestionNumber, int] = {
+            question.question_number: index for index, question in enumerate(questions)
+        }
+        self._metric_columns: Optional[MetricColumns] = None
+        self._feature_columns: Optional[FeatureColumns] = None
+        self._marked: Optional[int] = None
+        self._with_metrics: Optional[int] = None
+        self._categories: Optional[dict[str, int]] = None
+        self._thresholds: dict[tuple[str, int], int] = {}
+
+    @property
+    def questions(self) -> list[Question]:
+        """Questions covered by the index."""
+        return self._questions
+
+    @property
+    def metrics(self) -> dict[QuestionNumber, QuestionMetric]:
+        """Metrics covered by the index."""
+        return self._metrics
+
+    @property
+    def all(self) -> int:
+        """Bitmap of all the questions."""
+        return self._all
+
+    @property
+    def metric_columns(self) -> MetricColumns:
+        """Array-backed metric columns of the questions."""
+        if self._metric_columns is None:
+            self._metric_columns = MetricColumns(self._questions, self._metrics)
+        return self._metric_columns
+
+    @property
+    def feature_columns(self) -> FeatureColumns:
+        """Numeric feature columns of the questions."""
+        if self._feature_columns is None:
+            self._feature_columns = FeatureColumns(self._questions, self.metric_columns)
+        return self._feature_columns
+
+    def position(self, question_number: QuestionNumber) -> Optional[int]:
+        """Returns the index of the question with the given number."""
+        return self._positions.get(question_number)
+
+    def marked(self) -> int:
+        """Bitmap of the marked questions."""
+        if self._marked is None:
+            self._marked = bitmap_from_indices(
+                (i for i, question in enumerate(self._questions) if question.is_marked),
+                len(self._questions),
+            )
+        return self._marked
+
+    def with_metrics(self) -> int:
+        """Bitmap of the questions with recorded metrics."""
+        if self._with_metrics is None:
+            self._with_metrics = bitmap_from_indices(
+                self.metric_columns.positions, len(self._questions)
+            )
+        return self._with_metrics
+
+    def category(self, category_id: str) -> int:
+        """Bitmap of the questions in the given category."""
+        if self._categories is None:
+            categories: dict[str, list[int]] = {}
+            for i, question in enumerate(self._questions):
+                if question.category is not None:
+                    categories.setdefault(question.category.category_id, []).append(i)
+            self._categories = {
+                cid: bitmap_from_indices(indices, len(self._questions))
+                for cid, indices in categories.items()
+            }
+        return self._categories.get(category_id, 0)
+
+    def metric_at_least(self, field: str, threshold: int) -> int:
+        """Bitmap of the questions whose metric field is at least the threshold."""
+        key = (field, threshold)
+        if key not in self._thresholds:
+            self._thresholds[key] = bitmap_from_indices(
+                self.metric_columns.at_least(field, threshold), len(self._questions)
+            )
+        return self._thresholds[key]
+
+    def numbers(self, question_numbers: Iterable[QuestionNumber]) -> int:
+        """Bitmap of the questions with the given numbers, unknown numbers are ignored."""
+        positions = (self._positions.get(qn) for qn in question_numbers)
+        return bitmap_from_indices((p for p in positions if p is not None), len(self._questions))
+
+
+class QuestionQuery:
+    """Composable, lazily resolved question query.
+
+    Queries are combined with ``&`` (and), ``|`` (or), ``-`` (and not) and ``~`` (not).
+    Filter methods return a new query matching this query and the filter.
+    """
+
+    def __init__(self, index: QuestionIndex, resolver: Optional[Callable[[], int]] = None):
+        self._index = index
+        self._resolver: Callable[[], int] = resolver if resolver else lambda: index.all
+
+    def _combine(self, resolver: Callable[[], int]) -> "QuestionQuery":
+        return QuestionQuery(self._index, resolver)
+
+    def _filter(self, resolver: Callable[[], int]) -> "QuestionQuery":
+        return self._combine(lambda: self.resolve() & resolver())
+
+    def __and__(self, other: "QuestionQuery") -> "QuestionQuery":
+        return self._combine(lambda: self.resolve() & other.resolve())
+
+    def __or__(self, other: "QuestionQuery") -> "QuestionQuery":
+        return self._combine(lambda: self.resolve() | other.resolve())
+
+    def __sub__(self, other: "QuestionQuery") -> "QuestionQuery":
+        return self._combine(lambda: self.resolve() & ~other.resolve())
+
+    def __invert__(self) -> "QuestionQuery":
+        return self._combine(lambda: self._index.all & ~self.resolve())
+
+    def marked(self) -> "QuestionQuery":
+        """Questions that are marked."""
+        return self._filter(self._index.marked)
+
+    def unmarked(self) -> "QuestionQuery":
+        """Questions that are not marked."""
+        return self._filter(lambda: self._index.all & ~self._index.marked())
+
+    def in_categories(self, *category_ids: str) -> "QuestionQuery":
+        """Questions in any of the given categories."""
+
+        def resolver() -> int:
+            bitmap = 0
+            for category_id in category_ids:
+                bitmap |= self._index.category(category_id)
+            return bitmap
+
+        return self._filter(resolver)
+
+    def with_metrics(self) -> "QuestionQuery":
+        """Questions with recorded metrics."""
+        return self._filter(self._index.with_metrics)
+
+    def without_metrics(self) -> "QuestionQuery":
+        """Questions without recorded metrics."""
+        return self._filter(lambda: self._index.all & ~self._index.with_metrics())
+
+    def correct_at_least(self, count: int) -> "QuestionQuery":
+        """Questions answered correctly at least the given number of times."""
+        return self._filter(lambda: self._index.metric_at_least("correct_attempts", count))
+
+    def wrong_at_least(self, count: int) -> "QuestionQuery":
+        """Questions answered wrong at least the given number of times."""
+        return self._filter(lambda: self._index.metric_at_least("wrong_attempts", count))
+
+    def skipped_at_least(self, count: int) -> "QuestionQuery":
+        """Questions skipped at least the given number of times."""
+        return self._filter(lambda: self._index.metric_at_least("skip_count", count))
+
+    def including(self, question_numbers: Iterable[QuestionNumber]) -> "QuestionQuery":
+        """Questions with the given numbers."""
+        numbers = list(question_numbers)
+        return self._filter(lambda: self._index.numbers(numbers))
+
+    def excluding(self, question_numbers: Iterable[QuestionNumber]) -> "QuestionQuery":
+        """Questions without the given numbers."""
+        numbers = list(question_numbers)
+        return self._filter(lambda: self._index.all & ~self._index.numbers(numbers))
+
+    def resolve(self) -> int:
+        """Resolve the query to a bitmap of the matching questions."""
+        return self._resolver()
+
+    def count(self) -> int:
+        """Number of matching questions."""
+        return bin(self.resolve()).count("1")
+
+    def questions(self) -> list[Question]:
+        """Matching questions, in question bank order."""
+        questions = self._index.questions
+        return [questions[i] for i in indices_from_bitmap(self.resolve())]
+
+    def sample(
+        self, number_of_questions: int, rng: Optional[random.Random] = None
+    ) -> list[Question]:
+        """Random sample of the matching questions.
+        :param number_of_questions: Number of questions to return, limited to the matching count.
+        :param rng: Random number generator to use (default is the random module).
+        :return: List of random questions.
+        """
+        questions = self._index.questions
+        indices = indices_from_bitmap(self.resolve())
+        number_of_questions = min(number_of_questions, len(indices))
+        sampler = rng if rng else random
+        return [questions[i] for i in sampler.sample(indices, number_of_questions)]
+
+    def weighted_sample(
+        self,
+        number_of_questions: int,
+        weights: Sequence[float],
+        rng: Optional[random.Random] = None,
+    ) -> list[Question]:
+        """Weighted random sample of the matching questions, without replacement.
+        :param number_of_questions: Number of questions to return, limited to the matching
+            questions with a positive weight.
+        :param weights: Weight of each question, indexed by question index.
+        :param rng: Random number generator to use (default is the random module).
+        :return: List of random questions, in the order they were drawn.
+        """
+        questions = self._index.questions
+        indices = indices_from_bitmap(self.resolve())
+        if not any(weights[i] > 0 for i in indices):
+            return []
+        sampler = AliasSampler([weights[i] for i in indices])
+        return [questions[indices[slot]] for slot in sampler.sample(number_of_questions, rng)]
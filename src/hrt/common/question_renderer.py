@@ -0,0 +1,76 @@
+"""
+This module contains the templates used to render the questions as text.
+
+A template is compiled once per answer display, so the display options are resolved when the
+template is built rather than for each choice of each rendered question. The marked status and
+the metrics change while a quiz runs, they are printed after the rendered question. The
+questions do not keep their rendered text, a quiz caches the text of its own questions.
+"""
+
+from functools import lru_cache
+from typing import TYPE_CHECKING, Hashable, Optional
+
+from hrt.common.constants import ANSWER_DISPLAY_PREFIX
+from hrt.common.enums import QuestionAnswerDisplay
+from hrt.common.question_display import IQuestionDisplay
+
+if TYPE_CHECKING:
+    from hrt.common.question import Question  # pragma: no cover
+
+CHOICE_INDENT: str = " " * len(ANSWER_DISPLAY_PREFIX)
+
+
+def get_display_key(question_display: Optional[IQuestionDisplay]) -> Optional[Hashable]:
+    """Returns the key of the display configuration the rendered text depends on, its answer
+    display."""
+    if question_display is None:
+        return None
+    return question_display.answer_display
+
+
+class QuestionTemplate:
+    """Template rendering a question and its choices."""
+
+    def __init__(self, choice_prefix: str, answer_prefix: str, skip_choice: Optional[str] = None):
+        """Create the template.
+        :param choice_prefix: Prefix of the choices.
+        :param answer_prefix: Prefix of the correct choice.
+        :param skip_choice: Text of the choice added after the choices (default is None, none).
+        """
+        self._choice_prefix = choice_prefix
+        self._answer_prefix = answer_prefix
+        self._skip_choice = skip_choice
+
+    def render(self, question: "Question", choices: list[str], answer_index: int) -> str:
+        """Render the question with the choices in the given order.
+        :param question: Question to render.
+        :param choices: Choices of the question, in display order.
+        :param answer_index: Index of the answer in the choices.
+        :return: Rendered question text.
+        """
+        lines = [f"{question.question_number}: {question.question_text}"]
+        lines.extend(
+            f"{self._answer_prefix if i == answer_index else self._choice_prefix}{i + 1}. {choice}"
+            for i, choice in enumerate(choices)
+        )
+        if self._skip_choice is not None:
+            lines.append(f"{self._choice_prefix}{len(choices) + 1}. {self._skip_choice}")
+        lines.append("")
+        return "\n".join(lines)
+
+
+@lru_cache(maxsize=None)
+def get_question_template(
+    display_key: Optional[Hashable], quiz: bool, skip_choice: str
+) -> QuestionTemplate:
+    """Returns the template compiled for the display configuration.
+    :param display_key: Key of the display configuration, as returned by get_display_key.
+    :param quiz: Whether the question is rendered for a quiz.
+    :param skip_choice: Text of the skip choice of the quiz questions.
+    :return: Question template.
+    """
+    if quiz:
+        return QuestionTemplate("", "", skip_choice)
+    if display_key == QuestionAnswerDisplay.WITH_QUESTION:
+        return QuestionTemplate(CHOICE_INDENT, ANSWER_DISPLAY_PREFIX)
+    return QuestionTemplate(CHOICE_INDENT, CHOICE_INDENT)
@@ -0,0 +1,139 @@
+"""
+This module computes summary statistics of a question bank in a single pass over its questions.
+
+The per-question values are collected into columns (arrays indexed by question) and every
+statistic of the report is aggregated from those columns, so the report can be rendered as text
+or exported as JSON.
+"""
+
+from array import array
+from collections import Counter
+from typing import Any, Sequence
+
+from hrt.common import utils
+from hrt.common.question_bank import IQuestionBank
+
+
+def summarize_lengths(lengths: Sequence[int]) -> dict[str, Any]:
+    """Summarize a column of lengths.
+    :param lengths: Lengths column.
+    :return: Dictionary with the count, min, max, mean, median and 90th percentile.
+    """
+    if not lengths:
+        return {"count": 0, "min": 0, "max": 0, "mean": 0.0, "median": 0, "p90": 0}
+    ordered = sorted(lengths)
+    count = len(ordered)
+    return {
+        "count": count,
+        "min": ordered[0],
+        "max": ordered[-1],
+        "mean": round(sum(ordered) / count, 2),
+        "median": ordered[(count - 1) // 2],
+        "p90": ordered[min(count - 1, (count * 9) // 10)],
+    }
+
+
+def get_ratio(count: int, total: int) -> float:
+    """Returns the count as a ratio of the total, rounded to 4 digits."""
+    return round(count / total, 4) if total else 0.0
+
+
+def get_question_bank_stats(question_bank: IQuestionBank) -> dict[str, Any]:
+    """Compute the statistics of the question bank in a single pass over its questions.
+    :param question_bank: Loaded question bank.
+    :return: JSON compatible dictionary of statistics.
+    """
+    questions = question_bank.questions
+    question_lengths = array("l")
+    choice_lengths = array("l")
+    category_counts: Counter = Counter()
+    answer_counts: Counter = Counter()
+    correct_longest = 0
+    with_metrics = 0
+    attempts = {"correct_attempts": 0, "wrong_attempts": 0, "skip_count": 0}
+    for question in questions:
+        question_lengths.append(len(question.question_text))
+        lengths = [len(choice) for choice in question.choices]
+        choice_lengths.extend(lengths)
+        answer_length = len(question.answer)
+        if lengths and answer_length == max(lengths) and lengths.count(answer_length) == 1:
+            correct_longest += 1
+        answer_counts[question.answer] += 1
+        if question.category is not None:
+            category_counts[question.category.category_id] += 1
+        metric = question.existing_metric
+        if metric.correct_attempts or metric.wrong_attempts or metric.skip_count:
+            with_metrics += 1
+            attempts["correct_attempts"] += metric.correct_attempts
+            attempts["wrong_attempts"] += metric.wrong_attempts
+            attempts["skip_count"] += metric.skip_count
+
+    total = len(questions)
+    duplicate_answers = {answer: count for answer, count in answer_counts.items() if count > 1}
+    categories = [
+        {
+            "id": category.category_id,
+            "name": category.name,
+            "quota": category.max_questions,
+            "count": category_counts.get(category.category_id, 0),
+        }
+        for category in question_bank.categories
+    ]
+    return {
+        "country": question_bank.country.code,
+        "exam_type": question_bank.exam_type.id,
+        "question_count": total,
+        "categories": categories,
+        "uncategorized": total - sum(category_counts.values()),
+        "question_length": summarize_lengths(question_lengths),
+        "choice_length": summarize_lengths(choice_lengths),
+        "correct_choice_longest": {
+            "count": correct_longest,
+            "ratio": get_ratio(correct_longest, total),
+        },
+        "duplicate_answers": {
+            "answers": len(duplicate_answers),
+            "questions": sum(duplicate_answers.values()),
+        },
+        "metrics": {
+            "questions": with_metrics,
+            "coverage": get_ratio(with_metrics, total),
+            **attempts,
+        },
+    }
+
+
+def format_question_bank_stats(stats: dict[str, Any]) -> list[str]:
+    """Format the statistics of a question bank as text lines.
+    :param stats: Statistics returned by get_question_bank_stats.
+    :return: List of text lines.
+    """
+    output = [utils.get_header(f"{stats['country']} {stats['exam_type']} statistics")]
+    output.append(f"Questions: {stats['question_count']}")
+    if stats["categories"]:
+        output.append("Categories (count/quota):")
+        for category in stats["categories"]:
+            output.append(
+                f"  {category['id']} {category['name']}: {category['count']}/{category['quota']}"
+            )
+        output.append(f"  Uncategorized: {stats['uncategorized']}")
+    for key, label in (("question_length", "Question length"), ("choice_length", "Choice length")):
+        lengths = stats[key]
+        output.append(
+            f"{label}: min {lengths['min']}, median {lengths['median']}, "
+            f"mean {lengths['mean']}, p90 {lengths['p90']}, max {lengths['max']}"
+        )
+    longest = stats["correct_choice_longest"]
+    output.append(f"Correct choice is the longest: {longest['count']} ({longest['ratio']:.1%})")
+    duplicates = stats["duplicate_answers"]
+    output.append(
+        f"Duplicate answers: {duplicates['answers']} answers "
+        f"shared by {duplicates['questions']} questions"
+    )
+    metrics = stats["metrics"]
+    output.append(
+        f"Metrics: {metrics['questions']} questions ({metrics['coverage']:.1%}), "
+        f"correct {metrics['correct_attempts']}, wrong {metrics['wrong_attempts']}, "
+        f"skipped {metrics['skip_count']}"
+    )
+    return output
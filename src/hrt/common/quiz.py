@@ -4,24 +4,30 @@ The Quiz class has the following attributes:
 - number_of_questions: The number of questions in the quiz
 - questions: A list of questions
 - exam_type: The type of exam
-- current_index: The index of the current question
-- submitted_questions: A dictionary of questions that have been submitted
-- mark_wrong_answers: A flag to mark wrong answers
+- session: The quiz session holding the current question, submitted questions, marks and skips
 - terminate_quiz: A flag to terminate the quiz
+- state: The state of the quiz loop
 - display_mode: The display mode of the quiz
 - start_time: The start time of the quiz
 - end_time: The end time of the quiz
 """
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 
 from hrt.common import utils
 from hrt.common.config_reader import logger
-from hrt.common.enums import CountryCode, ExamType, QuestionDisplayMode, QuizAnswerDisplay
-from hrt.common.question import Question
+from hrt.common.enums import (
+    CountryCode,
+    ExamType,
+    QuestionDisplayMode,
+    QuizAnswerDisplay,
+    QuizEventType,
+    QuizState,
+)
+from hrt.common.question import ChoiceOrder, Question
 from hrt.common.question_display import QuizQuestionDisplay
-from hrt.common.question_submitted import QuestionSubmitted
+from hrt.common.quiz_session import QuizSession
 
 if TYPE_CHECKING:
     from hrt.common.hrt_types import QuestionNumber  # pragma: no cover
@@ -42,6 +48,14 @@ class IQuiz(ABC):
     def start(self) -> None:
         """Start the quiz."""
 
+    @abstractmethod
+    def resume(self) -> None:
+        """Resume the quiz from the current state of its session."""
+
+    @abstractmethod
+    def get_session(self) -> QuizSession:
+        """Get the session of the quiz."""
+
     @abstractmethod
     def previous_question(self) -> None:
         """Move to the previous question."""
@@ -134,9 +148,23 @@ class IQuiz(ABC):
     def get_marked_questions(self) -> List[Question]:
         """Get the marked questions."""
 
+    @abstractmethod
+    def get_quiz_choices(self, question: Question) -> List[str]:
+        """Get the choices of the question in the quiz order, followed by the skip choice."""
+
+    @abstractmethod
+    def get_answer_index(self, question: Question) -> int:
+        """Get the index of the answer in the choices of the question in the quiz order."""
+
 
 class Quiz(IQuiz, ABC):
-    """Quiz class."""
+    """Quiz class, the interactive front end of a quiz session.
+
+    The quiz runs as a loop over explicit states. Each state handler prompts the user once and
+    sets the next state, and the actions selected by the user are dispatched from a table to the
+    methods which perform them and set the next state, so no action re-enters the loop. The
+    answers, marks and skips are applied to the session and the returned events are printed.
+    """
 
     # Common pass percentages for quizzes
     PASS_PERCENTAGE: int = 70
@@ -150,6 +178,7 @@ class Quiz(IQuiz, ABC):
         display_mode: QuestionDisplayMode,
         answer_display: QuizAnswerDisplay,
         quiz_config: Dict,
+        choice_order: Optional[ChoiceOrder] = None,
     ):
         if number_of_questions != len(questions):
             logger.warning(
@@ -159,11 +188,36 @@ class Quiz(IQuiz, ABC):
             )
         self._number_of_questions = len(questions)
         self._questions = questions
+        # draw the choice order of every question upfront, so it only depends on the seed
+        self._choice_order = choice_order if choice_order is not None else ChoiceOrder()
+        for question in questions:
+            self._choice_order.get(question)
+        self._session = QuizSession(
+            questions, self._choice_order, quiz_config["mark_wrong_answers"]
+        )
+        # rendered text of the questions, their choice order is fixed for the quiz
+        self._rendered: Dict[QuestionNumber, str] = {}
         self._exam_type = exam_type
-        self._current_index = 0
-        self._submitted_questions: Dict[QuestionNumber, QuestionSubmitted] = {}
-        self._mark_wrong_answers = quiz_config["mark_wrong_answers"]
         self._terminate_quiz = False
+        self._state = QuizState.QUESTION
+        self._choice_index = -1
+        self._state_handlers: Dict[QuizState, Callable[[], None]] = {
+            QuizState.QUESTION: self._show_question,
+            QuizState.CHOICE: self._read_choice,
+            QuizState.ACTION: self._read_choice_action,
+            QuizState.REVIEW: self._read_review_action,
+        }
+        self._action_handlers: Dict[str, Callable[[int], None]] = {
+            "P": lambda _: self.previous_question(),
+            "N": lambda _: self.next_question(),
+            "S": self.submit,
+            "M": self.mark,
+            "U": lambda _: self.unmark(),
+            "K": lambda _: self.skip(),
+            "Q": lambda _: self.quit(),
+            "F": lambda _: self.finish(),
+            "C": lambda _: self.change_answer(),
+        }
         self._display_mode = display_mode
         Question.question_display = QuizQuestionDisplay(
             answer_display,
@@ -182,202 +236,192 @@ class Quiz(IQuiz, ABC):
         if self._exam_type.country != country:
             raise ValueError("Invalid exam type for the country.")
 
-    def _display_question_and_get_action(self, skip_last: bool = False) -> None:
-        while not self._terminate_quiz:
-            if self._current_index >= self._number_of_questions:
-                print("No next question available.")
-                break
-            cq = self.get_current_question()
-            print(self.print_question(cq))
-            if skip_last:
-                _, _ = self.get_actions(submitted=True, skip_last=skip_last)
-                cq.skip_count += 1
-            elif cq.question_number in self._submitted_questions:
-                _, _ = self.get_actions(submitted=True)
-            else:
-                choice_index = utils.get_user_input_index(cq.quiz_choices, "Enter choice: ")
-                if (
-                    choice_index == len(cq.quiz_choices) - 1
-                    and self._current_index == self._number_of_questions - 1
-                ):
-                    cq = self.get_current_question()
-                    cq.skip_count += 1
-                    action_prompt, actions = self.get_actions(submitted=False, skip_last=True)
-                    print(action_prompt)
-                    action = utils.get_user_input_option(actions, "Please select an action: ")
-                    self.process_action(action, choice_index, actions)
-                    break
-                if choice_index == len(cq.quiz_choices) - 1:
-                    self.skip()
-                    continue
-                action_prompt, actions = self.get_actions(submitted=False)
-                print(action_prompt)
-                action = utils.get_user_input_option(actions, "Please select an action: ")
-                self.process_action(action, choice_index, actions)
-                break
-            if len(self._submitted_questions) == self._number_of_questions:
-                self._terminate_quiz = True
-                self.finish()
-                break
-            action_prompt, actions = self.get_actions(submitted=True)
-            print(action_prompt)
-            action = utils.get_user_input_option(actions, "Please select an action: ")
-            if action == "P" and self._current_index == 0:
-                print("No previous question available.")
-                break
-            self.process_action(action, -1, actions)
+    def get_session(self) -> QuizSession:
+        """Get the session of the quiz."""
+        return self._session
+
+    def get_state(self) -> QuizState:
+        """Get the state of the quiz loop."""
+        return self._state
+
+    def run(self) -> None:
+        """Run the quiz loop from the current state until the quiz is finished or quit."""
+        while self._state != QuizState.DONE and not self._terminate_quiz:
+            self._state_handlers[self._state]()
+
+    def _show_question(self) -> None:
+        if self._session.current_index >= self._number_of_questions:
+            print("No next question available.")
+            self._state = QuizState.DONE
+            return
+        cq = self.get_current_question()
+        print(self.print_question(cq))
+        if self._session.is_submitted(cq):
+            self._state = QuizState.REVIEW
+        else:
+            self._state = QuizState.CHOICE
+
+    def _read_choice(self) -> None:
+        choices = self.get_quiz_choices(self.get_current_question())
+        choice_index = utils.get_user_input_index(choices, "Enter choice: ")
+        if choice_index == len(choices) - 1:
+            self.skip()
+            return
+        self._choice_index = choice_index
+        self._state = QuizState.ACTION
+
+    def _read_choice_action(self) -> None:
+        action_prompt, actions = self.get_actions(submitted=False)
+        print(action_prompt)
+        action = utils.get_user_input_option(actions, "Please select an action: ")
+        self.process_action(action, self._choice_index, actions)
+
+    def _read_review_action(self) -> None:
+        if self._session.all_submitted:
+            self.finish()
+            return
+        action_prompt, actions = self.get_actions(submitted=True)
+        print(action_prompt)
+        action = utils.get_user_input_option(actions, "Please select an action: ")
+        self.process_action(action, -1, actions)
 
     def previous_question(self) -> None:
-        if self._current_index > 0:
-            self._current_index -= 1
+        if self._session.current_index > 0:
+            self._session.move(self._session.current_index - 1)
         else:
             print("No previous question available.")
+        self._state = QuizState.QUESTION
 
     def next_question(self) -> None:
-        if self._current_index < len(self._questions) - 1:
-            self._current_index += 1
+        if self._session.current_index < len(self._questions) - 1:
+            self._session.move(self._session.current_index + 1)
         else:
             print("No next question available.")
+        self._state = QuizState.QUESTION
 
-    def start(self) -> None:
-        """Start the quiz."""
+    def _print_header(self) -> None:
         print(
             utils.get_header(
                 f"\nQuiz: {self._exam_type.id} - "
                 f"{self._exam_type.country.code} - {len(self._questions)} Questions"
             )
         )
-        self._current_index = 0
+
+    def start(self) -> None:
+        """Start the quiz."""
+        self._print_header()
+        self._session.current_index = 0
+        self._state = QuizState.QUESTION
+        self._start_time = utils.get_current_time()
+        self.run()
+
+    def resume(self) -> None:
+        """Resume the quiz from the current question of its session."""
+        self._print_header()
+        print(
+            f"Resuming with {len(self._session.submitted)} of {self._number_of_questions} "
+            "questions submitted."
+        )
+        self._state = QuizState.DONE if self._session.is_finished else QuizState.QUESTION
         self._start_time = utils.get_current_time()
-        self._display_question_and_get_action()
+        self.run()
 
     def process_action(self, action: str, choice_index: int, actions: List[str]) -> None:
-        """Process the action selected by the user."""
+        """Process the action selected by the user.
+
+        The action sets the next state of the quiz loop, the current question is displayed again
+        unless the action selects another state.
+        """
         if action not in actions:
             print("Invalid action. Please select a valid action.")
             return
-        action_map = {
-            "P": self.previous_question,
-            "N": self.next_question,
-            "S": lambda: self.submit(choice_index),
-            "M": lambda: self.mark(choice_index),
-            "U": self.unmark,
-            "K": self.skip,
-            "Q": self.quit,
-            "F": self.finish,
-            "C": self.change_answer,
-        }
-        action_map[action]()
-        self._display_question_and_get_action()
+        self._state = QuizState.QUESTION
+        self._action_handlers[action](choice_index)
 
     def submit(self, choice_index: int) -> None:
         cq = self.get_current_question()
-        if cq.question_number in self._submitted_questions:
+        if self._session.is_submitted(cq):
             return
         if choice_index == -1:
             logger.info("No choice selected.")
             return
-        is_correct = choice_index == cq.quiz_choices.index(cq.answer)
-        if is_correct:
-            cq.correct_attempts += 1
-            if (
-                cq.question_display
-                and cq.question_display.answer_display == QuizAnswerDisplay.AFTER_QUESTION
-            ):
+        event = self._session.answer(choice_index)
+        if event.event_type == QuizEventType.SKIPPED:
+            self._move_after_skip()
+            return
+        if cq.question_display and cq.question_display.answer_display == (
+            QuizAnswerDisplay.AFTER_QUESTION
+        ):
+            if event.is_correct:
                 char = "\033[92m✓✓\033[0m"  # Two green checks
                 print(f"{char}")
-        else:
-            cq.wrong_attempts += 1
-            if (
-                cq.question_display
-                and cq.question_display.answer_display == QuizAnswerDisplay.AFTER_QUESTION
-            ):
+            else:
                 char = "\033[91m✗✗\033[0m"  # Two red cross-marks
-                print(f"{char}\nCorrect Answer: ({cq.answer_index + 1}) {cq.answer}")
-        self._submitted_questions[cq.question_number] = QuestionSubmitted(
-            cq.question_number, cq.quiz_choices[choice_index]
-        )
-        if not is_correct and self._mark_wrong_answers:
-            cq.is_marked = True
+                print(f"{char}\nCorrect Answer: ({event.answer_index + 1}) {cq.answer}")
         print(self.get_progress() + "\n")
-        if len(self._submitted_questions) == self._number_of_questions:
+        if self._session.all_submitted:
             self.finish()
         else:
             self.next_question()
 
     def mark(self, choice_index: int) -> None:
-        current_question = self.get_current_question()
-        if not current_question.is_marked:
-            current_question.is_marked = True
-            print(f"Question {current_question.question_number} marked.")
+        event = self._session.mark()
+        if event.changed:
+            print(f"Question {event.question_number} marked.")
         else:
-            print(f"Question {current_question.question_number} is already marked.")
+            print(f"Question {event.question_number} is already marked.")
         if choice_index == -1:
             logger.info("No choice selected.")
             return
-        if current_question.quiz_choices[choice_index] == Question.SKIP_CHOICE:
-            self.skip()
         self.submit(choice_index)
 
     def unmark(self) -> None:
-        current_question = self.get_current_question()
-        if current_question.is_marked:
-            current_question.is_marked = False
-            print(f"Question {current_question.question_number} unmarked.")
+        event = self._session.unmark()
+        if event.changed:
+            print(f"Question {event.question_number} unmarked.")
         else:
-            print(f"Question {current_question.question_number} is not marked.")
+            print(f"Question {event.question_number} is not marked.")
 
     def skip(self) -> None:
-        current_question = self.get_current_question()
-        if current_question.question_number in self._submitted_questions:
+        if self._session.is_submitted(self.get_current_question()):
             return
-        current_question.skip_count += 1
-        if self._current_index == self._number_of_questions - 1:
-            self._display_question_and_get_action(skip_last=True)
+        self._session.skip()
+        self._move_after_skip()
+
+    def _move_after_skip(self) -> None:
+        if self._session.current_index == self._number_of_questions - 1:
+            self._state = QuizState.REVIEW
         else:
             self.next_question()
 
     def quit(self) -> None:
         self._end_time = utils.get_current_time()
         self._terminate_quiz = True
+        self._state = QuizState.DONE
 
     def finish(self) -> None:
         if not self._terminate_quiz:  # Check if the quiz is already terminated
-            if len(self._submitted_questions) < self._number_of_questions:
-                not_submitted = [
-                    q.question_number
-                    for q in self._questions
-                    if q.question_number not in self._submitted_questions
-                ]
-                print(f"Warning: {len(not_submitted)} questions are not submitted.")
+            if not self._session.all_submitted:
+                not_submitted = self._number_of_questions - len(self._session.submitted)
+                print(f"Warning: {not_submitted} questions are not submitted.")
                 confirm = utils.get_user_input_option(
                     ["Y", "N"], "Do you really want to finish the quiz? (Y/N): "
                 )
                 if confirm == "N":
                     self._terminate_quiz = False
-                    self._display_question_and_get_action()
+                    self._state = QuizState.QUESTION
                     return
-                for q in not_submitted:
-                    self._submitted_questions[q] = QuestionSubmitted(q, Question.SKIP_CHOICE)
+            self._session.finish()
             print("Quiz completed.")
             self._end_time = utils.get_current_time()
             self.quit()
 
     def change_answer(self) -> None:
-        current_question = self.get_current_question()
-        if current_question.question_number in self._submitted_questions:
+        if self._session.is_submitted(self.get_current_question()):
             print("Cannot change answer for a submitted question.")
+            self._state = QuizState.REVIEW
             return
-        choice_index = utils.get_user_input_index(
-            current_question.quiz_choices, "Enter new choice: "
-        )
-        skip_last = False
-        if choice_index == len(current_question.quiz_choices) - 1:
-            skip_last = True
-        action_prompt, actions = self.get_actions(submitted=False, skip_last=skip_last)
-        print(action_prompt)
-        action = utils.get_user_input_option(actions, "Please select an action: ")
-        self.process_action(action, choice_index, actions)
+        self._state = QuizState.CHOICE
 
     def get_number_of_questions(self) -> int:
         return self._number_of_questions
@@ -393,13 +437,13 @@ class Quiz(IQuiz, ABC):
         return self._questions
 
     def get_current_question(self) -> Question:
-        return self._questions[self._current_index]
+        return self._session.current_question
 
     def get_current_index(self) -> int:
-        return self._current_index
+        return self._session.current_index
 
     def set_current_index(self, index: int) -> None:
-        self._current_index = index
+        self._session.current_index = index
 
     def get_question_by_index(self, index: int) -> Question:
         if 0 <= index < self._number_of_questions:
@@ -415,24 +459,27 @@ class Quiz(IQuiz, ABC):
 
     def print_question(self, question: Question) -> str:
         """Print the question."""
-        question_text = question.format_quiz_question()
+        question_text = self._rendered.get(question.question_number)
+        if question_text is None:
+            question_text = question.format_quiz_question(self._choice_order.get(question))
+            self._rendered[question.question_number] = question_text
         progress_text = self.get_progress()
         if (
-            question.is_marked
+            self._session.is_marked(question)
             and question.question_display
             and question.question_display.show_marked_status
         ):
-            question_text += f"Marked: {'Yes' if question.is_marked else 'No'}\n"
+            question_text += "Marked: Yes\n"
         question_text += f"\n{progress_text}"
         return question_text
 
     def get_actions(self, submitted: bool, skip_last: bool = False) -> Tuple[str, List[str]]:
         """Get the actions for the current question."""
         if submitted:
-            if self._current_index == 0:
+            if self._session.current_index == 0:
                 action_prompt = "Actions: [N]ext, [Q]uit"
                 actions = ["N", "Q"]
-            elif self._current_index == self._number_of_questions - 1:
+            elif self._session.current_index == self._number_of_questions - 1:
                 action_prompt = "Actions: [P]revious, [Q]uit, [F]inish"
                 actions = ["P", "Q", "F"]
             else:
@@ -440,7 +487,7 @@ class Quiz(IQuiz, ABC):
                 actions = ["P", "N", "Q", "F"]
         else:
             cq = self.get_current_question()
-            if cq.is_marked:
+            if self._session.is_marked(cq):
                 action_prompt = "Actions: [S]ubmit, [M]ark, [U]nmark, [C]hange, [K]skip, [Q]uit"
                 actions = ["S", "M", "U", "C", "K", "Q"]
             else:
@@ -456,16 +503,16 @@ class Quiz(IQuiz, ABC):
         correct = 0
         wrong = 0
         skipped = 0
-        for q in self._questions:
-            correct += q.correct_attempts
-            wrong += q.wrong_attempts
-            skipped += q.skip_count
+        for metric in self._session.metrics.values():
+            correct += metric.correct_attempts
+            wrong += metric.wrong_attempts
+            skipped += metric.skip_count
 
         return correct, wrong, skipped
 
     def get_progress(self) -> str:
         """Get the progress of the quiz."""
-        current = self._current_index + 1
+        current = self._session.current_index + 1
         total = self._number_of_questions
         return f"Progress: {current}/{total}"
 
@@ -477,7 +524,24 @@ class Quiz(IQuiz, ABC):
         return duration
 
     def get_marked_questions(self) -> List[Question]:
-        return [q for q in self._questions if q.is_marked]
+        return [q for q in self._questions if self._session.is_marked(q)]
+
+    def apply_session(self) -> None:
+        """Apply the answers, skips and marks of the session to the questions, when the quiz is
+        saved."""
+        for question in self._questions:
+            metric = self._session.metrics.get(question.question_number)
+            if metric is not None:
+                question.correct_attempts += metric.correct_attempts
+                question.wrong_attempts += metric.wrong_attempts
+                question.skip_count += metric.skip_count
+            question.is_marked = self._session.is_marked(question)
+
+    def get_quiz_choices(self, question: Question) -> List[str]:
+        return self._session.get_choices(question)
+
+    def get_answer_index(self, question: Question) -> int:
+        return self._session.get_answer_index(question)
 
     def post_process(self) -> None:
         """Common post-processing for all quiz types.
@@ -508,6 +572,19 @@ class Quiz(IQuiz, ABC):
 class QuizFactory:
     """Factory class to create quizzes."""
 
+    @staticmethod
+    def get_quiz_class(exam_type: ExamType) -> type[Quiz]:
+        """Get the quiz class of the country of the exam type."""
+        if exam_type.country == CountryCode.CANADA:
+            from hrt.question_banks.ca_quiz import CAQuiz
+
+            return CAQuiz
+        if exam_type.country == CountryCode.UNITED_STATES:
+            from hrt.question_banks.us_quiz import USQuiz
+
+            return USQuiz
+        raise ValueError(f"Unsupported exam type: {exam_type}")
+
     @staticmethod
     def get_quiz(
         number_of_questions: int,
@@ -516,28 +593,15 @@ class QuizFactory:
         display_mode: QuestionDisplayMode,
         answer_display: QuizAnswerDisplay,
         quiz_config: Dict,
+        choice_order: Optional[ChoiceOrder] = None,
     ) -> Quiz:
         """Get a quiz."""
-        if exam_type.country == CountryCode.CANADA:
-            from hrt.question_banks.ca_quiz import CAQuiz
-
-            return CAQuiz(
-                number_of_questions,
-                questions,
-                exam_type,
-                display_mode,
-                answer_display,
-                quiz_config,
-            )
-        if exam_type.country == CountryCode.UNITED_STATES:
-            from hrt.question_banks.us_quiz import USQuiz
-
-            return USQuiz(
-                number_of_questions,
-                questions,
-                exam_type,
-                display_mode,
-                answer_display,
-                quiz_config,
-            )
-        raise ValueError(f"Unsupported exam type: {exam_type}")
+        return QuizFactory.get_quiz_class(exam_type)(
+            number_of_questions,
+            questions,
+            exam_type,
+            display_mode,
+            answer_display,
+            quiz_config,
+            choice_order,
+        )
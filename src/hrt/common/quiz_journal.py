@@ -0,0 +1,230 @@
+"""
+This module contains the QuizJournal class, an append-only journal of the events of a quiz.
+
+The journal is a JSON lines file. The first line describes the quiz (exam type, questions and
+choice orders), the following lines are the events of the session: answers, skips, marks and
+moves between questions. Each event is appended and flushed as it happens, and the file is synced
+to disk at most every JOURNAL_SYNC_INTERVAL seconds, so an interrupted quiz can be rebuilt by
+replaying its events.
+
+A checkpoint line is appended when the progress of the quiz is saved. The metrics to save are
+folded from the events after the last checkpoint, so a resumed quiz does not count the answers
+saved before it was interrupted twice.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from hrt.common import constants
+from hrt.common.config_reader import logger
+from hrt.common.enums import QuizEventType
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.question_metric import QuestionMetric
+from hrt.common.quiz_session import QuizEvent, QuizSession
+
+JOURNAL_VERSION: int = 1
+START_EVENT: str = "start"
+CHECKPOINT_EVENT: str = "checkpoint"
+JOURNALED_EVENTS: tuple[QuizEventType, ...] = (
+    QuizEventType.QUESTION,
+    QuizEventType.ANSWERED,
+    QuizEventType.SKIPPED,
+    QuizEventType.MARKED,
+    QuizEventType.UNMARKED,
+    QuizEventType.FINISHED,
+)
+
+
+def get_event_record(event: QuizEvent) -> Dict[str, Any]:
+    """Returns the journal record of a session event."""
+    record: Dict[str, Any] = {"event": event.event_type.id}
+    if event.event_type == QuizEventType.FINISHED:
+        return record
+    record["index"] = event.index
+    record["question"] = event.question_number
+    if event.event_type == QuizEventType.ANSWERED:
+        record["choice"] = event.choice_index
+        record["correct"] = event.is_correct
+        record["marked"] = event.is_marked
+    return record
+
+
+def get_pending_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Returns the event records after the last checkpoint."""
+    for position in range(len(records) - 1, -1, -1):
+        if records[position]["event"] == CHECKPOINT_EVENT:
+            return records[position + 1 :]
+    return records
+
+
+def fold_metrics(records: List[Dict[str, Any]]) -> List[QuestionMetric]:
+    """Returns the metrics of the answers and skips of the event records."""
+    metrics: Dict[QuestionNumber, QuestionMetric] = {}
+    for record in records:
+        event = record["event"]
+        if event not in (QuizEventType.ANSWERED.id, QuizEventType.SKIPPED.id):
+            continue
+        question_number = QuestionNumber(record["question"])
+        metric = metrics.get(question_number)
+        if metric is None:
+            metric = metrics[question_number] = QuestionMetric(question_number)
+        if event == QuizEventType.SKIPPED.id:
+            metric.skip_count += 1
+        elif record["correct"]:
+            metric.correct_attempts += 1
+        else:
+            metric.wrong_attempts += 1
+    return list(metrics.values())
+
+
+def fold_marks(records: List[Dict[str, Any]]) -> Dict[QuestionNumber, bool]:
+    """Returns the last marked status of the questions marked, unmarked or answered."""
+    marks: Dict[QuestionNumber, bool] = {}
+    for record in records:
+        event = record["event"]
+        if event == QuizEventType.MARKED.id:
+            marks[QuestionNumber(record["question"])] = True
+        elif event == QuizEventType.UNMARKED.id:
+            marks[QuestionNumber(record["question"])] = False
+        elif event == QuizEventType.ANSWERED.id and record["marked"]:
+            marks[QuestionNumber(record["question"])] = True
+    return marks
+
+
+def replay_records(session: QuizSession, records: List[Dict[str, Any]]) -> None:
+    """Apply the event records to a new session of the same questions and choice orders."""
+    for record in records:
+        event = record["event"]
+        if event == CHECKPOINT_EVENT:
+            continue
+        if event == QuizEventType.FINISHED.id:
+            session.finish()
+            continue
+        session.move(record["index"])
+        if event == QuizEventType.ANSWERED.id:
+            session.answer(record["choice"])
+        elif event == QuizEventType.SKIPPED.id:
+            session.skip()
+        elif event == QuizEventType.MARKED.id:
+            session.mark()
+        elif event == QuizEventType.UNMARKED.id:
+            session.unmark()
+
+
+class QuizJournal:
+    """Append-only journal of the events of a quiz session."""
+
+    def __init__(self, filepath: str, sync_interval: float = constants.JOURNAL_SYNC_INTERVAL):
+        """Create the journal.
+        :param filepath: Path of the journal file.
+        :param sync_interval: Maximum number of seconds between two syncs of the file to disk.
+        """
+        self._filepath = filepath
+        self._sync_interval = sync_interval
+        self._file = None
+        self._last_sync = 0.0
+        self._pending: List[Dict[str, Any]] = []
+
+    @property
+    def filepath(self) -> str:
+        """Path of the journal file."""
+        return self._filepath
+
+    @property
+    def pending(self) -> List[Dict[str, Any]]:
+        """Event records appended after the last checkpoint."""
+        return self._pending
+
+    def exists(self) -> bool:
+        """Check if the journal file exists."""
+        return os.path.exists(self._filepath)
+
+    def read(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Read the journal file.
+
+        A last line cut short by an interruption is ignored.
+
+        :return: Header record (None if the journal is empty) and event records.
+        :raises ValueError: If a line other than the last one is invalid.
+        """
+        with open(self._filepath, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        records = []
+        for line_number, line in enumerate(lines, start=1):
+            try:
+                records.append(json.loads(line))
+            except ValueError as e:
+                if line_number == len(lines):
+                    logger.warning("Ignoring the incomplete last line of %s", self._filepath)
+                    break
+                raise ValueError(f"Invalid quiz journal line {line_number}: {e}") from e
+        if not records:
+            return None, []
+        if records[0].get("event") != START_EVENT:
+            raise ValueError(f"Invalid quiz journal {self._filepath}: missing start record")
+        return records[0], records[1:]
+
+    def start(self, header: Dict[str, Any]) -> None:
+        """Start a new journal with the header record, replacing any existing journal."""
+        self.close()
+        Path(self._filepath).parent.mkdir(parents=True, exist_ok=True)
+        # the journal stays open for the whole session
+        self._file = open(self._filepath, "w", encoding="utf-8")  # noqa: SIM115
+        self._pending = []
+        self._append({"event": START_EVENT, "version": JOURNAL_VERSION, **header})
+        self.sync()
+
+    def reopen(self, pending: List[Dict[str, Any]]) -> None:
+        """Reopen an existing journal to append the events of a resumed session.
+        :param pending: Event records of the journal after its last checkpoint.
+        """
+        self.close()
+        with open(self._filepath, "rb+") as f:
+            # drop a last line cut short by an interruption, before appending to the journal
+            content = f.read()
+            f.truncate(content.rfind(b"\n") + 1)
+        self._file = open(self._filepath, "a", encoding="utf-8")  # noqa: SIM115
+        self._pending = list(pending)
+
+    def record(self, event: QuizEvent) -> None:
+        """Append a session event, used as a listener of the session."""
+        if event.event_type in JOURNALED_EVENTS:
+            record = get_event_record(event)
+            self._append(record)
+            self._pending.append(record)
+
+    def checkpoint(self) -> None:
+        """Append a checkpoint, once the progress of the pending events is saved."""
+        self._append({"event": CHECKPOINT_EVENT})
+        self.sync()
+        self._pending = []
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        if self._file is None:
+            raise ValueError("The quiz journal is not open")
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._file.flush()
+        if time.monotonic() - self._last_sync >= self._sync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        """Sync the journal file to disk."""
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """Sync and close the journal file."""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def remove(self) -> None:
+        """Close and delete the journal file."""
+        self.close()
+        Path(self._filepath).unlink(missing_ok=True)
@@ -0,0 +1,386 @@
+"""
+This module contains the QuizSession class, the state of a quiz driven through method calls.
+
+The session neither prompts nor prints: each call returns a QuizEvent describing what happened,
+so a quiz can be answered programmatically (simulations, tests, servers) as well as from the
+interactive quiz, which is one front end of the session. The events changing the state of the
+session are also passed to its listeners, such as the quiz journal.
+
+The answers, skips and marks are kept by the session, by question number, and the questions are
+left unchanged: sessions over the same shared questions do not see each other's state. The
+interactive quiz applies the state of its session to the questions when the quiz is saved.
+
+Example::
+
+    session = QuizSession(questions, ChoiceOrder(random.Random(seed)))
+    event = session.next()
+    while event.event_type != QuizEventType.FINISHED:
+        session.answer(pick_choice(event.choices))
+        event = session.next()
+    results = session.results()
+"""
+
+from typing import Callable, Dict, List, Optional
+
+from hrt.common.enums import QuizEventType
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.question import ChoiceOrder, Question
+from hrt.common.question_metric import QuestionMetric
+from hrt.common.question_submitted import QuestionSubmitted
+
+
+class QuizEvent:
+    """Event returned by the quiz session."""
+
+    def __init__(
+        self,
+        event_type: QuizEventType,
+        index: int = -1,
+        question: Optional[Question] = None,
+        choices: Optional[List[str]] = None,
+        choice_index: int = -1,
+        answer_index: int = -1,
+        is_correct: bool = False,
+        changed: bool = False,
+        is_marked: bool = False,
+    ):
+        """Create the event.
+        :param event_type: Type of the event.
+        :param index: Index of the question in the quiz (default is -1, no question).
+        :param question: Question of the event (default is None, no question).
+        :param choices: Choices of the question in the quiz order, followed by the skip choice.
+        :param choice_index: Index of the selected choice (default is -1, none).
+        :param answer_index: Index of the answer in the choices (default is -1, not revealed).
+        :param is_correct: Whether the selected choice is the answer.
+        :param changed: Whether the marked status of the question changed.
+        :param is_marked: Whether the question is marked in the session.
+        """
+        self.event_type = event_type
+        self.index = index
+        self.question = question
+        self.choices = choices
+        self.choice_index = choice_index
+        self.answer_index = answer_index
+        self.is_correct = is_correct
+        self.changed = changed
+        self.is_marked = is_marked
+
+    @property
+    def question_number(self) -> Optional[QuestionNumber]:
+        """Question number of the event, if any."""
+        return self.question.question_number if self.question else None
+
+    def __repr__(self) -> str:
+        return (
+            f"QuizEvent({self.event_type.id}, index={self.index}, "
+            f"question={self.question_number}, choice={self.choice_index}, "
+            f"correct={self.is_correct})"
+        )
+
+
+class QuizResults:
+    """Results of a quiz session."""
+
+    def __init__(
+        self,
+        number_of_questions: int,
+        correct: int,
+        wrong: int,
+        skipped: int,
+        marked: List[QuestionNumber],
+    ):
+        self.number_of_questions = number_of_questions
+        self.correct = correct
+        self.wrong = wrong
+        self.skipped = skipped
+        self.marked = marked
+
+    @property
+    def answered(self) -> int:
+        """Number of questions answered."""
+        return self.correct + self.wrong
+
+    @property
+    def percentage(self) -> int:
+        """Percentage of the questions answered correctly, rounded."""
+        if not self.number_of_questions:
+            return 0
+        return round(self.correct / self.number_of_questions * 100)
+
+
+class QuizSession:
+    """State of a quiz: current question, submitted answers, marks and skips."""
+
+    def __init__(
+        self,
+        questions: List[Question],
+        choice_order: Optional[ChoiceOrder] = None,
+        mark_wrong_answers: bool = False,
+    ):
+        """Create the session.
+        :param questions: Questions of the quiz.
+        :param choice_order: Order of the choices (default is None, a new unseeded order).
+        :param mark_wrong_answers: Whether to mark the questions answered wrong.
+        """
+        self._questions = questions
+        self._choice_order = choice_order if choice_order is not None else ChoiceOrder()
+        self._mark_wrong_answers = mark_wrong_answers
+        self._current_index = 0
+        self._presented = False
+        self._finished = False
+        self._submitted: Dict[QuestionNumber, QuestionSubmitted] = {}
+        self._metrics: Dict[QuestionNumber, QuestionMetric] = {}
+        # marked status of the questions, starting from their saved status
+        self._marks: Dict[QuestionNumber, bool] = {
+            q.question_number: q.is_marked for q in questions
+        }
+        self._correct = 0
+        self._wrong = 0
+        self._skipped = 0
+        self._listeners: List[Callable[[QuizEvent], None]] = []
+
+    def add_listener(self, listener: Callable[[QuizEvent], None]) -> None:
+        """Add a listener called with every event changing the state of the session."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[QuizEvent], None]) -> None:
+        """Remove a listener of the session."""
+        self._listeners.remove(listener)
+
+    def _notify(self, event: QuizEvent) -> QuizEvent:
+        for listener in self._listeners:
+            listener(event)
+        return event
+
+    @property
+    def questions(self) -> List[Question]:
+        """Questions of the quiz."""
+        return self._questions
+
+    @property
+    def choice_order(self) -> ChoiceOrder:
+        """Order of the choices of the questions."""
+        return self._choice_order
+
+    @property
+    def submitted(self) -> Dict[QuestionNumber, QuestionSubmitted]:
+        """Submitted questions by question number."""
+        return self._submitted
+
+    @property
+    def metrics(self) -> Dict[QuestionNumber, QuestionMetric]:
+        """Answers and skips of the session, by question number."""
+        return self._metrics
+
+    @property
+    def marks(self) -> Dict[QuestionNumber, bool]:
+        """Marked status of the questions in the session, by question number."""
+        return self._marks
+
+    def get_metric(self, question: Question) -> QuestionMetric:
+        """Returns the answers and skips of the question in the session."""
+        metric = self._metrics.get(question.question_number)
+        return metric if metric is not None else QuestionMetric(question.question_number)
+
+    def _add_metric(self, question: Question) -> QuestionMetric:
+        metric = self._metrics.get(question.question_number)
+        if metric is None:
+            metric = self._metrics[question.question_number] = QuestionMetric(
+                question.question_number
+            )
+        return metric
+
+    def is_marked(self, question: Question) -> bool:
+        """Check if the question is marked in the session."""
+        return self._marks.get(question.question_number, False)
+
+    @property
+    def current_index(self) -> int:
+        """Index of the current question."""
+        return self._current_index
+
+    @current_index.setter
+    def current_index(self, index: int) -> None:
+        self._current_index = index
+
+    @property
+    def current_question(self) -> Question:
+        """Current question."""
+        return self._questions[self._current_index]
+
+    @property
+    def is_finished(self) -> bool:
+        """Whether the session is finished."""
+        return self._finished
+
+    @property
+    def all_submitted(self) -> bool:
+        """Whether every question of the quiz is submitted."""
+        return len(self._submitted) == len(self._questions)
+
+    def is_submitted(self, question: Question) -> bool:
+        """Check if the question is submitted."""
+        return question.question_number in self._submitted
+
+    def get_choices(self, question: Question) -> List[str]:
+        """Returns the choices of the question in the quiz order, followed by the skip choice."""
+        return question.get_quiz_choices(self._choice_order.get(question))
+
+    def get_answer_index(self, question: Question) -> int:
+        """Returns the index of the answer in the choices of the question in the quiz order."""
+        return question.get_answer_index(self._choice_order.get(question))
+
+    def current(self) -> QuizEvent:
+        """Returns the current question, or the end of the session."""
+        if self._finished:
+            return QuizEvent(QuizEventType.FINISHED)
+        question = self.current_question
+        return QuizEvent(
+            QuizEventType.QUESTION, self._current_index, question, self.get_choices(question)
+        )
+
+    def next(self) -> QuizEvent:
+        """Move to the next question not submitted yet, after the current one.
+
+        The first call presents the current question. The search wraps around to the skipped
+        questions, and the session finishes once every question is submitted.
+
+        :return: Question event, or finished event.
+        """
+        if self._finished:
+            return QuizEvent(QuizEventType.FINISHED)
+        if self.all_submitted:
+            return self.finish()
+        count = len(self._questions)
+        start = self._current_index + 1 if self._presented else self._current_index
+        self._presented = True
+        for offset in range(count):
+            index = (start + offset) % count
+            if self._questions[index].question_number not in self._submitted:
+                self._current_index = index
+                break
+        return self._notify(self.current())
+
+    def move(self, index: int) -> QuizEvent:
+        """Move to the question at the given index.
+        :param index: Index of the question in the quiz.
+        :return: Question event.
+        :raises ValueError: If the session is finished or the index is out of range.
+        """
+        if self._finished:
+            raise ValueError("The quiz session is finished")
+        if not 0 <= index < len(self._questions):
+            raise ValueError(f"Invalid question index {index}")
+        self._current_index = index
+        self._presented = True
+        return self._notify(self.current())
+
+    def _get_open_question(self) -> Question:
+        if self._finished:
+            raise ValueError("The quiz session is finished")
+        question = self.current_question
+        if question.question_number in self._submitted:
+            raise ValueError(f"Question {question.question_number} is already submitted")
+        return question
+
+    def answer(self, choice_index: int) -> QuizEvent:
+        """Submit a choice for the current question.
+
+        Selecting the skip choice skips the question.
+
+        :param choice_index: Index of the choice in the quiz order.
+        :return: Answered event, or skipped event.
+        :raises ValueError: If the choice is invalid or the question is already submitted.
+        """
+        question = self._get_open_question()
+        order = self._choice_order.get(question)
+        if choice_index == len(order):
+            return self.skip()
+        if not 0 <= choice_index < len(order):
+            raise ValueError(f"Invalid choice {choice_index} for {question.question_number}")
+        is_correct = order[choice_index] == question.answer_index
+        metric = self._add_metric(question)
+        if is_correct:
+            metric.correct_attempts += 1
+            self._correct += 1
+        else:
+            metric.wrong_attempts += 1
+            self._wrong += 1
+            if self._mark_wrong_answers:
+                self._marks[question.question_number] = True
+        self._submitted[question.question_number] = QuestionSubmitted(
+            question.question_number, question.choices[order[choice_index]]
+        )
+        return self._notify(
+            QuizEvent(
+                QuizEventType.ANSWERED,
+                self._current_index,
+                question,
+                choice_index=choice_index,
+                answer_index=question.get_answer_index(order),
+                is_correct=is_correct,
+                is_marked=self.is_marked(question),
+            )
+        )
+
+    def skip(self) -> QuizEvent:
+        """Skip the current question, it can be answered later.
+        :return: Skipped event.
+        :raises ValueError: If the question is already submitted.
+        """
+        question = self._get_open_question()
+        self._add_metric(question).skip_count += 1
+        self._skipped += 1
+        return self._notify(QuizEvent(QuizEventType.SKIPPED, self._current_index, question))
+
+    def mark(self) -> QuizEvent:
+        """Mark the current question.
+        :return: Marked event, changed unless the question was already marked.
+        """
+        question = self.current_question
+        changed = not self.is_marked(question)
+        self._marks[question.question_number] = True
+        return self._notify(
+            QuizEvent(
+                QuizEventType.MARKED,
+                self._current_index,
+                question,
+                changed=changed,
+                is_marked=True,
+            )
+        )
+
+    def unmark(self) -> QuizEvent:
+        """Unmark the current question.
+        :return: Unmarked event, changed unless the question was not marked.
+        """
+        question = self.current_question
+        changed = self.is_marked(question)
+        self._marks[question.question_number] = False
+        return self._notify(
+            QuizEvent(QuizEventType.UNMARKED, self._current_index, question, changed=changed)
+        )
+
+    def finish(self) -> QuizEvent:
+        """Finish the session, the questions not submitted are submitted with the skip choice.
+        :return: Finished event.
+        """
+        if not self._finished:
+            for question in self._questions:
+                if question.question_number not in self._submitted:
+                    self._submitted[question.question_number] = QuestionSubmitted(
+                        question.question_number, Question.SKIP_CHOICE
+                    )
+            self._finished = True
+            return self._notify(QuizEvent(QuizEventType.FINISHED))
+        return QuizEvent(QuizEventType.FINISHED)
+
+    def results(self) -> QuizResults:
+        """Returns the results of the session."""
+        return QuizResults(
+            len(self._questions),
+            self._correct,
+            self._wrong,
+            self._skipped,
+            [question.question_number for question in self._questions if self.is_marked(question)],
+        )
@@ -0,0 +1,203 @@
+"""
+This module contains the spaced repetition schedule of the questions (SM-2 algorithm).
+
+Each reviewed question has a due time, an interval in days, an ease factor and a number of
+successful repetitions in a row. A correct answer multiplies the interval by the ease factor, a
+wrong or skipped answer brings the question back the next day and lowers the ease factor.
+
+The schedule is kept in a heap keyed on the due time, so the questions due first are selected
+without scanning the whole schedule. Reviews push a new heap entry and leave the old one behind,
+it is skipped when it reaches the top.
+
+The schedule file has one line per question::
+
+    question_number:due:interval:ease:repetitions
+"""
+
+import heapq
+import os
+from typing import Container, Dict, KeysView, List, Optional, Tuple
+
+from hrt.common import constants
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.question_metric import QuestionMetric
+
+SECONDS_PER_DAY: int = 24 * 60 * 60
+MINIMUM_EASE: float = 1.3
+INITIAL_EASE: float = 2.5
+FIRST_INTERVAL: int = 1
+SECOND_INTERVAL: int = 6
+QUALITY_CORRECT: int = 4
+QUALITY_SKIPPED: int = 2
+QUALITY_WRONG: int = 1
+PASSING_QUALITY: int = 3
+
+
+def get_review_quality(metric: QuestionMetric) -> Optional[int]:
+    """Returns the quality of the answer of a quiz question, None if it was not answered."""
+    if metric.correct_attempts:
+        return QUALITY_CORRECT
+    if metric.wrong_attempts:
+        return QUALITY_WRONG
+    if metric.skip_count:
+        return QUALITY_SKIPPED
+    return None
+
+
+class ReviewItem:
+    """Spaced repetition state of a question."""
+
+    def __init__(
+        self,
+        question_number: QuestionNumber,
+        due: int = 0,
+        interval: int = 0,
+        ease: float = INITIAL_EASE,
+        repetitions: int = 0,
+    ):
+        """Create the review state.
+        :param question_number: Question number.
+        :param due: Time the question is due for review, in seconds since the epoch.
+        :param interval: Days between the last review and the due time.
+        :param ease: Ease factor, the interval growth of a correct answer.
+        :param repetitions: Number of correct answers in a row.
+        """
+        self.question_number = question_number
+        self.due = due
+        self.interval = interval
+        self.ease = ease
+        self.repetitions = repetitions
+
+    def review(self, quality: int, now: int) -> None:
+        """Update the review state with the quality of an answer (0 to 5, SM-2)."""
+        if quality >= PASSING_QUALITY:
+            if self.repetitions == 0:
+                self.interval = FIRST_INTERVAL
+            elif self.repetitions == 1:
+                self.interval = SECOND_INTERVAL
+            else:
+                self.interval = round(self.interval * self.ease)
+            self.repetitions += 1
+        else:
+            self.repetitions = 0
+            self.interval = FIRST_INTERVAL
+        penalty = 5 - quality
+        self.ease = max(MINIMUM_EASE, self.ease + 0.1 - penalty * (0.08 + penalty * 0.02))
+        self.due = now + self.interval * SECONDS_PER_DAY
+
+    def format(self) -> str:
+        """Format the review state as a line of the schedule file."""
+        delimiter = constants.DEFAULT_METRICS_DELIMITER
+        return delimiter.join(
+            [
+                self.question_number,
+                str(self.due),
+                str(self.interval),
+                f"{self.ease:.2f}",
+                str(self.repetitions),
+            ]
+        )
+
+    @staticmethod
+    def parse(line: str) -> Optional["ReviewItem"]:
+        """Parse a line of the schedule file, None if it is invalid."""
+        parts = line.strip().split(constants.DEFAULT_METRICS_DELIMITER)
+        if len(parts) != 5:
+            return None
+        try:
+            return ReviewItem(
+                QuestionNumber(parts[0]),
+                int(parts[1]),
+                int(parts[2]),
+                float(parts[3]),
+                int(parts[4]),
+            )
+        except ValueError:
+            return None
+
+
+class ReviewSchedule:
+    """Spaced repetition schedule of the questions, ordered by due time."""
+
+    def __init__(self, items: Optional[List[ReviewItem]] = None):
+        self._items: Dict[QuestionNumber, ReviewItem] = {
+            item.question_number: item for item in items or []
+        }
+        self._heap: List[Tuple[int, QuestionNumber]] = [
+            (item.due, item.question_number) for item in self._items.values()
+        ]
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, question_number: object) -> bool:
+        return question_number in self._items
+
+    @property
+    def question_numbers(self) -> KeysView[QuestionNumber]:
+        """Question numbers of the reviewed questions."""
+        return self._items.keys()
+
+    def get(self, question_number: QuestionNumber) -> Optional[ReviewItem]:
+        """Returns the review state of the question, None if it was never reviewed."""
+        return self._items.get(question_number)
+
+    def review(self, question_number: QuestionNumber, quality: int, now: int) -> ReviewItem:
+        """Update the review state of the question with the quality of an answer.
+        :param question_number: Question number.
+        :param quality: Quality of the answer (QUALITY_CORRECT, QUALITY_SKIPPED, QUALITY_WRONG).
+        :param now: Time of the answer, in seconds since the epoch.
+        :return: Updated review state.
+        """
+        item = self._items.get(question_number)
+        if item is None:
+            item = ReviewItem(question_number)
+            self._items[question_number] = item
+        item.review(quality, now)
+        heapq.heappush(self._heap, (item.due, question_number))
+        return item
+
+    def get_due(
+        self, count: int, now: int, eligible: Optional[Container[QuestionNumber]] = None
+    ) -> List[QuestionNumber]:
+        """Returns the questions due for review, the most overdue first.
+        :param count: Maximum number of questions.
+        :param now: Current time, in seconds since the epoch.
+        :param eligible: Question numbers that can be selected (default is None, all).
+        :return: Question numbers of the due questions.
+        """
+        due: List[QuestionNumber] = []
+        popped: List[Tuple[int, QuestionNumber]] = []
+        while self._heap and len(due) < count and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            item = self._items.get(entry[1])
+            if item is None or item.due != entry[0] or entry in popped:
+                continue  # outdated by a later review, or reviewed twice at the same time
+            popped.append(entry)
+            if eligible is None or entry[1] in eligible:
+                due.append(entry[1])
+        for entry in popped:
+            heapq.heappush(self._heap, entry)
+        return due
+
+    def save(self, filepath: str) -> None:
+        """Save the schedule, replacing the file once it is written."""
+        os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+        temp_path = f"{filepath}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for question_number in sorted(self._items):
+                f.write(f"{self._items[question_number].format()}\n")
+        os.replace(temp_path, filepath)
+
+    @staticmethod
+    def load(filepath: str) -> "ReviewSchedule":
+        """Load the schedule, empty if the file does not exist. Invalid lines are ignored."""
+        items: List[ReviewItem] = []
+        if os.path.exists(filepath):
+            with open(filepath, "r", encoding="utf-8") as f:
+                for line in f:
+                    item = ReviewItem.parse(line)
+                    if item:
+                        items.append(item)
+        return ReviewSchedule(items)
@@ -0,0 +1,361 @@
+"""
+This module contains the SearchIndex class, an inverted index over the question text and choices
+of a question bank with BM25 ranking.
+
+The index is persisted next to the question bank file and stamped with the hash of the bank
+file, so it is rebuilt when the bank changes. The inode, size and modification time of the bank
+file are kept with the index too, so a search can check that the index is current from a stat
+of the bank file, without hashing it or loading the question bank. The layout of the index file
+is:
+
+    magic (8 bytes) | bank file hash (64 ascii bytes) | metadata length (uint32)
+    | metadata (json) | postings (uint32 pairs of question index and term frequency)
+
+The metadata holds the question numbers, the question lengths, the term dictionary and the stat
+of the bank file. The postings are memory-mapped and only the postings of the query terms are
+read.
+"""
+
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Optional, Union
+
+from hrt.common import constants, utils
+from hrt.common.config_reader import logger
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.question import Question
+
+INDEX_MAGIC: bytes = b"HRTSIDX1"
+HASH_LENGTH: int = 64
+HEADER_FORMAT: str = f"<{len(INDEX_MAGIC)}s{HASH_LENGTH}sI"
+HEADER_SIZE: int = struct.calcsize(HEADER_FORMAT)
+BM25_K1: float = 1.5
+BM25_B: float = 0.75
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split the text into lowercase word tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def get_question_terms(question: Question) -> list[str]:
+    """Returns the tokens of the question text and choices."""
+    return tokenize(" ".join([question.question_text, *question.choices]))
+
+
+def get_term_frequencies(question: Question) -> tuple[int, dict[str, int]]:
+    """Returns the number of tokens of the question and the frequency of each token."""
+    tokens = get_question_terms(question)
+    frequencies: dict[str, int] = {}
+    for token in tokens:
+        frequencies[token] = frequencies.get(token, 0) + 1
+    return len(tokens), frequencies
+
+
+class SearchIndex:
+    """Inverted index with BM25 ranking over the questions of a question bank."""
+
+    def __init__(
+        self,
+        question_numbers: list[QuestionNumber],
+        lengths: list[int],
+        terms: dict[str, list[int]],
+        postings: Union[bytes, mmap.mmap],
+        postings_offset: int = 0,
+        file_hash: str = "",
+        file_stat: Optional[list[int]] = None,
+    ):
+        """Create the search index.
+        :param question_numbers: Question numbers, by question index.
+        :param lengths: Number of tokens of each question, by question index.
+        :param terms: Term to postings offset (in pairs) and document frequency.
+        :param postings: Buffer holding the postings.
+        :param postings_offset: Byte offset of the postings in the buffer.
+        :param file_hash: Hash of the question bank file the index was built from.
+        :param file_stat: Stat of the question bank file, as returned by
+            utils.get_file_stat (default is None, unknown).
+        """
+        self._question_numbers = question_numbers
+        self._lengths = lengths
+        self._terms = terms
+        self._postings = postings
+        self._postings_offset = postings_offset
+        self._file_hash = file_hash
+        self._file_stat = file_stat or []
+        self._average_length = sum(lengths) / len(lengths) if lengths else 0.0
+
+    @property
+    def file_hash(self) -> str:
+        """Hash of the question bank file the index was built from."""
+        return self._file_hash
+
+    @property
+    def file_stat(self) -> list[int]:
+        """Stat of the question bank file the index was built from."""
+        return self._file_stat
+
+    @property
+    def question_numbers(self) -> list[QuestionNumber]:
+        """Question numbers covered by the index."""
+        return self._question_numbers
+
+    @classmethod
+    def build(
+        cls,
+        questions: list[Question],
+        file_hash: str = "",
+        file_stat: Optional[list[int]] = None,
+    ) -> "SearchIndex":
+        """Build the search index from the questions.
+        :param questions: Questions to index.
+        :param file_hash: Hash of the question bank file.
+        :param file_stat: Stat of the question bank file.
+        :return: Search index.
+        """
+        documents = [get_term_frequencies(question) for question in questions]
+        return cls._from_documents(
+            [question.question_number for question in questions], documents, file_hash, file_stat
+        )
+
+    @classmethod
+    def _from_documents(
+        cls,
+        question_numbers: list[QuestionNumber],
+        documents: list[tuple[int, dict[str, int]]],
+        file_hash: str,
+        file_stat: Optional[list[int]],
+    ) -> "SearchIndex":
+        inverted: dict[str, list[int]] = {}
+        lengths = []
+        for index, (length, frequencies) in enumerate(documents):
+            lengths.append(length)
+            for token, frequency in frequencies.items():
+                inverted.setdefault(token, []).extend((index, frequency))
+
+        terms: dict[str, list[int]] = {}
+        postings = array("I")
+        for term in sorted(inverted):
+            pairs = inverted[term]
+            terms[term] = [len(postings) // 2, len(pairs) // 2]
+            postings.extend(pairs)
+        if sys.byteorder == "big":
+            postings.byteswap()
+        return cls(
+            question_numbers,
+            lengths,
+            terms,
+            postings.tobytes(),
+            file_hash=file_hash,
+            file_stat=file_stat,
+        )
+
+    def update(
+        self,
+        questions: list[Question],
+        unchanged: dict[QuestionNumber, QuestionNumber],
+        file_hash: str,
+        file_stat: Optional[list[int]] = None,
+    ) -> "SearchIndex":
+        """Build the index of a new release of the question bank from this index.
+
+        The postings of the questions whose content did not change are carried over from this
+        index, so only the added and changed questions are tokenized.
+
+        :param questions: Questions of the new release.
+        :param unchanged: New question number by old question number, for the questions whose
+            content did not change.
+        :param file_hash: Hash of the new question bank file.
+        :param file_stat: Stat of the new question bank file.
+        :return: Search index of the new release.
+        """
+        new_indices = {question.question_number: i for i, question in enumerate(questions)}
+        carried: dict[int, int] = {}
+        for old_index, old_number in enumerate(self._question_numbers):
+            new_index = new_indices.get(unchanged.get(old_number, ""))
+            if new_index is not None:
+                carried[old_index] = new_index
+        documents: list[Optional[tuple[int, dict[str, int]]]] = [None] * len(questions)
+        for old_index, new_index in carried.items():
+            documents[new_index] = (self._lengths[old_index], {})
+        for term in self._terms:
+            for old_index, frequency in self._get_postings(term):
+                new_index = carried.get(old_index)
+                if new_index is not None:
+                    documents[new_index][1][term] = frequency
+        tokenized = 0
+        for index, question in enumerate(questions):
+            if documents[index] is None:
+                documents[index] = get_term_frequencies(question)
+                tokenized += 1
+        logger.info("Search index updated, %d questions tokenized", tokenized)
+        return self._from_documents(
+            [question.question_number for question in questions], documents, file_hash, file_stat
+        )
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        """Save the search index to the path, replacing any existing index.
+        :param path: Path of the index file.
+        """
+        metadata = json.dumps(
+            {
+                "numbers": self._question_numbers,
+                "lengths": self._lengths,
+                "terms": self._terms,
+                "stat": self._file_stat,
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+        header = struct.pack(
+            HEADER_FORMAT, INDEX_MAGIC, self._file_hash.encode("ascii"), len(metadata)
+        )
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(header)
+            file.write(metadata)
+            file.write(self._postings[self._postings_offset :])
+        os.replace(temp_path, path)
+        logger.info("Search index saved to %s", path)
+
+    @classmethod
+    def _read(
+        cls, path: Union[str, os.PathLike], file_hash: Optional[str]
+    ) -> Optional["SearchIndex"]:
+        """Read the index file, None if it is missing, invalid or not of the file hash."""
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as file:
+            header = file.read(HEADER_SIZE)
+            if len(header) < HEADER_SIZE:
+                logger.warning("Invalid search index at %s", path)
+                return None
+            magic, index_hash, metadata_length = struct.unpack(HEADER_FORMAT, header)
+            if magic != INDEX_MAGIC:
+                logger.warning("Invalid search index at %s", path)
+                return None
+            index_hash = index_hash.rstrip(b"\x00").decode("ascii")
+            if file_hash is not None and index_hash != file_hash:
+                logger.info("Search index at %s is stale", path)
+                return None
+            try:
+                metadata = json.loads(file.read(metadata_length).decode("utf-8"))
+            except ValueError:
+                logger.warning("Invalid search index at %s", path)
+                return None
+            postings = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(
+            metadata["numbers"],
+            metadata["lengths"],
+            metadata["terms"],
+            postings,
+            HEADER_SIZE + metadata_length,
+            index_hash,
+            metadata.get("stat"),
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike], file_hash: str) -> Optional["SearchIndex"]:
+        """Load the search index from the path with the postings memory-mapped.
+        :param path: Path of the index file.
+        :param file_hash: Expected hash of the question bank file.
+        :return: Search index or None if the index is missing, stale or invalid.
+        """
+        return cls._read(path, file_hash)
+
+    @classmethod
+    def load_current(
+        cls, path: Union[str, os.PathLike], bank_filepath: Union[str, os.PathLike]
+    ) -> Optional["SearchIndex"]:
+        """Load the search index if the question bank file did not change since it was built.
+
+        The inode, size and modification time of the bank file are compared, the file is not read.
+
+        :param path: Path of the index file.
+        :param bank_filepath: Path of the question bank file.
+        :return: Search index or None if the index is missing, invalid or may be stale.
+        """
+        file_stat = utils.get_file_stat(bank_filepath)
+        index = cls._read(path, None)
+        if index is None or not file_stat or index.file_stat != file_stat:
+            return None
+        return index
+
+    @classmethod
+    def load_or_build(
+        cls,
+        path: Union[str, os.PathLike],
+        questions: list[Question],
+        file_hash: str,
+        file_stat: Optional[list[int]] = None,
+    ) -> "SearchIndex":
+        """Load the search index from the path, rebuilding and saving it if it is stale.
+        :param path: Path of the index file.
+        :param questions: Questions to index if the index is rebuilt.
+        :param file_hash: Hash of the question bank file.
+        :param file_stat: Stat of the question bank file, saved with the
+            index if it differs (default is None, not saved).
+        :return: Search index.
+        """
+        index = cls.load(path, file_hash)
+        if index is not None and (not file_stat or index.file_stat == file_stat):
+            return index
+        if index is None:
+            logger.info("Building search index for %d questions", len(questions))
+            index = cls.build(questions, file_hash, file_stat)
+        else:
+            # the bank file was touched or copied without changes
+            index._file_stat = file_stat
+        try:
+            index.save(path)
+        except OSError as e:
+            logger.warning("Unable to save search index to %s: %s", path, e)
+        return index
+
+    def _get_postings(self, term: str) -> list[tuple[int, int]]:
+        entry = self._terms.get(term)
+        if not entry:
+            return []
+        offset, count = entry
+        values = struct.unpack_from(
+            f"<{count * 2}I", self._postings, self._postings_offset + offset * 8
+        )
+        return list(zip(values[::2], values[1::2], strict=True))
+
+    def search(
+        self, query: str, max_results: int = constants.DEFAULT_SEARCH_RESULTS_COUNT
+    ) -> list[tuple[QuestionNumber, float]]:
+        """Search the index with BM25 ranking.
+        :param query: Search terms.
+        :param max_results: Maximum number of results to return.
+        :return: Question numbers and scores, best match first.
+        """
+        question_count = len(self._question_numbers)
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._get_postings(term)
+            if not postings:
+                continue
+            frequency = len(postings)
+            idf = math.log(1 + (question_count - frequency + 0.5) / (frequency + 0.5))
+            for index, term_frequency in postings:
+                length_norm = 1 - BM25_B + BM25_B * self._lengths[index] / self._average_length
+                score = (
+                    idf * term_frequency * (BM25_K1 + 1) / (term_frequency + BM25_K1 * length_norm)
+                )
+                scores[index] = scores.get(index, 0.0) + score
+        best = heapq.nlargest(max_results, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(self._question_numbers[index], score) for index, score in best]
+
+
+def get_search_index_path(filepath: Union[str, os.PathLike]) -> Path:
+    """Returns the path of the search index persisted next to the question bank file."""
+    return Path(f"{filepath}{constants.SEARCH_INDEX_FILE_SUFFIX}")
@@ -1,11 +1,12 @@
 """Utility functions for the HRT project."""
 
 import csv
+import hashlib
 import os
 import tempfile
 import time
 import zipfile
-from typing import Any, Dict, List, Optional, Set, TypeVar, Union
+from typing import Any, Dict, Iterable, List, Optional, Set, TypeVar, Union
 
 import click
 import requests
@@ -53,21 +54,56 @@ def read_delim_file(
     return data
 
 
-def save_output(filename: str, output: str, folder: Optional[str] = None) -> None:
-    """Saves the output to a file with the given filename in the given folder.
-    :param filename: Name of the file to save the output.
-    :param output: Output to be saved in the file.
+def get_output_path(filename: str, folder: Optional[str] = None) -> str:
+    """Returns the path of the output file, creating its folder if it does not exist.
+    :param filename: Name of the output file.
     :param folder: Folder where the file will be saved (default is None).
+    :return: Path of the output file.
     """
     file_parent_folder = os.path.dirname(filename)
     file_folder = os.path.join(folder, file_parent_folder) if folder else file_parent_folder
     if file_folder and not os.path.exists(file_folder):
         create_folder(file_folder)
-    filename = os.path.join(folder, filename) if folder else filename
-    with open(filename, "w", encoding="utf-8", newline="") as file:
+    return os.path.join(folder, filename) if folder else filename
+
+
+def save_output(filename: str, output: str, folder: Optional[str] = None) -> None:
+    """Saves the output to a file with the given filename in the given folder.
+    :param filename: Name of the file to save the output.
+    :param output: Output to be saved in the file.
+    :param folder: Folder where the file will be saved (default is None).
+    """
+    with open(get_output_path(filename, folder), "w", encoding="utf-8", newline="") as file:
         file.write(output)
 
 
+def save_output_lines(filename: str, lines: Iterable[str], folder: Optional[str] = None) -> int:
+    """Saves the lines to a file as they are produced, separated by new lines.
+
+    The lines are written through a buffered writer, so the output is never held in memory as
+    a whole. The file content is the same as save_output with the joined lines.
+
+    :param filename: Name of the file to save the output.
+    :param lines: Lines to be saved in the file.
+    :param folder: Folder where the file will be saved (default is None).
+    :return: Number of lines written.
+    """
+    count = 0
+    with open(
+        get_output_path(filename, folder),
+        "w",
+        encoding="utf-8",
+        newline="",
+        buffering=constants.OUTPUT_BUFFER_SIZE,
+    ) as file:
+        for line in lines:
+            if count:
+                file.write("\n")
+            file.write(line)
+            count += 1
+    return count
+
+
 def get_header(header: str) -> str:
     """Returns the header with a separator line.
     :param header: Header to be returned.
@@ -327,6 +363,31 @@ def get_current_time() -> float:
     return time.time()
 
 
+def get_file_hash(file_path: Union[str, os.PathLike]) -> str:
+    """Returns the SHA-256 hash of a file.
+    :param file_path: Path to the file.
+    :return: Hex digest of the file contents.
+    """
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(65536), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def get_file_stat(file_path: Union[str, os.PathLike]) -> list[int]:
+    """Returns the inode, size and modification time (ns) of a file, to tell cheaply whether it
+    changed.
+    :param file_path: Path to the file.
+    :return: Stat of the file, empty if the file cannot be stat'ed.
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return []
+    return [stat.st_ino, stat.st_size, stat.st_mtime_ns]
+
+
 def load_question_metrics(metrics_file_path: Union[str, os.PathLike]) -> List[QuestionMetric]:
     """Loads metrics from a file.
     :param metrics_file_path: Path to the metrics file.
@@ -348,6 +409,19 @@ def load_question_metrics(metrics_file_path: Union[str, os.PathLike]) -> List[Qu
     return metrics
 
 
+def replace_file_lines(filepath: str, lines: Iterable[str]) -> None:
+    """Write the lines to a temporary file and replace the file with it, so the file is never
+    left partially written.
+    :param filepath: Path of the file.
+    :param lines: Lines to write, without their new line.
+    """
+    os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+    temp_path = f"{filepath}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.writelines(f"{line}\n" for line in lines)
+    os.replace(temp_path, filepath)
+
+
 def read_metrics_from_file(metrics_file: str) -> List[QuestionMetric]:
     """Reads metrics from a file.
     :param metrics_file: Path to the metrics file.
@@ -1,35 +1,266 @@
 """QuestionProcessor class to process questions based on the criteria"""
 
+import heapq
+import json
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from hrt.common import constants, utils
+from hrt.common.bank_manifest import (
+    BankManifest,
+    get_manifest_path,
+    migrate_question_numbers_file,
+)
 from hrt.common.config_reader import HRTConfig, logger
 from hrt.common.enums import (
     CountryCode,
     ExamType,
+    GeneralQuestionListingType,
     MarkedQuestionListingType,
     QuestionAnswerDisplay,
     QuestionDisplayMode,
+    QuestionLanguage,
     QuestionListingType,
     QuizAnswerDisplay,
     TopQuestionsListingType,
 )
-from hrt.common.question import Question
-from hrt.common.question_bank import IQuestionBank, QuestionBankFactory
+from hrt.common.file_lock import FileLock
+from hrt.common.metrics_repository import MetricsRepository
+from hrt.common.progress_store import ProgressStore
+from hrt.common.question import ChoiceOrder, Question
+from hrt.common.question_bank import (
+    MARKED_METRIC_FIELDS,
+    IQuestionBank,
+    QuestionBankFactory,
+    QuestionBankRegistry,
+    get_derived_filepath,
+)
 from hrt.common.question_display import QuestionDisplay, QuestionDisplayModeFactory
+from hrt.common.question_stats import format_question_bank_stats, get_question_bank_stats
+from hrt.common.search_index import SearchIndex, get_search_index_path
+
+
+def iter_answers(
+    questions: Iterable[Question], choice_order: Optional[ChoiceOrder] = None
+) -> Iterator[str]:
+    """Yield the answers to the questions, numbered in the choice order of the session, if any."""
+    if Question.question_display.answer_display not in (
+        QuestionAnswerDisplay.IN_THE_END,
+        QuizAnswerDisplay.IN_THE_END,
+    ):
+        return
+    for q in questions:
+        order = choice_order.get(q) if choice_order else None
+        yield f"{q.question_number}: {q.get_answer_index(order) + 1}. {q.answer}"
+
+
+LISTING_TYPES: Tuple[Union[QuestionListingType, TopQuestionsListingType], ...] = (
+    *GeneralQuestionListingType,
+    *TopQuestionsListingType,
+)
+
+# processor inherited by the forked processes computing the listings
+_forked_processor: Optional["QuestionProcessor"] = None
+
+
+def _save_forked_listing(
+    criteria: Union[QuestionListingType, TopQuestionsListingType], max_questions: int
+) -> Path:
+    """Save a listing of the processor inherited from the parent process."""
+    return _forked_processor.save_listing(criteria, max_questions)
+
+
+def get_listing_executor(max_workers: Optional[int] = None) -> Executor:
+    """Returns the executor computing the listings.
+
+    Forked processes share the loaded question bank of the parent process without pickling it.
+    Where forking is not available, the listings are computed in threads.
+    """
+    if "fork" in multiprocessing.get_all_start_methods():
+        try:
+            return ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context("fork"))
+        except (OSError, NotImplementedError) as e:
+            logger.warning("Process pool not available, using threads: %s", e)
+    return ThreadPoolExecutor(max_workers)
+
+
+def get_answers(
+    questions: List[Question], choice_order: Optional[ChoiceOrder] = None
+) -> List[str]:
+    """Get the answers to the questions, numbered in the choice order of the session, if any."""
+    return list(iter_answers(questions, choice_order))
+
+
+def get_question_bank_filepath(
+    config: HRTConfig, country: CountryCode, exam_type: ExamType
+) -> Path:
+    """Returns the path of the question bank file of the exam type set in the config."""
+    exam_settings = (
+        config.get_country_settings(country.code).get("question_bank").get(exam_type.id)
+    )
+    if not exam_type.is_supported:
+        raise ValueError(f"Exam type {exam_type} for {country} is not supported")
+    file = exam_settings.get("file")
+    if not file:
+        raise ValueError(f"Questions file not set for {country} and {exam_type}")
+    folder = config.get_input().get("folder")
+    if not folder:
+        raise ValueError("Input folder not found in the config file")
+    return Path(folder) / country.code / exam_type.id / file
 
 
-def get_answers(questions: List[Question]) -> List[str]:
-    """Get the answers to the questions."""
+def get_question_processors(
+    config: HRTConfig,
+    country: CountryCode,
+    display_mode: QuestionDisplayMode = QuestionDisplayMode.PRINT,
+    language: QuestionLanguage = QuestionLanguage.EN,
+    exam_type_ids: Optional[Iterable[str]] = None,
+) -> List["QuestionProcessor"]:
+    """Returns the question processors of the supported exam types of the country.
+
+    The question banks are loaded concurrently. Exam types without a question bank file are
+    skipped.
+
+    :param exam_type_ids: Ids of the exam types (default is None, all the supported exam types).
+    """
+
+    def create_processor(exam_type_id: str) -> Optional[QuestionProcessor]:
+        try:
+            return QuestionProcessor(
+                config, country, ExamType.from_id(exam_type_id), display_mode, language
+            )
+        except FileNotFoundError as e:
+            logger.warning("Skipping %s questions: %s", exam_type_id, e)
+            return None
+
+    if exam_type_ids is None:
+        exam_type_ids = ExamType.supported_country_ids(country)
+    exam_type_ids = list(exam_type_ids)
+    with ThreadPoolExecutor(max_workers=max(len(exam_type_ids), 1)) as executor:
+        processors = list(executor.map(create_processor, exam_type_ids))
+    return [processor for processor in processors if processor]
+
+
+def search_question_bank_index(
+    config: HRTConfig,
+    country: CountryCode,
+    exam_type: ExamType,
+    terms: str,
+    max_results: int = constants.DEFAULT_SEARCH_RESULTS_COUNT,
+    language: QuestionLanguage = QuestionLanguage.EN,
+) -> Optional[List[Tuple[float, Question]]]:
+    """Search the persisted search index of the question bank of the exam type.
+
+    The index is used if the question bank file did not change since the index was saved, as
+    told by the stat of the file, and only the rows of the matching questions are read from the
+    question bank file. The question bank is not loaded.
+
+    :return: Matching questions, best match first, or None if the index is missing or may be
+        stale.
+    """
+    filepath = get_question_bank_filepath(config, country, exam_type)
+    if not filepath.exists():
+        raise FileNotFoundError(f"Questions file not found at {filepath}")
+    index = SearchIndex.load_current(
+        get_search_index_path(get_derived_filepath(filepath, language)), filepath
+    )
+    if index is None:
+        return None
+    hits = index.search(terms, max_results)
+    questions = {
+        question.question_number: question
+        for question in QuestionBankFactory.read_questions(
+            country, filepath, language, [question_number for question_number, _ in hits]
+        )
+    }
     return [
-        f"{q.question_number}: {q.answer_index + 1}. {q.answer}"
-        for q in questions
-        if Question.question_display.answer_display == QuestionAnswerDisplay.IN_THE_END
-        or Question.question_display.answer_display == QuizAnswerDisplay.IN_THE_END
+        (score, questions[question_number])
+        for question_number, score in hits
+        if question_number in questions
     ]
 
 
+def search_question_banks(
+    config: HRTConfig,
+    country: CountryCode,
+    terms: str,
+    answer_display: QuestionAnswerDisplay,
+    max_results: int = constants.DEFAULT_SEARCH_RESULTS_COUNT,
+    save_to_file: bool = True,
+    language: QuestionLanguage = QuestionLanguage.EN,
+) -> None:
+    """Search the question banks of all the supported exam types of the country."""
+    if Question.question_display is None:
+        Question.question_display = QuestionDisplay(answer_display)
+    else:
+        Question.question_display.answer_display = answer_display
+    results: List[Tuple[float, Question]] = []
+    # exam types without a current search index load their question bank to build it
+    unindexed = []
+    for exam_type_id in ExamType.supported_country_ids(country):
+        try:
+            hits = search_question_bank_index(
+                config, country, ExamType.from_id(exam_type_id), terms, max_results, language
+            )
+        except FileNotFoundError as e:
+            logger.warning("Skipping %s questions: %s", exam_type_id, e)
+            continue
+        if hits is None:
+            unindexed.append(exam_type_id)
+        else:
+            results.extend(hits)
+    if unindexed:
+        for qp in get_question_processors(
+            config, country, language=language, exam_type_ids=unindexed
+        ):
+            results.extend(qp.search(terms, max_results))
+    results = heapq.nlargest(max_results, results, key=lambda result: result[0])
+
+    output = [utils.get_header(f"Search: {terms}")]
+    choice_order = ChoiceOrder()
+    output.extend(question.format(choice_order.get(question)) for _, question in results)
+    answers = get_answers([question for _, question in results], choice_order)
+    if answers:
+        output.append(utils.get_header("Answers"))
+        output.extend(answers)
+    output.append(f"Count: {len(results)}")
+    if save_to_file:
+        output_folder = config.get_output().get("folder")
+        output_file = Path(country.code) / constants.SEARCH_OUTPUT_FILENAME
+        utils.save_output(str(output_file), "\n".join(output), output_folder)
+        logger.info("Search results saved to %s", Path(output_folder) / output_file)
+    else:
+        for line in output:
+            print(line)
+
+
+def report_question_bank_stats(
+    config: HRTConfig,
+    country: CountryCode,
+    json_format: bool = False,
+    save_to_file: bool = True,
+    language: QuestionLanguage = QuestionLanguage.EN,
+) -> None:
+    """Report the statistics of the question banks of all the supported exam types."""
+    processors = get_question_processors(config, country, language=language)
+    stats = [qp.get_stats() for qp in processors]
+    if json_format:
+        output = json.dumps(stats, indent=2)
+        filename = constants.STATS_JSON_OUTPUT_FILENAME
+    else:
+        output = "\n\n".join("\n".join(format_question_bank_stats(s)) for s in stats)
+        filename = constants.STATS_OUTPUT_FILENAME
+    if save_to_file:
+        output_folder = config.get_output().get("folder")
+        output_file = Path(country.code) / filename
+        utils.save_output(str(output_file), output, output_folder)
+        logger.info("Statistics saved to %s", Path(output_folder) / output_file)
+    else:
+        print(output)
+
+
 class QuestionProcessor:
     """QuestionProcessor class to process questions based on the criteria"""
 
@@ -39,14 +270,16 @@ class QuestionProcessor:
         country: CountryCode,
         exam_type: ExamType,
         display_mode: QuestionDisplayMode = QuestionDisplayMode.PRINT,
+        language: QuestionLanguage = QuestionLanguage.EN,
     ):
         self.config = config
         self.country = country
         self.exam_type = exam_type
         self.display_mode = display_mode
+        self.language = language
         self._initialize_paths()
         self._initialize_question_display()
-        self._qb: IQuestionBank = QuestionBankFactory.get_question_bank(
+        self._qb: IQuestionBank = QuestionBankRegistry.get_question_bank(
             country,
             exam_type,
             self.file_path,
@@ -54,6 +287,8 @@ class QuestionProcessor:
             self.categories_file_path,
             self.marked_questions_file_path,
             self.metrics_file_path,
+            language,
+            self.progress_store_file_path,
         )
 
     def get_question_bank(self) -> IQuestionBank:
@@ -61,18 +296,11 @@ class QuestionProcessor:
         return self._qb
 
     def _initialize_paths(self) -> None:
+        self.file_path = get_question_bank_filepath(self.config, self.country, self.exam_type)
         country_settings = self.config.get_country_settings(self.country.code)
         exam_settings = country_settings.get("question_bank").get(self.exam_type.id)
         input_settings = self.config.get_input()
-        if not self.exam_type.is_supported:
-            raise ValueError(f"Exam type {self.exam_type} for {self.country} is not supported")
-        file = exam_settings.get("file")
-        if not file:
-            raise ValueError(f"Questions file not set for {self.country} and {self.exam_type}")
         folder = input_settings.get("folder")
-        if not folder:
-            raise ValueError("Input folder not found in the config file")
-        self.file_path = Path(folder) / self.country.code / self.exam_type.id / file
         if not self.file_path.exists():
             raise FileNotFoundError(f"Questions file not found at {self.file_path}")
         categories_file = exam_settings.get("categories_file")
@@ -99,7 +327,9 @@ class QuestionProcessor:
         self.output_folder = self.config.get_output().get("folder")
         if not self.output_folder:
             raise ValueError("Output folder not found in the config file")
-        # set metrics file path
+        self._initialize_metrics_paths()
+
+    def _initialize_metrics_paths(self) -> None:
         metrics_config = self.config.get("metrics")
         metrics_folder = metrics_config.get("folder", constants.DEFAULT_METRICS_FOLDER)
         metrics_file = metrics_config.get("file")
@@ -114,6 +344,26 @@ class QuestionProcessor:
             logger.warning(
                 "Metrics file not found. Created new file at %s", self.metrics_file_path
             )
+        self.review_schedule_file_path = self.metrics_file_path.parent / metrics_config.get(
+            "review_schedule_filename", constants.DEFAULT_REVIEW_SCHEDULE_FILENAME
+        )
+        database = metrics_config.get("database")
+        self.progress_store_file_path = Path(metrics_folder) / database if database else None
+        if not self.progress_store_file_path:
+            return
+        # the metrics and marked questions files are imported into the progress store once
+        with ProgressStore(self.progress_store_file_path) as store:
+            if store.migrate_files(
+                self.country.code,
+                self.exam_type.id,
+                self.metrics_file_path,
+                self.marked_questions_file_path,
+            ):
+                logger.info(
+                    "Imported the metrics and marked questions of %s into %s",
+                    self.exam_type.id,
+                    self.progress_store_file_path,
+                )
 
     def _initialize_question_display(self) -> None:
         question_display = QuestionDisplayModeFactory.get_question_display_mode(
@@ -126,34 +376,53 @@ class QuestionProcessor:
 
     def _process_list_result(
         self,
-        result: List[Question],
-        result_text: List[str],
+        result: Union[List[Question], Dict[Any, Any]],
+        result_text: Iterable[str],
         criteria: Union[QuestionListingType, TopQuestionsListingType, MarkedQuestionListingType],
         save_to_file: bool,
+        choice_order: Optional[ChoiceOrder] = None,
     ) -> None:
-        output = [utils.get_header(criteria.name)]
-        output.extend(result_text)
-        answers = get_answers(result)
-        if answers:
-            output.append(utils.get_header("Answers"))
-            output.extend(answers)
-        output.append(f"Count: {len(result)}")
+        output = self._iter_list_output(result, result_text, criteria, choice_order)
         if save_to_file:
             self._save_to_file(output, criteria)
         else:
             for line in output:
                 print(line)
 
+    @staticmethod
+    def _iter_list_output(
+        result: Union[List[Question], Dict[Any, Any]],
+        result_text: Iterable[str],
+        criteria: Union[QuestionListingType, TopQuestionsListingType, MarkedQuestionListingType],
+        choice_order: Optional[ChoiceOrder] = None,
+    ) -> Iterator[str]:
+        """Yield the lines of the listing: header, questions, answers and count.
+
+        The answers and the count are produced once the question text is consumed, as the result
+        of a criteria returning an iterator is filled while its text is formatted.
+        """
+        yield utils.get_header(criteria.name)
+        yield from result_text
+        # grouped results (same answer, question answer) already show the answer of each group
+        answers = iter_answers(result if isinstance(result, list) else [], choice_order)
+        first_answer = next(answers, None)
+        if first_answer is not None:
+            yield utils.get_header("Answers")
+            yield first_answer
+            yield from answers
+        yield f"Count: {len(result)}"
+
     def _save_to_file(
         self,
-        output: List[str],
+        output: Iterable[str],
         criteria: Union[QuestionListingType, TopQuestionsListingType, MarkedQuestionListingType],
-    ) -> None:
+    ) -> Path:
         filename = criteria.get_filename()
         output_file = Path(self.country.code) / self.exam_type.id / filename
-        utils.save_output(output_file, "\n".join(output), self.output_folder)
+        utils.save_output_lines(str(output_file), output, self.output_folder)
         output_path = Path(self.output_folder) / output_file
         logger.info("Questions saved to %s", output_path)
+        return output_path
 
     def list(
         self,
@@ -163,13 +432,85 @@ class QuestionProcessor:
         save_to_file: bool = True,
     ) -> None:
         """List the questions based on the criteria."""
+        self.set_answer_display(answer_display)
+        choice_order = ChoiceOrder()
+        result, result_text = self._qb.iter_questions(criteria, max_questions, choice_order)
+        self._process_list_result(result, result_text, criteria, save_to_file, choice_order)
+
+    def set_answer_display(
+        self, answer_display: Union[QuestionAnswerDisplay, QuizAnswerDisplay]
+    ) -> None:
+        """Set the answer display of the listed questions."""
         if answer_display:
             if Question.question_display is None:
                 Question.question_display = QuestionDisplay(answer_display)
             else:
                 Question.question_display.answer_display = answer_display
-        result, result_text = self._qb.get_questions(criteria, max_questions)
-        self._process_list_result(result, result_text, criteria, save_to_file)
+
+    def save_listing(
+        self,
+        criteria: Union[QuestionListingType, TopQuestionsListingType],
+        max_questions: int = 0,
+    ) -> Path:
+        """Save the listing of the criteria to its file and return the path of the file."""
+        choice_order = ChoiceOrder()
+        result, result_text = self._qb.iter_questions(criteria, max_questions, choice_order)
+        output = self._iter_list_output(result, result_text, criteria, choice_order)
+        return self._save_to_file(output, criteria)
+
+    def list_all(
+        self,
+        answer_display: Union[QuestionAnswerDisplay, QuizAnswerDisplay],
+        max_questions: int = constants.DEFAULT_TOP_QUESTIONS_COUNT,
+        save_to_file: bool = True,
+        max_workers: Optional[int] = None,
+    ) -> List[Path]:
+        """List the questions of every general and top questions criteria.
+
+        The question bank is loaded once and the listings are computed concurrently, each saved
+        to the file of its criteria. Printed listings are produced one after the other.
+
+        :param answer_display: Answer display of the listed questions.
+        :param max_questions: Number of questions of the top questions listings.
+        :param save_to_file: Whether to save the listings to files or print them.
+        :param max_workers: Maximum number of concurrent listings (default is None, the number
+            of processors).
+        :return: Paths of the saved listings.
+        """
+        global _forked_processor  # pylint: disable=global-statement
+        self.set_answer_display(answer_display)
+        if not save_to_file:
+            for criteria in LISTING_TYPES:
+                self.list(
+                    criteria,
+                    answer_display,
+                    self._get_max_questions(criteria, max_questions),
+                    False,
+                )
+            return []
+        self._qb.prepare_listings()
+        _forked_processor = self
+        try:
+            with get_listing_executor(max_workers) as executor:
+                if isinstance(executor, ProcessPoolExecutor):
+                    save = _save_forked_listing
+                else:
+                    save = self.save_listing
+                futures = [
+                    executor.submit(
+                        save, criteria, self._get_max_questions(criteria, max_questions)
+                    )
+                    for criteria in LISTING_TYPES
+                ]
+                return [future.result() for future in futures]
+        finally:
+            _forked_processor = None
+
+    @staticmethod
+    def _get_max_questions(
+        criteria: Union[QuestionListingType, TopQuestionsListingType], max_questions: int
+    ) -> int:
+        return max_questions if isinstance(criteria, TopQuestionsListingType) else 0
 
     def list_marked(
         self,
@@ -178,11 +519,114 @@ class QuestionProcessor:
         questions_count: int = constants.MIN_MARKED_QUESTIONS_COUNT,
         save_to_file: bool = True,
     ) -> None:
-        """List marked questions based on the criteria."""
+        """List marked questions based on the criteria.
+
+        With a progress store, only the metrics at or above the question count are read, through
+        the index of the metric field.
+        """
         if Question.question_display is None:
             Question.question_display = QuestionDisplay(answer_display)
         if answer_display:
             Question.question_display.answer_display = answer_display
-        metrics = utils.load_question_metrics(self.metrics_file_path)
-        result, result_text = self._qb.get_marked_questions(criteria, metrics, questions_count)
-        self._process_list_result(result, result_text, criteria, save_to_file)
+        metrics = None
+        field = MARKED_METRIC_FIELDS.get(criteria)
+        if self.progress_store_file_path and field:
+            with ProgressStore(self.progress_store_file_path) as store:
+                metrics = store.get_metrics_at_least(
+                    self.country.code, self.exam_type.id, field, questions_count
+                )
+        choice_order = ChoiceOrder()
+        result, result_text = self._qb.iter_marked_questions(
+            criteria,
+            metrics=metrics,
+            question_count=questions_count,
+            choice_order=choice_order,
+        )
+        self._process_list_result(result, result_text, criteria, save_to_file, choice_order)
+
+    def search(
+        self, terms: str, max_results: int = constants.DEFAULT_SEARCH_RESULTS_COUNT
+    ) -> List[Tuple[float, Question]]:
+        """Search the question text and choices, best match first.
+
+        The search index is persisted next to the question bank file and rebuilt when the
+        hash of the question bank file changes. The hash is the one taken when the question bank
+        was loaded.
+        """
+        index = SearchIndex.load_or_build(
+            get_search_index_path(self._qb.derived_filepath),
+            self._qb.questions,
+            self._qb.file_hash,
+            self._qb.file_stat,
+        )
+        questions = {question.question_number: question for question in self._qb.questions}
+        return [
+            (score, questions[question_number])
+            for question_number, score in index.search(terms, max_results)
+            if question_number in questions
+        ]
+
+    def diff(self, apply: bool = False, save_to_file: bool = True) -> None:
+        """Compare the question bank with the release its manifest was saved for.
+
+        With apply, the metrics, marked questions and review schedule files are migrated to the
+        new question numbers, the search index is updated for the changed questions only, and
+        the manifest becomes the baseline for the next release.
+        """
+        manifest_path = get_manifest_path(self.file_path)
+        new_manifest = BankManifest.from_questions(
+            self._qb.get_manifest_questions(), self._qb.file_hash
+        )
+        old_manifest = BankManifest.load(manifest_path)
+        if old_manifest is None:
+            new_manifest.save(manifest_path)
+            logger.info("No manifest found, saved the current question bank as the baseline")
+            return
+        diff = old_manifest.diff(new_manifest)
+        output = [utils.get_header(f"Question bank diff: {self.exam_type.id}")]
+        output.extend(diff.format())
+        if save_to_file:
+            output_file = Path(self.country.code) / self.exam_type.id
+            output_file = output_file / constants.BANK_DIFF_OUTPUT_FILENAME
+            utils.save_output(str(output_file), "\n".join(output), self.output_folder)
+            logger.info("Question bank diff saved to %s", Path(self.output_folder) / output_file)
+        else:
+            for line in output:
+                print(line)
+        if not apply:
+            return
+        if diff.has_changes:
+            # the delta files of the metrics have the previous question numbers
+            MetricsRepository.get(self.metrics_file_path).merge_deltas()
+            for path in (
+                self.metrics_file_path,
+                self.marked_questions_file_path,
+                self.review_schedule_file_path,
+            ):
+                with FileLock(str(path)):
+                    dropped = migrate_question_numbers_file(path, diff)
+                logger.info("Migrated %s, %d removed questions dropped", path, dropped)
+            if self.progress_store_file_path:
+                with ProgressStore(self.progress_store_file_path) as store:
+                    dropped = store.migrate_question_numbers(
+                        self.country.code, self.exam_type.id, diff.renumbered, diff.removed
+                    )
+                logger.info(
+                    "Migrated %s, %d removed questions dropped",
+                    self.progress_store_file_path,
+                    dropped,
+                )
+            index_path = get_search_index_path(self._qb.derived_filepath)
+            index = SearchIndex.load(index_path, old_manifest.file_hash)
+            if index:
+                index.update(
+                    self._qb.questions,
+                    diff.get_unchanged_content_mapping(),
+                    new_manifest.file_hash,
+                    self._qb.file_stat,
+                ).save(index_path)
+        new_manifest.save(manifest_path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Compute the statistics of the question bank."""
+        return get_question_bank_stats(self._qb)
@@ -1,19 +1,135 @@
 """QuizProcessor class to process the quiz based on the quiz source"""
 
+import json
 import os
+import random
+import time
 from typing import TYPE_CHECKING, Dict, List, Optional
 
-from hrt.common import utils
-from hrt.common.enums import QuestionDisplayMode, QuizAnswerDisplay, QuizSource
+from hrt.common import constants, utils
+from hrt.common.answer_log import AnswerLog, AnswerRecorder, new_session_id
+from hrt.common.answer_stats import format_answer_stats, get_answer_stats
+from hrt.common.config_reader import logger
+from hrt.common.enums import ExamType, QuestionDisplayMode, QuizAnswerDisplay, QuizSource
+from hrt.common.file_lock import FileLock
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.metrics_repository import MetricsRepository
+from hrt.common.progress_store import ProgressStore
+from hrt.common.question import ChoiceOrder
 from hrt.common.question_bank import IQuestionBank
 from hrt.common.question_metric import QuestionMetric
+from hrt.common.question_query import QuestionQuery
 from hrt.common.quiz import IQuiz, QuizFactory
+from hrt.common.quiz_journal import (
+    QuizJournal,
+    fold_marks,
+    fold_metrics,
+    get_pending_records,
+    replay_records,
+)
+from hrt.common.review_schedule import (
+    SECONDS_PER_DAY,
+    ReviewItem,
+    ReviewSchedule,
+    get_review_quality,
+)
 from hrt.common.utils import get_header
 
 if TYPE_CHECKING:
     from hrt.common.question import Question  # pragma: no cover
 
 
+class AdaptiveWeights:
+    """Weights of the questions of an adaptive quiz.
+
+    The weight of a question is the base weight, plus the wrong weight per wrong answer and the
+    skip weight per skip, plus the recent weight if its last answer was wrong or skipped,
+    divided by one plus the number of days since that answer.
+    """
+
+    def __init__(self, base: float, wrong: float, skip: float, recent: float):
+        if min(base, wrong, skip, recent) < 0:
+            raise ValueError("Adaptive weights must not be negative")
+        self.base = base
+        self.wrong = wrong
+        self.skip = skip
+        self.recent = recent
+
+    @staticmethod
+    def from_config(quiz_config: Dict) -> "AdaptiveWeights":
+        """Adaptive weights of the quiz configuration, with the defaults for the missing ones."""
+        weights = {**constants.DEFAULT_ADAPTIVE_WEIGHTS, **quiz_config.get("adaptive_weights", {})}
+        return AdaptiveWeights(
+            float(weights["base"]),
+            float(weights["wrong"]),
+            float(weights["skip"]),
+            float(weights["recent"]),
+        )
+
+    def get_weight(
+        self, metric: Optional[QuestionMetric], review: Optional[ReviewItem], now: int
+    ) -> float:
+        """Returns the weight of a question from its metric and review state."""
+        weight = self.base
+        if metric is not None:
+            weight += self.wrong * metric.wrong_attempts + self.skip * metric.skip_count
+        if review is not None and review.repetitions == 0:
+            last_review = review.due - review.interval * SECONDS_PER_DAY
+            days = max(0, now - last_review) / SECONDS_PER_DAY
+            weight += self.recent / (1 + days)
+        return weight
+
+
+def get_metrics_folder(metrics_config: Dict, exam_type: ExamType) -> str:
+    """Returns the folder of the progress files of an exam type."""
+    metrics_dir = metrics_config.get("folder")
+    if not metrics_dir:
+        raise ValueError("Metrics folder not found in the config file")
+    return os.path.join(str(metrics_dir), exam_type.country.code, exam_type.id)
+
+
+def get_answer_log(metrics_config: Dict, exam_type: ExamType) -> AnswerLog:
+    """Returns the answer log of an exam type."""
+    return AnswerLog(
+        os.path.join(
+            get_metrics_folder(metrics_config, exam_type),
+            metrics_config.get("answer_log_folder", constants.DEFAULT_ANSWER_LOG_FOLDER),
+        )
+    )
+
+
+def report_answer_stats(
+    question_bank: IQuestionBank,
+    metrics_config: Dict,
+    json_format: bool = False,
+    period: int = SECONDS_PER_DAY,
+    top: int = 10,
+) -> None:
+    """Report the learning statistics of the answer log of the exam type of the question bank.
+    :param question_bank: Loaded question bank, for the categories of the questions.
+    :param metrics_config: Metrics configuration.
+    :param json_format: Whether to print the statistics as JSON (default is False).
+    :param period: Length of the accuracy periods in seconds (default is a day).
+    :param top: Number of slowest questions (default is 10).
+    """
+    et = question_bank.exam_type
+    categories = {
+        q.question_number: q.category.category_id
+        for q in question_bank.questions
+        if q.category is not None
+    }
+    answers = get_answer_log(metrics_config, et).read()
+    stats = {
+        "country": et.country.code,
+        "exam_type": et.id,
+        **get_answer_stats(answers, categories, period, top),
+    }
+    if json_format:
+        print(json.dumps(stats, indent=2))
+    else:
+        print("\n".join(format_answer_stats(stats)))
+
+
 class QuizProcessor:
     """QuizProcessor class to process the quiz based on the quiz source"""
 
@@ -27,7 +143,13 @@ class QuizProcessor:
         quiz_config: Dict,
         print_config: Dict,
         metrics_config: Dict,
+        seed: Optional[int] = None,
+        resume: bool = False,
     ):
+        """Create the quiz processor.
+        :param resume: Whether to resume the quiz of the journal instead of drawing a new one
+            (default is False).
+        """
         self._question_bank = question_bank
         self._number_of_questions = number_of_questions
         self._display_mode = display_mode
@@ -36,42 +158,32 @@ class QuizProcessor:
         self._quiz_config = quiz_config
         self._print_config = print_config
         self._metrics_config = metrics_config
+        # questions and choice orders are drawn from the same generator, so a seed reproduces
+        # the whole quiz
+        self._random = random.Random(seed)
         self._quiz: Optional[IQuiz] = None
-        self._initialize_quiz()
+        self._review_schedule: Optional[ReviewSchedule] = None
+        self._resume = resume
+        self._journal: Optional[QuizJournal] = None
+        self._journal_lock: Optional[FileLock] = None
+        self._resumed_records: List[Dict] = []
+        self._answer_session = new_session_id()
+        if resume:
+            self._initialize_resumed_quiz()
+        else:
+            self._initialize_quiz()
 
     def _initialize_quiz(self) -> None:
-        excluded_questions: List[str] = []
-        included_questions: List[str] = []
-        include_marked = False
-        if self._quiz_source == QuizSource.MARKED:
-            include_marked = True
-        elif self._quiz_source == QuizSource.NEW:
-            excluded = self._get_metric_questions()
-            excluded_questions = [q.question_number for q in excluded]
-        elif self._quiz_source == QuizSource.SKIPPED_QUESTIONS:
-            excluded = self._get_metric_questions()
-            excluded_questions = [
-                q.question_number for q in excluded if q.skip_count > 0 and q.correct_attempts == 0
-            ]
-        elif self._quiz_source == QuizSource.EXCLUDE_CORRECT_ANSWERS:
-            excluded = self._get_metric_questions()
-            excluded_questions = [q.question_number for q in excluded if q.correct_attempts > 0]
-        elif self._quiz_source == QuizSource.WRONG_ANSWERS:
-            included = self._get_metric_questions()
-            included_questions = [q.question_number for q in included if q.wrong_attempts > 0]
-            include_marked = True
-        elif self._quiz_source == QuizSource.OLD:
-            included = self._get_metric_questions()
-            included_questions = [q.question_number for q in included]
-            include_marked = True
-        elif self._quiz_source == QuizSource.ALL:
-            pass
+        if self._quiz_source == QuizSource.BLUEPRINT:
+            questions = self._question_bank.get_blueprint_questions(
+                self._number_of_questions, self._random
+            )
+        elif self._quiz_source == QuizSource.DUE:
+            questions = self._get_due_questions()
+        elif self._quiz_source == QuizSource.ADAPTIVE:
+            questions = self._get_adaptive_questions()
         else:
-            raise ValueError(f"Invalid quiz source: {self._quiz_source}")
-
-        questions = self._question_bank.get_random_questions(
-            self._number_of_questions, include_marked, included_questions, excluded_questions
-        )
+            questions = self._get_random_questions()
         if not questions:
             print("No questions found for the quiz.")
             return
@@ -82,7 +194,99 @@ class QuizProcessor:
             self._display_mode,
             self._answer_display,
             self._quiz_config,
+            ChoiceOrder(self._random),
+        )
+
+    def _initialize_resumed_quiz(self) -> None:
+        """Rebuild the quiz of the journal and replay its events."""
+        journal = QuizJournal(self._get_journal_file_path())
+        header, records = journal.read() if journal.exists() else (None, [])
+        if header is None:
+            print("No quiz to resume.")
+            return
+        if header["exam_type"] != self._question_bank.exam_type.id:
+            raise ValueError(
+                f"The quiz to resume is for exam type {header['exam_type']}, "
+                f"not {self._question_bank.exam_type.id}"
+            )
+        question_numbers = [entry["question"] for entry in header["questions"]]
+        by_number = {
+            q.question_number: q
+            for q in self._question_bank.query().including(question_numbers).questions()
+        }
+        missing = [qn for qn in question_numbers if qn not in by_number]
+        if missing:
+            raise ValueError(f"Questions of the quiz to resume not found: {', '.join(missing)}")
+        choice_order = ChoiceOrder(self._random)
+        for entry in header["questions"]:
+            choice_order.set(by_number[entry["question"]], entry["order"])
+        self._display_mode = QuestionDisplayMode.from_id(header["display_mode"])
+        self._answer_display = QuizAnswerDisplay.from_id(header["answer_display"])
+        self._quiz_source = QuizSource.from_id(header["quiz_source"])
+        self._number_of_questions = len(question_numbers)
+        self._quiz = QuizFactory.get_quiz(
+            self._number_of_questions,
+            [by_number[qn] for qn in question_numbers],
+            self._question_bank.exam_type,
+            self._display_mode,
+            self._answer_display,
+            self._quiz_config,
+            choice_order,
         )
+        replay_records(self._quiz.get_session(), records)
+        self._answer_session = header.get("session", self._answer_session)
+        self._resumed_records = get_pending_records(records)
+
+    def _get_random_questions(self) -> List["Question"]:
+        query = self._get_source_query()
+        return query.sample(self._number_of_questions, self._random)
+
+    def _get_due_questions(self) -> List["Question"]:
+        """Questions due for review first, then questions never reviewed."""
+        schedule = self._get_review_schedule()
+        query = self._question_bank.query()
+        question_numbers = {q.question_number for q in self._question_bank.questions}
+        due = schedule.get_due(self._number_of_questions, int(time.time()), question_numbers)
+        questions = query.including(due).questions()
+        remaining = self._number_of_questions - len(questions)
+        if remaining > 0:
+            new_questions = query.excluding(schedule.question_numbers)
+            questions.extend(new_questions.sample(remaining, self._random))
+        return questions
+
+    def _get_adaptive_questions(self) -> List["Question"]:
+        """Questions drawn with weights from their metrics and review state."""
+        adaptive_weights = AdaptiveWeights.from_config(self._quiz_config)
+        schedule = self._get_review_schedule()
+        metrics = self._question_bank.metrics
+        now = int(time.time())
+        weights = [
+            adaptive_weights.get_weight(
+                metrics.get(q.question_number), schedule.get(q.question_number), now
+            )
+            for q in self._question_bank.questions
+        ]
+        query = self._question_bank.query()
+        return query.weighted_sample(self._number_of_questions, weights, self._random)
+
+    def _get_source_query(self) -> QuestionQuery:
+        query = self._question_bank.query()
+        if self._quiz_source in (QuizSource.ALL, QuizSource.EXCLUDE_MARKED_QUESTIONS):
+            return query.unmarked()
+        if self._quiz_source == QuizSource.MARKED:
+            return query.marked()
+        if self._quiz_source == QuizSource.NEW:
+            return query.unmarked().without_metrics()
+        if self._quiz_source == QuizSource.SKIPPED_QUESTIONS:
+            skipped = query.skipped_at_least(1) - query.correct_at_least(1)
+            return query.unmarked() - skipped
+        if self._quiz_source == QuizSource.EXCLUDE_CORRECT_ANSWERS:
+            return query.unmarked() - query.correct_at_least(1)
+        if self._quiz_source == QuizSource.WRONG_ANSWERS:
+            return query.marked().wrong_at_least(1)
+        if self._quiz_source == QuizSource.OLD:
+            return query.marked().with_metrics()
+        raise ValueError(f"Invalid quiz source: {self._quiz_source}")
 
     def process(self) -> None:
         """Process the quiz"""
@@ -90,11 +294,147 @@ class QuizProcessor:
             print("Quiz not initialized. Exiting...")
             return
         self._quiz.pre_process()
-        self._quiz.start()
+        journal = self._open_journal()
+        if journal is None and self._resume:
+            return
+        session = self._quiz.get_session()
+        recorder = AnswerRecorder(
+            get_answer_log(self._metrics_config, self._question_bank.exam_type),
+            session.choice_order,
+            self._answer_session,
+        )
+        session.add_listener(recorder.record)
+        if journal:
+            session.add_listener(journal.record)
+        try:
+            if self._resume:
+                self._quiz.resume()
+            else:
+                self._quiz.start()
+        except BaseException:
+            # the events are already in the journal, the quiz can be resumed
+            self._release_journal()
+            raise
+        finally:
+            session.remove_listener(recorder.record)
+            if journal:
+                session.remove_listener(journal.record)
+        self._quiz.apply_session()
         self._quiz.post_process()
         self._display_answers()
         self._save_marked_questions()
         self._save_metrics()
+        self._save_review_schedule()
+        self._close_journal()
+
+    def _get_journal_file_path(self) -> str:
+        metrics_dir = os.path.dirname(self._get_metrics_file_path())
+        return os.path.join(
+            metrics_dir,
+            self._metrics_config.get("journal_filename", constants.DEFAULT_QUIZ_JOURNAL_FILENAME),
+        )
+
+    def _open_journal(self) -> Optional[QuizJournal]:
+        """Open the journal of the quiz, saving the progress of an unfinished quiz it replaces.
+
+        The journal is locked while the quiz runs. If another quiz of the exam type holds it, the
+        quiz runs without a journal and cannot be resumed.
+
+        :return: The journal, None if another quiz holds it.
+        """
+        journal_file = self._get_journal_file_path()
+        journal_lock = FileLock(journal_file)
+        if not journal_lock.acquire(blocking=False):
+            if self._resume:
+                print("The quiz is already in progress in another session.")
+            else:
+                print(
+                    "Another quiz of this exam type is in progress, "
+                    "this quiz cannot be resumed if it is interrupted."
+                )
+            return None
+        self._journal_lock = journal_lock
+        journal = QuizJournal(journal_file)
+        if self._resume:
+            journal.reopen(self._resumed_records)
+        else:
+            if journal.exists():
+                self._recover_journal(journal)
+            journal.start(self._get_journal_header())
+        self._journal = journal
+        return journal
+
+    def _get_journal_header(self) -> Dict:
+        quiz = self._quiz
+        if quiz is None:
+            raise ValueError("Quiz not initialized")
+        choice_order = quiz.get_session().choice_order
+        return {
+            "exam_type": self._question_bank.exam_type.id,
+            "quiz_source": self._quiz_source.id,
+            "display_mode": self._display_mode.id,
+            "answer_display": self._answer_display.id,
+            "session": self._answer_session,
+            "questions": [
+                {"question": q.question_number, "order": list(choice_order.get(q))}
+                for q in quiz.get_questions()
+            ],
+        }
+
+    def _recover_journal(self, journal: QuizJournal) -> None:
+        """Save the progress of the unfinished quiz of the journal and delete the journal."""
+        try:
+            _, records = journal.read()
+        except ValueError as e:
+            logger.warning("Discarding the unfinished quiz journal: %s", e)
+            journal.remove()
+            return
+        pending = get_pending_records(records)
+        metrics = fold_metrics(pending)
+        marks = fold_marks(pending)
+        if metrics or marks:
+            questions = self._question_bank.query().including(marks).questions()
+            for question in questions:
+                question.is_marked = marks[question.question_number]
+            self._save_marked_questions(marks)
+            self._save_metrics(metrics)
+            self._save_review_schedule(metrics)
+            print(f"Saved the progress of an unfinished quiz ({len(metrics)} questions).")
+        journal.remove()
+
+    def _close_journal(self) -> None:
+        """Delete the journal of a finished quiz, or checkpoint it so the quiz can be resumed."""
+        journal = self._journal
+        if journal is None or self._quiz is None:
+            return
+        if self._quiz.get_session().is_finished:
+            journal.remove()
+        else:
+            journal.checkpoint()
+            journal.close()
+            print("Quiz saved. Run 'quiz resume' to continue it.")
+        self._release_journal()
+
+    def _release_journal(self) -> None:
+        """Close the journal and release its lock."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if self._journal_lock is not None:
+            self._journal_lock.release()
+            self._journal_lock = None
+
+    def _get_session_metrics(self) -> List[QuestionMetric]:
+        """Metrics of the quiz not saved yet.
+
+        With a journal, they are folded from the events after its last checkpoint, so the answers
+        of a resumed quiz saved before it was interrupted are not counted again.
+        """
+        if self._journal is not None:
+            return fold_metrics(self._journal.pending)
+        if self._quiz:
+            return [q.metric for q in self._quiz.get_questions() if q.metric]
+        return []
 
     def _display_answers(self) -> None:
         if self._answer_display == QuizAnswerDisplay.IN_THE_END:
@@ -102,75 +442,114 @@ class QuizProcessor:
             if self._quiz:
                 for count, q in enumerate(self._quiz.get_questions(), start=1):
                     if q.metric.wrong_attempts > 0:
-                        print(f"[{count}] {q.question_number} ({q.answer_index + 1}) {q.answer}")
+                        answer_number = self._quiz.get_answer_index(q) + 1
+                        print(f"[{count}] {q.question_number} ({answer_number}) {q.answer}")
+
+    def _get_session_marks(self) -> Dict[QuestionNumber, bool]:
+        """Marked status of the questions of the quiz not saved yet."""
+        if self._journal is not None:
+            return fold_marks(self._journal.pending)
+        if self._quiz:
+            return {q.question_number: q.is_marked for q in self._quiz.get_questions()}
+        return {}
+
+    def _save_marked_questions(self, marks: Optional[Dict[QuestionNumber, bool]] = None) -> None:
+        """Save the marked questions.
 
-    def _save_marked_questions(self) -> None:
+        Only the marked status of the questions of the quiz is updated. The marked questions
+        file is read again and rewritten while holding its lock, so the questions marked by
+        another quiz in the meantime are kept.
+
+        :param marks: Marked status of the questions to update (default is None, the marked
+            status of the questions of the quiz not saved yet).
+        """
+        if marks is None:
+            marks = self._get_session_marks()
+        progress_store_file = self._get_progress_store_file_path()
+        if progress_store_file:
+            et = self._question_bank.exam_type
+            with ProgressStore(progress_store_file) as store:
+                store.set_marked_questions(et.country.code, et.id, marks)
+            return
         marked_questions_file = self._question_bank.get_marked_questions_filepath()
         if not marked_questions_file:
             raise ValueError("Marked questions file path not found")
 
-        marked_questions_dir = os.path.dirname(marked_questions_file)
-        os.makedirs(marked_questions_dir, exist_ok=True)
-
-        with open(marked_questions_file, "w", encoding="utf-8") as f:
-            if self._quiz:
-                mqs: List["Question"] = self._quiz.get_marked_questions()
-                question_numbers = [q.question_number for q in mqs]
-                questions = self._question_bank.get_all_marked_questions()
-                for q in questions:
-                    if q.question_number not in question_numbers:
-                        question_numbers.append(q.question_number)
-                        mqs.append(q)
-
-                question_numbers.sort()
-                for q in question_numbers:
-                    f.write(f"{q}\n")
+        with FileLock(marked_questions_file):
+            lines = []
+            if os.path.exists(marked_questions_file):
+                lines = utils.read_delim_file(marked_questions_file, delimiter="\n")
+            question_numbers = {QuestionNumber(item) for line in lines for item in line if item}
+            question_numbers.update(qn for qn, is_marked in marks.items() if is_marked)
+            question_numbers.difference_update(
+                qn for qn, is_marked in marks.items() if not is_marked
+            )
+            utils.replace_file_lines(marked_questions_file, sorted(question_numbers))
 
     def _get_metrics_file_path(self) -> str:
-        et = self._question_bank.exam_type
-        country = et.country
-        exam_type = et.id
+        metrics_dir = get_metrics_folder(self._metrics_config, self._question_bank.exam_type)
+        return os.path.join(metrics_dir, self._metrics_config.get("filename", "metrics.txt"))
+
+    def _get_progress_store_file_path(self) -> Optional[str]:
+        database = self._metrics_config.get("database")
+        if not database:
+            return None
         metrics_dir = self._metrics_config.get("folder")
         if not metrics_dir:
             raise ValueError("Metrics folder not found in the config file")
-        metrics_dir = os.path.join(metrics_dir, country.code, exam_type)
-        return os.path.join(str(metrics_dir), self._metrics_config.get("filename", "metrics.txt"))
+        return os.path.join(metrics_dir, database)
+
+    def _get_metrics_repository(self) -> MetricsRepository:
+        return MetricsRepository.get(self._get_metrics_file_path())
 
     def _get_metric_questions(self) -> List[QuestionMetric]:
-        metrics_file = self._get_metrics_file_path()
-        return utils.read_metrics_from_file(metrics_file)
+        return list(self._get_metrics_repository().get_metrics().values())
 
-    def _save_metrics(self) -> None:
-        metrics_file = self._get_metrics_file_path()
-        os.makedirs(os.path.dirname(metrics_file), exist_ok=True)
+    def _save_metrics(self, metrics: Optional[List[QuestionMetric]] = None) -> None:
+        """Add the metrics of the quiz to the metrics file, or to the progress store if it is set.
+        :param metrics: Metrics to add (default is None, the metrics of the quiz not saved yet).
+        """
+        if metrics is None:
+            metrics = self._get_session_metrics()
+        progress_store_file = self._get_progress_store_file_path()
+        if progress_store_file:
+            et = self._question_bank.exam_type
+            with ProgressStore(progress_store_file) as store:
+                store.add_metrics(et.country.code, et.id, metrics)
+            return
+        self._get_metrics_repository().save_metrics(metrics)
 
-        existing_metrics = self._get_metric_questions()
-        if self._quiz:
-            for q in self._quiz.get_questions():
-                metric = q.metric
-                if metric:
-                    existing_metric = next(
-                        (
-                            m
-                            for m in existing_metrics
-                            if m.question_number == metric.question_number
-                        ),
-                        None,
-                    )
-                    if existing_metric:
-                        existing_metric.correct_attempts += metric.correct_attempts
-                        existing_metric.wrong_attempts += metric.wrong_attempts
-                        existing_metric.skip_count += metric.skip_count
-                    else:
-                        existing_metrics.append(metric)
-
-        existing_metrics.sort(key=lambda x: str(x.question_number))
-
-        with open(metrics_file, "w", encoding="utf-8") as f:
-            for metric in existing_metrics:
-                f.write(
-                    f"{metric.question_number}:"
-                    f"{metric.correct_attempts}:"
-                    f"{metric.wrong_attempts}:"
-                    f"{metric.skip_count}\n"
-                )
+    def _get_review_schedule_file_path(self) -> str:
+        metrics_dir = os.path.dirname(self._get_metrics_file_path())
+        return os.path.join(
+            metrics_dir,
+            self._metrics_config.get(
+                "review_schedule_filename", constants.DEFAULT_REVIEW_SCHEDULE_FILENAME
+            ),
+        )
+
+    def _get_review_schedule(self) -> ReviewSchedule:
+        if self._review_schedule is None:
+            self._review_schedule = ReviewSchedule.load(self._get_review_schedule_file_path())
+        return self._review_schedule
+
+    def _save_review_schedule(self, metrics: Optional[List[QuestionMetric]] = None) -> None:
+        """Update the review schedule with the questions answered in the quiz.
+        :param metrics: Metrics of the answers (default is None, the metrics of the quiz not
+            saved yet).
+        """
+        if metrics is None:
+            if not self._quiz:
+                return
+            metrics = self._get_session_metrics()
+        review_schedule_file = self._get_review_schedule_file_path()
+        now = int(time.time())
+        # the schedule is read again, another quiz may have saved it since it was loaded
+        with FileLock(review_schedule_file):
+            schedule = ReviewSchedule.load(review_schedule_file)
+            for metric in metrics:
+                quality = get_review_quality(metric)
+                if quality is not None:
+                    schedule.review(metric.question_number, quality, now)
+            schedule.save(review_schedule_file)
+        self._review_schedule = schedule
@@ -1,15 +1,22 @@
 """This module contains the implementation of the CAQuestionBank class."""
 
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Collection, Dict, Iterator, List, Optional
 
-from hrt.common import utils
-from hrt.common.enums import CountryCode, ExamType, QuestionDisplayMode
+from hrt.common import constants, utils
+from hrt.common.config_reader import logger
+from hrt.common.enums import CountryCode, ExamType, QuestionDisplayMode, QuestionLanguage
 from hrt.common.hrt_types import QuestionNumber
+from hrt.common.language_columns import LanguageColumns
+from hrt.common.metrics_repository import MetricsRepository
+from hrt.common.progress_store import ProgressStore
 from hrt.common.question import Question, QuestionCategory
 from hrt.common.question_bank import QuestionBank
 from hrt.common.question_metric import QuestionMetric
 
+# question text, correct answer and three incorrect answers, per language
+LANGUAGE_FIELDS_COUNT = 5
+
 
 def get_question_category_id(question_number: QuestionNumber) -> str:
     """Get the category ID from the question number."""
@@ -27,7 +34,10 @@ class CAQuestionBank(QuestionBank):
         categories_filepath: Optional[Path] = None,
         marked_questions_filepath: Optional[Path] = None,
         metrics_filepath: Optional[Path] = None,
+        language: QuestionLanguage = QuestionLanguage.EN,
+        progress_store_filepath: Optional[Path] = None,
     ):
+        self._language_columns: Optional[LanguageColumns] = None
         super().__init__(
             CountryCode.CANADA,
             exam_type,
@@ -36,6 +46,8 @@ class CAQuestionBank(QuestionBank):
             str(categories_filepath) if categories_filepath else None,
             str(marked_questions_filepath) if marked_questions_filepath else None,
             str(metrics_filepath) if metrics_filepath else None,
+            language,
+            progress_store_filepath,
         )
 
     def load_categories(self) -> List[QuestionCategory]:
@@ -45,40 +57,115 @@ class CAQuestionBank(QuestionBank):
         ]
 
     def load_metrics(self) -> Dict[QuestionNumber, QuestionMetric]:
-        metrics = (
-            utils.read_metrics_from_file(str(self.metrics_filepath))
-            if self.metrics_filepath
-            else []
-        )
-        return {metric.question_number: metric for metric in metrics}
+        if self.progress_store_filepath:
+            with ProgressStore(self.progress_store_filepath) as store:
+                return store.load_metrics(self.country.code, self.exam_type.id)
+        if not self.metrics_filepath:
+            return {}
+        return MetricsRepository.get(self.metrics_filepath).get_metrics()
 
     def load_questions(self) -> List[Question]:
-        result: List[Question] = []
-        questions = utils.read_delim_file(
-            str(self.filepath),
-            delimiter=";",
-            skip_header=True,
-            header="question_id",
-            fields_count=6,
-        )
-        for q in questions:
-            question_number = q[0]
-            question_text = q[1]
-            # use the rest of the fields split by comma as choices
-            choices = q[2:6]
-            answer = q[2]
-            category_id = get_question_category_id(QuestionNumber(question_number))
-            category = self.get_category_by_id(category_id)
-            metric = self.metrics.get(QuestionNumber(question_number))
-            q = Question(
-                question_text, choices, answer, QuestionNumber(question_number), category, metric
+        """Load the questions in the language of the question bank.
+
+        The English and French columns of the question bank file are indexed by byte offset and
+        only the columns of the language of the question bank are decoded.
+        """
+        try:
+            self._language_columns = LanguageColumns(
+                self.filepath, 1 + LANGUAGE_FIELDS_COUNT, delimiter=";", header="question_id"
             )
-            result.append(q)
-        return result
-
-    def get_category_by_id(self, category_id: str) -> Optional[QuestionCategory]:
-        """Get the category by its ID."""
-        for category in self.categories:
-            if category.category_id == category_id:
-                return category
-        return None
+        except OSError as e:
+            logger.error("Error: The file at %s could not be read: %s", self.filepath, e)
+            self._language_columns = None
+            return []
+        return list(self._create_questions(self.language))
+
+    def get_manifest_questions(self) -> List[Question]:
+        if self.language == QuestionLanguage.EN or self._language_columns is None:
+            return self.questions
+        return list(self._create_questions(QuestionLanguage.EN))
+
+    def _create_questions(self, language: QuestionLanguage) -> Iterator[Question]:
+        skipped = 0
+        for question_number, fields in read_language_fields(self._language_columns, language):
+            if len(fields) < LANGUAGE_FIELDS_COUNT:
+                skipped += 1
+                continue
+            category = self.get_category_by_id(get_question_category_id(question_number))
+            metric = self.metrics.get(question_number)
+            yield create_question(question_number, fields, category, metric)
+        if skipped:
+            logger.warning("Skipped %d questions without %s text", skipped, language.description)
+
+
+def read_language_fields(
+    columns: LanguageColumns,
+    language: QuestionLanguage,
+    question_numbers: Optional[Collection[QuestionNumber]] = None,
+) -> Iterator[tuple[QuestionNumber, List[str]]]:
+    """Read the question fields of the language, English and French joined for both.
+    :param columns: Language columns of the question bank file.
+    :param language: Language of the question fields.
+    :param question_numbers: Question numbers of the rows to read (default is None, all).
+    :return: Iterator of the question number and the question fields of each row.
+    """
+    if language != QuestionLanguage.BOTH:
+        for question_number, fields in columns.read(language, question_numbers):
+            yield QuestionNumber(question_number), fields
+        return
+    rows = zip(
+        columns.read(QuestionLanguage.EN, question_numbers),
+        columns.read(QuestionLanguage.FR, question_numbers),
+        strict=True,
+    )
+    for (question_number, english), (_, french) in rows:
+        if len(english) < LANGUAGE_FIELDS_COUNT or len(french) < LANGUAGE_FIELDS_COUNT:
+            yield QuestionNumber(question_number), english
+            continue
+        fields = [
+            english[0] + constants.BILINGUAL_TEXT_SEPARATOR + french[0],
+            *(
+                en + constants.BILINGUAL_CHOICE_SEPARATOR + fr
+                for en, fr in zip(
+                    english[1:LANGUAGE_FIELDS_COUNT],
+                    french[1:LANGUAGE_FIELDS_COUNT],
+                    strict=True,
+                )
+            ),
+        ]
+        yield QuestionNumber(question_number), fields
+
+
+def create_question(
+    question_number: QuestionNumber,
+    fields: List[str],
+    category: Optional[QuestionCategory] = None,
+    metric: Optional[QuestionMetric] = None,
+) -> Question:
+    """Create the question from the question fields of a row."""
+    # the correct answer comes first, followed by the incorrect answers
+    choices = fields[1:LANGUAGE_FIELDS_COUNT]
+    return Question(fields[0], choices, fields[1], question_number, category, metric)
+
+
+def read_questions(
+    filepath: Path, language: QuestionLanguage, question_numbers: Collection[QuestionNumber]
+) -> List[Question]:
+    """Read the questions of the question numbers from the question bank file.
+
+    Only the rows of the questions are decoded. The questions are read without their category
+    and metric, as the question bank is not loaded.
+
+    :param filepath: Path of the question bank file.
+    :param language: Language of the questions.
+    :param question_numbers: Question numbers of the questions to read.
+    :return: Questions in the order of the question bank file.
+    """
+    columns = LanguageColumns(
+        filepath, 1 + LANGUAGE_FIELDS_COUNT, delimiter=";", header="question_id"
+    )
+    return [
+        create_question(question_number, fields)
+        for question_number, fields in read_language_fields(columns, language, question_numbers)
+        if len(fields) >= LANGUAGE_FIELDS_COUNT
+    ]
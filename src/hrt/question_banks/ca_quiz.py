@@ -5,10 +5,10 @@ The CAQuiz class is a subclass of the Quiz class and has the following attribute
 - PASS_PERCENTAGE_WITH_HONOURS: The pass percentage with honours for the quiz
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from hrt.common.enums import CountryCode, ExamType, QuestionDisplayMode, QuizAnswerDisplay
-from hrt.common.question import Question
+from hrt.common.question import ChoiceOrder, Question
 from hrt.common.quiz import Quiz
 
 
@@ -26,9 +26,16 @@ class CAQuiz(Quiz):
         display_mode: QuestionDisplayMode,
         answer_display: QuizAnswerDisplay,
         quiz_config: Dict,
+        choice_order: Optional[ChoiceOrder] = None,
     ):
         super().__init__(
-            number_of_questions, questions, exam_type, display_mode, answer_display, quiz_config
+            number_of_questions,
+            questions,
+            exam_type,
+            display_mode,
+            answer_display,
+            quiz_config,
+            choice_order,
         )
 
     def pre_process(self) -> None:
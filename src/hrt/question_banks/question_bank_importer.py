@@ -0,0 +1,309 @@
+"""
+This module imports custom or community question banks from CSV or JSON lines files into the
+delimited format of the native (ISED) question banks, with a categories file.
+
+The source is read, validated and written row by row in a single pass. Only the category index
+(question count per category), the answer index and the question numbers already seen are kept
+in memory, so large question banks import with memory bounded by their distinct values rather
+than their size.
+
+Each record has the fields below. The incorrect answers can also be given as a list in an
+``incorrect_answers`` field.
+
+- question_id: Question number (optional), in the native format ``<prefix>-<category>-...``.
+- category: Category id (optional when the question number holds it).
+- category_name: Category name (optional).
+- question: Question text.
+- correct_answer: Correct answer.
+- incorrect_answer_1 to incorrect_answer_3: Incorrect answers.
+"""
+
+import csv
+import json
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Iterator, Optional, Union
+
+from hrt.common import constants
+from hrt.common.config_reader import logger
+from hrt.common.enums import QuestionBankImportFormat
+
+INCORRECT_ANSWERS_COUNT: int = 3
+INCORRECT_ANSWER_FIELDS: tuple[str, ...] = tuple(
+    f"incorrect_answer_{i}" for i in range(1, INCORRECT_ANSWERS_COUNT + 1)
+)
+QUESTIONS_HEADER: list[str] = [
+    "question_id",
+    "question_english",
+    "correct_answer_english",
+    *(f"{field}_english" for field in INCORRECT_ANSWER_FIELDS),
+]
+NATIVE_QUESTION_ID = re.compile(r"^[A-Za-z0-9]+-([A-Za-z0-9]+)-[A-Za-z0-9-]+$")
+CATEGORY_ID = re.compile(r"^[A-Za-z0-9]+$")
+WHITESPACE = re.compile(r"\s+")
+
+
+class ImportedQuestion:
+    """Question record validated for the native question bank format."""
+
+    def __init__(
+        self,
+        question_id: str,
+        category_id: str,
+        category_name: str,
+        question_text: str,
+        answer: str,
+        incorrect_answers: list[str],
+    ):
+        self.question_id = question_id
+        self.category_id = category_id
+        self.category_name = category_name
+        self.question_text = question_text
+        self.answer = answer
+        self.incorrect_answers = incorrect_answers
+
+    def get_fields(self) -> list[str]:
+        """Returns the columns of the question in the native question bank file."""
+        return [self.question_id, self.question_text, self.answer, *self.incorrect_answers]
+
+
+class ImportResult:
+    """Summary of a question bank import."""
+
+    def __init__(self):
+        self.imported = 0
+        self.skipped = 0
+        self.errors: list[str] = []
+        self.categories: dict[str, list[Any]] = {}
+        self.answers: Counter = Counter()
+
+    @property
+    def duplicate_answers(self) -> int:
+        """Number of answers shared by more than one imported question."""
+        return sum(1 for count in self.answers.values() if count > 1)
+
+    def add_error(self, line_number: int, message: str) -> None:
+        """Record a row skipped because it is invalid, keeping the first errors only."""
+        self.skipped += 1
+        if len(self.errors) < constants.IMPORT_ERRORS_REPORTED:
+            self.errors.append(f"Line {line_number}: {message}")
+
+    def format(self) -> list[str]:
+        """Format the summary as text lines."""
+        output = [
+            f"Imported: {self.imported}",
+            f"Skipped: {self.skipped}",
+            f"Categories: {len(self.categories)}",
+        ]
+        output.extend(
+            f"  {category_id} {name}: {count}"
+            for category_id, (name, count) in sorted(self.categories.items())
+        )
+        output.append(f"Duplicate answers: {self.duplicate_answers}")
+        output.extend(self.errors)
+        if self.skipped > len(self.errors):
+            output.append(f"... {self.skipped - len(self.errors)} more errors")
+        return output
+
+
+def get_import_format(source: Union[str, os.PathLike]) -> QuestionBankImportFormat:
+    """Returns the import format matching the extension of the source file."""
+    suffix = Path(source).suffix.lower()
+    if suffix in (".jsonl", ".ndjson"):
+        return QuestionBankImportFormat.JSONL
+    if suffix == ".csv":
+        return QuestionBankImportFormat.CSV
+    raise ValueError(f"Unknown question bank format for {source}, use .csv or .jsonl")
+
+
+def get_imported_categories_path(questions_path: Union[str, os.PathLike]) -> Path:
+    """Returns the default path of the categories file of an imported question bank."""
+    path = Path(questions_path)
+    return path.with_name(f"{path.stem}{constants.IMPORTED_CATEGORIES_SUFFIX}")
+
+
+def read_records(
+    source: Union[str, os.PathLike], import_format: QuestionBankImportFormat
+) -> Iterator[tuple[int, Any]]:
+    """Read the records of the source one at a time.
+    :param source: Path of the CSV or JSON lines file.
+    :param import_format: Format of the file.
+    :return: Iterator of the line number and the record (a dictionary, or an error message for
+        the lines that cannot be parsed).
+    """
+    with open(source, "r", encoding="utf-8-sig", newline="") as file:
+        if import_format == QuestionBankImportFormat.CSV:
+            reader = csv.DictReader(file)
+            for record in reader:
+                yield reader.line_num, record
+            return
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError as e:
+                yield line_number, f"invalid JSON: {e}"
+
+
+def normalize_text(value: Any) -> str:
+    """Returns the value as single line text, without surrounding or repeated whitespace."""
+    if value is None:
+        return ""
+    return WHITESPACE.sub(" ", str(value)).strip()
+
+
+def get_answers(record: dict) -> tuple[str, list[str]]:
+    """Returns the correct answer and the incorrect answers of the record.
+    :raises ValueError: If an answer is missing.
+    """
+    answer = normalize_text(record.get("correct_answer"))
+    incorrect = record.get("incorrect_answers")
+    if not isinstance(incorrect, list):
+        incorrect = [record.get(field) for field in INCORRECT_ANSWER_FIELDS]
+    incorrect_answers = [normalize_text(value) for value in incorrect]
+    if not answer:
+        raise ValueError("missing correct_answer")
+    if len(incorrect_answers) != INCORRECT_ANSWERS_COUNT or not all(incorrect_answers):
+        raise ValueError(f"expected {INCORRECT_ANSWERS_COUNT} incorrect answers")
+    if answer in incorrect_answers:
+        raise ValueError("correct answer is also an incorrect answer")
+    return answer, incorrect_answers
+
+
+def get_question_id(record: dict, prefix: str, sequence: int) -> tuple[str, str]:
+    """Returns the question number and the category id of the record.
+
+    The category id is the second part of the question number of the record, if any, otherwise
+    a question number is generated in the category of the record.
+
+    :raises ValueError: If the question number or the category is invalid.
+    """
+    question_id = normalize_text(record.get("question_id"))
+    category_id = normalize_text(record.get("category"))
+    if question_id:
+        match = NATIVE_QUESTION_ID.match(question_id)
+        if not match:
+            raise ValueError(
+                f"question_id {question_id} is not in the <prefix>-<category>-... format"
+            )
+        if category_id and category_id != match.group(1):
+            raise ValueError(f"question_id {question_id} is not in category {category_id}")
+        return question_id, match.group(1)
+    if not category_id:
+        raise ValueError("missing category")
+    if not CATEGORY_ID.match(category_id):
+        raise ValueError(f"invalid category {category_id}")
+    return f"{prefix}-{category_id}-{sequence:03d}-001", category_id
+
+
+def validate_record(
+    record: Any, seen_ids: set[str], prefix: str, sequence: int
+) -> ImportedQuestion:
+    """Validate a record and convert it to a question of the native question bank format.
+    :param record: Record read from the source.
+    :param seen_ids: Question numbers of the questions already imported.
+    :param prefix: Prefix of the generated question numbers.
+    :param sequence: Sequence number of the record, used in the generated question numbers.
+    :return: Validated question.
+    :raises ValueError: If the record is invalid.
+    """
+    if isinstance(record, str):
+        raise ValueError(record)
+    if not isinstance(record, dict):
+        raise ValueError("record is not an object")
+    question_text = normalize_text(record.get("question"))
+    if not question_text:
+        raise ValueError("missing question")
+    answer, incorrect_answers = get_answers(record)
+    question_id, category_id = get_question_id(record, prefix, sequence)
+    if question_id in seen_ids:
+        raise ValueError(f"duplicate question_id {question_id}")
+
+    question = ImportedQuestion(
+        question_id,
+        category_id,
+        normalize_text(record.get("category_name")).replace(":", " ") or category_id,
+        question_text,
+        answer,
+        incorrect_answers,
+    )
+    try:
+        "".join([question.category_name, *question.get_fields()]).encode(
+            constants.QUESTION_BANK_ENCODING
+        )
+    except UnicodeEncodeError as e:
+        raise ValueError(f"text not representable in {constants.QUESTION_BANK_ENCODING}") from e
+    return question
+
+
+def import_question_bank(
+    source: Union[str, os.PathLike],
+    questions_path: Union[str, os.PathLike],
+    categories_path: Union[str, os.PathLike],
+    import_format: Optional[QuestionBankImportFormat] = None,
+    prefix: str = constants.IMPORTED_QUESTION_PREFIX,
+) -> ImportResult:
+    """Import a question bank into the native question bank format in a single pass.
+
+    Invalid records are skipped and reported. The question bank file is written as the records
+    are validated and replaces any existing file only once the import completes. The categories
+    file lists the question count of each category as its quota, so practice exams draw from
+    the categories in proportion to their size.
+
+    :param source: Path of the CSV or JSON lines file.
+    :param questions_path: Path of the question bank file to write.
+    :param categories_path: Path of the categories file to write.
+    :param import_format: Format of the source (default is None, from the file extension).
+    :param prefix: Prefix of the generated question numbers.
+    :return: Summary of the import.
+    """
+    import_format = import_format or get_import_format(source)
+    result = ImportResult()
+    seen_ids: set[str] = set()
+    Path(questions_path).parent.mkdir(parents=True, exist_ok=True)
+    temp_path = f"{questions_path}.tmp"
+    try:
+        with open(
+            temp_path,
+            "w",
+            encoding=constants.QUESTION_BANK_ENCODING,
+            newline="",
+            buffering=constants.OUTPUT_BUFFER_SIZE,
+        ) as file:
+            writer = csv.writer(file, delimiter=";", lineterminator="\r\n")
+            writer.writerow(QUESTIONS_HEADER)
+            for line_number, record in read_records(source, import_format):
+                try:
+                    question = validate_record(record, seen_ids, prefix, result.imported + 1)
+                except ValueError as e:
+                    result.add_error(line_number, str(e))
+                    continue
+                writer.writerow(question.get_fields())
+                seen_ids.add(question.question_id)
+                category = result.categories.setdefault(
+                    question.category_id, [question.category_name, 0]
+                )
+                category[1] += 1
+                result.answers[question.answer] += 1
+                result.imported += 1
+    except (OSError, UnicodeDecodeError, csv.Error):
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+    os.replace(temp_path, questions_path)
+
+    temp_path = f"{categories_path}.tmp"
+    with open(temp_path, "w", encoding=constants.QUESTION_BANK_ENCODING, newline="") as file:
+        for category_id, (name, count) in sorted(result.categories.items()):
+            file.write(f"{category_id}:{name}:{count}\n")
+    os.replace(temp_path, categories_path)
+    logger.info(
+        "Imported %d questions (%d skipped) from %s to %s",
+        result.imported,
+        result.skipped,
+        source,
+        questions_path,
+    )
+    return result
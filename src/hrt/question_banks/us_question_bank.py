@@ -22,6 +22,7 @@ class USQuestionBank(QuestionBank):
         categories_filepath: Optional[Path] = None,
         marked_questions_filepath: Optional[Path] = None,
         metrics_filepath: Optional[Path] = None,
+        progress_store_filepath: Optional[Path] = None,
     ):
         super().__init__(
             CountryCode.UNITED_STATES,
@@ -31,6 +32,7 @@ class USQuestionBank(QuestionBank):
             categories_filepath,
             marked_questions_filepath,
             metrics_filepath,
+            progress_store_filepath=progress_store_filepath,
         )
 
     def load_questions(self) -> List[Question]:
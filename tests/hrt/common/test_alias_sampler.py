@@ -0,0 +1,53 @@
+import random
+import unittest
+from collections import Counter
+
+from hrt.common.alias_sampler import AliasSampler
+
+
+class TestAliasSampler(unittest.TestCase):
+    def test_draw_follows_weights(self):
+        sampler = AliasSampler([1, 2, 3, 0, 4])
+        rng = random.Random(1)
+        counts = Counter(sampler.draw(rng) for _ in range(50000))
+        self.assertNotIn(3, counts)
+        for index, weight in ((0, 1), (1, 2), (2, 3), (4, 4)):
+            self.assertAlmostEqual(counts[index] / 50000, weight / 10, delta=0.01)
+
+    def test_sample_without_replacement(self):
+        sampler = AliasSampler([1, 2, 3, 0, 4])
+        sample = sampler.sample(10, random.Random(1))
+        self.assertEqual(sorted(sample), [0, 1, 2, 4])
+        self.assertEqual(len(sampler.sample(2, random.Random(2))), 2)
+
+    def test_sample_rebuilds_after_heavy_draws(self):
+        rng = random.Random(1)
+        sampler = AliasSampler([1000] + [1] * 5)
+        for _ in range(100):
+            sample = sampler.sample(3, rng)
+            self.assertEqual(len(set(sample)), 3)
+            self.assertIn(0, sample)
+
+    def test_sample_proportional_first_draw(self):
+        sampler = AliasSampler([1, 3])
+        rng = random.Random(1)
+        counts = Counter(sampler.sample(2, rng)[0] for _ in range(20000))
+        self.assertAlmostEqual(counts[1] / 20000, 0.75, delta=0.02)
+
+    def test_same_seed_same_sample(self):
+        sampler = AliasSampler([float(i % 7) for i in range(1000)])
+        self.assertEqual(
+            sampler.sample(50, random.Random(3)), sampler.sample(50, random.Random(3))
+        )
+
+    def test_invalid_weights(self):
+        with self.assertRaises(ValueError):
+            AliasSampler([1, -1])
+        with self.assertRaises(ValueError):
+            AliasSampler([0, 0])
+        with self.assertRaises(ValueError):
+            AliasSampler([])
+
+
+if __name__ == "__main__":
+    unittest.main()
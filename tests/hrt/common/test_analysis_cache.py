@@ -0,0 +1,102 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from hrt.common.analysis_cache import AnalysisCache, decode_result, encode_result
+from hrt.common.file_lock import FileLock
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.question import Question
+
+
+class TestAnalysisCache(unittest.TestCase):
+    def setUp(self):
+        self.questions = [
+            Question(f"Question {i}?", ["A", "B", "C"], "A", QuestionNumber(f"Q{i}"))
+            for i in range(3)
+        ]
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.filepath = Path(self.temp_dir.name) / "questions.txt.analysis.json"
+
+    def test_encode_decode_round_trip(self):
+        q0, q1, q2 = self.questions
+        by_number = {q.question_number: q for q in self.questions}
+        results = [
+            [q2, q0],
+            {"A": [q0, q1]},
+            {("A", "B"): [q1, q2]},
+            {q0: [q1, q2]},
+        ]
+        for result in results:
+            encoded = json.loads(json.dumps(encode_result(result)))
+            self.assertEqual(decode_result(encoded, by_number), result)
+
+    def test_get_computes_once(self):
+        cache = AnalysisCache(self.questions)
+        compute = MagicMock(return_value=[self.questions[0]])
+        self.assertEqual(cache.get("key", compute), [self.questions[0]])
+        self.assertEqual(cache.get("key", compute), [self.questions[0]])
+        compute.assert_called_once()
+
+    def test_persisted_results_are_reused(self):
+        AnalysisCache(self.questions, self.filepath, "hash").get(
+            "key", lambda: {"A": self.questions[1:]}
+        )
+        self.assertTrue(os.path.exists(self.filepath))
+        compute = MagicMock()
+        result = AnalysisCache(self.questions, self.filepath, "hash").get("key", compute)
+        self.assertEqual(result, {"A": self.questions[1:]})
+        compute.assert_not_called()
+
+    def test_stale_persisted_results_are_recomputed(self):
+        AnalysisCache(self.questions, self.filepath, "hash").get("key", lambda: self.questions)
+        compute = MagicMock(return_value=[])
+        result = AnalysisCache(self.questions, self.filepath, "other").get("key", compute)
+        self.assertEqual(result, [])
+        compute.assert_called_once()
+
+    def test_persisted_results_with_unknown_questions_are_recomputed(self):
+        AnalysisCache(self.questions, self.filepath, "hash").get("key", lambda: self.questions)
+        compute = MagicMock(return_value=[])
+        cache = AnalysisCache(self.questions[:1], self.filepath, "hash")
+        self.assertEqual(cache.get("key", compute), [])
+        compute.assert_called_once()
+
+    def test_results_persisted_by_another_cache_are_kept(self):
+        cache1 = AnalysisCache(self.questions, self.filepath, "hash")
+        cache2 = AnalysisCache(self.questions, self.filepath, "hash")
+        cache1.get("key1", lambda: self.questions[:1])
+        cache2.get("key2", lambda: self.questions[1:])
+        compute = MagicMock()
+        cache = AnalysisCache(self.questions, self.filepath, "hash")
+        self.assertEqual(cache.get("key1", compute), self.questions[:1])
+        self.assertEqual(cache.get("key2", compute), self.questions[1:])
+        compute.assert_not_called()
+
+    def test_save_waits_for_file_lock(self):
+        cache = AnalysisCache(self.questions, self.filepath, "hash")
+        with FileLock(str(self.filepath)):
+            thread = threading.Thread(target=cache.get, args=("key", lambda: self.questions))
+            thread.start()
+            thread.join(0.2)
+            # another process holding the lock is merging and replacing the file
+            self.assertTrue(thread.is_alive())
+            self.assertFalse(self.filepath.exists())
+        thread.join()
+        compute = MagicMock()
+        AnalysisCache(self.questions, self.filepath, "hash").get("key", compute)
+        compute.assert_not_called()
+
+    def test_invalid_persisted_file(self):
+        self.filepath.write_text("invalid", encoding="utf-8")
+        compute = MagicMock(return_value=[])
+        AnalysisCache(self.questions, self.filepath, "hash").get("key", compute)
+        compute.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
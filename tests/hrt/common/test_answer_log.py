@@ -0,0 +1,118 @@
+import os
+import random
+import tempfile
+import unittest
+
+from hrt.common.answer_log import COLUMNS, AnswerEvent, AnswerLog, AnswerRecorder
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.question import ChoiceOrder, Question
+from hrt.common.quiz_session import QuizSession
+
+
+def create_event(question_number, choice=0, correct=True, timestamp=1000, session=7):
+    return AnswerEvent(timestamp, QuestionNumber(question_number), choice, correct, 250, session)
+
+
+class TestAnswerLog(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.folder = os.path.join(temp_dir.name, "ca", "basic", "answer-log")
+        self.answer_log = AnswerLog(self.folder)
+
+    def test_empty(self):
+        answers = self.answer_log.read()
+        self.assertEqual(len(answers), 0)
+        self.assertEqual(answers.question_numbers, [])
+
+    def test_append_and_read(self):
+        self.answer_log.append([create_event("Q1"), create_event("Q2", -1, False)])
+        count = self.answer_log.append([create_event("Q1", 2, False, timestamp=2**40)])
+        self.assertEqual(count, 1)
+        answers = self.answer_log.read()
+        self.assertEqual(len(answers), 3)
+        self.assertEqual(answers.question_numbers, ["Q1", "Q2"])
+        self.assertEqual(list(answers["question"]), [0, 1, 0])
+        self.assertEqual(list(answers["choice"]), [0, -1, 2])
+        self.assertEqual(list(answers["correct"]), [1, 0, 0])
+        self.assertEqual(list(answers["timestamp"]), [1000, 1000, 2**40])
+        self.assertEqual(list(answers["latency"]), [250] * 3)
+        self.assertEqual(list(answers["session"]), [7] * 3)
+        self.assertEqual(self.answer_log.append([]), 0)
+
+    def test_fixed_width_columns(self):
+        self.answer_log.append([create_event("Q1"), create_event("Q2")])
+        sizes = {
+            column: os.path.getsize(self.answer_log.get_column_path(column)) for column in COLUMNS
+        }
+        self.assertEqual(
+            sizes,
+            {
+                "timestamp": 16,
+                "question": 8,
+                "choice": 2,
+                "correct": 2,
+                "latency": 8,
+                "session": 8,
+            },
+        )
+        with open(self.answer_log.get_column_path("timestamp"), "rb") as f:
+            self.assertEqual(f.read(8), (1000).to_bytes(8, "little"))
+
+    def test_read_columns(self):
+        self.answer_log.append([create_event("Q1")])
+        answers = self.answer_log.read(["choice"])
+        self.assertEqual(list(answers.columns), ["choice"])
+        self.assertEqual(answers.question_numbers, [])
+        with self.assertRaisesRegex(ValueError, "Invalid answer log columns: other"):
+            self.answer_log.read(["choice", "other"])
+
+    def test_incomplete_event(self):
+        self.answer_log.append([create_event("Q1")])
+        # an append interrupted after its first columns
+        with open(self.answer_log.get_column_path("timestamp"), "ab") as f:
+            f.write((2000).to_bytes(8, "little"))
+        self.assertEqual(len(self.answer_log), 1)
+        self.answer_log.append([create_event("Q2", timestamp=3000)])
+        self.assertEqual(list(self.answer_log.read()["timestamp"]), [1000, 3000])
+
+    def test_shared_questions(self):
+        other = AnswerLog(self.folder)
+        self.answer_log.append([create_event("Q1")])
+        other.append([create_event("Q2"), create_event("Q1")])
+        self.answer_log.append([create_event("Q3")])
+        answers = self.answer_log.read()
+        self.assertEqual(answers.question_numbers, ["Q1", "Q2", "Q3"])
+        self.assertEqual(list(answers["question"]), [0, 1, 0, 2])
+
+
+class TestAnswerRecorder(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.answer_log = AnswerLog(temp_dir.name)
+
+    def test_records_answers_and_skips(self):
+        questions = [
+            Question(f"Question {i}", ["A", "B", "C", "D"], "A", QuestionNumber(f"Q{i}"))
+            for i in range(2)
+        ]
+        session = QuizSession(questions, ChoiceOrder(random.Random(1)))
+        recorder = AnswerRecorder(self.answer_log, session.choice_order, 42)
+        session.add_listener(recorder.record)
+        session.next()
+        session.answer(session.get_answer_index(questions[0]))
+        session.next()
+        session.skip()
+        session.mark()
+
+        answers = self.answer_log.read()
+        self.assertEqual(answers.question_numbers, ["Q0", "Q1"])
+        # the choice is stored in the question bank order, where the answer is first
+        self.assertEqual(list(answers["choice"]), [0, -1])
+        self.assertEqual(list(answers["correct"]), [1, 0])
+        self.assertEqual(list(answers["session"]), [42, 42])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from hrt.common.answer_log import AnswerEvent, AnswerLog
+from hrt.common.answer_stats import (
+    AnswerTotals,
+    format_answer_stats,
+    get_accuracy_over_time,
+    get_answer_stats,
+    get_learning_curves,
+    get_slowest_questions,
+)
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.review_schedule import SECONDS_PER_DAY
+
+DAY_MS = SECONDS_PER_DAY * 1000
+HOUR_MS = 3600 * 1000
+# US eastern time, UTC-5 and UTC-4 from the second Sunday of March to the first Sunday of November
+EASTERN_TIMEZONE = "EST+5EDT,M3.2.0/2,M11.1.0/2"
+
+
+def set_timezone(test: unittest.TestCase, timezone: str) -> None:
+    """Set the local timezone for the duration of the test."""
+    patcher = mock.patch.dict(os.environ, {"TZ": timezone})
+    patcher.start()
+    test.addCleanup(time.tzset)
+    test.addCleanup(patcher.stop)
+    time.tzset()
+
+
+class TestAnswerStats(unittest.TestCase):
+    def setUp(self):
+        set_timezone(self, "UTC")
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.answers_folder = temp_dir.name
+        answer_log = AnswerLog(temp_dir.name)
+        qn = QuestionNumber
+        answer_log.append(
+            [
+                # day 0: Q1 wrong then Q2 right, Q3 skipped
+                AnswerEvent(0, qn("Q1"), 1, False, 9000, 1),
+                AnswerEvent(1000, qn("Q2"), 0, True, 1000, 1),
+                AnswerEvent(2000, qn("Q3"), -1, False, 500, 1),
+                # day 1: Q1 right twice, Q3 right
+                AnswerEvent(DAY_MS, qn("Q1"), 0, True, 3000, 2),
+                AnswerEvent(DAY_MS + 1, qn("Q1"), 0, True, 3000, 2),
+                AnswerEvent(DAY_MS + 2, qn("Q3"), 0, True, 2000, 2),
+            ]
+        )
+        self.answers = answer_log.read()
+        self.categories = {qn("Q1"): "001", qn("Q2"): "001", qn("Q3"): "002"}
+
+    def test_accuracy_over_time(self):
+        periods = get_accuracy_over_time(AnswerTotals(self.answers, self.categories))
+        self.assertEqual(
+            [(p["start"], p["answered"], p["correct"]) for p in periods],
+            [(0, 2, 1), (SECONDS_PER_DAY, 3, 3)],
+        )
+        self.assertEqual(periods[0]["accuracy"], 0.5)
+        totals = AnswerTotals(self.answers, self.categories, 2 * SECONDS_PER_DAY)
+        self.assertEqual(len(get_accuracy_over_time(totals)), 1)
+
+    def test_accuracy_over_time_out_of_order(self):
+        # answers of concurrent sessions may be logged out of time order
+        answer_log = AnswerLog(self.answers_folder)
+        answer_log.append([AnswerEvent(3000, QuestionNumber("Q2"), 1, False, 1000, 3)])
+        periods = get_accuracy_over_time(AnswerTotals(answer_log.read(), self.categories))
+        self.assertEqual(
+            [(p["start"], p["answered"], p["correct"]) for p in periods],
+            [(0, 3, 1), (SECONDS_PER_DAY, 3, 3)],
+        )
+
+    def test_accuracy_over_time_local_days(self):
+        set_timezone(self, EASTERN_TIMEZONE)
+        periods = get_accuracy_over_time(AnswerTotals(self.answers, self.categories))
+        # the answers at 00:00 UTC were given at 19:00 the previous day in eastern time
+        self.assertEqual(
+            [(p["start"], p["answered"], p["correct"]) for p in periods],
+            [(-SECONDS_PER_DAY + 5 * 3600, 2, 1), (5 * 3600, 3, 3)],
+        )
+
+    def test_accuracy_over_time_daylight_saving_time(self):
+        set_timezone(self, EASTERN_TIMEZONE)
+        # 2024-03-10 is 23 hours long in eastern time, it starts at 05:00 UTC
+        day_start = 1710046800 * 1000
+        answer_log = AnswerLog(self.answers_folder)
+        answer_log.append(
+            [
+                AnswerEvent(day_start + 12 * HOUR_MS, QuestionNumber("Q2"), 0, True, 1000, 3),
+                AnswerEvent(day_start + 23 * HOUR_MS, QuestionNumber("Q2"), 0, True, 1000, 3),
+            ]
+        )
+        stats = get_answer_stats(answer_log.read(), self.categories)
+        self.assertEqual(
+            [(p["start"], p["answered"]) for p in stats["accuracy_over_time"][-2:]],
+            [(day_start // 1000, 1), (day_start // 1000 + 23 * 3600, 1)],
+        )
+        output = format_answer_stats({"country": "ca", "exam_type": "basic", **stats})
+        self.assertIn("  2024-03-10 00:00: 1/1 (100.0%)", output)
+        self.assertIn("  2024-03-11 00:00: 1/1 (100.0%)", output)
+
+    def test_learning_curves(self):
+        curves = get_learning_curves(AnswerTotals(self.answers, self.categories))
+        self.assertEqual(curves, {"001": [0.5, 1.0, 1.0], "002": [1.0]})
+        totals = AnswerTotals(self.answers, {}, max_attempts=1)
+        self.assertEqual(get_learning_curves(totals), {"-": [0.6667]})
+
+    def test_slowest_questions(self):
+        slowest = get_slowest_questions(AnswerTotals(self.answers, self.categories), top=2)
+        self.assertEqual(
+            [(q["question"], q["answered"], q["mean_latency"]) for q in slowest],
+            [("Q1", 3, 5000), ("Q3", 1, 2000)],
+        )
+
+    def test_answer_stats(self):
+        stats = get_answer_stats(self.answers, self.categories)
+        self.assertEqual(
+            {key: stats[key] for key in ("events", "sessions", "questions", "answered")},
+            {"events": 6, "sessions": 2, "questions": 3, "answered": 5},
+        )
+        self.assertEqual(stats["skipped"], 1)
+        self.assertEqual(stats["accuracy"], 0.8)
+        json.dumps(stats)
+        output = format_answer_stats({"country": "ca", "exam_type": "basic", **stats})
+        self.assertIn("ca basic answer statistics", output[0])
+        self.assertIn("  001: 50% 100% 100%", output)
+        self.assertIn("  Q1: 5.0 (3 answers)", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+
+from hrt.common.bank_manifest import (
+    BankDiff,
+    BankManifest,
+    get_manifest_path,
+    get_question_hash,
+    migrate_question_numbers_file,
+)
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.question import Question
+from hrt.common.review_schedule import ReviewSchedule
+
+
+def get_question(number: str, text: str) -> Question:
+    return Question(text, ["A", "B", "C"], "A", QuestionNumber(number))
+
+
+class TestBankManifest(unittest.TestCase):
+    def setUp(self):
+        self.old = BankManifest.from_questions(
+            [
+                get_question("Q1", "First"),
+                get_question("Q2", "Second"),
+                get_question("Q3", "Third"),
+                get_question("Q4", "Fourth"),
+            ],
+            "a" * 64,
+        )
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def test_question_hash_ignores_choice_order(self):
+        first = Question("Text", ["A", "B", "C"], "A", QuestionNumber("Q1"))
+        second = Question("Text", ["C", "A", "B"], "A", QuestionNumber("Q2"))
+        third = Question("Text", ["A", "B", "C"], "B", QuestionNumber("Q3"))
+        self.assertEqual(get_question_hash(first), get_question_hash(second))
+        self.assertNotEqual(get_question_hash(first), get_question_hash(third))
+
+    def test_diff(self):
+        new = BankManifest.from_questions(
+            [
+                get_question("Q1", "Second"),
+                get_question("Q2", "First"),
+                get_question("Q3", "Third, reworded"),
+                get_question("Q5", "Fifth"),
+            ]
+        )
+        diff = self.old.diff(new)
+        self.assertEqual(diff.renumbered, {"Q2": "Q1", "Q1": "Q2"})
+        self.assertEqual(diff.reworded, ["Q3"])
+        self.assertEqual(diff.added, ["Q5"])
+        self.assertEqual(diff.removed, ["Q4"])
+        self.assertEqual(diff.unchanged, [])
+        self.assertTrue(diff.has_changes)
+        self.assertEqual(diff.get_unchanged_content_mapping(), {"Q2": "Q1", "Q1": "Q2"})
+
+    def test_diff_unchanged(self):
+        diff = self.old.diff(BankManifest(dict(self.old.hashes)))
+        self.assertEqual(diff.unchanged, ["Q1", "Q2", "Q3", "Q4"])
+        self.assertFalse(diff.has_changes)
+
+    def test_save_and_load(self):
+        path = get_manifest_path(os.path.join(self.temp_dir.name, "questions.txt"))
+        self.old.save(path)
+        loaded = BankManifest.load(path)
+        self.assertEqual(loaded.hashes, self.old.hashes)
+        self.assertEqual(loaded.file_hash, "a" * 64)
+
+    def test_load_invalid(self):
+        path = os.path.join(self.temp_dir.name, "manifest.json")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("[]")
+        self.assertIsNone(BankManifest.load(path))
+        self.assertIsNone(BankManifest.load(os.path.join(self.temp_dir.name, "missing.json")))
+
+    def test_migrate_question_numbers_file(self):
+        diff = BankDiff()
+        diff.renumbered = {QuestionNumber("Q1"): QuestionNumber("Q2")}
+        diff.removed = [QuestionNumber("Q2")]
+        path = os.path.join(self.temp_dir.name, "metrics.txt")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("Q1:1:2:0\nQ2:3:0:0\nQ3:0:0:1\n")
+        self.assertEqual(migrate_question_numbers_file(path, diff), 1)
+        with open(path, "r", encoding="utf-8") as file:
+            self.assertEqual(file.read(), "Q2:1:2:0\nQ3:0:0:1\n")
+
+    def test_migrate_review_schedule_file(self):
+        diff = BankDiff()
+        diff.renumbered = {QuestionNumber("Q1"): QuestionNumber("Q5")}
+        diff.removed = [QuestionNumber("Q2")]
+        path = os.path.join(self.temp_dir.name, "review-schedule.txt")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("Q1:100:6:2.60:2\nQ2:50:1:2.50:1\n")
+        self.assertEqual(migrate_question_numbers_file(path, diff), 1)
+        schedule = ReviewSchedule.load(path)
+        self.assertEqual(list(schedule.question_numbers), ["Q5"])
+        self.assertEqual(schedule.get(QuestionNumber("Q5")).interval, 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
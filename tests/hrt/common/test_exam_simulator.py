@@ -0,0 +1,133 @@
+import itertools
+import math
+import random
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from hrt.common.enums import CountryCode, ExamType
+from hrt.common.exam_simulator import (
+    convolve,
+    estimate_exam_readiness,
+    get_category_distributions,
+    get_pass_mark,
+    get_score_distribution,
+    get_success_probability,
+    simulate_scores,
+)
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.question import Question
+from hrt.common.question_bank import QuestionBank
+from hrt.common.question_category import QuestionCategory
+from hrt.common.question_metric import QuestionMetric
+
+
+def create_question(number, correct=0, wrong=0, skip=0):
+    question_number = QuestionNumber(f"Q-{number}")
+    metric = QuestionMetric(question_number, correct, wrong, skip)
+    return Question(
+        f"Question {number}", ["A", "B", "C", "D"], "A", question_number, metric=metric
+    )
+
+
+class ShortCategoryQuestionBank(QuestionBank):
+    """Category 001 has fewer questions than its quota."""
+
+    def load_categories(self):
+        return [QuestionCategory("001", "Category 1", 3), QuestionCategory("002", "Category 2", 2)]
+
+    def load_metrics(self):
+        return {}
+
+    def load_questions(self):
+        questions = []
+        for category_id, count in [("001", 2), ("002", 5)]:
+            for i in range(count):
+                question = create_question(f"{category_id}-{i}", correct=10)
+                question.category = self.get_category_by_id(category_id)
+                questions.append(question)
+        return questions
+
+    def load_marked_questions(self):
+        return 0
+
+
+class TestExamSimulator(unittest.TestCase):
+    def test_get_success_probability(self):
+        self.assertEqual(get_success_probability(create_question(1, 9)), 10 / 11)
+        self.assertEqual(get_success_probability(create_question(2, 3, 1, 2)), 4 / 8)
+        self.assertEqual(get_success_probability(create_question(3)), 0.5)
+        self.assertEqual(get_success_probability(create_question(4, 0, 10)), 0.25)
+
+    def test_get_score_distribution_matches_enumeration(self):
+        probabilities = [0.9, 0.2, 0.5, 0.7, 0.35]
+        quota = 3
+        expected = [0.0] * (quota + 1)
+        samples = list(itertools.combinations(probabilities, quota))
+        for sample in samples:
+            for outcome in itertools.product((0, 1), repeat=quota):
+                p = math.prod(q if hit else 1 - q for q, hit in zip(sample, outcome))
+                expected[sum(outcome)] += p / len(samples)
+        for value, expected_value in zip(
+            get_score_distribution(probabilities, quota), expected, strict=True
+        ):
+            self.assertAlmostEqual(value, expected_value)
+
+    def test_get_score_distribution_caps_quota(self):
+        self.assertEqual(len(get_score_distribution([1.0, 1.0], 5)), 3)
+        self.assertEqual(get_score_distribution([1.0, 1.0], 5), [0.0, 0.0, 1.0])
+
+    def test_convolve(self):
+        self.assertEqual(convolve([0.5, 0.5], [0.5, 0.5]), [0.25, 0.5, 0.25])
+
+    def test_get_pass_mark(self):
+        self.assertEqual(get_pass_mark(100, 70), 70)
+        self.assertEqual(get_pass_mark(3, 70), 3)
+        self.assertEqual(get_pass_mark(10, 80), 8)
+
+    def test_simulate_scores(self):
+        scores = simulate_scores([[0.0, 1.0], [0.0, 0.0, 1.0]], 10, random.Random(1))
+        self.assertEqual(scores, [3] * 10)
+
+    def test_estimate_exam_readiness(self):
+        questions = [create_question(i, correct=8, wrong=2) for i in range(20)]
+        question_bank = MagicMock()
+        question_bank.questions = questions
+        question_bank.get_fitted_category_quotas.return_value = {"001": 4, "002": 6}
+        question_bank.category_index = {"001": list(range(10)), "002": list(range(10, 20))}
+
+        readiness = estimate_exam_readiness(question_bank, 10, 70, 80, 20000, random.Random(1))
+        # every question has the same probability: the score is binomial
+        p = 9 / 12
+        expected = sum(math.comb(10, k) * p**k * (1 - p) ** (10 - k) for k in range(7, 11))
+        self.assertEqual(readiness.number_of_questions, 10)
+        self.assertAlmostEqual(readiness.expected_score, 7.5)
+        self.assertAlmostEqual(readiness.pass_probability, expected)
+        self.assertAlmostEqual(readiness.simulated_pass / readiness.runs, expected, delta=0.02)
+        self.assertLess(readiness.honours_probability, readiness.pass_probability)
+        self.assertIn("Simulated exams: 20000", readiness.format())
+
+    @patch("hrt.common.question_bank.logger")
+    def test_category_smaller_than_quota(self, _):
+        question_bank = ShortCategoryQuestionBank(
+            CountryCode.CANADA, ExamType.BASIC, Path("dummy_path")
+        )
+        distributions = get_category_distributions(question_bank, 5)
+        self.assertEqual([len(d) - 1 for d in distributions], [2, 3])
+        readiness = estimate_exam_readiness(question_bank, 5, 70, 80, 0)
+        self.assertEqual(readiness.number_of_questions, 5)
+        self.assertEqual(readiness.pass_mark, 4)
+
+    def test_estimate_exam_readiness_without_quotas(self):
+        question_bank = MagicMock()
+        question_bank.questions = [create_question(i, correct=100) for i in range(5)]
+        question_bank.get_fitted_category_quotas.return_value = {}
+
+        readiness = estimate_exam_readiness(question_bank, 3, 70, 80, 0)
+        self.assertEqual(readiness.number_of_questions, 3)
+        self.assertGreater(readiness.pass_probability, 0.95)
+        self.assertFalse(any(line.startswith("Simulated") for line in readiness.format()))
+
+
+if __name__ == "__main__":
+    unittest.main()
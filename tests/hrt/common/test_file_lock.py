@@ -0,0 +1,37 @@
+import os
+import tempfile
+import unittest
+
+from hrt.common.file_lock import FileLock
+
+
+class TestFileLock(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.filepath = os.path.join(temp_dir.name, "ca", "basic", "metrics.txt")
+
+    def test_acquire_release(self):
+        lock = FileLock(self.filepath)
+        self.assertTrue(lock.acquire())
+        self.assertTrue(lock.is_locked)
+        self.assertTrue(os.path.exists(lock.lock_path))
+        with self.assertRaises(ValueError):
+            lock.acquire()
+        lock.release()
+        self.assertFalse(lock.is_locked)
+        lock.release()
+
+    def test_contended(self):
+        with FileLock(self.filepath):
+            other = FileLock(self.filepath)
+            self.assertFalse(other.acquire(blocking=False))
+            self.assertFalse(other.is_locked)
+        self.assertTrue(other.acquire(blocking=False))
+        other.release()
+        # the lock file is kept, another process may be waiting on it
+        self.assertTrue(os.path.exists(other.lock_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from hrt.common.enums import QuestionLanguage
+from hrt.common.language_columns import LanguageColumns
+
+
+class TestLanguageColumns(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.filepath = Path(temp_dir.name) / "questions.txt"
+        self.filepath.write_bytes(
+            "question_id;text;a;b;text_fr;a_fr;b_fr\r\n"
+            "Q1;Text 1;A1;B1;Texte 1;é1;B1 fr\r\n"
+            '"Q2";"Text; 2";A2;B2;Texte 2;A2 fr;B2 fr\n'
+            "\n"
+            "Q3;Text 3;A3;B3".encode("iso-8859-1")
+        )
+        self.columns = LanguageColumns(self.filepath, 4, header="question_id")
+
+    def test_keys(self):
+        self.assertEqual(self.columns.keys, ["Q1", "Q2", "Q3"])
+        self.assertEqual(len(self.columns), 3)
+
+    def test_read_english(self):
+        self.assertEqual(
+            list(self.columns.read(QuestionLanguage.EN)),
+            [
+                ("Q1", ["Text 1", "A1", "B1"]),
+                ("Q2", ["Text; 2", "A2", "B2"]),
+                ("Q3", ["Text 3", "A3", "B3"]),
+            ],
+        )
+
+    def test_read_french(self):
+        self.assertEqual(
+            list(self.columns.read(QuestionLanguage.FR)),
+            [
+                ("Q1", ["Texte 1", "é1", "B1 fr"]),
+                ("Q2", ["Texte 2", "A2 fr", "B2 fr"]),
+                ("Q3", []),
+            ],
+        )
+
+    def test_read_keys(self):
+        self.assertEqual(
+            list(self.columns.read(QuestionLanguage.FR, {"Q2", "Q9"})),
+            [("Q2", ["Texte 2", "A2 fr", "B2 fr"])],
+        )
+
+    def test_quoted_newline(self):
+        self.filepath.write_bytes(
+            b'Q1;"What is\nthis; thing";A1;B1;"Qu\'est-ce\r\n""que""";A1 fr;B1 fr\n'
+            b"Q2;Text 2;A2;B2;Texte 2;A2 fr;B2 fr\n"
+        )
+        columns = LanguageColumns(self.filepath, 4)
+        self.assertEqual(columns.keys, ["Q1", "Q2"])
+        self.assertEqual(
+            list(columns.read(QuestionLanguage.EN)),
+            [("Q1", ["What is\nthis; thing", "A1", "B1"]), ("Q2", ["Text 2", "A2", "B2"])],
+        )
+        self.assertEqual(
+            next(columns.read(QuestionLanguage.FR)),
+            ("Q1", ['Qu\'est-ce\r\n"que"', "A1 fr", "B1 fr"]),
+        )
+
+    def test_quote_within_column(self):
+        self.filepath.write_bytes(
+            b'Q1;Use 5" coax;A1;B1;Texte 1;A1 fr;B1 fr\n'
+            b"Q2;Text 2;A2;B2;Texte 2;A2 fr;B2 fr\n"
+            b'Q3;Text "3";A3;B3;"Texte\n3";A3 fr;B3 fr\n'
+        )
+        columns = LanguageColumns(self.filepath, 4)
+        self.assertEqual(columns.keys, ["Q1", "Q2", "Q3"])
+        self.assertEqual(
+            list(columns.read(QuestionLanguage.EN)),
+            [
+                ("Q1", ['Use 5" coax', "A1", "B1"]),
+                ("Q2", ["Text 2", "A2", "B2"]),
+                ("Q3", ['Text "3"', "A3", "B3"]),
+            ],
+        )
+        self.assertEqual(list(columns.read(QuestionLanguage.FR))[2][1][0], "Texte\n3")
+
+    def test_unclosed_quote(self):
+        self.filepath.write_bytes(b'Q1;Text 1;A1;B1\nQ2;"Text 2\n;A2;B2\n')
+        self.assertEqual(LanguageColumns(self.filepath, 4).keys, ["Q1", "Q2"])
+
+    def test_empty_file(self):
+        self.filepath.write_bytes(b"")
+        columns = LanguageColumns(self.filepath, 4)
+        self.assertEqual(list(columns.read(QuestionLanguage.EN)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from hrt.common import utils
+from hrt.common.file_lock import FileLock
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.metrics_repository import MetricsRepository
+from hrt.common.question_metric import QuestionMetric
+
+
+class TestMetricsRepository(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.addCleanup(MetricsRepository.clear)
+        self.filepath = os.path.join(temp_dir.name, "ca", "basic", "metrics.txt")
+        os.makedirs(os.path.dirname(self.filepath))
+        self.write("Q1:1:0:0\nQ3:0:1:0\n")
+
+    def write(self, content):
+        with open(self.filepath, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def read(self):
+        with open(self.filepath, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_shared_per_file(self):
+        repository = MetricsRepository.get(self.filepath)
+        relative = os.path.relpath(self.filepath)
+        self.assertIs(MetricsRepository.get(relative), repository)
+
+    def test_file_read_once(self):
+        repository = MetricsRepository.get(self.filepath)
+        with patch.object(
+            utils, "read_metrics_from_file", wraps=utils.read_metrics_from_file
+        ) as mock_read:
+            repository.get_metrics()
+            repository.save_metrics([QuestionMetric(QuestionNumber("Q2"), 1)])
+            metrics = repository.get_metrics()
+            mock_read.assert_called_once()
+        self.assertEqual(list(metrics), ["Q1", "Q2", "Q3"])
+
+    def test_file_changed(self):
+        repository = MetricsRepository.get(self.filepath)
+        repository.get_metrics()
+        self.write("Q5:0:0:1\n")
+        self.assertEqual(list(repository.get_metrics()), ["Q5"])
+
+    def test_file_replaced_within_mtime_tick(self):
+        repository = MetricsRepository.get(self.filepath)
+        repository.get_metrics()
+        stat = os.stat(self.filepath)
+        # another process replaces the file with one of the same size and mtime
+        utils.replace_file_lines(self.filepath, ["Q1:2:0:0", "Q3:0:1:0"])
+        os.utime(self.filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(os.path.getsize(self.filepath), stat.st_size)
+        metrics = repository.get_metrics()
+        self.assertEqual(metrics[QuestionNumber("Q1")].correct_attempts, 2)
+
+    def test_get_metrics_returns_copies(self):
+        repository = MetricsRepository.get(self.filepath)
+        repository.get_metrics()[QuestionNumber("Q1")].correct_attempts = 10
+        self.assertEqual(repository.get_metrics()[QuestionNumber("Q1")].correct_attempts, 1)
+
+    def test_save_metrics_merges(self):
+        repository = MetricsRepository.get(self.filepath)
+        added = repository.save_metrics(
+            [
+                QuestionMetric(QuestionNumber("Q4"), 1),
+                None,
+                QuestionMetric(QuestionNumber("Q3"), skip_count=1),
+                QuestionMetric(QuestionNumber("Q0"), 0, 1),
+            ]
+        )
+        self.assertEqual(added, 3)
+        self.assertEqual(self.read(), "Q0:0:1:0\nQ1:1:0:0\nQ3:0:1:1\nQ4:1:0:0\n")
+        self.assertEqual(repository.save_metrics([]), 0)
+
+    def test_duplicate_lines_are_added(self):
+        self.write("Q1:1:0:0\nQ1:0:2:0\n")
+        metrics = MetricsRepository.get(self.filepath).get_metrics()
+        self.assertEqual(metrics[QuestionNumber("Q1")].wrong_attempts, 2)
+        self.assertEqual(metrics[QuestionNumber("Q1")].correct_attempts, 1)
+
+    def test_failed_save_reads_file_again(self):
+        repository = MetricsRepository.get(self.filepath)
+        with (
+            patch.object(utils, "replace_file_lines", side_effect=OSError("disk full")),
+            self.assertRaises(OSError),
+        ):
+            repository.save_metrics([QuestionMetric(QuestionNumber("Q2"), 1)])
+        self.assertEqual(list(repository.get_metrics()), ["Q1", "Q3"])
+
+    def test_missing_file(self):
+        repository = MetricsRepository.get(os.path.join(os.path.dirname(self.filepath), "new.txt"))
+        self.assertEqual(repository.get_metrics(), {})
+        repository.save_metrics([QuestionMetric(QuestionNumber("Q1"), 1)])
+        self.assertEqual(list(repository.get_metrics()), ["Q1"])
+
+    def get_delta_names(self):
+        folder = os.path.dirname(self.filepath)
+        return [name for name in os.listdir(folder) if name.startswith("metrics.txt.delta-")]
+
+    def test_contended_save_writes_delta(self):
+        repository = MetricsRepository.get(self.filepath)
+        repository.get_metrics()
+        with FileLock(self.filepath):
+            repository.save_metrics([QuestionMetric(QuestionNumber("Q3"), 1)])
+            repository.save_metrics([QuestionMetric(QuestionNumber("Q2"), 0, 0, 1)])
+            self.assertEqual(self.read(), "Q1:1:0:0\nQ3:0:1:0\n")
+            self.assertEqual(len(self.get_delta_names()), 2)
+            metrics = repository.get_metrics()
+        self.assertEqual(
+            {
+                qn: (m.correct_attempts, m.wrong_attempts, m.skip_count)
+                for qn, m in metrics.items()
+            },
+            {"Q1": (1, 0, 0), "Q2": (0, 0, 1), "Q3": (1, 1, 0)},
+        )
+        repository.save_metrics([QuestionMetric(QuestionNumber("Q1"), 1)])
+        self.assertEqual(self.read(), "Q1:2:0:0\nQ2:0:0:1\nQ3:1:1:0\n")
+        self.assertEqual(self.get_delta_names(), [])
+
+    def test_merge_deltas(self):
+        repository = MetricsRepository.get(self.filepath)
+        with FileLock(self.filepath):
+            repository.save_metrics([QuestionMetric(QuestionNumber("Q1"), 1)])
+        self.assertEqual(repository.merge_deltas(), 1)
+        self.assertEqual(self.read(), "Q1:2:0:0\nQ3:0:1:0\n")
+        self.assertEqual(repository.merge_deltas(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
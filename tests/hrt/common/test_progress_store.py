@@ -0,0 +1,158 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.metrics_repository import MetricsRepository
+from hrt.common.progress_store import ProgressStore
+from hrt.common.question_metric import QuestionMetric
+
+
+def get_counts(metrics):
+    return {qn: (m.correct_attempts, m.wrong_attempts, m.skip_count) for qn, m in metrics.items()}
+
+
+class TestProgressStore(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.addCleanup(MetricsRepository.clear)
+        self.folder = temp_dir.name
+        self.filepath = os.path.join(self.folder, "metrics", "progress.db")
+        self.store = ProgressStore(self.filepath)
+        self.addCleanup(self.store.close)
+
+    def test_wal_mode(self):
+        mode = self.store._connection.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    def test_add_metrics(self):
+        self.store.add_metrics(
+            "ca",
+            "basic",
+            [QuestionMetric(QuestionNumber("Q1"), 1), QuestionMetric(QuestionNumber("Q2"), 0, 1)],
+        )
+        count = self.store.add_metrics(
+            "ca", "basic", [QuestionMetric(QuestionNumber("Q1"), 0, 1, 2), None]
+        )
+        self.assertEqual(count, 1)
+        self.assertEqual(
+            get_counts(self.store.load_metrics("ca", "basic")),
+            {"Q1": (1, 1, 2), "Q2": (0, 1, 0)},
+        )
+        self.assertEqual(self.store.load_metrics("ca", "advanced"), {})
+
+    def test_get_metrics_at_least(self):
+        self.store.add_metrics(
+            "ca",
+            "basic",
+            [QuestionMetric(QuestionNumber(f"Q{i}"), 0, i) for i in range(5)],
+        )
+        self.store.add_metrics("ca", "advanced", [QuestionMetric(QuestionNumber("Q9"), 0, 9)])
+        metrics = self.store.get_metrics_at_least("ca", "basic", "wrong_attempts", 3)
+        self.assertEqual([m.question_number for m in metrics], ["Q3", "Q4"])
+        plan = self.store._connection.execute(
+            "EXPLAIN QUERY PLAN SELECT question_number FROM metrics "
+            "WHERE country = 'ca' AND exam_type = 'basic' AND wrong_attempts >= 3"
+        ).fetchall()
+        self.assertIn("metrics_wrong_attempts", str(plan))
+        with self.assertRaises(ValueError):
+            self.store.get_metrics_at_least("ca", "basic", "question_number", 1)
+
+    def test_marked_questions(self):
+        qn = QuestionNumber
+        self.store.set_marked_questions("ca", "basic", {qn("Q1"): True, qn("Q2"): True})
+        self.store.set_marked_questions("ca", "basic", {qn("Q1"): False, qn("Q3"): True})
+        self.assertEqual(self.store.load_marked_questions("ca", "basic"), {"Q2", "Q3"})
+        self.assertEqual(self.store.load_marked_questions("ca", "advanced"), set())
+
+    def test_migrate_files(self):
+        metrics_file = os.path.join(self.folder, "metrics.txt")
+        marked_file = os.path.join(self.folder, "marked-questions.txt")
+        with open(metrics_file, "w", encoding="utf-8") as f:
+            f.write("Q1:1:2:3\nQ2:0:1:0\n")
+        with open(marked_file, "w", encoding="utf-8") as f:
+            f.write("Q2\nQ4\n")
+        self.assertTrue(self.store.migrate_files("ca", "basic", metrics_file, marked_file))
+        self.assertTrue(self.store.is_migrated("ca", "basic"))
+        with open(metrics_file, "w", encoding="utf-8") as f:
+            f.write("Q1:9:9:9\n")
+        self.assertFalse(self.store.migrate_files("ca", "basic", metrics_file, marked_file))
+        self.assertEqual(
+            get_counts(self.store.load_metrics("ca", "basic")),
+            {"Q1": (1, 2, 3), "Q2": (0, 1, 0)},
+        )
+        self.assertEqual(self.store.load_marked_questions("ca", "basic"), {"Q2", "Q4"})
+        self.assertTrue(self.store.migrate_files("ca", "advanced", "missing.txt", None))
+        self.assertEqual(self.store.load_metrics("ca", "advanced"), {})
+
+    def test_migrate_files_with_deltas(self):
+        metrics_file = os.path.join(self.folder, "metrics.txt")
+        with open(metrics_file, "w", encoding="utf-8") as f:
+            f.write("Q1:1:0:0\n")
+        # metrics saved while another process held the lock of the metrics file
+        with open(f"{metrics_file}.delta-1-a", "w", encoding="utf-8") as f:
+            f.write("Q1:0:1:0\nQ2:0:0:1\n")
+        self.assertTrue(self.store.migrate_files("ca", "basic", metrics_file, None))
+        self.assertEqual(
+            get_counts(self.store.load_metrics("ca", "basic")),
+            {"Q1": (1, 1, 0), "Q2": (0, 0, 1)},
+        )
+
+    def test_migrate_files_concurrently(self):
+        metrics_file = os.path.join(self.folder, "metrics.txt")
+        with open(metrics_file, "w", encoding="utf-8") as f:
+            f.write("Q1:1:2:3\n")
+        # another process passed the migration check before this one migrated the files
+        other = ProgressStore(self.filepath)
+        self.addCleanup(other.close)
+        self.assertFalse(other.is_migrated("ca", "basic"))
+        self.assertTrue(self.store.migrate_files("ca", "basic", metrics_file, None))
+        with open(metrics_file, "w", encoding="utf-8") as f:
+            f.write("Q1:9:9:9\n")
+        with mock.patch.object(other, "is_migrated", return_value=False):
+            self.assertFalse(other.migrate_files("ca", "basic", metrics_file, None))
+        self.assertEqual(get_counts(other.load_metrics("ca", "basic")), {"Q1": (1, 2, 3)})
+
+    def test_migrate_question_numbers(self):
+        qn = QuestionNumber
+        self.store.add_metrics(
+            "ca",
+            "basic",
+            [
+                QuestionMetric(qn("Q1"), 1),
+                QuestionMetric(qn("Q2"), 2),
+                QuestionMetric(qn("Q3"), 3),
+            ],
+        )
+        self.store.set_marked_questions("ca", "basic", {qn("Q1"): True, qn("Q3"): True})
+        dropped = self.store.migrate_question_numbers(
+            "ca", "basic", {qn("Q1"): qn("Q2"), qn("Q2"): qn("Q1")}, [qn("Q3")]
+        )
+        self.assertEqual(dropped, 2)
+        self.assertEqual(
+            get_counts(self.store.load_metrics("ca", "basic")),
+            {"Q1": (2, 0, 0), "Q2": (1, 0, 0)},
+        )
+        self.assertEqual(self.store.load_marked_questions("ca", "basic"), {"Q2"})
+
+    def test_reopen(self):
+        self.store.add_metrics("ca", "basic", [QuestionMetric(QuestionNumber("Q1"), 1)])
+        self.store.close()
+        with ProgressStore(self.filepath) as store:
+            self.assertEqual(get_counts(store.load_metrics("ca", "basic")), {"Q1": (1, 0, 0)})
+        self.assertFalse(os.path.exists(f"{self.filepath}-wal"))
+
+    def test_newer_version(self):
+        self.store.close()
+        connection = sqlite3.connect(self.filepath)
+        connection.execute("PRAGMA user_version=99")
+        connection.close()
+        with self.assertRaisesRegex(ValueError, "Unsupported progress store version"):
+            ProgressStore(self.filepath)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import random
 import unittest
 
 from hrt.common.enums import QuestionAnswerDisplay
@@ -5,7 +6,7 @@ from hrt.common.hrt_types import QuestionNumber
 from hrt.common.question_category import QuestionCategory
 from hrt.common.question_display import QuestionDisplay
 from hrt.common.question_metric import QuestionMetric
-from hrt.common.question import Question
+from hrt.common.question import ChoiceOrder, Question
 
 
 class TestQuestion(unittest.TestCase):
@@ -249,6 +250,20 @@ class TestQuestion(unittest.TestCase):
         expected_choices = self.choices + [Question.SKIP_CHOICE]
         self.assertEqual(question.quiz_choices, expected_choices)
 
+    def test_choices_keep_question_bank_order(self):
+        question = Question(self.question_text, list(self.choices), self.answer)
+        self.assertEqual(question.choices, self.choices)
+        self.assertEqual(question.answer_index, 0)
+
+    def test_choices_in_order(self):
+        question = Question(self.question_text, list(self.choices), self.answer)
+        order = (2, 0, 3, 1)
+        self.assertEqual(question.get_choices(order), ["Berlin", "Paris", "Madrid", "London"])
+        self.assertEqual(question.get_quiz_choices(order)[-1], Question.SKIP_CHOICE)
+        self.assertEqual(question.get_answer_index(order), 1)
+        self.assertIn("2. Paris", question.format_quiz_question(order))
+        self.assertEqual(question.choices, self.choices)
+
     def test_equals_non_question(self):
         """Test equals with a non-Question object."""
         question = Question(
@@ -263,5 +278,35 @@ class TestQuestion(unittest.TestCase):
         self.assertNotEqual(question, other)
 
 
+class TestChoiceOrder(unittest.TestCase):
+    def setUp(self):
+        self.questions = [
+            Question(f"Question {i}?", ["A", "B", "C", "D"], "A", QuestionNumber(f"Q{i}"))
+            for i in range(5)
+        ]
+
+    def test_order_is_a_permutation(self):
+        order = ChoiceOrder().get(self.questions[0])
+        self.assertEqual(sorted(order), [0, 1, 2, 3])
+
+    def test_order_is_stable_per_session(self):
+        choice_order = ChoiceOrder()
+        self.assertEqual(choice_order.get(self.questions[0]), choice_order.get(self.questions[0]))
+
+    def test_order_is_reproducible_from_seed(self):
+        first = ChoiceOrder(random.Random(7))
+        second = ChoiceOrder(random.Random(7))
+        self.assertEqual(
+            [first.get(q) for q in self.questions], [second.get(q) for q in self.questions]
+        )
+
+    def test_set_order(self):
+        choice_order = ChoiceOrder()
+        choice_order.set(self.questions[0], [3, 2, 1, 0])
+        self.assertEqual(choice_order.get(self.questions[0]), (3, 2, 1, 0))
+        with self.assertRaisesRegex(ValueError, "Invalid choice order"):
+            choice_order.set(self.questions[1], [0, 0, 1, 2])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,3 +1,4 @@
+import random
 import re
 import unittest
 from pathlib import Path
@@ -11,10 +12,12 @@ from hrt.common.enums import (
     MarkedQuestionListingType,
     QuestionAnswerDisplay,
     QuestionDisplayMode,
+    TopQuestionsListingType,
 )
 from hrt.common.hrt_types import QuestionNumber
 from hrt.common.question import Question
 from hrt.common.question_bank import QuestionBank, process_dict_result
+from hrt.common.question_category import QuestionCategory
 from hrt.common.question_display import QuestionDisplay
 from hrt.common.question_metric import QuestionMetric
 
@@ -75,6 +78,107 @@ class ConcreteQuestionBank(QuestionBank):
         return self._questions
 
 
+class CategorizedQuestionBank(QuestionBank):
+    def load_categories(self):
+        return [
+            QuestionCategory("001", "Category 1", 2),
+            QuestionCategory("002", "Category 2", 1),
+            QuestionCategory("003", "Category 3", 0),
+        ]
+
+    def load_metrics(self):
+        return {}
+
+    def load_questions(self):
+        questions = []
+        for category_id, count in [("001", 4), ("002", 3), ("003", 2)]:
+            for i in range(count):
+                questions.append(
+                    Question(
+                        f"Question {category_id}-{i}",
+                        ["A", "B", "C"],
+                        "A",
+                        QuestionNumber(f"B-{category_id}-{i}"),
+                        self.get_category_by_id(category_id),
+                    )
+                )
+        return questions
+
+    def load_marked_questions(self):
+        return 0
+
+
+class TestQuestionBankBlueprint(unittest.TestCase):
+    def setUp(self):
+        self.question_bank = CategorizedQuestionBank(
+            CountryCode.CANADA, ExamType.BASIC, Path("dummy_path")
+        )
+
+    def test_category_index(self):
+        index = self.question_bank.category_index
+        self.assertEqual(index["001"], [0, 1, 2, 3])
+        self.assertEqual(index["002"], [4, 5, 6])
+        self.assertEqual(index["003"], [7, 8])
+
+    def test_get_category_by_id(self):
+        self.assertEqual(self.question_bank.get_category_by_id("002").name, "Category 2")
+        self.assertIsNone(self.question_bank.get_category_by_id("999"))
+
+    def test_get_category_quotas_blueprint_total(self):
+        self.assertEqual(self.question_bank.get_category_quotas(3), {"001": 2, "002": 1})
+
+    def test_get_category_quotas_scaled(self):
+        self.assertEqual(self.question_bank.get_category_quotas(6), {"001": 4, "002": 2})
+        self.assertEqual(self.question_bank.get_category_quotas(2), {"001": 1, "002": 1})
+
+    @patch("hrt.common.question_bank.logger")
+    def test_get_fitted_category_quotas(self, _):
+        self.assertEqual(self.question_bank.get_fitted_category_quotas(3), {"001": 2, "002": 1})
+        # quotas 5 and 2, category 001 has only 4 questions
+        self.assertEqual(self.question_bank.get_fitted_category_quotas(7), {"001": 4, "002": 3})
+        self.question_bank._categories = []
+        self.assertEqual(self.question_bank.get_fitted_category_quotas(3), {})
+
+    def test_get_blueprint_questions(self):
+        questions = self.question_bank.get_blueprint_questions(3)
+        self.assertEqual(len(questions), 3)
+        category_ids = [q.category.category_id for q in questions]
+        self.assertEqual(sorted(category_ids), ["001", "001", "002"])
+        self.assertEqual(len(set(questions)), 3)
+
+    def test_get_blueprint_questions_mixed(self):
+        orders = {
+            tuple(
+                q.category.category_id for q in self.question_bank.get_blueprint_questions(6, rng)
+            )
+            for rng in (random.Random(seed) for seed in range(10))
+        }
+        self.assertGreater(len(orders), 1)
+
+    @patch("hrt.common.question_bank.logger")
+    def test_get_blueprint_questions_shortfall_redistributed(self, mock_logger):
+        # quotas 5 and 2, category 001 has only 4 questions, 002 gets the missing one
+        questions = self.question_bank.get_blueprint_questions(7, random.Random(1))
+        self.assertEqual(len(questions), 7)
+        self.assertEqual(len([q for q in questions if q.category.category_id == "002"]), 3)
+        mock_logger.warning.assert_called_once()
+
+    @patch("hrt.common.question_bank.logger")
+    def test_get_blueprint_questions_quota_exceeds_category(self, mock_logger):
+        questions = self.question_bank.get_blueprint_questions(9)
+        self.assertEqual(len(questions), 7)
+        self.assertEqual(len([q for q in questions if q.category.category_id == "002"]), 3)
+        self.assertEqual(mock_logger.warning.call_count, 2)
+        self.assertIn("fewer than the %d requested", mock_logger.warning.call_args[0][0])
+
+    @patch("hrt.common.question_bank.logger")
+    def test_get_blueprint_questions_without_quotas(self, mock_logger):
+        self.question_bank._categories = []
+        questions = self.question_bank.get_blueprint_questions(2)
+        self.assertEqual(len(questions), 2)
+        mock_logger.warning.assert_called_with("No category quotas found, using uniform sampling")
+
+
 class TestQuestionBank(unittest.TestCase):
     def setUp(self):
         self.country = CountryCode.CANADA
@@ -283,6 +387,15 @@ class TestQuestionBank(unittest.TestCase):
         self.assertIsInstance(result, dict)
         self.assertIsInstance(result_text, list)
 
+    def test_iter_questions_is_lazy(self):
+        self.question_bank.mappings[GeneralQuestionListingType.ALL] = lambda: iter(
+            self.question_bank.questions
+        )
+        result, result_text = self.question_bank.iter_questions(GeneralQuestionListingType.ALL, 2)
+        self.assertEqual(result, [])
+        self.assertEqual(len(list(result_text)), 2)
+        self.assertEqual(result, self.question_bank.questions[:2])
+
     def test_get_questions_invalid_criteria(self):
         with self.assertRaises(ValueError) as context:
             self.question_bank.get_questions("INVALID_CRITERIA")
@@ -409,6 +522,44 @@ class TestQuestionBank(unittest.TestCase):
         self.assertEqual(result[0].question_number, "Q2")
         self.assertEqual(result[1].question_number, "Q3")
 
+    def test_get_marked_questions_bank_metrics(self):
+        self._set_questions()
+        result, _ = self.question_bank.get_marked_questions(
+            MarkedQuestionListingType.WRONG_ATTEMPT, question_count=1
+        )
+        self.assertEqual([q.question_number for q in result], ["Q1", "Q2"])
+        result, _ = self.question_bank.get_marked_questions(
+            MarkedQuestionListingType.CORRECT_ANSWER, question_count=2
+        )
+        self.assertEqual([q.question_number for q in result], ["Q1"])
+
+    def test_analysis_is_computed_once(self):
+        self.question_bank._questions = [
+            Question("What is 1+1?", ["A", "B", "C"], "A", QuestionNumber("Q1")),
+            Question("What is 2+2?", ["A", "B", "C"], "B", QuestionNumber("Q2")),
+        ]
+        with patch.object(
+            self.question_bank,
+            "_find_same_choices",
+            wraps=self.question_bank._find_same_choices,
+        ) as mock_find:
+            result, result_text = self.question_bank.get_questions(
+                GeneralQuestionListingType.SAME_CHOICES
+            )
+            self.question_bank.get_questions(GeneralQuestionListingType.SAME_CHOICES)
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result_text[0], "Choices: ('A', 'B', 'C')")
+        mock_find.assert_called_once()
+
+    def test_analysis_cache_invalidated_on_reload(self):
+        self._set_questions()
+        first = self.question_bank.get_longest_question_text(1)
+        self.question_bank._questions = [
+            Question("A much longer question?", ["A", "B"], "A", QuestionNumber("Q9"))
+        ]
+        second = self.question_bank.get_longest_question_text(1)
+        self.assertNotEqual(first[0].question_number, second[0].question_number)
+
     def test_get_marked_questions_invalid_criteria(self):
         with self.assertRaises(ValueError) as context:
             self.question_bank.get_marked_questions("INVALID_CRITERIA", [], 0)
@@ -458,6 +609,27 @@ class TestQuestionBank(unittest.TestCase):
         self.assertEqual(result[1].answer, "BB")
         self.assertEqual(result[2].answer, "A")
 
+    def test_get_questions_top_criteria(self):
+        self.question_bank._questions = [
+            Question("Question 1", ["A", "BBBB", "C"], "A", QuestionNumber("Q1")),
+            Question("Question 2", ["AAA", "B", "C"], "AAA", QuestionNumber("Q2")),
+            Question("Question 3", ["A", "B", "C"], "B", QuestionNumber("Q3")),
+        ]
+        self.question_bank._metrics = {
+            "Q3": QuestionMetric(QuestionNumber("Q3"), 1, 1, 0),
+        }
+        self.question_bank.init_criteria_mapping()
+        result, _ = self.question_bank.get_questions(
+            TopQuestionsListingType.CHOICE_LENGTH_SPREAD, 2
+        )
+        self.assertEqual([q.question_number for q in result], ["Q1", "Q2"])
+        result, _ = self.question_bank.get_questions(
+            TopQuestionsListingType.CORRECT_CHOICE_LENGTH_RATIO, 1
+        )
+        self.assertEqual([q.question_number for q in result], ["Q2"])
+        result, _ = self.question_bank.get_questions(TopQuestionsListingType.WRONG_ATTEMPT_RATE, 5)
+        self.assertEqual([q.question_number for q in result], ["Q3"])
+
     def test_get_marked_questions_filepath(self):
         self.assertEqual(
             self.question_bank.get_marked_questions_filepath(), "dummy_marked_questions_path"
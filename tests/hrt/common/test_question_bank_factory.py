@@ -1,7 +1,12 @@
+import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
-from hrt.common.enums import CountryCode, ExamType, QuestionDisplayMode
-from hrt.common.question_bank import QuestionBankFactory
+from unittest.mock import MagicMock, patch
+
+from hrt.common.enums import CountryCode, ExamType, QuestionDisplayMode, QuestionLanguage
+from hrt.common.question_bank import QuestionBankFactory, QuestionBankRegistry
 
 
 class TestQuestionBankFactory(unittest.TestCase):
@@ -35,5 +40,98 @@ class TestQuestionBankFactory(unittest.TestCase):
         )
 
 
+class TestQuestionBankRegistry(unittest.TestCase):
+    def setUp(self):
+        QuestionBankRegistry.clear()
+        self.addCleanup(QuestionBankRegistry.clear)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.filepath = Path(self.temp_dir.name) / "questions.txt"
+        self.filepath.write_text("question_id;question_english\n", encoding="utf-8")
+        patcher = patch.object(QuestionBankFactory, "get_question_bank")
+        self.mock_get_question_bank = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_get_question_bank.side_effect = lambda *_: MagicMock()
+
+    def test_get_fingerprint(self):
+        fingerprint = QuestionBankRegistry.get_fingerprint(self.filepath, None)
+        self.assertEqual(fingerprint[0][0], str(self.filepath))
+        self.assertIsNone(fingerprint[1])
+        self.assertIsNone(QuestionBankRegistry.get_fingerprint(Path("missing")))
+
+    def test_bank_is_loaded_once(self):
+        bank1 = QuestionBankRegistry.get_question_bank(
+            CountryCode.CANADA, ExamType.BASIC, self.filepath
+        )
+        bank2 = QuestionBankRegistry.get_question_bank(
+            CountryCode.CANADA, ExamType.BASIC, self.filepath
+        )
+        self.assertIs(bank1, bank2)
+        self.mock_get_question_bank.assert_called_once()
+
+    def test_bank_is_reloaded_when_file_changes(self):
+        bank1 = QuestionBankRegistry.get_question_bank(
+            CountryCode.CANADA, ExamType.BASIC, self.filepath
+        )
+        self.filepath.write_text("question_id;question_english\nchanged\n", encoding="utf-8")
+        bank2 = QuestionBankRegistry.get_question_bank(
+            CountryCode.CANADA, ExamType.BASIC, self.filepath
+        )
+        self.assertIsNot(bank1, bank2)
+        self.assertEqual(self.mock_get_question_bank.call_count, 2)
+
+    def test_bank_is_loaded_per_language(self):
+        args = (CountryCode.CANADA, ExamType.BASIC, self.filepath)
+        english = QuestionBankRegistry.get_question_bank(*args)
+        french = QuestionBankRegistry.get_question_bank(*args, language=QuestionLanguage.FR)
+        self.assertIsNot(english, french)
+        self.assertIs(
+            french, QuestionBankRegistry.get_question_bank(*args, language=QuestionLanguage.FR)
+        )
+        self.assertIs(english, QuestionBankRegistry.get_question_bank(*args))
+
+    def test_bank_without_files_is_not_cached(self):
+        missing = Path(self.temp_dir.name) / "missing.txt"
+        QuestionBankRegistry.get_question_bank(CountryCode.CANADA, ExamType.BASIC, missing)
+        QuestionBankRegistry.get_question_bank(CountryCode.CANADA, ExamType.BASIC, missing)
+        self.assertEqual(self.mock_get_question_bank.call_count, 2)
+
+    def test_concurrent_requests_load_once(self):
+        def slow_load(*_):
+            time.sleep(0.05)
+            return MagicMock()
+
+        self.mock_get_question_bank.side_effect = slow_load
+        banks = []
+        threads = [
+            threading.Thread(
+                target=lambda: banks.append(
+                    QuestionBankRegistry.get_question_bank(
+                        CountryCode.CANADA, ExamType.BASIC, self.filepath
+                    )
+                )
+            )
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len({id(bank) for bank in banks}), 1)
+        self.mock_get_question_bank.assert_called_once()
+
+    def test_failed_load_is_not_cached(self):
+        self.mock_get_question_bank.side_effect = [ValueError("error"), MagicMock()]
+        with self.assertRaises(ValueError):
+            QuestionBankRegistry.get_question_bank(
+                CountryCode.CANADA, ExamType.BASIC, self.filepath
+            )
+        self.assertIsNotNone(
+            QuestionBankRegistry.get_question_bank(
+                CountryCode.CANADA, ExamType.BASIC, self.filepath
+            )
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
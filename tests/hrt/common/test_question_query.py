@@ -0,0 +1,199 @@
+import random
+import unittest
+
+from hrt.common.enums import TopQuestionsListingType
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.question import Question
+from hrt.common.question_category import QuestionCategory
+from hrt.common.question_metric import QuestionMetric
+from hrt.common.question_query import (
+    FeatureColumns,
+    MetricColumns,
+    QuestionIndex,
+    QuestionQuery,
+    bitmap_from_indices,
+    correct_choice_length_ratio,
+    indices_from_bitmap,
+)
+
+
+class TestBitmapHelpers(unittest.TestCase):
+    def test_bitmap_from_indices(self):
+        self.assertEqual(bitmap_from_indices([0, 2, 9], 10), 0b1000000101)
+        self.assertEqual(bitmap_from_indices([], 10), 0)
+
+    def test_indices_from_bitmap(self):
+        self.assertEqual(indices_from_bitmap(0b1000000101), [0, 2, 9])
+        self.assertEqual(indices_from_bitmap(0), [])
+
+    def test_round_trip(self):
+        indices = [1, 7, 8, 63, 64, 100]
+        self.assertEqual(indices_from_bitmap(bitmap_from_indices(indices, 101)), indices)
+
+
+class TestMetricColumns(unittest.TestCase):
+    def setUp(self):
+        self.questions = [
+            Question(f"Question {i}", ["A", "B"], "A", QuestionNumber(f"Q{i}")) for i in range(4)
+        ]
+        metrics = {
+            "Q0": QuestionMetric(QuestionNumber("Q0"), 3, 0, 1),
+            "Q2": QuestionMetric(QuestionNumber("Q2"), 1, 2, 0),
+            "Q3": QuestionMetric(QuestionNumber("Q3"), 2, 0, 0),
+        }
+        self.columns = MetricColumns(self.questions, metrics)
+
+    def test_columns(self):
+        self.assertEqual(list(self.columns.column("correct_attempts")), [3, 0, 1, 2])
+        self.assertEqual(list(self.columns.positions), [0, 2, 3])
+
+    def test_at_least(self):
+        self.assertEqual(list(self.columns.at_least("correct_attempts", 2)), [3, 0])
+        self.assertEqual(list(self.columns.at_least("wrong_attempts", 1)), [2])
+        self.assertEqual(sorted(self.columns.at_least("skip_count", 0)), [0, 2, 3])
+        self.assertEqual(list(self.columns.at_least("skip_count", 5)), [])
+
+    def test_invalid_field(self):
+        with self.assertRaises(ValueError):
+            self.columns.at_least("unknown", 1)
+        with self.assertRaises(ValueError):
+            self.columns.column("unknown")
+
+
+class TestFeatureColumns(unittest.TestCase):
+    def setUp(self):
+        self.questions = [
+            Question("Short", ["A", "BB", "CCC"], "A", QuestionNumber("Q0")),
+            Question("A longer question", ["AAAA", "B", "C"], "AAAA", QuestionNumber("Q1")),
+            Question("Medium one", ["AA", "BB", "CC"], "BB", QuestionNumber("Q2")),
+        ]
+        metrics = {
+            "Q0": QuestionMetric(QuestionNumber("Q0"), 1, 3, 0),
+            "Q2": QuestionMetric(QuestionNumber("Q2"), 2, 0, 2),
+        }
+        self.columns = FeatureColumns(self.questions, MetricColumns(self.questions, metrics))
+
+    def test_correct_choice_length_ratio(self):
+        self.assertEqual(correct_choice_length_ratio(self.questions[1]), 4.0)
+        self.assertEqual(correct_choice_length_ratio(self.questions[2]), 1.0)
+
+    def test_column_is_cached(self):
+        column = self.columns.column(TopQuestionsListingType.LONGEST_QUESTION_TEXT)
+        self.assertEqual(list(column), [5.0, 17.0, 10.0])
+        self.assertIs(column, self.columns.column(TopQuestionsListingType.LONGEST_QUESTION_TEXT))
+
+    def test_top(self):
+        self.assertEqual(
+            self.columns.top(TopQuestionsListingType.LONGEST_QUESTION_TEXT, 2), [1, 2]
+        )
+        self.assertEqual(self.columns.top(TopQuestionsListingType.CHOICE_LENGTH_SPREAD, 5), [1, 0])
+        self.assertEqual(self.columns.top(TopQuestionsListingType.LONGEST_CORRECT_CHOICE, 0), [])
+
+    def test_top_ties_keep_bank_order(self):
+        self.assertEqual(
+            self.columns.top(TopQuestionsListingType.CORRECT_CHOICE_LENGTH_RATIO, 3), [1, 2, 0]
+        )
+
+    def test_top_metric_rates(self):
+        self.assertEqual(self.columns.top(TopQuestionsListingType.WRONG_ATTEMPT_RATE, 3), [0])
+        self.assertEqual(self.columns.top(TopQuestionsListingType.SKIP_RATE, 3), [2])
+        self.assertEqual(
+            list(self.columns.column(TopQuestionsListingType.WRONG_ATTEMPT_RATE)), [0.75, 0.0, 0.0]
+        )
+
+
+class TestQuestionQuery(unittest.TestCase):
+    def setUp(self):
+        category1 = QuestionCategory("001", "Category 1", 1)
+        category2 = QuestionCategory("002", "Category 2", 1)
+        self.questions = [
+            Question(
+                f"Question {i}",
+                ["A", "B", "C"],
+                "A",
+                QuestionNumber(f"Q{i}"),
+                category1 if i < 3 else category2,
+            )
+            for i in range(5)
+        ]
+        self.questions[1].is_marked = True
+        self.questions[3].is_marked = True
+        self.metrics = {
+            "Q0": QuestionMetric(QuestionNumber("Q0"), 2, 0, 0),
+            "Q1": QuestionMetric(QuestionNumber("Q1"), 0, 1, 0),
+            "Q2": QuestionMetric(QuestionNumber("Q2"), 0, 0, 3),
+        }
+        self.query = QuestionQuery(QuestionIndex(self.questions, self.metrics))
+
+    def _numbers(self, query):
+        return [q.question_number for q in query.questions()]
+
+    def test_all(self):
+        self.assertEqual(self.query.count(), 5)
+        self.assertEqual(self._numbers(self.query), ["Q0", "Q1", "Q2", "Q3", "Q4"])
+
+    def test_marked_and_unmarked(self):
+        self.assertEqual(self._numbers(self.query.marked()), ["Q1", "Q3"])
+        self.assertEqual(self._numbers(self.query.unmarked()), ["Q0", "Q2", "Q4"])
+
+    def test_in_categories(self):
+        self.assertEqual(self._numbers(self.query.in_categories("002")), ["Q3", "Q4"])
+        self.assertEqual(self.query.in_categories("001", "002").count(), 5)
+        self.assertEqual(self.query.in_categories("999").count(), 0)
+
+    def test_metrics(self):
+        self.assertEqual(self._numbers(self.query.with_metrics()), ["Q0", "Q1", "Q2"])
+        self.assertEqual(self._numbers(self.query.without_metrics()), ["Q3", "Q4"])
+
+    def test_metric_thresholds(self):
+        self.assertEqual(self._numbers(self.query.correct_at_least(1)), ["Q0"])
+        self.assertEqual(self._numbers(self.query.wrong_at_least(1)), ["Q1"])
+        self.assertEqual(self._numbers(self.query.skipped_at_least(3)), ["Q2"])
+        self.assertEqual(self.query.skipped_at_least(4).count(), 0)
+
+    def test_invalid_metric_field(self):
+        index = QuestionIndex(self.questions, self.metrics)
+        with self.assertRaises(ValueError):
+            index.metric_at_least("unknown", 1)
+
+    def test_including_and_excluding(self):
+        query = self.query.including(["Q1", "Q2", "Q9"]).excluding(["Q2"])
+        self.assertEqual(self._numbers(query), ["Q1"])
+
+    def test_operators(self):
+        self.assertEqual(
+            self._numbers(self.query.marked() | self.query.correct_at_least(1)),
+            ["Q0", "Q1", "Q3"],
+        )
+        self.assertEqual(self._numbers(self.query.marked() & self.query.with_metrics()), ["Q1"])
+        self.assertEqual(
+            self._numbers(self.query.with_metrics() - self.query.marked()), ["Q0", "Q2"]
+        )
+        self.assertEqual(self._numbers(~self.query.in_categories("001")), ["Q3", "Q4"])
+
+    def test_filters_are_lazy(self):
+        query = self.query.marked()
+        self.questions[0].is_marked = True
+        self.assertEqual(self._numbers(query), ["Q0", "Q1", "Q3"])
+
+    def test_sample(self):
+        sample = self.query.unmarked().sample(2, random.Random(1))
+        self.assertEqual(len(sample), 2)
+        for question in sample:
+            self.assertFalse(question.is_marked)
+
+    def test_sample_more_than_available(self):
+        sample = self.query.marked().sample(10)
+        self.assertEqual(sorted(q.question_number for q in sample), ["Q1", "Q3"])
+
+    def test_weighted_sample(self):
+        weights = [0, 5, 1, 0, 2]
+        sample = self.query.weighted_sample(10, weights, random.Random(1))
+        self.assertEqual(sorted(q.question_number for q in sample), ["Q1", "Q2", "Q4"])
+        sample = self.query.unmarked().weighted_sample(1, weights, random.Random(1))
+        self.assertIn(sample[0].question_number, ["Q2", "Q4"])
+        self.assertEqual(self.query.in_categories("002").weighted_sample(2, [0] * 5), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
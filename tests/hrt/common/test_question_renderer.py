@@ -0,0 +1,92 @@
+import unittest
+from unittest import mock
+
+from hrt.common.constants import ANSWER_DISPLAY_PREFIX
+from hrt.common.enums import QuestionAnswerDisplay
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.question import Question
+from hrt.common.question_display import QuestionDisplay
+from hrt.common.question_renderer import (
+    CHOICE_INDENT,
+    QuestionTemplate,
+    get_display_key,
+    get_question_template,
+)
+
+
+class TestQuestionRenderer(unittest.TestCase):
+    def setUp(self):
+        self.question = Question(
+            question_text="What is the capital of France?",
+            choices=["Paris", "London", "Berlin", "Madrid"],
+            answer="Paris",
+            question_number=QuestionNumber("1"),
+        )
+
+    def test_get_display_key(self):
+        self.assertIsNone(get_display_key(None))
+        display = QuestionDisplay(answer_display=QuestionAnswerDisplay.WITH_QUESTION)
+        self.assertEqual(get_display_key(display), QuestionAnswerDisplay.WITH_QUESTION)
+        # the marked status and metrics are not rendered by the templates
+        display.show_marked_status = not display.show_marked_status
+        display.show_metrics = not display.show_metrics
+        self.assertEqual(get_display_key(display), QuestionAnswerDisplay.WITH_QUESTION)
+
+    def test_template_is_compiled_once(self):
+        key = get_display_key(QuestionDisplay(answer_display=QuestionAnswerDisplay.WITH_QUESTION))
+        self.assertIs(
+            get_question_template(key, False, Question.SKIP_CHOICE),
+            get_question_template(key, False, Question.SKIP_CHOICE),
+        )
+
+    def test_render(self):
+        template = QuestionTemplate(CHOICE_INDENT, ANSWER_DISPLAY_PREFIX)
+        text = template.render(self.question, ["London", "Paris"], 1)
+        self.assertEqual(
+            text,
+            f"1: What is the capital of France?\n{CHOICE_INDENT}1. London\n"
+            f"{ANSWER_DISPLAY_PREFIX}2. Paris\n",
+        )
+
+    def test_render_quiz(self):
+        text = self.question.format_quiz_question((0, 1, 2, 3))
+        self.assertEqual(
+            text,
+            "1: What is the capital of France?\n1. Paris\n2. London\n3. Berlin\n4. Madrid\n"
+            f"5. {Question.SKIP_CHOICE}\n",
+        )
+
+    def test_answer_highlighted_only_with_question(self):
+        self.question.question_display = QuestionDisplay(
+            answer_display=QuestionAnswerDisplay.WITH_QUESTION
+        )
+        self.assertIn(f"{ANSWER_DISPLAY_PREFIX}1. Paris", self.question.format((0, 1, 2, 3)))
+        self.question.question_display = QuestionDisplay(
+            answer_display=QuestionAnswerDisplay.IN_THE_END
+        )
+        self.assertNotIn(ANSWER_DISPLAY_PREFIX, self.question.format((0, 1, 2, 3)))
+
+    def test_rendered_text_is_not_kept(self):
+        with mock.patch.object(
+            QuestionTemplate, "render", autospec=True, return_value="text"
+        ) as mock_render:
+            self.assertEqual(self.question.format((0, 1, 2, 3)), "text")
+            self.question.format((0, 1, 2, 3))
+            self.assertEqual(mock_render.call_count, 2)
+        self.assertFalse(hasattr(self.question, "_rendered"))
+
+    def test_cache_invalidated_by_display_change(self):
+        display = QuestionDisplay(answer_display=QuestionAnswerDisplay.WITH_QUESTION)
+        self.question.question_display = display
+        highlighted = self.question.format((0, 1, 2, 3))
+        display.answer_display = QuestionAnswerDisplay.IN_THE_END
+        self.assertNotEqual(self.question.format((0, 1, 2, 3)), highlighted)
+
+    def test_cache_invalidated_by_renumbering(self):
+        self.question.format()
+        self.question.question_number = QuestionNumber("2")
+        self.assertTrue(self.question.format().startswith("2: "))
+
+
+if __name__ == "__main__":
+    unittest.main()
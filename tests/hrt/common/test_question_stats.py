@@ -0,0 +1,78 @@
+import json
+import unittest
+from unittest.mock import MagicMock
+
+from hrt.common.enums import CountryCode, ExamType
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.question import Question
+from hrt.common.question_bank import IQuestionBank
+from hrt.common.question_category import QuestionCategory
+from hrt.common.question_metric import QuestionMetric
+from hrt.common.question_stats import (
+    format_question_bank_stats,
+    get_question_bank_stats,
+    summarize_lengths,
+)
+
+
+class TestSummarizeLengths(unittest.TestCase):
+    def test_summarize_lengths(self):
+        summary = summarize_lengths([4, 1, 3, 2])
+        self.assertEqual(summary["count"], 4)
+        self.assertEqual(summary["min"], 1)
+        self.assertEqual(summary["max"], 4)
+        self.assertEqual(summary["mean"], 2.5)
+        self.assertEqual(summary["median"], 2)
+
+    def test_summarize_empty(self):
+        self.assertEqual(summarize_lengths([])["count"], 0)
+
+
+class TestQuestionBankStats(unittest.TestCase):
+    def setUp(self):
+        regulations = QuestionCategory("001", "Regulations", 2)
+        operating = QuestionCategory("002", "Operating", 1)
+        questions = [
+            Question("What?", ["Yes", "No"], "Yes", QuestionNumber("Q1"), regulations),
+            Question(
+                "Why not?",
+                ["Because", "No"],
+                "Because",
+                QuestionNumber("Q2"),
+                regulations,
+                QuestionMetric(QuestionNumber("Q2"), 1, 2, 0),
+            ),
+            Question("Who?", ["Yes", "Maybe"], "Yes", QuestionNumber("Q3")),
+        ]
+        self.question_bank = MagicMock(spec=IQuestionBank)
+        self.question_bank.questions = questions
+        self.question_bank.categories = [regulations, operating]
+        self.question_bank.country = CountryCode.CANADA
+        self.question_bank.exam_type = ExamType.BASIC
+
+    def test_get_question_bank_stats(self):
+        stats = get_question_bank_stats(self.question_bank)
+        self.assertEqual(stats["question_count"], 3)
+        self.assertEqual([c["count"] for c in stats["categories"]], [2, 0])
+        self.assertEqual([c["quota"] for c in stats["categories"]], [2, 1])
+        self.assertEqual(stats["uncategorized"], 1)
+        self.assertEqual(stats["question_length"]["max"], 8)
+        self.assertEqual(stats["choice_length"]["count"], 6)
+        self.assertEqual(stats["correct_choice_longest"]["count"], 2)
+        self.assertEqual(stats["duplicate_answers"], {"answers": 1, "questions": 2})
+        self.assertEqual(stats["metrics"]["questions"], 1)
+        self.assertEqual(stats["metrics"]["wrong_attempts"], 2)
+
+    def test_stats_are_json_serializable(self):
+        stats = get_question_bank_stats(self.question_bank)
+        self.assertEqual(json.loads(json.dumps(stats)), stats)
+
+    def test_format_question_bank_stats(self):
+        output = format_question_bank_stats(get_question_bank_stats(self.question_bank))
+        self.assertEqual(output[0].splitlines()[0], "ca basic statistics")
+        self.assertIn("  001 Regulations: 2/2", output)
+        self.assertIn("Duplicate answers: 1 answers shared by 2 questions", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
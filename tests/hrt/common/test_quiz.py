@@ -4,9 +4,16 @@ from io import StringIO
 
 from hrt.common.question_submitted import QuestionSubmitted
 from hrt.common.quiz import Quiz, QuizFactory
-from hrt.common.enums import CountryCode, ExamType, QuestionDisplayMode, QuizAnswerDisplay
+from hrt.common.enums import (
+    CountryCode,
+    ExamType,
+    QuestionDisplayMode,
+    QuizAnswerDisplay,
+    QuizState,
+)
 from hrt.common.hrt_types import QuestionNumber
 from hrt.common.question import Question
+from hrt.common.question_metric import QuestionMetric
 from hrt.question_banks.ca_quiz import CAQuiz
 from hrt.question_banks.us_quiz import USQuiz
 
@@ -177,10 +184,24 @@ class TestQuiz(unittest.TestCase):
             self.quiz.validate_exam_type(CountryCode.CANADA)
 
     @patch("builtins.input", side_effect=["1", "S", "1", "S"])
-    def test_display_question_and_get_action(self, _):
-        self.quiz._display_question_and_get_action()
+    def test_run(self, _):
+        self.quiz.run()
         self.assertEqual(self.quiz.get_current_index(), 1)
         self.assertTrue(self.quiz._terminate_quiz)
+        self.assertEqual(self.quiz.get_state(), QuizState.DONE)
+
+    @patch("sys.stdout", new_callable=StringIO)
+    def test_run_long_session(self, _):
+        """Each action is processed by the loop, so long sessions do not grow the stack."""
+        self.quiz.submit(0)
+        navigation = ["N", "P"] * 2000
+        with (
+            patch("hrt.common.utils.get_user_input_option", side_effect=[*navigation, "Q"]),
+            patch("hrt.common.utils.get_user_input_index", return_value=0),
+        ):
+            self.quiz.set_current_index(0)
+            self.quiz.run()
+        self.assertTrue(self.quiz._terminate_quiz)
 
     def test_previous_question(self):
         self.quiz.set_current_index(1)
@@ -196,17 +217,19 @@ class TestQuiz(unittest.TestCase):
         self.quiz.start()
         self.assertEqual(self.quiz.get_current_index(), 1)
 
-    @patch("builtins.input", side_effect=["1"])
-    def test_process_action(self, _):
+    def test_process_action(self):
         self.quiz.process_action("S", -1, ["N", "P", "Q"])
         self.assertEqual(self.quiz.get_current_index(), 0)
+        self.quiz.process_action("N", -1, ["N", "P", "Q"])
+        self.assertEqual(self.quiz.get_current_index(), 1)
+        self.assertEqual(self.quiz.get_state(), QuizState.QUESTION)
 
     def test_submit(self):
         self.quiz.submit(3)
-        self.assertIn(QuestionNumber("Q1"), self.quiz._submitted_questions)
+        self.assertIn(QuestionNumber("Q1"), self.quiz.get_session().submitted)
 
     def test_submit_return(self):
-        self.quiz._submitted_questions[QuestionNumber("Q1")] = QuestionSubmitted(
+        self.quiz.get_session().submitted[QuestionNumber("Q1")] = QuestionSubmitted(
             question_number=QuestionNumber("Q1"), selected_choice="3"
         )
         self.quiz.submit(3)
@@ -216,89 +239,103 @@ class TestQuiz(unittest.TestCase):
         self.quiz.submit(-1)
         mock_logger.info.assert_called_with("No choice selected.")
 
+    def metric(self, index):
+        return self.quiz.get_session().get_metric(self.quiz.get_question_by_index(index))
+
+    def is_marked(self, index):
+        return self.quiz.get_session().is_marked(self.quiz.get_question_by_index(index))
+
     @patch("sys.stdout", new_callable=StringIO)
     def test_submit_correct_answer(self, mock_stdout):
-        self.quiz._current_index = 0
-        answer_index = self.quiz.get_current_question().answer_index
+        self.quiz.set_current_index(0)
+        answer_index = self.quiz.get_answer_index(self.quiz.get_current_question())
         self.quiz.submit(answer_index)
         self.assertIn("\033[92m✓✓\033[0m", mock_stdout.getvalue())
         prev_index = self.quiz.get_current_index() - 1
-        self.assertEqual(self.quiz.get_question_by_index(prev_index).correct_attempts, 1)
+        self.assertEqual(self.metric(prev_index).correct_attempts, 1)
 
     def test_mark(self):
         self.quiz.mark(4)
-        self.assertTrue(self.quiz.get_current_question().is_marked)
+        self.assertTrue(self.is_marked(0))
+        self.assertEqual(self.metric(0).skip_count, 1)
+        self.assertFalse(self.is_marked(self.quiz.get_current_index()))
 
     @patch("hrt.common.quiz.logger")
     def test_mark_already(self, mock_logger):
         self.quiz.mark(3)
-        self.quiz._current_index = 0
+        self.quiz.set_current_index(0)
         self.quiz.mark(-1)
-        self.assertTrue(self.quiz.get_current_question().is_marked)
+        self.assertTrue(self.is_marked(0))
         mock_logger.info.assert_called_with("No choice selected.")
 
     def test_mark_correct_choice(self):
-        self.quiz._current_index = 0
-        answer_index = self.quiz.get_current_question().answer_index
+        self.quiz.set_current_index(0)
+        answer_index = self.quiz.get_answer_index(self.quiz.get_current_question())
         self.quiz.mark(answer_index)
         prev_index = self.quiz.get_current_index() - 1
-        pq = self.quiz.get_question_by_index(prev_index)
-        self.assertTrue(pq.is_marked)
-        self.assertEqual(pq.correct_attempts, 1)
+        self.assertTrue(self.is_marked(prev_index))
+        self.assertEqual(self.metric(prev_index).correct_attempts, 1)
 
     def test_unmark(self):
         self.quiz.mark(3)
         self.quiz.unmark()
-        self.assertFalse(self.quiz.get_current_question().is_marked)
-        self.quiz._current_index = 0
+        self.assertFalse(self.is_marked(self.quiz.get_current_index()))
+        self.quiz.set_current_index(0)
         self.quiz.unmark()
 
-    @patch("builtins.input", side_effect=["S", "F", "Y"])
-    def test_skip(self, _):
+    def test_skip(self):
         self.quiz.skip()
         self.quiz.previous_question()
-        self.assertEqual(self.quiz.get_current_question().skip_count, 1)
+        self.assertEqual(self.metric(self.quiz.get_current_index()).skip_count, 1)
         self.quiz.submit(3)
         self.quiz.previous_question()
         self.quiz.skip()
-        self.assertEqual(self.quiz.get_current_question().skip_count, 1)
+        self.assertEqual(self.metric(self.quiz.get_current_index()).skip_count, 1)
         self.quiz.next_question()
         self.quiz.skip()
+        self.assertEqual(self.metric(self.quiz.get_current_index()).skip_count, 1)
+        self.assertEqual(self.quiz.get_state(), QuizState.REVIEW)
 
     def test_quit(self):
         self.quiz.quit()
         self.assertTrue(self.quiz._terminate_quiz)
+        self.assertEqual(self.quiz.get_state(), QuizState.DONE)
 
     @patch("builtins.input", side_effect=["Y"])
     def test_finish(self, _):
         self.quiz.finish()
         self.assertTrue(self.quiz._terminate_quiz)
 
-    @patch.object(Quiz, "_display_question_and_get_action")
     @patch("builtins.input", side_effect=["N"])
-    def test_terminate_quiz(self, mock_display_question_and_get_action, _):
+    def test_terminate_quiz(self, _):
         self.quiz._terminate_quiz = False
-        # self.quiz._submitted_questions = {
-        #     q.question_number: QuestionSubmitted(q.question_number, q.answer)
-        #     for q in self.questions
-        # }
+        self.quiz._state = QuizState.REVIEW
         self.quiz.finish()
         self.assertFalse(self.quiz._terminate_quiz)
-        mock_display_question_and_get_action.assert_called_once()
+        self.assertEqual(self.quiz.get_state(), QuizState.QUESTION)
 
-    @patch("builtins.input", side_effect=["5", "S", "1", "S", "Q", "Y"])
-    def test_change_answer(self, _):
+    def test_change_answer(self):
         self.quiz.change_answer()
-        self.assertEqual(self.quiz.get_current_index(), 1)
+        self.assertEqual(self.quiz.get_state(), QuizState.CHOICE)
+
+    @patch("builtins.input", side_effect=["1", "C", "2", "S", "1", "S"])
+    def test_run_change_answer(self, _):
+        self.quiz.run()
+        self.assertEqual(
+            self.quiz.get_session().submitted[QuestionNumber("Q1")].selected_choice,
+            self.quiz.get_quiz_choices(self.questions[0])[1],
+        )
+        self.assertTrue(self.quiz._terminate_quiz)
 
     @patch("sys.stdout", new_callable=StringIO)
     def test_change_answer_for_submitted_question(self, mock_stdout):
-        self.quiz._submitted_questions[QuestionNumber("Q1")] = QuestionSubmitted(
+        self.quiz.get_session().submitted[QuestionNumber("Q1")] = QuestionSubmitted(
             question_number=QuestionNumber("Q1"), selected_choice="4"
         )
-        self.quiz._current_index = 0
+        self.quiz.set_current_index(0)
         self.quiz.change_answer()
         self.assertIn("Cannot change answer for a submitted question.", mock_stdout.getvalue())
+        self.assertEqual(self.quiz.get_state(), QuizState.REVIEW)
 
     def test_get_number_of_questions(self):
         self.assertEqual(self.quiz.get_number_of_questions(), 2)
@@ -330,6 +367,15 @@ class TestQuiz(unittest.TestCase):
         output = self.quiz.print_question(self.questions[0])
         self.assertIn("Marked", output)
 
+    def test_print_question_renders_once(self):
+        with patch.object(
+            Question, "format_quiz_question", autospec=True, return_value="text\n"
+        ) as mock_format:
+            self.quiz.print_question(self.questions[0])
+            self.quiz.print_question(self.questions[0])
+            self.quiz.print_question(self.questions[1])
+            self.assertEqual(mock_format.call_count, 2)
+
     def test_get_actions(self):
         action_prompt, actions = self.quiz.get_actions(submitted=False)
         self.assertIn("S", actions)
@@ -380,67 +426,61 @@ class TestQuiz(unittest.TestCase):
             answer_display=QuizAnswerDisplay.AFTER_QUESTION,
             quiz_config=self.quiz_config,
         )
-        quiz._current_index = 2
-        quiz._display_question_and_get_action()
+        quiz.set_current_index(2)
+        quiz.run()
         self.assertIn("No next question available.", mock_stdout.getvalue())
+        self.assertEqual(quiz.get_state(), QuizState.DONE)
 
-    @patch("builtins.input", side_effect=["1", "C", "S", "1", "Q", "Y"])
-    def test_display_question_and_get_action_skip_last(self, _):
-        self.quiz._current_index = 1
-        self.quiz._display_question_and_get_action(skip_last=True)
-        self.assertEqual(self.quiz.get_current_question().skip_count, 1)
+    @patch("builtins.input", side_effect=["5", "P", "1", "S", "5", "F", "Y"])
+    def test_run_skip_last(self, _):
+        self.quiz.set_current_index(1)
+        self.quiz.run()
+        self.assertEqual(self.metric(1).skip_count, 2)
+        self.assertEqual(self.metric(0).correct_attempts + self.metric(0).wrong_attempts, 1)
+        self.assertTrue(self.quiz._terminate_quiz)
 
-    @patch("builtins.input", side_effect=["1", "C", "S", "1", "Q", "Y"])
-    def test_display_question_and_get_action_submitted(self, _):
-        self.quiz._current_index = 1
-        self.quiz._submitted_questions[QuestionNumber("Q2")] = QuestionSubmitted(
+    @patch("builtins.input", side_effect=["P", "1", "Q"])
+    def test_run_submitted(self, _):
+        self.quiz.set_current_index(1)
+        self.quiz.get_session().submitted[QuestionNumber("Q2")] = QuestionSubmitted(
             question_number=QuestionNumber("Q2"), selected_choice="4"
         )
-        self.quiz._display_question_and_get_action(skip_last=False)
-        self.assertEqual(self.quiz.get_current_question().skip_count, 0)
-
-    @patch("hrt.common.utils.get_user_input_index", return_value=4)
-    @patch("hrt.common.utils.get_user_input_option", return_value="N")
-    def test_display_question_and_get_action_last(self, _, __):
-        self.quiz._current_index = 1
-        self.quiz._display_question_and_get_action()
-        self.assertEqual(self.quiz.get_current_question().skip_count, 1)
+        self.quiz.run()
+        self.assertEqual(self.quiz.get_current_index(), 0)
+        self.assertEqual(self.metric(self.quiz.get_current_index()).skip_count, 0)
 
     @patch("hrt.common.utils.get_user_input_index", return_value=4)
-    @patch("hrt.common.utils.get_user_input_option", return_value="N")
-    def test_display_question_and_get_action_skip_not_last(self, _, __):
-        self.quiz._current_index = 0
-        self.quiz._display_question_and_get_action()
-        self.assertEqual(self.quiz.get_current_question().skip_count, 1)
+    def test_run_skip_not_last(self, _):
+        self.quiz.set_current_index(0)
+        with patch("hrt.common.utils.get_user_input_option", side_effect=["Q"]):
+            self.quiz._state = QuizState.CHOICE
+            self.quiz.run()
+        self.assertEqual(self.metric(0).skip_count, 1)
+        self.assertEqual(self.metric(1).skip_count, 1)
 
     @patch("sys.stdout", new_callable=StringIO)
-    @patch("hrt.common.utils.get_user_input_index", return_value=3)
-    @patch("hrt.common.utils.get_user_input_option", return_value="S")
-    def test_display_question_and_get_action_terminate_quiz(self, mock_stdout, _, __):
-        self.quiz._current_index = 0
-        self.quiz._submitted_questions[QuestionNumber("Q1")] = QuestionSubmitted(
-            question_number=QuestionNumber("Q1"), selected_choice="3"
-        )
-        self.quiz._submitted_questions[QuestionNumber("Q2")] = QuestionSubmitted(
-            question_number=QuestionNumber("Q2"), selected_choice="3"
-        )
-        self.quiz._display_question_and_get_action(skip_last=True)
-        self.quiz._current_index = self.quiz.get_number_of_questions()
+    def test_run_all_submitted(self, _):
+        self.quiz.set_current_index(0)
+        for number in ("Q1", "Q2"):
+            self.quiz.get_session().submitted[QuestionNumber(number)] = QuestionSubmitted(
+                question_number=QuestionNumber(number), selected_choice="3"
+            )
+        self.quiz.run()
         self.assertTrue(self.quiz._terminate_quiz)
 
-    @patch("hrt.common.utils.get_user_input_index", return_value=3)
-    @patch("hrt.common.utils.get_user_input_option", side_effect=["P", "S", "S"])
-    def test_display_question_and_get_action_not_all_submitted(self, _, __):
-        self.quiz._current_index = 0
-        self.quiz._submitted_questions[QuestionNumber("Q1")] = QuestionSubmitted(
+    @patch("sys.stdout", new_callable=StringIO)
+    @patch("hrt.common.utils.get_user_input_option", side_effect=["X", "Q"])
+    def test_run_invalid_action(self, _, mock_stdout):
+        self.quiz.get_session().submitted[QuestionNumber("Q1")] = QuestionSubmitted(
             question_number=QuestionNumber("Q1"), selected_choice="3"
         )
-        self.quiz._display_question_and_get_action(skip_last=True)
-        self.assertFalse(self.quiz._terminate_quiz)
+        self.quiz.run()
+        self.assertIn("Invalid action", mock_stdout.getvalue())
+        self.assertTrue(self.quiz._terminate_quiz)
 
     @patch("sys.stdout", new_callable=StringIO)
     def test_no_previous_question_available(self, mock_stdout):
-        self.quiz._current_index = 0
+        self.quiz.set_current_index(0)
         self.quiz.previous_question()
         self.assertIn("No previous question available.", mock_stdout.getvalue())
 
@@ -474,31 +514,43 @@ class TestQuiz(unittest.TestCase):
 
     def test_post_process(self):
         """Test the post_process method with different pass scenarios."""
+        metrics = self.quiz.get_session().metrics
+        q1, q2 = QuestionNumber("Q1"), QuestionNumber("Q2")
         # Test pass with honours (>=80%)
-        self.quiz._questions[0].correct_attempts = 2  # Both questions correct
-        self.quiz._questions[1].correct_attempts = 2
+        metrics[q1] = QuestionMetric(q1, correct_attempts=2)  # Both questions correct
+        metrics[q2] = QuestionMetric(q2, correct_attempts=2)
         with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
             self.quiz.post_process()
             output = mock_stdout.getvalue()
             self.assertIn("Pass with Honours", output)
 
         # Test regular pass (70-79%)
-        self.quiz._questions[0].correct_attempts = 0
-        self.quiz._questions[0].wrong_attempts = 1
-        self.quiz._questions[1].correct_attempts = 1  # Only one question correct = 50%
+        metrics[q1] = QuestionMetric(q1, wrong_attempts=1)
+        metrics[q2] = QuestionMetric(q2, correct_attempts=1)  # Only one question correct = 50%
         with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
             self.quiz.post_process()
             output = mock_stdout.getvalue()
             self.assertIn("Fail", output)  # Should fail at 50%
 
         # Test fail (<70%)
-        self.quiz._questions[0].correct_attempts = 0
-        self.quiz._questions[1].correct_attempts = 0
+        metrics[q1] = QuestionMetric(q1)
+        metrics[q2] = QuestionMetric(q2)
         with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
             self.quiz.post_process()
             output = mock_stdout.getvalue()
             self.assertIn("Fail", output)
 
+    def test_apply_session(self):
+        self.quiz.set_current_index(0)
+        answer_index = self.quiz.get_answer_index(self.quiz.get_current_question())
+        self.quiz.submit((answer_index + 1) % 4)
+        self.assertEqual(self.questions[0].wrong_attempts, 0)
+        self.assertFalse(self.questions[0].is_marked)
+        self.quiz.apply_session()
+        self.assertEqual(self.questions[0].wrong_attempts, 1)
+        self.assertTrue(self.questions[0].is_marked)
+        self.assertFalse(self.questions[1].is_marked)
+
     def test_get_question_by_number_full_loop(self):
         """Test get_question_by_number iterates through all questions."""
         questions = [
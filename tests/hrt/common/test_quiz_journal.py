@@ -0,0 +1,129 @@
+import os
+import random
+import tempfile
+import unittest
+
+from hrt.common.enums import QuizEventType
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.question import ChoiceOrder, Question
+from hrt.common.quiz_journal import (
+    QuizJournal,
+    fold_marks,
+    fold_metrics,
+    get_pending_records,
+    replay_records,
+)
+from hrt.common.quiz_session import QuizSession
+
+
+def create_questions():
+    return [
+        Question(f"Question {i}", ["A", "B", "C", "D"], "A", QuestionNumber(f"Q{i}"))
+        for i in range(3)
+    ]
+
+
+class TestQuizJournal(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.filepath = os.path.join(temp_dir.name, "ca", "basic", "quiz-journal.jsonl")
+        self.journal = QuizJournal(self.filepath)
+        self.addCleanup(self.journal.close)
+        self.questions = create_questions()
+        self.session = QuizSession(self.questions, ChoiceOrder(random.Random(1)), True)
+
+    def play(self):
+        """Answer the first question right, the second wrong and skip the third."""
+        self.journal.start({"questions": ["Q0", "Q1", "Q2"]})
+        self.session.add_listener(self.journal.record)
+        self.session.next()
+        self.session.answer(self.session.get_answer_index(self.questions[0]))
+        self.session.next()
+        self.session.answer((self.session.get_answer_index(self.questions[1]) + 1) % 4)
+        self.session.next()
+        self.session.skip()
+        self.session.unmark()
+
+    def test_records_events(self):
+        self.play()
+        header, records = self.journal.read()
+        self.assertEqual(header["questions"], ["Q0", "Q1", "Q2"])
+        self.assertEqual(
+            [record["event"] for record in records],
+            ["question", "answered", "question", "answered", "question", "skipped", "unmarked"],
+        )
+        self.assertEqual(records[3], {**records[3], "question": "Q1", "correct": False})
+        self.assertEqual(len(self.journal.pending), 7)
+
+    def test_fold(self):
+        self.play()
+        metrics = {m.question_number: m for m in fold_metrics(self.journal.pending)}
+        self.assertEqual(
+            [(m.correct_attempts, m.wrong_attempts, m.skip_count) for m in metrics.values()],
+            [(1, 0, 0), (0, 1, 0), (0, 0, 1)],
+        )
+        self.assertEqual(fold_marks(self.journal.pending), {"Q1": True, "Q2": False})
+
+    def test_checkpoint(self):
+        self.play()
+        self.journal.checkpoint()
+        self.assertEqual(self.journal.pending, [])
+        self.session.answer(0)
+        _, records = self.journal.read()
+        self.assertEqual(len(get_pending_records(records)), 1)
+        self.assertEqual(self.journal.pending, get_pending_records(records))
+
+    def test_replay_rebuilds_session(self):
+        self.play()
+        self.journal.close()
+        _, records = self.journal.read()
+        questions = create_questions()
+        choice_order = ChoiceOrder()
+        for question in questions:
+            choice_order.set(question, self.session.choice_order.get(question))
+        session = QuizSession(questions, choice_order, True)
+        replay_records(session, records)
+        self.assertEqual(session.current_index, 2)
+        self.assertEqual(set(session.submitted), {"Q0", "Q1"})
+        metrics = [session.get_metric(q) for q in questions]
+        self.assertEqual(
+            [(m.correct_attempts, m.wrong_attempts, m.skip_count) for m in metrics],
+            [(1, 0, 0), (0, 1, 0), (0, 0, 1)],
+        )
+        self.assertEqual([session.is_marked(q) for q in questions], [False, True, False])
+        self.assertEqual(session.next().question_number, "Q2")
+
+    def test_incomplete_last_line(self):
+        self.play()
+        self.journal.close()
+        with open(self.filepath, "a", encoding="utf-8") as f:
+            f.write('{"event":"answ')
+        _, records = self.journal.read()
+        self.assertEqual(len(records), 7)
+        self.journal.reopen(get_pending_records(records))
+        self.session.finish()
+        _, records = self.journal.read()
+        self.assertEqual(records[-1]["event"], QuizEventType.FINISHED.id)
+        self.assertEqual(len(records), 8)
+
+    def test_invalid_journal(self):
+        os.makedirs(os.path.dirname(self.filepath))
+        with open(self.filepath, "w", encoding="utf-8") as f:
+            f.write('{"event":"answered"}\n')
+        with self.assertRaisesRegex(ValueError, "missing start record"):
+            self.journal.read()
+        with open(self.filepath, "w", encoding="utf-8") as f:
+            f.write('{"event":"start"}\ninvalid\n{"event":"finished"}\n')
+        with self.assertRaisesRegex(ValueError, "line 2"):
+            self.journal.read()
+
+    def test_remove(self):
+        self.play()
+        self.assertTrue(self.journal.exists())
+        self.journal.remove()
+        self.assertFalse(self.journal.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+import random
+import unittest
+
+from hrt.common.enums import QuizEventType
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.question import ChoiceOrder, Question
+from hrt.common.quiz_session import QuizResults, QuizSession
+
+
+class TestQuizSession(unittest.TestCase):
+    def setUp(self):
+        self.questions = [
+            Question(f"Question {i}", ["A", "B", "C", "D"], "A", QuestionNumber(f"Q{i}"))
+            for i in range(3)
+        ]
+        self.session = QuizSession(
+            self.questions, ChoiceOrder(random.Random(1)), mark_wrong_answers=True
+        )
+
+    def answer_index(self, index):
+        return self.session.get_answer_index(self.questions[index])
+
+    def test_next_presents_questions_in_order(self):
+        event = self.session.next()
+        self.assertEqual(event.event_type, QuizEventType.QUESTION)
+        self.assertEqual(event.question_number, "Q0")
+        self.assertEqual(event.choices[-1], Question.SKIP_CHOICE)
+        self.assertEqual(sorted(event.choices[:-1]), ["A", "B", "C", "D"])
+        self.session.answer(self.answer_index(0))
+        self.assertEqual(self.session.next().question_number, "Q1")
+
+    def test_answer(self):
+        self.session.next()
+        event = self.session.answer(self.answer_index(0))
+        self.assertEqual(event.event_type, QuizEventType.ANSWERED)
+        self.assertTrue(event.is_correct)
+        self.assertEqual(event.answer_index, self.answer_index(0))
+        self.assertEqual(self.session.get_metric(self.questions[0]).correct_attempts, 1)
+        self.assertEqual(self.session.submitted[QuestionNumber("Q0")].selected_choice, "A")
+        with self.assertRaisesRegex(ValueError, "already submitted"):
+            self.session.answer(0)
+
+    def test_wrong_answer_is_marked(self):
+        self.session.next()
+        event = self.session.answer((self.answer_index(0) + 1) % 4)
+        self.assertFalse(event.is_correct)
+        self.assertTrue(event.is_marked)
+        self.assertEqual(self.session.get_metric(self.questions[0]).wrong_attempts, 1)
+        self.assertTrue(self.session.is_marked(self.questions[0]))
+
+    def test_invalid_choice(self):
+        self.session.next()
+        with self.assertRaisesRegex(ValueError, "Invalid choice"):
+            self.session.answer(5)
+
+    def test_skip_choice_skips(self):
+        self.session.next()
+        event = self.session.answer(4)
+        self.assertEqual(event.event_type, QuizEventType.SKIPPED)
+        self.assertEqual(self.session.get_metric(self.questions[0]).skip_count, 1)
+        self.assertNotIn(QuestionNumber("Q0"), self.session.submitted)
+
+    def test_skipped_questions_come_back(self):
+        self.session.next()
+        self.session.skip()
+        for index in (1, 2):
+            self.assertEqual(self.session.next().question_number, f"Q{index}")
+            self.session.answer(self.answer_index(index))
+        self.assertEqual(self.session.next().question_number, "Q0")
+        self.session.answer(self.answer_index(0))
+        self.assertEqual(self.session.next().event_type, QuizEventType.FINISHED)
+        self.assertTrue(self.session.is_finished)
+
+    def test_mark_and_unmark(self):
+        self.assertTrue(self.session.mark().changed)
+        self.assertFalse(self.session.mark().changed)
+        event = self.session.unmark()
+        self.assertEqual(event.event_type, QuizEventType.UNMARKED)
+        self.assertTrue(event.changed)
+        self.assertFalse(self.session.unmark().changed)
+
+    def test_finish(self):
+        self.session.next()
+        self.session.answer(self.answer_index(0))
+        self.assertEqual(self.session.finish().event_type, QuizEventType.FINISHED)
+        self.assertEqual(
+            self.session.submitted[QuestionNumber("Q2")].selected_choice, Question.SKIP_CHOICE
+        )
+        self.assertEqual(self.session.current().event_type, QuizEventType.FINISHED)
+        with self.assertRaisesRegex(ValueError, "finished"):
+            self.session.skip()
+
+    def test_results(self):
+        self.session.next()
+        self.session.answer(self.answer_index(0))
+        self.session.next()
+        self.session.answer((self.answer_index(1) + 1) % 4)
+        self.session.next()
+        self.session.skip()
+        results = self.session.results()
+        self.assertEqual((results.correct, results.wrong, results.skipped), (1, 1, 1))
+        self.assertEqual(results.answered, 2)
+        self.assertEqual(results.percentage, 33)
+        self.assertEqual(results.marked, ["Q1"])
+
+    def test_sessions_do_not_share_state(self):
+        self.session.next()
+        self.session.answer((self.answer_index(0) + 1) % 4)
+        self.session.mark()
+        other = QuizSession(self.questions, ChoiceOrder(random.Random(2)))
+        other.next()
+        other.answer(other.get_answer_index(self.questions[0]))
+        other.unmark()
+        self.assertEqual(self.session.results().marked, ["Q0"])
+        self.assertEqual(other.results().marked, [])
+        self.assertEqual(
+            (other.results().correct, other.results().wrong, self.session.results().wrong),
+            (1, 0, 1),
+        )
+        question = self.questions[0]
+        self.assertFalse(question.is_marked)
+        self.assertEqual((question.correct_attempts, question.wrong_attempts), (0, 0))
+
+    def test_listeners(self):
+        events = []
+        self.session.add_listener(events.append)
+        self.session.next()
+        self.session.answer(self.answer_index(0))
+        self.session.remove_listener(events.append)
+        self.session.next()
+        self.assertEqual(
+            [event.event_type for event in events],
+            [QuizEventType.QUESTION, QuizEventType.ANSWERED],
+        )
+
+    def test_move(self):
+        event = self.session.move(2)
+        self.assertEqual(event.question_number, "Q2")
+        self.session.skip()
+        self.assertEqual(self.session.move(0).question_number, "Q0")
+        with self.assertRaisesRegex(ValueError, "Invalid question index"):
+            self.session.move(3)
+
+    def test_results_without_questions(self):
+        self.assertEqual(QuizResults(0, 0, 0, 0, []).percentage, 0)
+
+    def test_same_seed_same_session(self):
+        def play(seed):
+            session = QuizSession(self.questions, ChoiceOrder(random.Random(seed)))
+            choices = []
+            event = session.next()
+            while event.event_type != QuizEventType.FINISHED:
+                choices.append(tuple(event.choices))
+                session.answer(0)
+                event = session.next()
+            return choices
+
+        self.assertEqual(play(7), play(7))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.question_metric import QuestionMetric
+from hrt.common.review_schedule import (
+    QUALITY_CORRECT,
+    QUALITY_SKIPPED,
+    QUALITY_WRONG,
+    SECONDS_PER_DAY,
+    ReviewItem,
+    ReviewSchedule,
+    get_review_quality,
+)
+
+NOW = 1_700_000_000
+
+
+class TestReviewItem(unittest.TestCase):
+    def test_correct_answers_grow_interval(self):
+        item = ReviewItem(QuestionNumber("Q1"))
+        intervals = []
+        for _ in range(4):
+            item.review(QUALITY_CORRECT, NOW)
+            intervals.append(item.interval)
+        self.assertEqual(intervals, [1, 6, 15, 38])
+        self.assertEqual(item.repetitions, 4)
+        self.assertEqual(item.ease, 2.5)
+        self.assertEqual(item.due, NOW + 38 * SECONDS_PER_DAY)
+
+    def test_wrong_answer_resets(self):
+        item = ReviewItem(QuestionNumber("Q1"), NOW, 15, 2.5, 3)
+        item.review(QUALITY_WRONG, NOW)
+        self.assertEqual((item.interval, item.repetitions), (1, 0))
+        self.assertAlmostEqual(item.ease, 1.96)
+        for _ in range(5):
+            item.review(QUALITY_WRONG, NOW)
+        self.assertEqual(item.ease, 1.3)
+
+    def test_format_and_parse(self):
+        item = ReviewItem(QuestionNumber("B-001-001-001"), NOW, 6, 2.36, 2)
+        line = item.format()
+        self.assertEqual(line, f"B-001-001-001:{NOW}:6:2.36:2")
+        parsed = ReviewItem.parse(line)
+        self.assertEqual(
+            (parsed.question_number, parsed.due, parsed.interval, parsed.ease),
+            ("B-001-001-001", NOW, 6, 2.36),
+        )
+        self.assertIsNone(ReviewItem.parse("Q1:1:2"))
+        self.assertIsNone(ReviewItem.parse("Q1:x:1:2.5:0"))
+
+
+class TestReviewSchedule(unittest.TestCase):
+    def setUp(self):
+        self.schedule = ReviewSchedule(
+            [ReviewItem(QuestionNumber(f"Q{i}"), NOW - i * SECONDS_PER_DAY) for i in range(1, 6)]
+        )
+
+    def test_get_due_most_overdue_first(self):
+        self.assertEqual(self.schedule.get_due(3, NOW), ["Q5", "Q4", "Q3"])
+        # selection leaves the schedule unchanged
+        self.assertEqual(self.schedule.get_due(3, NOW), ["Q5", "Q4", "Q3"])
+        self.assertEqual(self.schedule.get_due(10, NOW - 3 * SECONDS_PER_DAY), ["Q5", "Q4", "Q3"])
+
+    def test_get_due_eligible(self):
+        self.assertEqual(self.schedule.get_due(2, NOW, {"Q1", "Q2", "Q4"}), ["Q4", "Q2"])
+
+    def test_review_reschedules(self):
+        self.schedule.review(QuestionNumber("Q5"), QUALITY_CORRECT, NOW)
+        self.schedule.review(QuestionNumber("Q5"), QUALITY_CORRECT, NOW)
+        self.schedule.review(QuestionNumber("Q6"), QUALITY_WRONG, NOW)
+        self.assertEqual(len(self.schedule), 6)
+        self.assertIn("Q6", self.schedule)
+        self.assertEqual(self.schedule.get_due(10, NOW), ["Q4", "Q3", "Q2", "Q1"])
+        self.assertEqual(
+            self.schedule.get_due(10, NOW + SECONDS_PER_DAY), ["Q4", "Q3", "Q2", "Q1", "Q6"]
+        )
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as folder:
+            filepath = os.path.join(folder, "ca", "review-schedule.txt")
+            self.schedule.save(filepath)
+            with open(filepath, "a", encoding="utf-8") as f:
+                f.write("invalid\n")
+            loaded = ReviewSchedule.load(filepath)
+            self.assertEqual(len(loaded), 5)
+            self.assertEqual(loaded.get_due(2, NOW), ["Q5", "Q4"])
+            self.assertFalse(os.path.exists(f"{filepath}.tmp"))
+        self.assertEqual(len(ReviewSchedule.load("missing.txt")), 0)
+
+    def test_get_review_quality(self):
+        question_number = QuestionNumber("Q1")
+        self.assertEqual(get_review_quality(QuestionMetric(question_number, 1)), QUALITY_CORRECT)
+        self.assertEqual(get_review_quality(QuestionMetric(question_number, 0, 1)), QUALITY_WRONG)
+        self.assertEqual(
+            get_review_quality(QuestionMetric(question_number, 0, 0, 2)), QUALITY_SKIPPED
+        )
+        self.assertIsNone(get_review_quality(QuestionMetric(question_number)))
+
+
+if __name__ == "__main__":
+    unittest.main()
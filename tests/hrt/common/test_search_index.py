@@ -0,0 +1,140 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from hrt.common import utils
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.question import Question
+from hrt.common.search_index import (
+    SearchIndex,
+    get_search_index_path,
+    get_term_frequencies,
+    tokenize,
+)
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.questions = [
+            Question(
+                "What is the unit of electrical resistance?",
+                ["Ohm", "Volt", "Ampere", "Watt"],
+                "Ohm",
+                QuestionNumber("Q1"),
+            ),
+            Question(
+                "What is the unit of electrical power?",
+                ["Watt", "Ohm", "Farad", "Henry"],
+                "Watt",
+                QuestionNumber("Q2"),
+            ),
+            Question(
+                "Which antenna is omnidirectional in the horizontal plane?",
+                ["Vertical antenna", "Yagi", "Quad", "Log periodic"],
+                "Vertical antenna",
+                QuestionNumber("Q3"),
+            ),
+        ]
+        self.index = SearchIndex.build(self.questions, "a" * 64)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.index_path = os.path.join(self.temp_dir.name, "questions.txt.idx")
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("What's the S-meter?"), ["what", "s", "the", "s", "meter"])
+
+    def test_search_ranking(self):
+        results = self.index.search("electrical resistance")
+        self.assertEqual([qn for qn, _ in results], ["Q1", "Q2"])
+        self.assertGreater(results[0][1], results[1][1])
+
+    def test_search_choices(self):
+        results = self.index.search("yagi")
+        self.assertEqual([qn for qn, _ in results], ["Q3"])
+
+    def test_search_no_match(self):
+        self.assertEqual(self.index.search("repeater"), [])
+
+    def test_search_max_results(self):
+        self.assertEqual(len(self.index.search("unit ohm watt", max_results=1)), 1)
+
+    def test_update(self):
+        questions = [
+            self.questions[2],
+            Question("What is a dipole?", ["Antenna", "Meter"], "Antenna", QuestionNumber("Q4")),
+            self.questions[1],
+        ]
+        questions[2].question_number = QuestionNumber("Q5")
+        with mock.patch(
+            "hrt.common.search_index.get_term_frequencies", wraps=get_term_frequencies
+        ) as mock_frequencies:
+            updated = self.index.update(questions, {"Q2": "Q5", "Q3": "Q3"}, "b" * 64)
+        mock_frequencies.assert_called_once_with(questions[1])
+        self.assertEqual(updated.question_numbers, ["Q3", "Q4", "Q5"])
+        self.assertEqual(updated.file_hash, "b" * 64)
+        rebuilt = SearchIndex.build(questions, "b" * 64)
+        for terms in ("electrical power", "dipole antenna", "yagi"):
+            self.assertEqual(updated.search(terms), rebuilt.search(terms))
+
+    def test_save_and_load(self):
+        self.index.save(self.index_path)
+        loaded = SearchIndex.load(self.index_path, "a" * 64)
+        self.assertIsNotNone(loaded)
+        self.assertEqual(loaded.question_numbers, ["Q1", "Q2", "Q3"])
+        self.assertEqual(loaded.search("electrical"), self.index.search("electrical"))
+
+    def test_load_stale_index(self):
+        self.index.save(self.index_path)
+        self.assertIsNone(SearchIndex.load(self.index_path, "b" * 64))
+
+    def test_load_invalid_index(self):
+        with open(self.index_path, "wb") as file:
+            file.write(b"invalid")
+        self.assertIsNone(SearchIndex.load(self.index_path, "a" * 64))
+
+    def test_load_missing_index(self):
+        self.assertIsNone(SearchIndex.load(self.index_path, "a" * 64))
+
+    def test_load_or_build(self):
+        index = SearchIndex.load_or_build(self.index_path, self.questions, "c" * 64)
+        self.assertEqual(index.file_hash, "c" * 64)
+        self.assertTrue(os.path.exists(self.index_path))
+        reloaded = SearchIndex.load_or_build(self.index_path, [], "c" * 64)
+        self.assertEqual(reloaded.question_numbers, ["Q1", "Q2", "Q3"])
+
+    def test_load_or_build_saves_file_stat(self):
+        bank_path = os.path.join(self.temp_dir.name, "questions.txt")
+        with open(bank_path, "w", encoding="utf-8") as file:
+            file.write("questions")
+        SearchIndex.load_or_build(self.index_path, self.questions, "c" * 64)
+        self.assertIsNone(SearchIndex.load_current(self.index_path, bank_path))
+        # the index is not rebuilt when only the stat of the bank file changed
+        SearchIndex.load_or_build(self.index_path, [], "c" * 64, utils.get_file_stat(bank_path))
+        index = SearchIndex.load_current(self.index_path, bank_path)
+        self.assertEqual(index.question_numbers, ["Q1", "Q2", "Q3"])
+        self.assertEqual(index.search("antenna")[0][0], "Q3")
+
+    def test_load_current_changed_bank_file(self):
+        bank_path = os.path.join(self.temp_dir.name, "questions.txt")
+        with open(bank_path, "w", encoding="utf-8") as file:
+            file.write("questions")
+        SearchIndex.build(self.questions, "c" * 64, utils.get_file_stat(bank_path)).save(
+            self.index_path
+        )
+        self.assertIsNotNone(SearchIndex.load_current(self.index_path, bank_path))
+        with open(bank_path, "a", encoding="utf-8") as file:
+            file.write(" changed")
+        self.assertIsNone(SearchIndex.load_current(self.index_path, bank_path))
+        os.remove(bank_path)
+        self.assertIsNone(SearchIndex.load_current(self.index_path, bank_path))
+
+    def test_get_search_index_path(self):
+        self.assertEqual(
+            str(get_search_index_path(os.path.join("data", "questions.txt"))),
+            os.path.join("data", "questions.txt.idx"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,6 +12,8 @@ from hrt.common.question_metric import QuestionMetric
 from hrt.common.utils import (
     create_folder,
     get_current_time,
+    get_file_hash,
+    get_file_stat,
     get_header,
     get_user_agent,
     get_user_input_index,
@@ -24,7 +26,9 @@ from hrt.common.utils import (
     read_filename,
     read_metrics_from_file,
     read_number_from_input,
+    replace_file_lines,
     save_output,
+    save_output_lines,
     select_from_options,
     select_option_from_list,
     download_file,
@@ -114,6 +118,13 @@ class TestSaveOutput(unittest.TestCase):
         os.remove(test_file_path)
         os.rmdir(folder)
 
+    def test_save_output_lines(self):
+        lines = (f"line{i}" for i in range(3))
+        self.assertEqual(save_output_lines(self.test_file.name, lines), 3)
+        with open(self.test_file.name, "r") as file:
+            content = file.read()
+        self.assertEqual(content, "\n".join(f"line{i}" for i in range(3)))
+
 
 class TestGetHeader(unittest.TestCase):
     def test_get_header(self):
@@ -312,6 +323,17 @@ class TestReadMetricsFromFile(unittest.TestCase):
         self.assertEqual(result, [])
 
 
+class TestReplaceFileLines(unittest.TestCase):
+    def test_replace_file_lines(self):
+        with tempfile.TemporaryDirectory() as folder:
+            filepath = os.path.join(folder, "ca", "marked.txt")
+            replace_file_lines(filepath, ["Q1", "Q2"])
+            replace_file_lines(filepath, iter(["Q3"]))
+            with open(filepath, "r", encoding="utf-8") as f:
+                self.assertEqual(f.read(), "Q3\n")
+            self.assertEqual(os.listdir(os.path.dirname(filepath)), ["marked.txt"])
+
+
 class TestDownloadFile(unittest.TestCase):
     @patch("requests.get")
     def test_download_file(self, mock_get):
@@ -676,5 +698,24 @@ class TestGetUserAgent(unittest.TestCase):
         self.assertEqual(get_user_agent(None), expected_user_agent)
 
 
+class TestGetFileHash(unittest.TestCase):
+    def test_get_file_hash(self):
+        with tempfile.NamedTemporaryFile(delete=False) as file:
+            file.write(b"abc")
+        self.addCleanup(os.remove, file.name)
+        self.assertEqual(
+            get_file_hash(file.name),
+            "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad",
+        )
+
+    def test_get_file_stat(self):
+        with tempfile.NamedTemporaryFile(delete=False) as file:
+            file.write(b"abc")
+        self.addCleanup(os.remove, file.name)
+        stat = os.stat(file.name)
+        self.assertEqual(get_file_stat(file.name), [stat.st_ino, 3, stat.st_mtime_ns])
+        self.assertEqual(get_file_stat(f"{file.name}.missing"), [])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -3,20 +3,29 @@ from pathlib import Path
 from unittest.mock import MagicMock, patch
 from unittest import mock
 
+from hrt.common import constants
 from hrt.common.config_reader import HRTConfig
 from typing import List, Sequence, cast
-from hrt.common.question import Question
+from hrt.common.hrt_types import QuestionNumber
+from hrt.common.question import ChoiceOrder, Question
 from hrt.common.question_display import QuestionDisplay
-from hrt.processors.question_processor import QuestionProcessor
+from concurrent.futures import ThreadPoolExecutor
+from hrt.processors.question_processor import LISTING_TYPES, QuestionProcessor
 from hrt.processors.question_processor import get_answers as processor_get_answers
+from hrt.processors.question_processor import get_question_processors
+from hrt.processors.question_processor import report_question_bank_stats
+from hrt.processors.question_processor import search_question_bank_index
+from hrt.processors.question_processor import search_question_banks
 from hrt.common.enums import (
     CountryCode,
     ExamType,
     GeneralQuestionListingType,
     QuestionDisplayMode,
+    QuestionLanguage,
     MarkedQuestionListingType,
     QuestionAnswerDisplay,
     QuizAnswerDisplay,
+    TopQuestionsListingType,
 )
 from hrt.common.question_bank import IQuestionBank
 
@@ -56,7 +65,7 @@ class TestQuestionProcessor(unittest.TestCase):
             self.config, self.country, self.exam_type, self.display_mode
         )
 
-    @patch("hrt.processors.question_processor.QuestionBankFactory.get_question_bank")
+    @patch("hrt.processors.question_processor.QuestionBankRegistry.get_question_bank")
     def test_initialization(self, mock_get_question_bank):
         mock_get_question_bank.return_value = MagicMock(spec=IQuestionBank)
         processor = QuestionProcessor(self.config, self.country, self.exam_type, self.display_mode)
@@ -81,22 +90,18 @@ class TestQuestionProcessor(unittest.TestCase):
         self.processor._initialize_question_display()
         self.assertIsNotNone(mock_display_mode)
 
-    @patch("hrt.processors.question_processor.utils.save_output")
-    def test_save_to_file(self, mock_save_output):
+    @patch("hrt.processors.question_processor.utils.save_output_lines")
+    def test_save_to_file(self, mock_save_output_lines):
         output = ["Header", "Question1", "Question2"]
         criteria = GeneralQuestionListingType.ALL
         self.processor._save_to_file(output, criteria)
-        mock_save_output.assert_called_once()
+        mock_save_output_lines.assert_called_once()
 
-    @patch("hrt.processors.question_processor.utils.get_header")
     @patch("hrt.processors.question_processor.QuestionProcessor._save_to_file")
-    @patch("hrt.processors.question_processor.utils.save_output")
-    def test_process_list_result1(self, mock_save_output, mock_get_header, mock_save_to_file):
+    def test_process_list_result1(self, mock_save_to_file):
         result = [MagicMock()]
         result_text = ["Question1"]
         criteria = GeneralQuestionListingType.ALL
-        mock_get_header.return_value = "Header"
-        mock_save_output.return_value = "output"
         self.processor._process_list_result(
             cast(List[Question], result), result_text, criteria, True
         )
@@ -114,7 +119,7 @@ class TestQuestionProcessor(unittest.TestCase):
         self.processor.list_marked(criteria, QuestionAnswerDisplay.IN_THE_END)
         mock_process_list_result.assert_called_once()
 
-    @patch("hrt.processors.question_processor.QuestionBankFactory.get_question_bank")
+    @patch("hrt.processors.question_processor.QuestionBankRegistry.get_question_bank")
     def test_get_question_bank(self, mock_get_question_bank):
         mock_question_bank_instance = MagicMock(spec=IQuestionBank)
         mock_get_question_bank.return_value = mock_question_bank_instance
@@ -234,8 +239,8 @@ class TestQuestionProcessor(unittest.TestCase):
         "hrt.processors.question_processor.utils.get_header", side_effect=lambda x: f"Header: {x}"
     )
     @patch(
-        "hrt.processors.question_processor.get_answers",
-        return_value=["1: 1. Answer1", "2: 2. Answer2"],
+        "hrt.processors.question_processor.iter_answers",
+        side_effect=lambda *_: iter(["1: 1. Answer1", "2: 2. Answer2"]),
     )
     def test_process_list_result2(self, mock_get_answers, mock_get_header):
         result = [MagicMock(spec=Question), MagicMock(spec=Question)]
@@ -266,8 +271,8 @@ class TestQuestionProcessor(unittest.TestCase):
         "hrt.processors.question_processor.utils.get_header", side_effect=lambda x: f"Header: {x}"
     )
     @patch(
-        "hrt.processors.question_processor.get_answers",
-        return_value=["1: 1. Answer1", "2: 2. Answer2"],
+        "hrt.processors.question_processor.iter_answers",
+        side_effect=lambda *_: iter(["1: 1. Answer1", "2: 2. Answer2"]),
     )
     def test_process_list_result_save_to_file(self, _, __, mock_save_to_file):
         result = [MagicMock(spec=Question), MagicMock(spec=Question)]
@@ -289,13 +294,15 @@ class TestQuestionProcessor(unittest.TestCase):
             "Count: 2",
         ]
 
-        mock_save_to_file.assert_called_once_with(expected_output, criteria)
+        mock_save_to_file.assert_called_once()
+        output, saved_criteria = mock_save_to_file.call_args.args
+        self.assertEqual(list(output), expected_output)
+        self.assertEqual(saved_criteria, criteria)
 
-    @patch("hrt.processors.question_processor.utils.load_question_metrics", return_value={})
     @patch("hrt.processors.question_processor.QuestionProcessor._process_list_result")
-    @patch("hrt.common.question_bank.QuestionBank.get_marked_questions")
+    @patch("hrt.common.question_bank.QuestionBank.iter_marked_questions")
     def test_list_marked_sets_question_display(
-        self, mock_get_marked_questions, mock_process_list_result, mock_load_question_metrics
+        self, mock_get_marked_questions, mock_process_list_result
     ):
         criteria = MagicMock(spec=MarkedQuestionListingType)
         answer_display = QuestionAnswerDisplay.IN_THE_END
@@ -308,12 +315,171 @@ class TestQuestionProcessor(unittest.TestCase):
         )
 
         self.processor.list_marked(criteria, answer_display)
+        mock_get_marked_questions.assert_called_once_with(
+            criteria,
+            metrics=None,
+            question_count=constants.MIN_MARKED_QUESTIONS_COUNT,
+            choice_order=mock.ANY,
+        )
 
         self.assertIsNotNone(Question.question_display)
         self.assertIsInstance(Question.question_display, QuestionDisplay)
         if Question.question_display:
             self.assertEqual(Question.question_display.answer_display, answer_display)
 
+    @patch("hrt.processors.question_processor.SearchIndex.load_or_build")
+    def test_search(self, mock_load_or_build):
+        question = Question("Test question?", ["A", "B"], "A", QuestionNumber("Q1"))
+        self.processor._qb = MagicMock(spec=IQuestionBank)
+        self.processor._qb.questions = [question]
+        self.processor._qb.file_hash = "hash"
+        self.processor._qb.file_stat = [1, 2, 3]
+        mock_load_or_build.return_value.search.return_value = [("Q1", 1.5), ("Q9", 1.0)]
+
+        result = self.processor.search("test", 5)
+
+        self.assertEqual(result, [(1.5, question)])
+        # the hash taken when the question bank was loaded is reused
+        mock_load_or_build.assert_called_once_with(mock.ANY, [question], "hash", [1, 2, 3])
+        mock_load_or_build.return_value.search.assert_called_once_with("test", 5)
+
+    @patch("hrt.processors.question_processor.QuestionBankFactory.read_questions")
+    @patch("hrt.processors.question_processor.SearchIndex.load_current")
+    def test_search_question_bank_index(self, mock_load_current, mock_read_questions):
+        question = Question("Test question?", ["A", "B"], "A", QuestionNumber("Q1"))
+        mock_load_current.return_value.search.return_value = [("Q1", 1.5), ("Q9", 1.0)]
+        mock_read_questions.return_value = [question]
+
+        result = search_question_bank_index(self.config, self.country, self.exam_type, "test")
+
+        self.assertEqual(result, [(1.5, question)])
+        file_path = Path("input_folder") / "ca" / "basic" / "questions.json"
+        mock_load_current.assert_called_once_with(Path(f"{file_path}.idx"), file_path)
+        mock_read_questions.assert_called_once_with(
+            self.country, file_path, QuestionLanguage.EN, ["Q1", "Q9"]
+        )
+
+    @patch("hrt.processors.question_processor.SearchIndex.load_current", return_value=None)
+    def test_search_question_bank_index_stale(self, _):
+        self.assertIsNone(
+            search_question_bank_index(self.config, self.country, self.exam_type, "test")
+        )
+
+    @patch("hrt.processors.question_processor.get_question_processors")
+    @patch("hrt.processors.question_processor.search_question_bank_index")
+    def test_search_question_banks(self, mock_search_index, mock_get_processors):
+        indexed = Question("Indexed?", ["A", "B"], "A", QuestionNumber("Q1"))
+        loaded = Question("Loaded?", ["A", "B"], "A", QuestionNumber("Q2"))
+        mock_search_index.side_effect = [[(1.0, indexed)], None]
+        processor = MagicMock()
+        processor.search.return_value = [(2.0, loaded)]
+        mock_get_processors.return_value = [processor]
+
+        with patch("builtins.print") as mock_print:
+            search_question_banks(
+                self.config, self.country, "test", QuestionAnswerDisplay.HIDE, save_to_file=False
+            )
+
+        # only the exam type without a current index loads its question bank
+        exam_type_ids = list(ExamType.supported_country_ids(self.country))
+        mock_get_processors.assert_called_once_with(
+            self.config,
+            self.country,
+            language=QuestionLanguage.EN,
+            exam_type_ids=exam_type_ids[1:],
+        )
+        printed = [call.args[0] for call in mock_print.call_args_list]
+        numbers = [line.split(":")[0] for line in printed if line.startswith("Q")]
+        self.assertEqual(numbers, ["Q2", "Q1"])
+        self.assertIn("Count: 2", printed)
+
+    @patch("hrt.processors.question_processor.QuestionProcessor")
+    def test_get_question_processors(self, mock_question_processor):
+        processor = MagicMock()
+        mock_question_processor.side_effect = [processor, FileNotFoundError("missing")]
+
+        processors = get_question_processors(self.config, self.country)
+
+        self.assertEqual(processors, [processor])
+        self.assertEqual(mock_question_processor.call_count, 2)
+
+    @patch("hrt.processors.question_processor.FileLock")
+    @patch("hrt.processors.question_processor.MetricsRepository")
+    @patch("hrt.processors.question_processor.SearchIndex.load")
+    @patch("hrt.processors.question_processor.migrate_question_numbers_file")
+    @patch("hrt.processors.question_processor.BankManifest")
+    def test_diff_apply(
+        self, mock_manifest, mock_migrate, mock_load_index, mock_repository, mock_lock
+    ):
+        self.processor._qb = MagicMock(spec=IQuestionBank)
+        self.processor._qb.file_hash = "hash"
+        new_manifest = mock_manifest.from_questions.return_value
+        old_manifest = mock_manifest.load.return_value
+        diff = old_manifest.diff.return_value
+        diff.format.return_value = ["Added: 1"]
+        diff.has_changes = True
+        mock_migrate.return_value = 0
+
+        with patch("builtins.print") as mock_print:
+            self.processor.diff(apply=True, save_to_file=False)
+
+        mock_print.assert_any_call("Added: 1")
+        self.assertEqual(mock_migrate.call_count, 3)
+        mock_migrate.assert_any_call(self.processor.review_schedule_file_path, diff)
+        mock_repository.get.return_value.merge_deltas.assert_called_once()
+        self.assertEqual(mock_lock.call_count, 3)
+        mock_load_index.return_value.update.return_value.save.assert_called_once()
+        mock_manifest.from_questions.assert_called_once_with(mock.ANY, "hash")
+        new_manifest.save.assert_called_once()
+
+    @patch("hrt.processors.question_processor.BankManifest")
+    def test_diff_without_manifest_saves_baseline(self, mock_manifest):
+        mock_manifest.load.return_value = None
+        self.processor.diff(apply=True, save_to_file=False)
+        mock_manifest.from_questions.return_value.save.assert_called_once()
+
+    @patch.object(QuestionProcessor, "save_listing", side_effect=lambda c, m: Path(c.id))
+    def test_list_all(self, mock_save_listing):
+        self.processor._qb = MagicMock(spec=IQuestionBank)
+        paths = self.processor.list_all(QuestionAnswerDisplay.IN_THE_END, 5)
+        self.assertEqual(paths, [Path(criteria.id) for criteria in LISTING_TYPES])
+        self.processor._qb.prepare_listings.assert_called_once()
+        self.assertEqual(
+            Question.question_display.answer_display, QuestionAnswerDisplay.IN_THE_END
+        )
+
+    @patch(
+        "hrt.processors.question_processor.get_listing_executor",
+        side_effect=lambda _: ThreadPoolExecutor(2),
+    )
+    @patch.object(QuestionProcessor, "save_listing", side_effect=lambda c, m: Path(c.id))
+    def test_list_all_in_threads(self, mock_save_listing, _):
+        self.processor._qb = MagicMock(spec=IQuestionBank)
+        self.processor.list_all(QuestionAnswerDisplay.HIDE, 5)
+        self.assertEqual(mock_save_listing.call_count, len(LISTING_TYPES))
+        mock_save_listing.assert_any_call(GeneralQuestionListingType.ALL, 0)
+        mock_save_listing.assert_any_call(TopQuestionsListingType.SKIP_RATE, 5)
+
+    @patch.object(QuestionProcessor, "list")
+    def test_list_all_printed(self, mock_list):
+        self.assertEqual(self.processor.list_all(QuestionAnswerDisplay.HIDE, 5, False), [])
+        self.assertEqual(mock_list.call_count, len(LISTING_TYPES))
+
+    @patch("hrt.processors.question_processor.utils.save_output")
+    @patch("hrt.processors.question_processor.get_question_processors")
+    def test_report_question_bank_stats_json(self, mock_get_processors, mock_save_output):
+        processor = MagicMock()
+        processor.get_stats.return_value = {"exam_type": "basic", "question_count": 2}
+        mock_get_processors.return_value = [processor]
+        self.config.get_output.return_value = {"folder": "output_folder"}
+
+        report_question_bank_stats(self.config, self.country, json_format=True)
+
+        filename, output, folder = mock_save_output.call_args.args
+        self.assertEqual(filename, str(Path("ca") / constants.STATS_JSON_OUTPUT_FILENAME))
+        self.assertIn('"question_count": 2', output)
+        self.assertEqual(folder, "output_folder")
+
 
 def get_answers(questions: Sequence[Question]) -> List[str]:
     return processor_get_answers(list(questions))
@@ -323,12 +489,12 @@ class TestGetAnswers(unittest.TestCase):
     def setUp(self):
         self.question1 = MagicMock(spec=Question)
         self.question1.question_number = 1
-        self.question1.answer_index = 0
+        self.question1.get_answer_index.return_value = 0
         self.question1.answer = "Answer1"
 
         self.question2 = MagicMock(spec=Question)
         self.question2.question_number = 2
-        self.question2.answer_index = 1
+        self.question2.get_answer_index.return_value = 1
         self.question2.answer = "Answer2"
 
     def test_get_answers_in_the_end(self):
@@ -347,6 +513,14 @@ class TestGetAnswers(unittest.TestCase):
         expected_answers = ["1: 1. Answer1", "2: 2. Answer2"]
         self.assertEqual(get_answers(questions), expected_answers)
 
+    def test_get_answers_with_choice_order(self):
+        Question.question_display = MagicMock()
+        Question.question_display.answer_display = QuestionAnswerDisplay.IN_THE_END
+        question = Question("Question?", ["A", "B", "C"], "A", QuestionNumber("Q1"))
+        choice_order = MagicMock(spec=ChoiceOrder)
+        choice_order.get.return_value = (2, 0, 1)
+        self.assertEqual(processor_get_answers([question], choice_order), ["Q1: 2. A"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,19 +1,35 @@
 """Test quiz processor."""
 
+import json
+import os
+import tempfile
+import time
 import unittest
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 from hrt.common.enums import (
     CountryCode,
+    ExamType,
     QuestionDisplayMode,
     QuizAnswerDisplay,
+    QuizEventType,
     QuizSource,
 )
 from hrt.common.hrt_types import QuestionNumber
+from hrt.common.metrics_repository import MetricsRepository
+from hrt.common.progress_store import ProgressStore
 from hrt.common.question import Question
-from hrt.common.question_bank import IQuestionBank
+from hrt.common.question_bank import IQuestionBank, QuestionBank
 from hrt.common.question_metric import QuestionMetric
-from hrt.processors.quiz_processor import QuizProcessor
+from hrt.common.quiz_journal import QuizJournal
+from hrt.common.review_schedule import SECONDS_PER_DAY, ReviewItem, ReviewSchedule
+from hrt.processors.quiz_processor import (
+    AdaptiveWeights,
+    QuizProcessor,
+    get_answer_log,
+    report_answer_stats,
+)
 
 
 class TestQuizProcessor(unittest.TestCase):
@@ -26,7 +42,8 @@ class TestQuizProcessor(unittest.TestCase):
         mock_exam_type.country = CountryCode.CANADA
         mock_exam_type.id = "basic"
         self.question_bank.exam_type = mock_exam_type
-        self.question_bank.get_random_questions.return_value = []  # Default return value
+        self.sample = self.question_bank.query.return_value.unmarked.return_value.sample
+        self.sample.return_value = []  # Default return value
 
         self.question = Question(
             "Test Question?", ["A", "B", "C", "D"], "A", QuestionNumber("Q1"), None
@@ -42,6 +59,7 @@ class TestQuizProcessor(unittest.TestCase):
         }
         self.print_config = {"answer_display": QuizAnswerDisplay.AFTER_QUESTION.id}
         self.metrics_config = {"folder": "test_metrics", "filename": "metrics.txt"}
+        self.addCleanup(MetricsRepository.clear)
         self.processor = QuizProcessor(
             self.question_bank,
             1,
@@ -53,69 +71,17 @@ class TestQuizProcessor(unittest.TestCase):
             self.metrics_config,
         )
 
-    def test_initialize_quiz_all_source(self):
-        """Test initialize quiz with ALL source."""
-        self.question_bank.reset_mock()
-        self.question_bank.get_random_questions.return_value = [self.question]
-        self.processor._initialize_quiz()
-        self.assertIsNotNone(self.processor._quiz)
-        self.question_bank.get_random_questions.assert_called_once_with(1, False, [], [])
-
-    def test_initialize_quiz_marked_source(self):
-        """Test initialize quiz with MARKED source."""
+    def test_initialize_quiz_blueprint_source(self):
+        """Test initialize quiz with BLUEPRINT source."""
         self.question_bank.reset_mock()
-        self.processor._quiz_source = QuizSource.MARKED
-        self.question_bank.get_random_questions.return_value = [self.question]
+        self.processor._quiz_source = QuizSource.BLUEPRINT
+        self.question_bank.get_blueprint_questions.return_value = [self.question]
         self.processor._initialize_quiz()
         self.assertIsNotNone(self.processor._quiz)
-        self.question_bank.get_random_questions.assert_called_once_with(1, True, [], [])
-
-    def test_initialize_quiz_new_source(self):
-        """Test initialize quiz with a NEW source."""
-        self.question_bank.reset_mock()
-        self.processor._quiz_source = QuizSource.NEW
-        metric = QuestionMetric(QuestionNumber("Q1"))
-        with patch.object(self.processor, "_get_metric_questions", return_value=[metric]):
-            self.question_bank.get_random_questions.return_value = [self.question]
-            self.processor._initialize_quiz()
-            self.assertIsNotNone(self.processor._quiz)
-            self.question_bank.get_random_questions.assert_called_once_with(1, False, [], ["Q1"])
-
-    def test_initialize_quiz_skipped_questions(self):
-        """Test initialize quiz with SKIPPED_QUESTIONS source."""
-        self.question_bank.reset_mock()
-        self.processor._quiz_source = QuizSource.SKIPPED_QUESTIONS
-        metric = QuestionMetric(QuestionNumber("Q1"))
-        metric.skip_count = 1
-        metric.correct_attempts = 0
-        with patch.object(self.processor, "_get_metric_questions", return_value=[metric]):
-            self.question_bank.get_random_questions.return_value = [self.question]
-            self.processor._initialize_quiz()
-            self.assertIsNotNone(self.processor._quiz)
-            self.question_bank.get_random_questions.assert_called_once_with(1, False, [], ["Q1"])
-
-    def test_initialize_quiz_exclude_correct(self):
-        """Test initialize quiz excluding correct answers."""
-        self.question_bank.reset_mock()
-        self.processor._quiz_source = QuizSource.EXCLUDE_CORRECT_ANSWERS
-        metric = QuestionMetric(QuestionNumber("Q1"))
-        metric.correct_attempts = 1
-        with patch.object(self.processor, "_get_metric_questions", return_value=[metric]):
-            self.question_bank.get_random_questions.return_value = [self.question]
-            self.processor._initialize_quiz()
-            self.assertIsNotNone(self.processor._quiz)
-            self.question_bank.get_random_questions.assert_called_once_with(1, False, [], ["Q1"])
-
-    def test_initialize_quiz_old(self):
-        """Test initialize quiz with an OLD source."""
-        self.question_bank.reset_mock()
-        self.processor._quiz_source = QuizSource.OLD
-        metric = QuestionMetric(QuestionNumber("Q1"))
-        with patch.object(self.processor, "_get_metric_questions", return_value=[metric]):
-            self.question_bank.get_random_questions.return_value = [self.question]
-            self.processor._initialize_quiz()
-            self.assertIsNotNone(self.processor._quiz)
-            self.question_bank.get_random_questions.assert_called_once_with(1, True, ["Q1"], [])
+        self.question_bank.get_blueprint_questions.assert_called_once_with(
+            1, self.processor._random
+        )
+        self.question_bank.query.assert_not_called()
 
     def test_initialize_quiz_invalid_source(self):
         """Test initialize quiz with an invalid source."""
@@ -126,19 +92,27 @@ class TestQuizProcessor(unittest.TestCase):
             self.processor._initialize_quiz()
         self.assertTrue("Invalid quiz source:" in str(context.exception))
 
-    @patch("os.makedirs")  # type: ignore
-    def test_save_marked_questions(self, mock_makedirs):
+    def _get_temp_folder(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        return temp_dir.name
+
+    def _read_file(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_save_marked_questions(self):
         """Test save marked questions."""
-        self.question_bank.get_marked_questions_filepath.return_value = "test_path/marked.txt"
+        marked_path = os.path.join(self._get_temp_folder(), "test_path", "marked.txt")
+        self.question_bank.get_marked_questions_filepath.return_value = marked_path
         self.processor._quiz = MagicMock()
-        self.processor._quiz.get_marked_questions.return_value = [self.question]
-        self.question_bank.get_all_marked_questions.return_value = []
+        question = Question("Test Question?", ["A", "B", "C", "D"], "A", QuestionNumber("Q1"))
+        question.is_marked = True
+        self.processor._quiz.get_questions.return_value = [question]
 
-        with patch("builtins.open", unittest.mock.mock_open()) as mock_file:
-            self.processor._save_marked_questions()
-            mock_makedirs.assert_called_once_with("test_path", exist_ok=True)
-            mock_file.assert_called_once_with("test_path/marked.txt", "w", encoding="utf-8")
-            mock_file().write.assert_called_once_with("Q1\n")
+        self.processor._save_marked_questions()
+        self.assertEqual(self._read_file(marked_path), "Q1\n")
+        self.assertFalse(os.path.exists(f"{marked_path}.tmp"))
 
     def test_save_marked_questions_no_filepath(self):
         """Test save marked questions with no filepath."""
@@ -150,28 +124,25 @@ class TestQuizProcessor(unittest.TestCase):
 
     def test_save_marked_questions_with_existing(self):
         """Test save marked questions when there are already existing marked questions."""
-        self.question_bank.get_marked_questions_filepath.return_value = "test_path/marked.txt"
+        marked_path = os.path.join(self._get_temp_folder(), "marked.txt")
+        self.question_bank.get_marked_questions_filepath.return_value = marked_path
         self.processor._quiz = MagicMock()
+        # Q2 marked by another quiz after the question bank was loaded, Q3 unmarked in the quiz
+        with open(marked_path, "w", encoding="utf-8") as f:
+            f.write("Q2\nQ3\n")
 
-        # Current quiz marked question
         current_marked = Question(
             "Test Question?", ["A", "B", "C", "D"], "A", QuestionNumber("Q1"), None
         )
-        self.processor._quiz.get_marked_questions.return_value = [current_marked]
-
-        # Previously marked question
-        existing_marked = Question(
-            "Test Question 2?", ["A", "B", "C", "D"], "B", QuestionNumber("Q2"), None
+        current_marked.is_marked = True
+        current_unmarked = Question(
+            "Test Question 3?", ["A", "B", "C", "D"], "C", QuestionNumber("Q3"), None
         )
-        self.question_bank.get_all_marked_questions.return_value = [existing_marked]
+        self.processor._quiz.get_questions.return_value = [current_marked, current_unmarked]
 
-        with patch("os.makedirs"), patch("builtins.open", unittest.mock.mock_open()) as mock_file:
-            self.processor._save_marked_questions()
-            mock_file.assert_called_once_with("test_path/marked.txt", "w", encoding="utf-8")
-            # Both Q1 and Q2 should be written to the file in sorted order
-            mock_file().write.assert_has_calls(
-                [unittest.mock.call("Q1\n"), unittest.mock.call("Q2\n")]
-            )
+        self.processor._save_marked_questions()
+        # Q1 and Q2 should be written to the file in sorted order
+        self.assertEqual(self._read_file(marked_path), "Q1\nQ2\n")
 
     def test_get_metrics_file_path(self):
         """Test get metrics file path."""
@@ -185,73 +156,78 @@ class TestQuizProcessor(unittest.TestCase):
             self.processor._get_metrics_file_path()
         self.assertEqual(str(context.exception), "Metrics folder not found in the config file")
 
+    def _use_temp_metrics_file(self, content=None):
+        folder = self._get_temp_folder()
+        self.processor._metrics_config = {"folder": folder, "filename": "metrics.txt"}
+        metrics_path = self.processor._get_metrics_file_path()
+        if content is not None:
+            os.makedirs(os.path.dirname(metrics_path))
+            with open(metrics_path, "w", encoding="utf-8") as f:
+                f.write(content)
+        return metrics_path
+
     def test_save_metrics_new_question(self):
         """Test save metrics for new question."""
+        metrics_path = self._use_temp_metrics_file()
         self.processor._quiz = MagicMock()
         question = self.question
         question.metric = QuestionMetric(QuestionNumber("Q1"))
         question.metric.correct_attempts = 1
         self.processor._quiz.get_questions.return_value = [question]
 
-        with (
-            patch("os.makedirs"),
-            patch.object(self.processor, "_get_metric_questions", return_value=[]),
-            patch("builtins.open", unittest.mock.mock_open()) as mock_file,
-        ):
-            self.processor._save_metrics()
-            mock_file().write.assert_called_once_with("Q1:1:0:0\n")
+        self.processor._save_metrics()
+        self.assertEqual(self._read_file(metrics_path), "Q1:1:0:0\n")
+        self.assertFalse(os.path.exists(f"{metrics_path}.tmp"))
 
     def test_save_metrics_existing_question(self):
         """Test save metrics for existing question."""
+        metrics_path = self._use_temp_metrics_file("Q1:2:0:0\n")
         self.processor._quiz = MagicMock()
         question = self.question
         question.metric = QuestionMetric(QuestionNumber("Q1"))
         question.metric.correct_attempts = 1
-        existing_metric = QuestionMetric(QuestionNumber("Q1"))
-        existing_metric.correct_attempts = 2
-
         self.processor._quiz.get_questions.return_value = [question]
 
-        with (
-            patch("os.makedirs"),
-            patch.object(self.processor, "_get_metric_questions", return_value=[existing_metric]),
-            patch("builtins.open", unittest.mock.mock_open()) as mock_file,
-        ):
-            self.processor._save_metrics()
-            mock_file().write.assert_called_once_with("Q1:3:0:0\n")
+        self.processor._save_metrics()
+        self.assertEqual(self._read_file(metrics_path), "Q1:3:0:0\n")
+
+    def test_save_metrics_merges_sorted(self):
+        """Test save metrics keeps the metrics file sorted by question number."""
+        metrics_path = self._use_temp_metrics_file("Q1:1:0:0\nQ3:0:1:0\n")
+        self.processor._save_metrics(
+            [
+                QuestionMetric(QuestionNumber("Q4"), 1),
+                QuestionMetric(QuestionNumber("Q3"), skip_count=1),
+                QuestionMetric(QuestionNumber("Q0"), 0, 1),
+            ]
+        )
+        self.assertEqual(self._read_file(metrics_path), "Q0:0:1:0\nQ1:1:0:0\nQ3:0:1:1\nQ4:1:0:0\n")
+        self.assertEqual(
+            [m.question_number for m in self.processor._get_metric_questions()],
+            ["Q0", "Q1", "Q3", "Q4"],
+        )
 
     def test_save_metrics_no_questions(self):
         """Test save metrics with no questions."""
+        metrics_path = self._use_temp_metrics_file()
         self.processor._quiz = MagicMock()
         self.processor._quiz.get_questions.return_value = []
-        expected_path = "test_metrics/ca/basic/metrics.txt"
 
-        with (
-            patch("os.makedirs"),
-            patch.object(self.processor, "_get_metric_questions", return_value=[]),
-            patch("builtins.open", unittest.mock.mock_open()) as mock_file,
-        ):
-            self.processor._save_metrics()
-            # File should be opened to write the empty metrics
-            mock_file.assert_called_once_with(expected_path, "w", encoding="utf-8")
+        self.processor._save_metrics()
+        # Nothing to add, the file is not written
+        self.assertFalse(os.path.exists(metrics_path))
 
     def test_save_metrics_question_without_metric(self):
         """Test save metrics when a question has no metric data."""
+        metrics_path = self._use_temp_metrics_file()
         self.processor._quiz = MagicMock()
         question = self.question
         question.metric = None  # Question without metric data
         self.processor._quiz.get_questions.return_value = [question]
-        expected_path = "test_metrics/ca/basic/metrics.txt"
 
-        with (
-            patch("os.makedirs"),
-            patch.object(self.processor, "_get_metric_questions", return_value=[]),
-            patch("builtins.open", unittest.mock.mock_open()) as mock_file,
-        ):
-            self.processor._save_metrics()
-            # File should be opened and default metrics written (0:0:0)
-            mock_file.assert_called_once_with(expected_path, "w", encoding="utf-8")
-            mock_file().write.assert_called_once_with("Q1:0:0:0\n")
+        self.processor._save_metrics()
+        # default metrics written (0:0:0)
+        self.assertEqual(self._read_file(metrics_path), "Q1:0:0:0\n")
 
     def test_display_answers_in_the_end(self):
         """Test display answers in the end."""
@@ -317,11 +293,18 @@ class TestQuizProcessor(unittest.TestCase):
             patch.object(self.processor, "_display_answers") as mock_display,
             patch.object(self.processor, "_save_marked_questions") as mock_save_marked,
             patch.object(self.processor, "_save_metrics") as mock_save_metrics,
+            patch.object(self.processor, "_save_review_schedule") as mock_save_schedule,
+            patch.object(self.processor, "_open_journal") as mock_open_journal,
+            patch.object(self.processor, "_close_journal") as mock_close_journal,
         ):
             self.processor.process()
             mock_display.assert_called_once()
             mock_save_marked.assert_called_once()
             mock_save_metrics.assert_called_once()
+            mock_save_schedule.assert_called_once()
+            mock_open_journal.assert_called_once()
+            mock_close_journal.assert_called_once()
+            self.processor._quiz.start.assert_called_once()
 
     def test_process_no_quiz(self):
         """Test the process method with no quiz."""
@@ -330,29 +313,6 @@ class TestQuizProcessor(unittest.TestCase):
             self.processor.process()
             mock_print.assert_called_once_with("Quiz not initialized. Exiting...")
 
-    def test_initialize_quiz_wrong_answers(self):
-        """Test initialize quiz with a wrong answers source."""
-        self.question_bank.reset_mock()
-        self.processor._quiz_source = QuizSource.WRONG_ANSWERS
-        metric = QuestionMetric(QuestionNumber("Q1"))
-        metric.wrong_attempts = 1
-        with patch.object(self.processor, "_get_metric_questions", return_value=[metric]):
-            self.question_bank.get_random_questions.return_value = [self.question]
-            self.processor._initialize_quiz()
-            self.assertIsNotNone(self.processor._quiz)
-            self.question_bank.get_random_questions.assert_called_once_with(1, True, ["Q1"], [])
-
-    def test_initialize_quiz_wrong_answers_no_metrics(self):
-        """Test initialize quiz with a wrong answers source but no metrics."""
-        self.question_bank.reset_mock()
-        self.processor._quiz_source = QuizSource.WRONG_ANSWERS
-        with patch.object(self.processor, "_get_metric_questions", return_value=[]):
-            self.question_bank.get_random_questions.return_value = [self.question]
-            self.processor._initialize_quiz()
-            self.assertIsNotNone(self.processor._quiz)
-            # In the actual implementation, it calls with shuffle=True since there are no wrong answers to filter by
-            self.question_bank.get_random_questions.assert_called_once_with(1, True, [], [])
-
     @patch("os.path.exists", return_value=False)
     def test_get_metric_questions_no_file(self, _):
         """Test get metric questions with no metrics file."""
@@ -385,8 +345,345 @@ class TestQuizProcessor(unittest.TestCase):
     def test_initialize_quiz_no_questions(self):
         """Test initialize quiz when no questions are found."""
         self.question_bank.reset_mock()
-        self.question_bank.get_random_questions.return_value = []
         with patch("builtins.print") as mock_print:
             self.processor._initialize_quiz()
             self.assertIsNone(self.processor._quiz)
             mock_print.assert_called_once_with("No questions found for the quiz.")
+
+
+QUIZ_CONFIG_KEYS = (
+    "mark_wrong_answers",
+    "show_explanation",
+    "show_hints",
+    "show_references",
+    "show_tags",
+    "show_marked_status",
+    "show_metrics",
+)
+
+
+class SourceQuestionBank(QuestionBank):
+    """Question bank with marked questions and metrics for the quiz sources."""
+
+    def load_categories(self):
+        return []
+
+    def load_metrics(self):
+        return {
+            "Q1": QuestionMetric(QuestionNumber("Q1"), correct_attempts=2),
+            "Q2": QuestionMetric(QuestionNumber("Q2"), wrong_attempts=1),
+            "Q3": QuestionMetric(QuestionNumber("Q3"), skip_count=1),
+            "Q5": QuestionMetric(QuestionNumber("Q5"), correct_attempts=1, skip_count=2),
+        }
+
+    def load_questions(self):
+        return [
+            Question(f"Question {i}?", ["A", "B", "C", "D"], "A", QuestionNumber(f"Q{i}"), None)
+            for i in range(1, 7)
+        ]
+
+    def load_marked_questions(self):
+        for question in self._questions:
+            question.is_marked = question.question_number in ("Q2", "Q4")
+        return 2
+
+
+class TestQuizProcessorSources(unittest.TestCase):
+    """Test the questions selected for each quiz source."""
+
+    def setUp(self):
+        self.question_bank = SourceQuestionBank(
+            CountryCode.CANADA, ExamType.BASIC, Path("dummy_path")
+        )
+
+    def _get_processor(self, quiz_source, number_of_questions=10, seed=None):
+        return QuizProcessor(
+            self.question_bank,
+            number_of_questions,
+            QuestionDisplayMode.QUIZ,
+            QuizAnswerDisplay.AFTER_QUESTION,
+            quiz_source,
+            dict.fromkeys(QUIZ_CONFIG_KEYS, False),
+            {},
+            {},
+            seed,
+        )
+
+    def _get_question_numbers(self, quiz_source):
+        processor = self._get_processor(quiz_source)
+        return sorted(q.question_number for q in processor._get_random_questions())
+
+    def test_all_source(self):
+        self.assertEqual(self._get_question_numbers(QuizSource.ALL), ["Q1", "Q3", "Q5", "Q6"])
+
+    def test_exclude_marked_source(self):
+        self.assertEqual(
+            self._get_question_numbers(QuizSource.EXCLUDE_MARKED_QUESTIONS),
+            ["Q1", "Q3", "Q5", "Q6"],
+        )
+
+    def test_marked_source(self):
+        self.assertEqual(self._get_question_numbers(QuizSource.MARKED), ["Q2", "Q4"])
+
+    def test_new_source(self):
+        self.assertEqual(self._get_question_numbers(QuizSource.NEW), ["Q6"])
+
+    def test_skipped_questions_source(self):
+        self.assertEqual(
+            self._get_question_numbers(QuizSource.SKIPPED_QUESTIONS), ["Q1", "Q5", "Q6"]
+        )
+
+    def test_exclude_correct_answers_source(self):
+        self.assertEqual(
+            self._get_question_numbers(QuizSource.EXCLUDE_CORRECT_ANSWERS), ["Q3", "Q6"]
+        )
+
+    def test_wrong_answers_source(self):
+        self.assertEqual(self._get_question_numbers(QuizSource.WRONG_ANSWERS), ["Q2"])
+
+    def test_old_source(self):
+        self.assertEqual(self._get_question_numbers(QuizSource.OLD), ["Q2"])
+
+    def test_number_of_questions(self):
+        processor = self._get_processor(QuizSource.ALL, number_of_questions=2)
+        self.assertEqual(len(processor._get_random_questions()), 2)
+
+    def test_seed_reproduces_quiz(self):
+        quizzes = []
+        for _ in range(2):
+            quiz = self._get_processor(QuizSource.ALL, seed=42)._quiz
+            questions = quiz.get_questions()
+            quizzes.append(
+                [(q.question_number, tuple(quiz.get_quiz_choices(q))) for q in questions]
+            )
+        self.assertEqual(quizzes[0], quizzes[1])
+
+    def test_due_source(self):
+        with tempfile.TemporaryDirectory() as folder:
+            metrics_dir = Path(folder, "ca", "basic")
+            metrics_dir.mkdir(parents=True)
+            now = int(time.time())
+            ReviewSchedule(
+                [
+                    ReviewItem(QuestionNumber("Q3"), now - 10),
+                    ReviewItem(QuestionNumber("Q1"), now - 20),
+                    ReviewItem(QuestionNumber("Q2"), now + 1000),
+                    ReviewItem(QuestionNumber("Q9"), now - 30),
+                ]
+            ).save(str(metrics_dir / "review-schedule.txt"))
+            processor = QuizProcessor(
+                self.question_bank,
+                2,
+                QuestionDisplayMode.QUIZ,
+                QuizAnswerDisplay.AFTER_QUESTION,
+                QuizSource.DUE,
+                dict.fromkeys(QUIZ_CONFIG_KEYS, False),
+                {},
+                {"folder": folder},
+            )
+            self.assertEqual(
+                [q.question_number for q in processor._quiz.get_questions()], ["Q1", "Q3"]
+            )
+            processor._number_of_questions = 4
+            questions = processor._get_due_questions()
+            self.assertEqual([q.question_number for q in questions[:2]], ["Q1", "Q3"])
+            self.assertTrue({q.question_number for q in questions[2:]} <= {"Q4", "Q5", "Q6"})
+
+            questions = processor._quiz.get_questions()
+            questions[0].correct_attempts = 1
+            questions[1].skip_count = 1
+            processor._save_review_schedule()
+            schedule = ReviewSchedule.load(str(metrics_dir / "review-schedule.txt"))
+            self.assertEqual(schedule.get(QuestionNumber("Q1")).repetitions, 1)
+            self.assertEqual(schedule.get(QuestionNumber("Q3")).ease, 2.18)
+            self.assertEqual(schedule.get_due(10, now), [QuestionNumber("Q9")])
+
+    def test_adaptive_source(self):
+        with tempfile.TemporaryDirectory() as folder:
+            processor = self._get_processor(QuizSource.ALL, number_of_questions=6)
+            processor._metrics_config = {"folder": folder}
+            processor._quiz_source = QuizSource.ADAPTIVE
+            questions = processor._get_adaptive_questions()
+            self.assertEqual(
+                sorted(q.question_number for q in questions), ["Q1", "Q2", "Q3", "Q4", "Q5", "Q6"]
+            )
+
+            processor._quiz_config = {
+                "adaptive_weights": {"base": 0, "wrong": 1, "skip": 0, "recent": 0}
+            }
+            processor._number_of_questions = 3
+            questions = processor._get_adaptive_questions()
+            self.assertEqual([q.question_number for q in questions], ["Q2"])
+
+    def test_adaptive_weights(self):
+        weights = AdaptiveWeights.from_config({"adaptive_weights": {"recent": 3}})
+        self.assertEqual((weights.base, weights.wrong, weights.skip), (1.0, 2.0, 1.0))
+        metric = QuestionMetric(QuestionNumber("Q1"), 1, 2, 1)
+        self.assertEqual(weights.get_weight(metric, None, 0), 6.0)
+        now = 10 * SECONDS_PER_DAY
+        review = ReviewItem(QuestionNumber("Q1"), now, 1, 2.5, 0)
+        # answered wrong one day ago
+        self.assertEqual(weights.get_weight(metric, review, now), 7.5)
+        review.repetitions = 1
+        self.assertEqual(weights.get_weight(metric, review, now), 6.0)
+        with self.assertRaises(ValueError):
+            AdaptiveWeights.from_config({"adaptive_weights": {"wrong": -1}})
+
+    def _get_journal_processor(self, folder, resume=False):
+        return QuizProcessor(
+            self.question_bank,
+            3,
+            QuestionDisplayMode.QUIZ,
+            QuizAnswerDisplay.AFTER_QUESTION,
+            QuizSource.ALL,
+            dict.fromkeys(QUIZ_CONFIG_KEYS, False),
+            {},
+            {"folder": folder},
+            seed=3,
+            resume=resume,
+        )
+
+    @patch("builtins.print")
+    def test_resume_quiz(self, _):
+        with tempfile.TemporaryDirectory() as folder:
+            processor = self._get_journal_processor(folder)
+            processor._open_journal()
+            session = processor._quiz.get_session()
+            session.add_listener(processor._journal.record)
+            session.next()
+            session.answer(session.get_answer_index(session.current_question))
+            session.next()
+            processor._save_metrics()
+            processor._close_journal()
+            self.assertTrue(os.path.exists(processor._get_journal_file_path()))
+
+            resumed = self._get_journal_processor(folder, resume=True)
+            resumed_session = resumed._quiz.get_session()
+            # the answers of the resumed quiz are logged in the same session
+            self.assertEqual(resumed._answer_session, processor._answer_session)
+            self.assertEqual(
+                [q.question_number for q in resumed._quiz.get_questions()],
+                [q.question_number for q in processor._quiz.get_questions()],
+            )
+            self.assertEqual(list(resumed_session.submitted), list(session.submitted))
+            self.assertEqual(resumed_session.current_index, 1)
+            # the answer saved before the checkpoint is not saved again
+            self.assertEqual(resumed._resumed_records, [])
+            resumed._open_journal()
+            self.assertEqual(resumed._get_session_metrics(), [])
+            resumed._release_journal()
+
+    @patch("builtins.print")
+    def test_recover_unfinished_quiz(self, _):
+        with tempfile.TemporaryDirectory() as folder:
+            processor = self._get_journal_processor(folder)
+            journal = processor._open_journal()
+            session = processor._quiz.get_session()
+            session.add_listener(journal.record)
+            session.next()
+            session.skip()
+            processor._release_journal()
+            question_number = session.current_question.question_number
+
+            marked_path = os.path.join(folder, "marked.txt")
+            with patch.object(
+                self.question_bank, "get_marked_questions_filepath", return_value=marked_path
+            ):
+                recovering = self._get_journal_processor(folder)
+                recovering._open_journal()
+                recovering._release_journal()
+            with open(processor._get_metrics_file_path(), "r", encoding="utf-8") as f:
+                self.assertIn(f"{question_number}:0:0:1", f.read())
+            _, records = QuizJournal(processor._get_journal_file_path()).read()
+            self.assertEqual(records, [])
+
+    @patch("builtins.print")
+    def test_journal_locked_by_another_quiz(self, mock_print):
+        with tempfile.TemporaryDirectory() as folder:
+            processor = self._get_journal_processor(folder)
+            self.assertIsNotNone(processor._open_journal())
+            other = self._get_journal_processor(folder)
+            self.assertIsNone(other._open_journal())
+            self.assertIn("cannot be resumed", mock_print.call_args[0][0])
+            # the quiz runs without a journal, its metrics come from its questions
+            question = other._quiz.get_questions()[0]
+            question.wrong_attempts = 1
+            self.assertIn(question.metric, other._get_session_metrics())
+            processor._release_journal()
+            self.assertIsNotNone(other._open_journal())
+            other._release_journal()
+
+    def test_save_review_schedule_reads_schedule_again(self):
+        with tempfile.TemporaryDirectory() as folder:
+            processor = self._get_journal_processor(folder)
+            schedule_file = processor._get_review_schedule_file_path()
+            processor._get_review_schedule()
+            # another quiz saves its review after the schedule was loaded
+            other = ReviewSchedule()
+            other.review(QuestionNumber("Q9"), 5, 0)
+            other.save(schedule_file)
+            processor._save_review_schedule([QuestionMetric(QuestionNumber("Q1"), 1)])
+            self.assertEqual(ReviewSchedule.load(schedule_file).question_numbers, {"Q1", "Q9"})
+            self.assertIn("Q1", processor._get_review_schedule().question_numbers)
+
+    @patch("builtins.print")
+    def test_answer_log(self, mock_print):
+        with tempfile.TemporaryDirectory() as folder:
+            processor = self._get_journal_processor(folder)
+            session = processor._quiz.get_session()
+
+            def answer_all():
+                event = session.next()
+                while event.event_type != QuizEventType.FINISHED:
+                    session.answer(session.get_answer_index(event.question))
+                    event = session.next()
+
+            marked_path = os.path.join(folder, "marked.txt")
+            with (
+                patch.object(processor._quiz, "start", side_effect=answer_all),
+                patch.object(
+                    self.question_bank, "get_marked_questions_filepath", return_value=marked_path
+                ),
+            ):
+                processor.process()
+            answers = get_answer_log(processor._metrics_config, self.question_bank.exam_type)
+            columns = answers.read()
+            self.assertEqual(len(columns), 3)
+            self.assertEqual(list(columns["session"]), [processor._answer_session] * 3)
+
+            report_answer_stats(self.question_bank, {"folder": folder}, json_format=True)
+            stats = json.loads(mock_print.call_args[0][0])
+            self.assertEqual((stats["exam_type"], stats["answered"]), ("basic", 3))
+            self.assertEqual(stats["accuracy"], 1.0)
+
+    def test_save_progress_store(self):
+        with tempfile.TemporaryDirectory() as folder:
+            processor = self._get_processor(QuizSource.ALL, number_of_questions=2, seed=1)
+            processor._metrics_config = {"folder": folder, "database": "progress.db"}
+            first, second = processor._quiz.get_questions()
+            first.correct_attempts = 1
+            second.wrong_attempts = 1
+            second.is_marked = True
+            processor._save_metrics()
+            processor._save_marked_questions()
+            processor._save_metrics([QuestionMetric(first.question_number, skip_count=1)])
+            processor._save_marked_questions({second.question_number: False})
+
+            self.assertFalse(os.path.exists(processor._get_metrics_file_path()))
+            with ProgressStore(os.path.join(folder, "progress.db")) as store:
+                metrics = store.load_metrics("ca", "basic")
+                self.assertEqual(
+                    {
+                        qn: (m.correct_attempts, m.wrong_attempts, m.skip_count)
+                        for qn, m in metrics.items()
+                    },
+                    {first.question_number: (1, 0, 1), second.question_number: (0, 1, 0)},
+                )
+                self.assertEqual(store.load_marked_questions("ca", "basic"), set())
+
+    def test_quizzes_do_not_share_choice_order(self):
+        question = self.question_bank.questions[0]
+        for seed in range(5):
+            self._get_processor(QuizSource.ALL, seed=seed)
+        self.assertEqual(question.choices, ["A", "B", "C", "D"])
+        self.assertEqual(question.answer_index, 0)
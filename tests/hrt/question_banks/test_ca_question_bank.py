@@ -1,17 +1,49 @@
+import tempfile
 import unittest
 from unittest.mock import patch
-from hrt.question_banks.ca_question_bank import CAQuestionBank, get_question_category_id
-from hrt.common.enums import ExamType
+from hrt.question_banks.ca_question_bank import (
+    CAQuestionBank,
+    get_question_category_id,
+    read_questions,
+)
+from hrt.common import utils
+from hrt.common.enums import ExamType, QuestionLanguage
 from hrt.common.question import Question, QuestionCategory, QuestionMetric
 from hrt.common.hrt_types import QuestionNumber
+from hrt.common.progress_store import ProgressStore
 from pathlib import Path
 
 
+QUESTIONS_FILE_CONTENT = (
+    "question_id;question_english;correct_answer_english;incorrect_answer_1_english;"
+    "incorrect_answer_2_english;incorrect_answer_3_english;question_french;"
+    "correct_answer_french;incorrect_answer_1_french;incorrect_answer_2_french;"
+    "incorrect_answer_3_french\r\n"
+    "A-001-789;Question 1;Choice 1;Choice 2;Choice 3;Choice 4;"
+    "Question 1 fr;Choix 1;Choix 2;Choix 3;Choix 4\r\n"
+    "B-002-321;Question 2;Choice A;Choice B;Choice C;Choice D;"
+    "Question 2 fr;Choix A;Choix B;Choix C;Choix D\r\n"
+)
+
+
 class TestCAQuestionBank(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.questions_path = Path(temp_dir.name) / "questions.txt"
+        self.questions_path.write_bytes(QUESTIONS_FILE_CONTENT.encode("iso-8859-1"))
+        self.bank = self.create_bank()
+
     @patch("hrt.common.utils.read_delim_file")
     @patch("hrt.common.utils.read_metrics_from_file")
     @patch("os.path.exists", return_value=True)
-    def setUp(self, _, mock_read_metrics_from_file, mock_read_delim_file):
+    def create_bank(
+        self,
+        _,
+        mock_read_metrics_from_file,
+        mock_read_delim_file,
+        language=QuestionLanguage.EN,
+    ):
         self.categories_file_content = [["001", "Category 1", "10"], ["002", "Category 2", "5"]]
         self.categories = [
             QuestionCategory("1", "Category 1", int(10)),
@@ -21,10 +53,6 @@ class TestCAQuestionBank(unittest.TestCase):
             QuestionMetric(QuestionNumber("A-001-789"), 5, 3, 0),
             QuestionMetric(QuestionNumber("987-654-321"), 2, 1, 0),
         ]
-        self.questions_file_content = [
-            ["A-001-789", "Question 1", "Choice 1", "Choice 2", "Choice 3", "Choice 4"],
-            ["B-002-321", "Question 2", "Choice A", "Choice B", "Choice C", "Choice D"],
-        ]
         self.questions = [
             Question(
                 "Question 1",
@@ -41,18 +69,20 @@ class TestCAQuestionBank(unittest.TestCase):
                 self.categories[1],
             ),
         ]
-        mock_read_delim_file.side_effect = [
-            self.categories_file_content,
-            self.questions_file_content,
-            [],
-        ]
+        # the input files are read concurrently, so match the content on the file path
+        file_contents = {
+            "dummy_categories_path": self.categories_file_content,
+            "dummy_marked_questions_path": [],
+        }
+        mock_read_delim_file.side_effect = lambda path, **_: file_contents[path]
         mock_read_metrics_from_file.return_value = self.metrics
-        self.bank = CAQuestionBank(
+        return CAQuestionBank(
             ExamType.BASIC,
-            Path("dummy_path"),
+            self.questions_path,
             categories_filepath=Path("dummy_categories_path"),
             marked_questions_filepath=Path("dummy_marked_questions_path"),
             metrics_filepath=Path("dummy_metrics_path"),
+            language=language,
         )
 
     def test_get_question_category_id(self):
@@ -79,6 +109,30 @@ class TestCAQuestionBank(unittest.TestCase):
         self.assertEqual(metrics[QuestionNumber("A-001-789")].correct_attempts, 5)
         self.assertEqual(metrics[QuestionNumber("A-001-789")].wrong_attempts, 3)
 
+    @patch("hrt.common.utils.read_delim_file")
+    def test_load_progress_store(self, mock_read_delim_file):
+        mock_read_delim_file.return_value = self.categories_file_content
+        store_path = self.questions_path.parent / "progress.db"
+        with ProgressStore(store_path) as store:
+            store.add_metrics(
+                "ca", "basic", [QuestionMetric(QuestionNumber("A-001-789"), 1, 2, 3)]
+            )
+            store.set_marked_questions("ca", "basic", {QuestionNumber("B-002-321"): True})
+        bank = CAQuestionBank(
+            ExamType.BASIC,
+            self.questions_path,
+            categories_filepath=Path("dummy_categories_path"),
+            marked_questions_filepath=Path("dummy_marked_questions_path"),
+            progress_store_filepath=store_path,
+        )
+        self.assertEqual(list(bank.metrics), ["A-001-789"])
+        self.assertEqual(bank.metrics[QuestionNumber("A-001-789")].skip_count, 3)
+        self.assertEqual(
+            [q.question_number for q in bank.get_all_marked_questions()], ["B-002-321"]
+        )
+        # the marked questions file is not read
+        mock_read_delim_file.assert_called_once_with("dummy_categories_path", delimiter=":")
+
     def test_load_questions(self):
         questions = self.bank.questions
         self.assertEqual(len(questions), 2)
@@ -89,6 +143,49 @@ class TestCAQuestionBank(unittest.TestCase):
         )
         self.assertEqual(questions[0].answer, "Choice 1")
         self.assertEqual(questions[0].category.category_id, "001")
+        self.assertEqual(self.bank.derived_filepath, self.questions_path)
+
+    def test_load_questions_french(self):
+        bank = self.create_bank(language=QuestionLanguage.FR)
+        questions = bank.questions
+        self.assertEqual(questions[1].question_number, "B-002-321")
+        self.assertEqual(questions[1].question_text, "Question 2 fr")
+        self.assertEqual(questions[1].answer, "Choix A")
+        self.assertEqual(bank.derived_filepath, Path(f"{self.questions_path}.fr"))
+        # the manifest tracks the English questions
+        manifest_questions = bank.get_manifest_questions()
+        self.assertEqual(manifest_questions[1].question_text, "Question 2")
+
+    def test_load_questions_both_languages(self):
+        question = self.create_bank(language=QuestionLanguage.BOTH).questions[0]
+        self.assertEqual(question.question_text, "Question 1\nQuestion 1 fr")
+        self.assertEqual(question.answer, "Choice 1 / Choix 1")
+        self.assertIn("Choice 4 / Choix 4", question.choices)
+
+    def test_read_questions(self):
+        questions = read_questions(
+            self.questions_path, QuestionLanguage.BOTH, {QuestionNumber("B-002-321")}
+        )
+        self.assertEqual(len(questions), 1)
+        self.assertEqual(questions[0].question_number, "B-002-321")
+        self.assertEqual(questions[0].question_text, "Question 2\nQuestion 2 fr")
+        self.assertEqual(questions[0].answer, "Choice A / Choix A")
+        self.assertIsNone(questions[0].category)
+
+    def test_file_hashed_once(self):
+        with patch(
+            "hrt.common.question_bank.utils.get_file_hash", wraps=utils.get_file_hash
+        ) as mock_hash:
+            bank = self.create_bank()
+            bank.get_same_answer_questions()
+        # the manifest check and the analysis cache share the hash taken on load
+        mock_hash.assert_called_once_with(self.questions_path)
+        self.assertEqual(bank.file_hash, utils.get_file_hash(self.questions_path))
+        self.assertEqual(bank.file_stat, utils.get_file_stat(self.questions_path))
+
+    def test_load_questions_missing_file(self):
+        self.questions_path.unlink()
+        self.assertEqual(self.create_bank().questions, [])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,155 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from hrt.common.enums import ExamType, QuestionBankImportFormat
+from hrt.question_banks.ca_question_bank import CAQuestionBank
+from hrt.question_banks.question_bank_importer import (
+    get_import_format,
+    get_imported_categories_path,
+    import_question_bank,
+    validate_record,
+)
+
+CSV_CONTENT = (
+    "question_id,category,category_name,question,correct_answer,incorrect_answer_1,"
+    "incorrect_answer_2,incorrect_answer_3\n"
+    ",001,Regulations,What is a  call sign?,An identifier;unique,A name,A number,A code\n"
+    'X-002-005-001,,Operating,"What is\nQRZ?",Who is calling me?,QRT,QSL,QSY\n'
+    ",001,,Missing answers,Yes,No,,\n"
+)
+
+
+class TestQuestionBankImporter(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.folder = Path(temp_dir.name)
+        self.questions_path = self.folder / "custom" / "questions.txt"
+        self.categories_path = self.folder / "custom" / "categories.txt"
+
+    def import_source(self, name, content):
+        source = self.folder / name
+        source.write_text(content, encoding="utf-8")
+        return import_question_bank(source, self.questions_path, self.categories_path)
+
+    def test_get_import_format(self):
+        self.assertEqual(get_import_format("bank.CSV"), QuestionBankImportFormat.CSV)
+        self.assertEqual(get_import_format("bank.jsonl"), QuestionBankImportFormat.JSONL)
+        with self.assertRaises(ValueError):
+            get_import_format("bank.xlsx")
+
+    def test_get_imported_categories_path(self):
+        self.assertEqual(
+            get_imported_categories_path(Path("data") / "custom.txt"),
+            Path("data") / "custom-categories.txt",
+        )
+
+    def test_import_csv(self):
+        result = self.import_source("bank.csv", CSV_CONTENT)
+        self.assertEqual(result.imported, 2)
+        self.assertEqual(result.skipped, 1)
+        self.assertEqual(len(result.errors), 1)
+        self.assertIn("incorrect answers", result.errors[0])
+        self.assertEqual(result.categories, {"001": ["Regulations", 1], "002": ["Operating", 1]})
+        lines = self.questions_path.read_text(encoding="iso-8859-1").splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].startswith("question_id;question_english;"))
+        self.assertEqual(
+            lines[1],
+            'C-001-001-001;What is a call sign?;"An identifier;unique";A name;A number;A code',
+        )
+        self.assertEqual(lines[2], "X-002-005-001;What is QRZ?;Who is calling me?;QRT;QSL;QSY")
+        self.assertEqual(
+            self.categories_path.read_text(encoding="utf-8"),
+            "001:Regulations:1\n002:Operating:1\n",
+        )
+        self.assertFalse(Path(f"{self.questions_path}.tmp").exists())
+
+    def test_import_jsonl(self):
+        records = [
+            {
+                "category": "003",
+                "question": "Unit of power?",
+                "correct_answer": "Watt",
+                "incorrect_answers": ["Volt", "Ohm", "Ampere"],
+            },
+            {
+                "category": "003",
+                "question": "Unit of resistance?",
+                "correct_answer": "Ohm",
+                "incorrect_answers": ["Volt", "Watt", "Ampere"],
+            },
+            {
+                "category": "003",
+                "question": "Unit of charge?",
+                "correct_answer": "Coulomb",
+                "incorrect_answers": ["Volt", "Watt", "Ampère ☺"],
+            },
+        ]
+        content = "\n".join(json.dumps(record) for record in records) + "\n\n{invalid\n"
+        result = self.import_source("bank.jsonl", content)
+        self.assertEqual(result.imported, 2)
+        self.assertEqual(result.skipped, 2)
+        self.assertIn("iso-8859-1", result.errors[0])
+        self.assertIn("Line 5: invalid JSON", result.errors[1])
+        self.assertEqual(result.categories, {"003": ["003", 2]})
+        self.assertEqual(result.duplicate_answers, 0)
+
+    def test_validate_record(self):
+        record = {
+            "question_id": "A-001-001-001",
+            "question": "Question",
+            "correct_answer": "A",
+            "incorrect_answers": ["B", "C", "D"],
+        }
+        question = validate_record(record, set(), "C", 1)
+        self.assertEqual(question.category_id, "001")
+        with self.assertRaisesRegex(ValueError, "duplicate"):
+            validate_record(record, {"A-001-001-001"}, "C", 2)
+        with self.assertRaisesRegex(ValueError, "not in category"):
+            validate_record({**record, "category": "002"}, set(), "C", 1)
+        with self.assertRaisesRegex(ValueError, "format"):
+            validate_record({**record, "question_id": "001"}, set(), "C", 1)
+        with self.assertRaisesRegex(ValueError, "also an incorrect"):
+            validate_record({**record, "correct_answer": "B"}, set(), "C", 1)
+        with self.assertRaisesRegex(ValueError, "missing category"):
+            validate_record({**record, "question_id": ""}, set(), "C", 1)
+        with self.assertRaisesRegex(ValueError, "not an object"):
+            validate_record([], set(), "C", 1)
+
+    def test_import_keeps_existing_file_on_error(self):
+        self.questions_path.parent.mkdir(parents=True)
+        self.questions_path.write_text("existing", encoding="utf-8")
+        with self.assertRaises(FileNotFoundError):
+            import_question_bank(
+                self.folder / "missing.csv", self.questions_path, self.categories_path
+            )
+        self.assertEqual(self.questions_path.read_text(encoding="utf-8"), "existing")
+        self.assertFalse(Path(f"{self.questions_path}.tmp").exists())
+
+    def test_imported_bank_loads(self):
+        self.import_source("bank.csv", CSV_CONTENT)
+        marked_path = self.folder / "marked.txt"
+        metrics_path = self.folder / "metrics.txt"
+        marked_path.touch()
+        metrics_path.touch()
+        bank = CAQuestionBank(
+            ExamType.BASIC,
+            self.questions_path,
+            categories_filepath=self.categories_path,
+            marked_questions_filepath=marked_path,
+            metrics_filepath=metrics_path,
+        )
+        questions = bank.get_all_questions()
+        self.assertEqual(
+            [question.question_number for question in questions],
+            ["C-001-001-001", "X-002-005-001"],
+        )
+        self.assertEqual(questions[0].answer, "An identifier;unique")
+        self.assertEqual(questions[1].category.name, "Operating")
+
+
+if __name__ == "__main__":
+    unittest.main()